@@ -0,0 +1,26 @@
+-- Migration: Multipass Phase Cache
+-- Date: 2026-06-12
+-- Purpose: Shared cache for multipass landing page pipeline phase results,
+--          so re-analyzing an unchanged page skips the LLM calls. Keys are
+--          content hashes of phase, model, prompt version and inputs.
+--          30-day freshness window (enforced in application code).
+
+CREATE TABLE IF NOT EXISTS multipass_phase_cache (
+    cache_key TEXT PRIMARY KEY,
+    phase TEXT NOT NULL,
+    value TEXT NOT NULL,
+    created_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+COMMENT ON TABLE multipass_phase_cache IS 'Content-addressed cache of multipass pipeline phase results. Freshness enforced in app code.';
+COMMENT ON COLUMN multipass_phase_cache.cache_key IS 'sha256 of phase, model id, prompt version and phase inputs (truncated)';
+COMMENT ON COLUMN multipass_phase_cache.phase IS 'Phase label (phase_0, phase_1, phase_3, phase_4)';
+COMMENT ON COLUMN multipass_phase_cache.value IS 'JSON: phase result plus the debug snapshots it produced';
+COMMENT ON COLUMN multipass_phase_cache.created_at IS 'When the phase result was computed';
+
+-- Index for freshness filtering and eviction
+CREATE INDEX IF NOT EXISTS idx_multipass_phase_cache_created ON multipass_phase_cache(created_at);
+
+-- RLS policy (same open policy as other cache tables)
+ALTER TABLE multipass_phase_cache ENABLE ROW LEVEL SECURITY;
+CREATE POLICY multipass_phase_cache_policy ON multipass_phase_cache FOR ALL TO authenticated USING (true) WITH CHECK (true);
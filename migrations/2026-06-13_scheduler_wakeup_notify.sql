@@ -0,0 +1,60 @@
+-- Migration: Scheduler wakeup NOTIFY triggers
+-- Date: 2026-06-13
+-- Purpose: Let idle scheduler workers block on LISTEN scheduler_wakeup
+--          instead of polling claim_next_job every 2s. A notification is
+--          sent whenever a scheduled_job_runs row may have become claimable:
+--            - a scheduled_jobs row is inserted / re-armed (active, with
+--              next_run_at set). Payload = next_run_at as epoch seconds, so
+--              workers can arm a timer for future runs.
+--            - a running scheduled_job_runs row finishes, freeing a
+--              concurrency cap slot and un-blocking its parent. Empty payload.
+--          claim_next_job clears next_run_at, so claims themselves do not
+--          notify. pg_notify is transactional: nothing is sent on rollback.
+--
+-- Consumer: viraltracker/worker/scheduler_concurrency.py::PgNotifyJobWakeup
+-- (enabled by SCHEDULER_NOTIFY_DSN; polling remains as a safety net).
+
+CREATE OR REPLACE FUNCTION notify_scheduler_job_ready()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    IF NEW.status = 'active' AND NEW.next_run_at IS NOT NULL THEN
+        PERFORM pg_notify(
+            'scheduler_wakeup',
+            EXTRACT(EPOCH FROM NEW.next_run_at)::TEXT
+        );
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+COMMENT ON FUNCTION notify_scheduler_job_ready() IS
+    'NOTIFY scheduler_wakeup with next_run_at (epoch) when a scheduled job is armed. See scheduler_concurrency.JobWakeup.';
+
+DROP TRIGGER IF EXISTS scheduled_jobs_wakeup ON scheduled_jobs;
+CREATE TRIGGER scheduled_jobs_wakeup
+    AFTER INSERT OR UPDATE OF next_run_at, status ON scheduled_jobs
+    FOR EACH ROW
+    EXECUTE FUNCTION notify_scheduler_job_ready();
+
+
+CREATE OR REPLACE FUNCTION notify_scheduler_run_finished()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    PERFORM pg_notify('scheduler_wakeup', '');
+    RETURN NULL;
+END;
+$$;
+
+COMMENT ON FUNCTION notify_scheduler_run_finished() IS
+    'NOTIFY scheduler_wakeup when a running run finishes (frees a concurrency cap slot).';
+
+DROP TRIGGER IF EXISTS scheduled_job_runs_wakeup ON scheduled_job_runs;
+CREATE TRIGGER scheduled_job_runs_wakeup
+    AFTER UPDATE OF status ON scheduled_job_runs
+    FOR EACH ROW
+    WHEN (OLD.status = 'running' AND NEW.status IS DISTINCT FROM 'running')
+    EXECUTE FUNCTION notify_scheduler_run_finished();
@@ -0,0 +1,18 @@
+-- Migration: Per-run execution mode and resource usage on scheduled_job_runs
+-- Date: 2026-06-14
+-- Purpose: Job handlers run either in a thread of the worker process or in a
+--          pre-warmed subprocess (per-job-type policy in JOB_HANDLERS). The
+--          dispatcher records how each run executed and what it cost, so
+--          CPU-heavy job types can be spotted and moved to the process pool.
+
+ALTER TABLE scheduled_job_runs
+    ADD COLUMN IF NOT EXISTS execution_mode TEXT,
+    ADD COLUMN IF NOT EXISTS cpu_seconds NUMERIC,
+    ADD COLUMN IF NOT EXISTS max_rss_mb NUMERIC;
+
+COMMENT ON COLUMN scheduled_job_runs.execution_mode IS
+    'How the handler ran: thread (worker process) or process (subprocess pool). NULL for older rows.';
+COMMENT ON COLUMN scheduled_job_runs.cpu_seconds IS
+    'CPU seconds used by the handler (thread CPU time for thread runs, process CPU time for process runs).';
+COMMENT ON COLUMN scheduled_job_runs.max_rss_mb IS
+    'Peak RSS of the pool process during the run (process runs) or worker RSS at run end (thread runs), in MB.';
@@ -17,7 +17,7 @@ logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(mess
 logger = logging.getLogger(__name__)
 
 
-def backfill_keywords(supabase, project_id=None, dry_run=False):
+def backfill_keywords(supabase, project_id=None, dry_run=False, concurrency=None, chunk_size=1000):
     """Embed all keywords with NULL embedding."""
     from viraltracker.core.embeddings import create_seo_embedder
 
@@ -42,21 +42,24 @@ def backfill_keywords(supabase, project_id=None, dry_run=False):
     embedder = create_seo_embedder()
     embedded = 0
 
-    # Process in batches of 100
-    for i in range(0, len(rows), 100):
-        batch = rows[i:i + 100]
+    # Process in chunks of 1000; each chunk keeps several 100-text API
+    # batches in flight under the embedder's shared rate limit
+    for i in range(0, len(rows), chunk_size):
+        batch = rows[i:i + chunk_size]
         texts = [r["keyword"] for r in batch]
         ids = [r["id"] for r in batch]
 
         try:
-            vectors = embedder.embed_texts(texts, task_type="CLUSTERING")
+            vectors = embedder.embed_texts_concurrent(
+                texts, task_type="CLUSTERING", max_concurrency=concurrency
+            )
             for kw_id, vec in zip(ids, vectors):
                 supabase.table("seo_keywords").update(
                     {"embedding": vec}
                 ).eq("id", kw_id).execute()
                 embedded += 1
         except Exception as e:
-            logger.error(f"Batch {i // 100 + 1} failed: {e}")
+            logger.error(f"Chunk {i // chunk_size + 1} failed: {e}")
             continue
 
         logger.info(f"Embedded {embedded}/{len(rows)} keywords...")
@@ -94,13 +97,17 @@ def main():
     parser.add_argument("--project-id", help="Limit to a specific project UUID")
     parser.add_argument("--dry-run", action="store_true", help="Show what would be done without changes")
     parser.add_argument("--skip-centroids", action="store_true", help="Skip centroid recomputation")
+    parser.add_argument("--concurrency", type=int, default=None,
+                        help="Embedding batches in flight (default: embedder setting)")
     args = parser.parse_args()
 
     from viraltracker.core.database import get_supabase_client
     supabase = get_supabase_client()
 
     # Step 1: Embed keywords
-    embedded = backfill_keywords(supabase, project_id=args.project_id, dry_run=args.dry_run)
+    embedded = backfill_keywords(
+        supabase, project_id=args.project_id, dry_run=args.dry_run, concurrency=args.concurrency
+    )
 
     # Step 2: Recompute centroids
     if not args.skip_centroids:
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Benchmark BaselineService cohort statistics on synthetic performance rows.
+
+Times CohortStatsEngine (row extraction and the percentile pass separately)
+for brands with 50k, 200k and 500k daily rows spread over 12 awareness ×
+format cohorts. No database access: rows are generated in memory and grouped
+with BaselineService._group_into_cohorts.
+
+Usage:
+    python scripts/benchmark_baseline_cohort_stats.py [--rows 50000 200000 500000]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from viraltracker.services.ad_intelligence.baseline_service import BaselineService  # noqa: E402
+from viraltracker.services.ad_intelligence.cohort_stats import CohortStatsEngine  # noqa: E402
+
+AWARENESS = ["unaware", "problem_aware", "solution_aware", "product_aware"]
+FORMATS = ["video_ugc", "image_static", "carousel"]
+
+
+def build_rows(n: int, days: int = 30, seed: int = 42):
+    """Synthetic daily rows: n // days ads with lognormal spend and impressions."""
+    rng = np.random.default_rng(seed)
+    n_ads = max(1, n // days)
+    ad_awareness = rng.integers(0, len(AWARENESS), size=n_ads)
+    ad_format = rng.integers(0, len(FORMATS), size=n_ads)
+    ads = rng.integers(0, n_ads, size=n)
+    impressions = rng.lognormal(7, 1.2, size=n).astype(int)
+    clicks = rng.binomial(impressions, 0.012)
+    spend = np.round(impressions * rng.uniform(0.005, 0.03, size=n), 2)
+    purchases = rng.poisson(0.3, size=n)
+    value = np.round(purchases * rng.uniform(20, 80, size=n), 2)
+    views = (impressions * rng.uniform(0, 0.4, size=n)).astype(int)
+    freq = np.round(rng.uniform(1, 3.5, size=n), 3)
+
+    return [
+        {
+            "meta_ad_id": f"ad{ads[i]}",
+            "creative_awareness_level": AWARENESS[ad_awareness[ads[i]]],
+            "creative_format": FORMATS[ad_format[ads[i]]],
+            "impressions": int(impressions[i]),
+            "link_clicks": int(clicks[i]),
+            "spend": float(spend[i]),
+            "purchases": int(purchases[i]),
+            "purchase_value": float(value[i]),
+            "video_views": int(views[i]),
+            "video_p25_watched": int(views[i] // 2),
+            "video_p100_watched": int(views[i] // 8),
+            "frequency": float(freq[i]),
+        }
+        for i in range(n)
+    ]
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--rows", type=int, nargs="+", default=[50_000, 200_000, 500_000])
+    args = parser.parse_args()
+
+    service = BaselineService(None)
+
+    print(f"{'rows':>10} {'cohorts':>8} {'extract':>9} {'compute':>9} {'total':>9}")
+    for n in args.rows:
+        cohorts = service._group_into_cohorts(build_rows(n))
+        engine, extract_time = timed(
+            lambda: CohortStatsEngine(cohorts, "purchase", "purchase_value")
+        )
+        (by_cohort, by_awareness, _), compute_time = timed(lambda: engine.compute(0.02))
+        segments = len(by_cohort) + len(by_awareness) + 1
+        print(
+            f"{n:>10,} {segments:>8} {extract_time:>8.3f}s {compute_time:>8.3f}s "
+            f"{extract_time + compute_time:>8.3f}s"
+        )
+
+
+if __name__ == "__main__":
+    main()
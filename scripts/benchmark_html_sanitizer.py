@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Benchmark the surgery S0 sanitizer: regex passes vs single-pass tokenizer.
+
+Runs HTMLSanitizer in both modes over captured pages (--html, any number of
+saved page HTML files) or, without files, over a synthetic Shopify-style
+page with deep nesting, popups, chrome sections, lazy images, videos,
+iframes, templates and carousels. Reports time per mode and whether the
+outputs are byte-identical.
+
+Usage:
+    python scripts/benchmark_html_sanitizer.py [--html page1.html page2.html] [--size-mb 1.5] [--depth 40]
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from viraltracker.services.landing_page_analysis.multipass.surgery.sanitizer import (  # noqa: E402
+    HTMLSanitizer,
+)
+
+PAGE_URL = "https://shop.example.com/products/widget"
+
+_BLOCKS = [
+    '<div class="product__media swiper-slide" style="width: 320px; margin-right: 10px;">'
+    '<img data-src="/cdn/shop/files/p{i}.jpg" src="data:image/gif;base64,R0lGOD" alt="Product {i}"></div>',
+    '<img src="" srcset="//cdn.shopify.com/s/{i}_300.jpg 300w, //cdn.shopify.com/s/{i}_900.jpg 900w" loading="lazy">',
+    '<p class="rte" onclick="track({i})">Paragraph {i} with enough copy to look like a real product description.</p>',
+    '<a href="/collections/all?page={i}" onmouseover="hover()">Shop collection {i}</a>',
+    '<div class="newsletter-popup modal" id="popup-{i}"><div><form action="/contact">'
+    '<input type="email"><input type="submit" value="Join" class="btn"></form></div></div>',
+    '<script>window.dataLayer.push({{"event": "view_{i}"}});</script>',
+    '<noscript><img width="1" height="1" src="https://www.facebook.com/tr?id={i}"></noscript>',
+    '<video autoplay muted loop poster="/cdn/shop/videos/poster{i}.jpg" style="width:100%">'
+    '<source src="/cdn/shop/videos/v{i}.mp4"></video>',
+    '<iframe src="https://www.youtube.com/embed/dQw4w9WgXc{d}" title="Demo {i}"></iframe>',
+    '<template x-if="open"><img src="/cdn/shop/files/alt{i}.jpg"></template>',
+    '<template id="tpl-{i}"><span>scaffold</span></template>',
+    '<svg viewBox="0 0 10 10"><use href="#icon-{i}"/><path d="M0 0h10v10z"/></svg>',
+    '<div class="swiper-wrapper" style="transition-duration: 300ms; transform: translate3d(-{i}px, 0px, 0px);">'
+    '<div class="swiper-slide">Slide {i}</div></div>',
+    '<div style="aspect-ratio: "><span style="background:url(/cdn/shop/bg{i}.png)">Badge</span></div>',
+    '<link rel="preload" href="/cdn/font{i}.woff2"><link rel="stylesheet" href="/cdn/theme{i}.css">',
+]
+
+
+def synthetic_page(size_bytes: int, depth: int, seed: int = 0) -> str:
+    """Shopify-like page: nested section wrappers around mixed content blocks."""
+    rng = random.Random(seed)
+    head = (
+        '<!DOCTYPE html><html><head><title>Widget</title>'
+        '<style>.hero{background:url("/cdn/shop/hero.jpg")} .x{background:url(//cdn.shopify.com/y.png)}</style>'
+        '<link rel="icon" href="/favicon.ico"></head><body>'
+    )
+    parts = [head]
+    size = len(head)
+    i = 0
+    while size < size_bytes:
+        section_id = rng.choice(["main", "main", "main", "footer", "mega-menu", "featured"])
+        opener = (
+            f'<shopify-section><div id="shopify-section-template--{i}__{section_id}" '
+            f'class="shopify-section">'
+        )
+        nest = "".join(f'<div class="wrap-{d}">' for d in range(depth))
+        body = "".join(
+            rng.choice(_BLOCKS).format(i=i * 100 + k, d=k % 10) for k in range(30)
+        )
+        closer = "</div>" * (depth + 1) + "</shopify-section>"
+        if i % 7 == 3:
+            body += '<footer class="site-footer"><div><a href="/pages/faq">FAQ</a></div></footer>'
+        chunk = opener + nest + body + closer
+        parts.append(chunk)
+        size += len(chunk)
+        i += 1
+    parts.append("</body></html>")
+    return "".join(parts)
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--html", nargs="*", default=[], help="Captured page HTML files")
+    parser.add_argument("--size-mb", type=float, default=1.5, help="Synthetic page size")
+    parser.add_argument("--depth", type=int, default=40, help="Synthetic nesting depth")
+    parser.add_argument("--page-url", default=PAGE_URL)
+    args = parser.parse_args()
+
+    pages = [(Path(p).name, Path(p).read_text(errors="replace")) for p in args.html]
+    if not pages:
+        pages = [(
+            f"synthetic {args.size_mb}MB depth={args.depth}",
+            synthetic_page(int(args.size_mb * 1024 * 1024), args.depth),
+        )]
+
+    print(f"{'page':<36} {'size':>8} {'regex':>9} {'single':>9} {'speedup':>8}  identical")
+    for name, html in pages:
+        regex_time, (regex_html, _) = timed(
+            lambda: HTMLSanitizer(mode="regex").sanitize(html, args.page_url)
+        )
+        single_time, (single_html, _) = timed(
+            lambda: HTMLSanitizer(mode="single_pass").sanitize(html, args.page_url)
+        )
+        print(
+            f"{name[:36]:<36} {len(html) / 1e6:>6.2f}MB {regex_time:>8.2f}s {single_time:>8.2f}s "
+            f"{regex_time / single_time:>7.1f}x  {regex_html == single_html}"
+        )
+
+
+if __name__ == "__main__":
+    main()
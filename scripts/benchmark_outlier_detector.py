@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Benchmark OutlierDetector statistics on synthetic tweets.
+
+Times the z-score and percentile detectors (plus time decay) on 10k, 100k and
+1M synthetic tweets. No database access: the detector is built without
+__init__ and fed TweetMetrics directly.
+
+Usage:
+    python scripts/benchmark_outlier_detector.py [--sizes 10000 100000 1000000]
+"""
+
+import argparse
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from viraltracker.generation.outlier_detector import OutlierDetector, TweetMetrics  # noqa: E402
+
+
+def build_tweets(n: int, seed: int = 42):
+    """Synthetic tweets with a heavy-tailed (lognormal) engagement distribution."""
+    rng = np.random.default_rng(seed)
+    now = datetime.now(timezone.utc)
+    likes = rng.lognormal(mean=3.0, sigma=1.5, size=n).astype(int)
+    age_hours = rng.integers(0, 24 * 30, size=n)
+    tweets = []
+    for i in range(n):
+        tweet = TweetMetrics(
+            tweet_id=str(i),
+            text="",
+            author_handle="bench",
+            author_followers=0,
+            posted_at=now - timedelta(hours=int(age_hours[i])),
+            views=int(likes[i] * 50 + 1),
+            likes=int(likes[i]),
+            replies=int(likes[i] // 4),
+            retweets=int(likes[i] // 3),
+        )
+        tweet.compute_metrics()
+        tweets.append(tweet)
+    return tweets
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    args = parser.parse_args()
+
+    detector = OutlierDetector.__new__(OutlierDetector)
+
+    print(f"{'tweets':>10} {'zscore':>10} {'percentile':>11} {'decay':>9} {'outliers':>9}")
+    for n in args.sizes:
+        tweets = build_tweets(n)
+        scores = np.fromiter((t.engagement_score for t in tweets), dtype=np.float64, count=n)
+
+        z_results, z_time = timed(lambda: detector._detect_zscore(tweets, scores, 2.0, 10.0))
+        _, p_time = timed(lambda: detector._detect_percentile(tweets, scores, 5.0))
+        _, d_time = timed(lambda: detector._apply_time_decay(tweets, 7))
+
+        print(f"{n:>10,} {z_time:>9.3f}s {p_time:>10.3f}s {d_time:>8.3f}s {len(z_results):>9,}")
+
+
+if __name__ == "__main__":
+    main()
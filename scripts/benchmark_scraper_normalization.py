@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Benchmark columnar normalization of Apify tweet and TikTok datasets.
+
+Times TwitterScraper._normalize_tweets and TikTokScraper._normalize_search_posts
+plus the posts upsert payload built by save_posts_to_db, on a synthetic 50k
+item fixture (5% malformed, ~10% duplicate ids). No network or database
+access: the scrapers are built without __init__ and the Supabase client is a
+MagicMock.
+
+Usage:
+    python scripts/benchmark_scraper_normalization.py [--sizes 50000 200000]
+"""
+
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from viraltracker.scrapers.tiktok import TikTokScraper  # noqa: E402
+from viraltracker.scrapers.twitter import TwitterScraper  # noqa: E402
+
+MONTHS = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+DAYS = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
+
+
+def build_tweets(n: int, seed: int = 42):
+    """Synthetic apidojo/tweet-scraper items."""
+    rng = np.random.default_rng(seed)
+    ids = rng.integers(0, int(n * 0.9), size=n)
+    users = rng.integers(0, max(1, n // 20), size=n)
+    likes = rng.lognormal(3, 1.5, size=n).astype(int)
+    media_roll = rng.random(size=n)
+    items = []
+    for i in range(n):
+        if media_roll[i] < 0.05:
+            items.append(None)
+            continue
+        tweet = {
+            "type": "tweet",
+            "id": str(ids[i]),
+            "url": f"https://x.com/u{users[i]}/status/{ids[i]}",
+            "text": "benchmark tweet text " * 5,
+            "viewCount": int(likes[i] * 40),
+            "retweetCount": int(likes[i] // 10),
+            "replyCount": int(likes[i] // 20),
+            "likeCount": int(likes[i]),
+            "quoteCount": 0,
+            "bookmarkCount": 0,
+            "createdAt": f"{DAYS[i % 7]} {MONTHS[i % 12]} {1 + i % 28:02d} 17:49:36 +0000 2025",
+            "lang": "en",
+            "isReply": False,
+            "isRetweet": False,
+            "isQuote": bool(media_roll[i] > 0.9),
+            "author": {"userName": f"u{users[i]}", "name": "User", "followers": int(users[i] * 7),
+                       "isVerified": False, "isBlueVerified": bool(users[i] % 3 == 0)},
+        }
+        if media_roll[i] < 0.3:
+            tweet["media"] = [{"type": "photo"}]
+        elif media_roll[i] < 0.4:
+            tweet["videos"] = ["v.mp4"]
+        items.append(tweet)
+    return items
+
+
+def build_tiktok_posts(n: int, seed: int = 42):
+    """Synthetic clockworks/tiktok-scraper items."""
+    rng = np.random.default_rng(seed)
+    ids = rng.integers(0, int(n * 0.9), size=n)
+    users = rng.integers(0, max(1, n // 20), size=n)
+    plays = rng.lognormal(9, 2, size=n).astype(int)
+    return [
+        {
+            "id": str(ids[i]),
+            "text": "benchmark caption",
+            "createTimeISO": "2025-10-10T18:25:28.000Z",
+            "authorMeta": {"name": f"c{users[i]}", "fans": int(users[i] * 11), "verified": False},
+            "videoMeta": {"duration": int(i % 90)},
+            "playCount": int(plays[i]),
+            "diggCount": int(plays[i] // 20),
+            "shareCount": int(plays[i] // 200),
+            "commentCount": int(plays[i] // 100),
+            "webVideoUrl": f"https://www.tiktok.com/@c{users[i]}/video/{ids[i]}",
+        }
+        for i in range(n)
+    ]
+
+
+def make_scraper(cls):
+    scraper = cls.__new__(cls)
+    scraper.platform_id = "platform"
+    scraper.supabase = MagicMock()
+    scraper._upsert_accounts = lambda df: {name: name for name in df["username"].unique()}
+    return scraper
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50_000])
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    print(f"{'platform':>9} {'items':>9} {'rows':>8} {'normalize':>10} {'payload':>9} {'total':>9}")
+    for n in args.sizes:
+        twitter = make_scraper(TwitterScraper)
+        items = build_tweets(n)
+        (df, _), normalize_time = timed(lambda: twitter._normalize_tweets(items))
+        _, payload_time = timed(lambda: twitter.save_posts_to_db(df))
+        print(f"{'twitter':>9} {n:>9,} {len(df):>8,} {normalize_time:>9.3f}s {payload_time:>8.3f}s "
+              f"{normalize_time + payload_time:>8.3f}s")
+
+        tiktok = make_scraper(TikTokScraper)
+        posts = build_tiktok_posts(n)
+        df, normalize_time = timed(lambda: tiktok._normalize_search_posts(posts))
+        _, payload_time = timed(lambda: tiktok.save_posts_to_db(df))
+        print(f"{'tiktok':>9} {n:>9,} {len(df):>8,} {normalize_time:>9.3f}s {payload_time:>8.3f}s "
+              f"{normalize_time + payload_time:>8.3f}s")
+
+
+if __name__ == "__main__":
+    main()
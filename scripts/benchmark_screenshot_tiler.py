@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Benchmark section cropping: per-call crop_section vs one ScreenshotTiler.
+
+Builds a synthetic full-page screenshot, then crops N equal sections the way
+multipass Phase 3 does (once per section, each call decoding the PNG) and
+with ScreenshotTiler in PNG / JPEG / WebP, sequential and threaded.
+
+Usage:
+    python scripts/benchmark_screenshot_tiler.py [--width 1440] [--height 6000] [--sections 15]
+"""
+
+import argparse
+import io
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from viraltracker.services.landing_page_analysis.multipass.cropper import (  # noqa: E402
+    NormalizedBox,
+    ScreenshotTiler,
+    crop_section,
+)
+
+
+def make_screenshot(width: int, height: int) -> bytes:
+    """Noisy bands so PNG compression has real work to do."""
+    rng = np.random.default_rng(0)
+    pixels = np.repeat(rng.integers(0, 255, size=(height // 8, width, 3), dtype=np.uint8), 8, axis=0)
+    buf = io.BytesIO()
+    Image.fromarray(pixels).save(buf, format="PNG")
+    return buf.getvalue()
+
+
+def timed(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--width", type=int, default=1440)
+    parser.add_argument("--height", type=int, default=6000)
+    parser.add_argument("--sections", type=int, default=15)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    screenshot = make_screenshot(args.width, args.height)
+    boxes = {
+        f"sec_{i}": NormalizedBox(f"sec_{i}", "s", i / args.sections, (i + 1) / args.sections)
+        for i in range(args.sections)
+    }
+
+    def tiled(fmt, workers):
+        with ScreenshotTiler(screenshot, image_format=fmt) as tiler:
+            return tiler.crop_all(boxes, max_workers=workers)
+
+    cases = [
+        ("crop_section per section (PNG)", lambda: [crop_section(screenshot, b) for b in boxes.values()]),
+        ("tiler PNG, 1 thread", lambda: tiled("PNG", 1)),
+        (f"tiler PNG, {args.workers} threads", lambda: tiled("PNG", args.workers)),
+        (f"tiler JPEG, {args.workers} threads", lambda: tiled("JPEG", args.workers)),
+        (f"tiler WEBP, {args.workers} threads", lambda: tiled("WEBP", args.workers)),
+    ]
+
+    print(f"{args.width}x{args.height} screenshot, {len(screenshot) / 1e6:.1f}MB PNG, {args.sections} sections")
+    print(f"{'case':<36} {'time':>10} {'speedup':>9}")
+    baseline = None
+    for name, fn in cases:
+        elapsed = timed(fn)
+        baseline = baseline or elapsed
+        print(f"{name:<36} {elapsed * 1000:>8.0f}ms {baseline / elapsed:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Microbenchmarks for core/vector_ops.py against the pure-Python versions it replaced.
+
+Times pgvector parsing, one-vs-many cosine, keyword-to-centroid scoring and
+centroid recompute on random 768-dim embeddings. No API or database access.
+
+Usage:
+    python scripts/benchmark_vector_ops.py [--dim 768] [--rows 1000] [--clusters 50]
+"""
+
+import argparse
+import json
+import math
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from viraltracker.core import vector_ops  # noqa: E402
+
+
+def py_cosine(a, b):
+    dot = sum(x * y for x, y in zip(a, b))
+    na = math.sqrt(sum(x * x for x in a))
+    nb = math.sqrt(sum(y * y for y in b))
+    return dot / (na * nb) if na and nb else 0.0
+
+
+def py_normalize(vec):
+    norm = math.sqrt(sum(x * x for x in vec))
+    return [x / norm for x in vec] if norm > 0 else vec
+
+
+def timed(fn, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--dim", type=int, default=768)
+    parser.add_argument("--rows", type=int, default=1000, help="keywords / embeddings")
+    parser.add_argument("--clusters", type=int, default=50, help="centroids for scoring")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    rows = rng.normal(size=(args.rows, args.dim)).astype(np.float32)
+    centroids = rng.normal(size=(args.clusters, args.dim)).astype(np.float32)
+    row_lists = rows.tolist()
+    centroid_lists = centroids.tolist()
+    pgvector = ["[" + ",".join(map(str, r)) + "]" for r in row_lists]
+    query = row_lists[0]
+
+    cases = [
+        (
+            f"parse {args.rows} pgvector strings",
+            lambda: [json.loads(s) for s in pgvector],
+            lambda: vector_ops.stack(pgvector),
+        ),
+        (
+            f"cosine 1 x {args.rows}",
+            lambda: [py_cosine(query, r) for r in row_lists],
+            lambda: vector_ops.cosine_batch(query, rows),
+        ),
+        (
+            f"score {args.rows} x {args.clusters} centroids",
+            lambda: [[py_cosine(r, c) for c in centroid_lists] for r in row_lists],
+            lambda: vector_ops.cosine_matrix(rows, centroids),
+        ),
+        (
+            f"top-5 of {args.rows}",
+            lambda: sorted(((py_cosine(query, r), i) for i, r in enumerate(row_lists)), reverse=True)[:5],
+            lambda: vector_ops.top_k(vector_ops.cosine_batch(query, rows), 5),
+        ),
+        (
+            f"centroid of {args.rows}",
+            lambda: py_normalize([sum(col) / len(row_lists) for col in zip(*row_lists)]),
+            lambda: vector_ops.centroid(rows),
+        ),
+    ]
+
+    print(f"dim={args.dim}")
+    print(f"{'case':<34} {'python':>10} {'numpy':>10} {'speedup':>9}")
+    for name, py_fn, np_fn in cases:
+        py_time = timed(py_fn, repeat=1)
+        np_time = timed(np_fn)
+        print(f"{name:<34} {py_time * 1000:>8.1f}ms {np_time * 1000:>8.2f}ms {py_time / np_time:>8.0f}x")
+
+
+if __name__ == "__main__":
+    main()
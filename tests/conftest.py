@@ -0,0 +1,10 @@
+"""Shared pytest fixtures."""
+import pytest
+
+from viraltracker.core.config import Config
+
+
+@pytest.fixture(autouse=True)
+def _tmp_cache_dir(tmp_path, monkeypatch):
+    """Keep default on-disk caches (embeddings, phase cache, ...) out of the repo's cache/."""
+    monkeypatch.setattr(Config, "CACHE_DIR", str(tmp_path / "cache"))
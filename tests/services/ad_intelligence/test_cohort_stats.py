@@ -0,0 +1,225 @@
+"""Tests for CohortStatsEngine - vectorized BaselineService cohort statistics.
+
+The reference functions below are the original list-based implementations
+(_winsorize, _percentile and the per-ad loop of _compute_cohort_baseline);
+the engine must reproduce their BaselineSnapshot values exactly.
+
+Run with: pytest tests/services/ad_intelligence/test_cohort_stats.py -v
+"""
+from __future__ import annotations
+
+import math
+import random
+from datetime import date
+from uuid import uuid4
+
+import pytest
+
+from viraltracker.services.ad_intelligence.baseline_service import BaselineService
+from viraltracker.services.ad_intelligence.cohort_stats import CohortStatsEngine
+from viraltracker.services.ad_intelligence.helpers import (
+    _safe_numeric,
+    extract_conversion_value,
+    extract_conversions,
+)
+from viraltracker.services.ad_intelligence.models import RunConfig
+
+BRAND = uuid4()
+SNAPSHOT_FIELDS = (
+    "sample_size", "unique_ads",
+    "median_ctr", "p25_ctr", "p75_ctr", "median_cpc", "p25_cpc", "p75_cpc",
+    "median_cpm", "p25_cpm", "p75_cpm", "median_roas", "p25_roas", "p75_roas",
+    "median_conversion_rate", "p25_conversion_rate", "p75_conversion_rate",
+    "median_cost_per_purchase", "median_cost_per_add_to_cart", "median_hook_rate",
+    "median_hold_rate", "median_completion_rate", "median_frequency", "p75_frequency",
+)
+
+
+def _reference_winsorize(values, pct):
+    if not values or len(values) < 3:
+        return values
+    sorted_vals = sorted(values)
+    n = len(sorted_vals)
+    low_val = sorted_vals[max(0, int(math.floor(n * pct)))]
+    high_val = sorted_vals[min(n - 1, int(math.ceil(n * (1 - pct))))]
+    return [max(low_val, min(high_val, v)) for v in values]
+
+
+def _reference_percentile(values, p):
+    if not values:
+        return None
+    sorted_vals = sorted(values)
+    n = len(sorted_vals)
+    if n == 1:
+        return sorted_vals[0]
+    k = (n - 1) * (p / 100.0)
+    f = math.floor(k)
+    c = math.ceil(k)
+    if f == c:
+        return sorted_vals[int(k)]
+    return sorted_vals[int(f)] * (c - k) + sorted_vals[int(c)] * (k - f)
+
+
+def _reference_baseline(rows, run_config, pct):
+    ad_totals = {}
+    for r in rows:
+        t = ad_totals.setdefault(r.get("meta_ad_id", "unknown"), {
+            "spend": 0.0, "impressions": 0.0, "link_clicks": 0.0, "add_to_carts": 0.0,
+            "conversions": 0.0, "conversion_value": 0.0, "video_views": 0.0,
+            "video_p25": 0.0, "video_p100": 0.0, "frequency_sum": 0.0, "frequency_count": 0,
+        })
+        t["spend"] += _safe_numeric(r.get("spend")) or 0
+        t["impressions"] += _safe_numeric(r.get("impressions")) or 0
+        t["link_clicks"] += _safe_numeric(r.get("link_clicks")) or 0
+        t["video_views"] += _safe_numeric(r.get("video_views")) or 0
+        t["video_p25"] += _safe_numeric(r.get("video_p25_watched")) or 0
+        t["video_p100"] += _safe_numeric(r.get("video_p100_watched")) or 0
+        conv = extract_conversions(r, run_config.primary_conversion_event)
+        if conv is not None:
+            t["conversions"] += conv
+        conv_val = _safe_numeric(r.get("purchase_value"))
+        if conv_val is None:
+            conv_val = extract_conversion_value(r, run_config.value_field)
+        if conv_val is not None:
+            t["conversion_value"] += conv_val
+        atc = extract_conversions(r, "add_to_cart")
+        if atc is not None:
+            t["add_to_carts"] += atc
+        freq = _safe_numeric(r.get("frequency"))
+        if freq is not None and freq >= 0:
+            t["frequency_sum"] += freq
+            t["frequency_count"] += 1
+
+    m = {k: [] for k in ("cpc", "cpm", "ctr", "roas", "cr", "cpp", "cpatc", "hook", "hold", "comp", "freq")}
+    for t in ad_totals.values():
+        spend, impressions, clicks = t["spend"], t["impressions"], t["link_clicks"]
+        if clicks > 0:
+            m["cpc"].append(spend / clicks)
+        if impressions > 0:
+            m["cpm"].append((spend / impressions) * 1000)
+            m["ctr"].append(clicks / impressions)
+        if spend > 0 and t["conversion_value"] > 0:
+            m["roas"].append(t["conversion_value"] / spend)
+        if clicks > 0 and t["conversions"] > 0:
+            m["cr"].append((t["conversions"] / clicks) * 100)
+        if t["conversions"] > 0:
+            m["cpp"].append(spend / t["conversions"])
+        if t["add_to_carts"] > 0:
+            m["cpatc"].append(spend / t["add_to_carts"])
+        if t["video_views"] > 0 and impressions > 0:
+            m["hook"].append(t["video_views"] / impressions)
+        if t["video_p25"] > 0 and t["video_views"] > 0:
+            m["hold"].append(t["video_p25"] / t["video_views"])
+        if t["video_p100"] > 0 and impressions > 0:
+            m["comp"].append(t["video_p100"] / impressions)
+        if t["frequency_count"] > 0:
+            m["freq"].append(t["frequency_sum"] / t["frequency_count"])
+    for k in ("cpc", "cpm", "ctr", "roas", "cr", "cpp", "cpatc", "freq"):
+        m[k] = _reference_winsorize(m[k], pct)
+
+    P = _reference_percentile
+    return {
+        "sample_size": len(rows),
+        "unique_ads": len(set(r.get("meta_ad_id") for r in rows if r.get("meta_ad_id"))),
+        "median_ctr": P(m["ctr"], 50), "p25_ctr": P(m["ctr"], 25), "p75_ctr": P(m["ctr"], 75),
+        "median_cpc": P(m["cpc"], 50), "p25_cpc": P(m["cpc"], 25), "p75_cpc": P(m["cpc"], 75),
+        "median_cpm": P(m["cpm"], 50), "p25_cpm": P(m["cpm"], 25), "p75_cpm": P(m["cpm"], 75),
+        "median_roas": P(m["roas"], 50), "p25_roas": P(m["roas"], 25), "p75_roas": P(m["roas"], 75),
+        "median_conversion_rate": P(m["cr"], 50), "p25_conversion_rate": P(m["cr"], 25),
+        "p75_conversion_rate": P(m["cr"], 75),
+        "median_cost_per_purchase": P(m["cpp"], 50),
+        "median_cost_per_add_to_cart": P(m["cpatc"], 50),
+        "median_hook_rate": P(m["hook"], 50),
+        "median_hold_rate": P(m["hold"], 50),
+        "median_completion_rate": P(m["comp"], 50),
+        "median_frequency": P(m["freq"], 50), "p75_frequency": P(m["freq"], 75),
+    }
+
+
+def _rows(n_ads, days, seed=3):
+    rng = random.Random(seed)
+    awareness = ["unaware", "problem_aware", "solution_aware", "product_aware"]
+    formats = ["video_ugc", "image_static", "carousel"]
+    rows = []
+    for a in range(n_ads):
+        cls = {"creative_awareness_level": rng.choice(awareness), "creative_format": rng.choice(formats)}
+        for d in range(rng.randint(1, days)):
+            impressions = rng.randint(0, 5000)
+            row = {
+                "meta_ad_id": f"ad{a}" if a % 17 else None,
+                "spend": round(rng.uniform(0, 120), 2) if rng.random() > 0.05 else None,
+                "impressions": impressions,
+                "link_clicks": rng.randint(0, impressions // 20 + 1),
+                "video_views": rng.randint(0, impressions // 3 + 1) if rng.random() > 0.4 else None,
+                "video_p25_watched": rng.randint(0, 200),
+                "video_p100_watched": rng.randint(0, 50) if rng.random() > 0.5 else 0,
+                "frequency": str(round(rng.uniform(1, 4), 3)) if rng.random() > 0.1 else None,
+                "purchase_value": round(rng.uniform(0, 300), 2) if rng.random() > 0.5 else None,
+                "purchases": rng.randint(0, 3) if rng.random() > 0.3 else None,
+                "raw_actions": [{"action_type": "add_to_cart", "value": str(rng.randint(0, 5))}]
+                if rng.random() > 0.5 else None,
+                **cls,
+            }
+            rows.append(row)
+    return rows
+
+
+def _snapshot_values(snapshot):
+    return {f: getattr(snapshot, f) for f in SNAPSHOT_FIELDS}
+
+
+@pytest.mark.parametrize("pct", [0.02, 0.1])
+def test_engine_matches_reference_exactly(pct):
+    service = BaselineService(None)
+    config = RunConfig()
+    cohorts = service._group_into_cohorts(_rows(300, 20))
+
+    by_cohort, by_awareness, brand = CohortStatsEngine(
+        cohorts, config.primary_conversion_event, config.value_field
+    ).compute(pct)
+
+    def snap(stats):
+        return _snapshot_values(service._snapshot_from_stats(
+            stats, BRAND, None, None, "x", "y", date(2026, 1, 1), date(2026, 1, 31),
+        ))
+
+    for key, rows in cohorts.items():
+        assert snap(by_cohort[key]) == _reference_baseline(rows, config, pct)
+
+    rollups = {}
+    for (awareness, _), rows in cohorts.items():
+        rollups.setdefault(awareness, []).extend(rows)
+    assert by_awareness.keys() == rollups.keys()
+    for awareness, rows in rollups.items():
+        assert snap(by_awareness[awareness]) == _reference_baseline(rows, config, pct)
+
+    all_rows = [r for rows in cohorts.values() for r in rows]
+    assert snap(brand) == _reference_baseline(all_rows, config, pct)
+
+
+def test_small_and_empty_metric_cohorts():
+    config = RunConfig()
+    rows = [
+        {"meta_ad_id": "a", "impressions": 100, "link_clicks": 2, "spend": 5.0},
+        {"meta_ad_id": "b", "impressions": 0, "link_clicks": 0, "spend": 1.0},
+    ]
+    cohorts = {("unaware", "image_static"): rows}
+    _, _, brand = CohortStatsEngine(cohorts, "purchase", "purchase_value").compute(0.02)
+
+    expected = _reference_baseline(rows, config, 0.02)
+    assert brand.get("ctr", 50) == expected["median_ctr"] == 0.02
+    assert brand.get("roas", 50) is None
+    assert brand.get("hook_rate", 50) is None
+    assert brand.unique_ads == 2
+
+
+def test_compute_cohort_baseline_uses_engine():
+    service = BaselineService(None)
+    config = RunConfig()
+    rows = _rows(40, 5, seed=11)
+
+    snapshot = service._compute_cohort_baseline(
+        rows, BRAND, None, None, "all", "all", date(2026, 1, 1), date(2026, 1, 31), 0.02, config,
+    )
+
+    assert _snapshot_values(snapshot) == _reference_baseline(rows, config, 0.02)
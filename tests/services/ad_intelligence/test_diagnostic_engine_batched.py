@@ -0,0 +1,233 @@
+"""Tests for DiagnosticEngine.diagnose_account batched loading.
+
+An in-memory fake Supabase client serves ad_creative_classifications,
+ad_intelligence_baselines and meta_ads_performance, so the batched account
+path can be checked against the per-ad diagnose_ad path on the same data.
+"""
+from datetime import date, datetime, timedelta, timezone
+from uuid import uuid4
+
+import pytest
+
+from viraltracker.services.ad_intelligence import diagnostic_engine
+from viraltracker.services.ad_intelligence.classifier_service import ClassifierService
+from viraltracker.services.ad_intelligence.diagnostic_engine import DiagnosticEngine
+from viraltracker.services.ad_intelligence.models import HealthStatus, RunConfig
+
+
+class FakeQuery:
+    def __init__(self, table, store):
+        self.table = table
+        self.store = store
+        self.filters = []
+        self.orders = []
+        self._limit = None
+        self._page_range = None
+        self._upsert = None
+
+    def select(self, *a, **k):
+        return self
+
+    def eq(self, col, val):
+        self.filters.append(lambda r: r.get(col) == val)
+        return self
+
+    def in_(self, col, vals):
+        vals = set(vals)
+        self.filters.append(lambda r: r.get(col) in vals)
+        return self
+
+    def gte(self, col, val):
+        self.filters.append(lambda r: r.get(col) is not None and str(r[col]) >= str(val))
+        return self
+
+    def lte(self, col, val):
+        self.filters.append(lambda r: r.get(col) is not None and str(r[col]) <= str(val))
+        return self
+
+    def order(self, col, desc=False):
+        self.orders.append((col, desc))
+        return self
+
+    def limit(self, n):
+        self._limit = n
+        return self
+
+    def range(self, start, end):
+        self._page_range = (start, end)
+        return self
+
+    def upsert(self, payload, on_conflict=None):
+        self._upsert = payload
+        return self
+
+    def execute(self):
+        self.store.calls.append(self.table)
+        if self._upsert is not None:
+            self.store.upserts.append(self._upsert)
+            return type("R", (), {"data": []})()
+        rows = [r for r in self.store.data.get(self.table, []) if all(f(r) for f in self.filters)]
+        for col, desc in reversed(self.orders):
+            rows.sort(key=lambda r: str(r.get(col)), reverse=desc)
+        if self._page_range:
+            rows = rows[self._page_range[0]:self._page_range[1] + 1]
+        if self._limit is not None:
+            rows = rows[:self._limit]
+        return type("R", (), {"data": rows})()
+
+
+class FakeStore:
+    def __init__(self, data):
+        self.data = data
+        self.calls = []
+        self.upserts = []
+
+    def table(self, name):
+        return FakeQuery(name, self)
+
+
+BRAND = uuid4()
+ORG = uuid4()
+RUN = uuid4()
+RUN_CREATED = datetime(2026, 3, 1, 12, tzinfo=timezone.utc)
+END = date(2026, 2, 28)
+
+
+def _classification(ad_id, fmt, classified_at, run_id=None, congruence=None):
+    return {
+        "id": str(uuid4()), "meta_ad_id": ad_id, "brand_id": str(BRAND),
+        "run_id": str(run_id) if run_id else None,
+        "creative_awareness_level": "problem_aware", "creative_format": fmt,
+        "congruence_score": congruence, "classified_at": classified_at,
+    }
+
+
+def _baseline(awareness, fmt, sample_size=50):
+    return {
+        "id": str(uuid4()), "brand_id": str(BRAND), "awareness_level": awareness,
+        "creative_format": fmt, "sample_size": sample_size, "unique_ads": 10,
+        "median_ctr": 1.5, "p25_ctr": 1.0, "p75_ctr": 2.0,
+        "median_cpc": 1.0, "p25_cpc": 0.8, "p75_cpc": 1.2,
+        "median_roas": 2.0, "p25_roas": 1.5, "p75_roas": 3.0,
+        "median_hook_rate": 0.3, "median_hold_rate": 0.5, "p75_frequency": 2.0,
+        "date_range_start": "2026-01-29", "date_range_end": "2026-02-28",
+        "computed_at": "2026-03-01T00:00:00+00:00",
+    }
+
+
+def _perf(ad_id, days, impressions, clicks, spend, frequency=1.5):
+    rows = []
+    for i in range(days):
+        day = END - timedelta(days=days - 1 - i)
+        rows.append({
+            "meta_ad_id": ad_id, "brand_id": str(BRAND), "date": day.isoformat(),
+            "impressions": impressions, "link_clicks": clicks, "spend": spend,
+            "link_ctr": clicks / impressions * 100, "frequency": frequency + i * 0.2,
+            "video_views": impressions // 4, "video_p25_watched": impressions // 10,
+            "campaign_objective": "OUTCOME_SALES",
+        })
+    return rows
+
+
+@pytest.fixture
+def store():
+    return FakeStore({
+        "ad_creative_classifications": [
+            # Same-run classification wins over a newer pre-run one
+            _classification("ad_a", "video_ugc", "2026-03-01T10:00:00+00:00", run_id=RUN),
+            _classification("ad_a", "image_static", "2026-03-01T11:00:00Z"),
+            # Only a classification from after the run started: ignored
+            _classification("ad_b", "image_static", "2026-02-20T00:00:00+00:00", congruence=0.2),
+            _classification("ad_b", "image_static", "2026-03-02T00:00:00+00:00"),
+            _classification("ad_d", "image_static", "2026-03-05T00:00:00+00:00"),
+        ],
+        "ad_intelligence_baselines": [
+            _baseline("problem_aware", "video_ugc"),
+            _baseline("problem_aware", "image_static", sample_size=3),  # insufficient
+            _baseline("all", "all"),
+        ],
+        "meta_ads_performance": (
+            _perf("ad_a", 10, impressions=2000, clicks=10, spend=40)
+            + _perf("ad_b", 8, impressions=1500, clicks=40, spend=30)
+            + _perf("ad_c", 6, impressions=1000, clicks=5, spend=60)
+        ),
+    })
+
+
+def _engine(store):
+    engine = DiagnosticEngine(store)
+    engine._classifier = ClassifierService(store)
+    return engine
+
+
+def _config():
+    return RunConfig(thresholds={"date_range_start": "2026-01-29", "date_range_end": END.isoformat()})
+
+
+def _comparable(diag):
+    return (
+        diag.meta_ad_id, diag.overall_health, diag.kill_recommendation, diag.kill_reason,
+        diag.trend_direction, diag.days_analyzed, diag.baseline_id, diag.classification_id,
+        [(r.rule_id, r.skipped, r.severity) for r in diag.fired_rules],
+    )
+
+
+@pytest.mark.asyncio
+async def test_batched_matches_per_ad(store):
+    ad_ids = ["ad_a", "ad_b", "ad_c", "ad_d"]
+    engine = _engine(store)
+    batched = await engine.diagnose_account(BRAND, ORG, RUN, RUN_CREATED, ad_ids, [], _config())
+
+    per_ad_store = FakeStore(store.data)
+    per_ad_engine = _engine(per_ad_store)
+    from viraltracker.services.ad_intelligence.baseline_service import BaselineService
+    bs = BaselineService(per_ad_store)
+    expected = []
+    for ad_id in ad_ids:
+        baseline = await bs.get_baseline_for_ad(
+            ad_id, BRAND, date(2026, 1, 29), END,
+        )
+        expected.append(await per_ad_engine.diagnose_ad(
+            ad_id, BRAND, ORG, RUN, RUN_CREATED, baseline, _config(),
+        ))
+
+    assert [_comparable(d) for d in batched] == [_comparable(d) for d in expected]
+    assert batched[2].overall_health == HealthStatus.INSUFFICIENT_DATA  # ad_c unclassified
+    assert batched[3].classification_id is None  # ad_d classified after the run
+
+
+@pytest.mark.asyncio
+async def test_batched_query_count_is_independent_of_ad_count(store, monkeypatch):
+    monkeypatch.setattr(diagnostic_engine, "AD_ID_CHUNK_SIZE", 2)
+    engine = _engine(store)
+
+    await engine.diagnose_account(
+        BRAND, ORG, RUN, RUN_CREATED, ["ad_a", "ad_b", "ad_c", "ad_d"], [], _config()
+    )
+
+    assert store.calls.count("ad_creative_classifications") == 2
+    assert store.calls.count("meta_ads_performance") == 2
+    assert store.calls.count("ad_intelligence_baselines") == 1
+    assert store.calls.count("ad_intelligence_diagnostics") == 1
+    assert [r["meta_ad_id"] for r in store.upserts[0]] == ["ad_a", "ad_b"]
+
+
+@pytest.mark.asyncio
+async def test_failed_bulk_store_falls_back_per_row(store):
+    engine = _engine(store)
+    original_execute = FakeQuery.execute
+
+    def execute(self):
+        if isinstance(self._upsert, list):
+            raise RuntimeError("payload too large")
+        return original_execute(self)
+
+    FakeQuery.execute = execute
+    try:
+        await engine.diagnose_account(
+            BRAND, ORG, RUN, RUN_CREATED, ["ad_a", "ad_b"], [], _config()
+        )
+    finally:
+        FakeQuery.execute = original_execute
+
+    assert [u["meta_ad_id"] for u in store.upserts] == ["ad_a", "ad_b"]
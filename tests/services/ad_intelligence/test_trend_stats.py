@@ -0,0 +1,222 @@
+"""Tests for trend_stats - vectorized fatigue trend statistics.
+
+The reference functions below are the original per-ad implementations
+(FatigueDetector._compute_ctr_trend and the half-split comparison of the
+DiagnosticEngine trend rules); the vectorized engine must reproduce them
+exactly.
+
+Run with: pytest tests/services/ad_intelligence/test_trend_stats.py -v
+"""
+from __future__ import annotations
+
+import asyncio
+import random
+from datetime import date, timedelta
+from uuid import uuid4
+
+from viraltracker.services.ad_intelligence import fatigue_detector
+from viraltracker.services.ad_intelligence.diagnostic_engine import (
+    _check_ctr_declining_7d,
+    _check_frequency_trend_rising,
+)
+from viraltracker.services.ad_intelligence.fatigue_detector import FatigueDetector
+from viraltracker.services.ad_intelligence.helpers import _safe_numeric
+from viraltracker.services.ad_intelligence.trend_stats import (
+    half_split_pairs,
+    week_over_week_change,
+)
+
+
+def _reference_wow(values):
+    if len(values) < 7:
+        return None
+    recent = values[-7:]
+    previous = values[-14:-7] if len(values) >= 14 else values[:-7]
+    if not previous:
+        return None
+    recent_ctrs = [c for c in (_safe_numeric(v) for v in recent) if c is not None and c > 0]
+    prev_ctrs = [c for c in (_safe_numeric(v) for v in previous) if c is not None and c > 0]
+    if not recent_ctrs or not prev_ctrs:
+        return None
+    recent_avg = sum(recent_ctrs) / len(recent_ctrs)
+    prev_avg = sum(prev_ctrs) / len(prev_ctrs)
+    if prev_avg == 0:
+        return None
+    return (recent_avg - prev_avg) / prev_avg
+
+
+def _reference_split(series):
+    if not series or len(series) < 5:
+        return None
+    mid = len(series) // 2
+    first = [_safe_numeric(v) for v in series[:mid] if _safe_numeric(v) is not None]
+    second = [_safe_numeric(v) for v in series[mid:] if _safe_numeric(v) is not None]
+    if not first or not second:
+        return None
+    return sum(first) / len(first), sum(second) / len(second)
+
+
+def _random_series(rng, max_len=30):
+    values = []
+    for _ in range(rng.randint(0, max_len)):
+        roll = rng.random()
+        if roll < 0.1:
+            values.append(None)
+        elif roll < 0.15:
+            values.append(0)
+        elif roll < 0.2:
+            values.append("abc")
+        elif roll < 0.35:
+            values.append(str(round(rng.uniform(0.1, 5), 4)))
+        else:
+            values.append(rng.uniform(0.01, 6))
+    return values
+
+
+def test_week_over_week_matches_reference():
+    rng = random.Random(7)
+    series = [_random_series(rng) for _ in range(500)]
+    trends = week_over_week_change(series)
+    for values, trend in zip(series, trends.tolist()):
+        expected = _reference_wow(values)
+        if expected is None:
+            assert trend != trend  # NaN
+        else:
+            assert trend == expected
+
+
+def test_half_split_matches_reference():
+    rng = random.Random(11)
+    series = [_random_series(rng, max_len=10) for _ in range(500)]
+    assert half_split_pairs(series) == [_reference_split(s) for s in series]
+
+
+def test_empty_inputs():
+    assert week_over_week_change([]).shape == (0,)
+    assert half_split_pairs([]) == []
+    assert half_split_pairs([[], [None] * 6]) == [None, None]
+
+
+def test_trend_rules_use_precomputed_split():
+    data = {"link_ctr_series": [2.0] * 8, "link_ctr_split": (2.0, 1.0)}
+    fired = _check_ctr_declining_7d(data, None)
+    assert fired.actual_value == 1.0 and fired.baseline_value == 2.0
+
+    data = {"frequency_series": [1.0, 1.0, 1.0, 2.0, 2.0, 2.0]}
+    fired = _check_frequency_trend_rising(data, None)
+    assert (fired.baseline_value, fired.actual_value) == (1.0, 2.0)
+
+
+class FakeQuery:
+    def __init__(self, store, table):
+        self.store = store
+        self.table = table
+        self.filters = []
+        self._range = None
+        self._limit = None
+
+    def select(self, *a, **k):
+        return self
+
+    def eq(self, col, val):
+        self.filters.append(lambda r: r.get(col) == val)
+        return self
+
+    def in_(self, col, vals):
+        vals = set(vals)
+        self.filters.append(lambda r: r.get(col) in vals)
+        return self
+
+    def gte(self, col, val):
+        self.filters.append(lambda r: str(r.get(col)) >= val)
+        return self
+
+    def lte(self, col, val):
+        self.filters.append(lambda r: str(r.get(col)) <= val)
+        return self
+
+    def order(self, *a, **k):
+        return self
+
+    def limit(self, n):
+        self._limit = n
+        return self
+
+    def range(self, start, end):
+        self._range = (start, end)
+        return self
+
+    def execute(self):
+        self.store.calls.append(self.table)
+        rows = [r for r in self.store.data.get(self.table, []) if all(f(r) for f in self.filters)]
+        rows.sort(key=lambda r: (r.get("meta_ad_id", ""), r.get("date", "")))
+        if self._range:
+            rows = rows[self._range[0]:self._range[1] + 1]
+        if self._limit is not None:
+            rows = rows[:self._limit]
+        return type("R", (), {"data": rows})()
+
+
+class FakeStore:
+    def __init__(self, data):
+        self.data = data
+        self.calls = []
+
+    def table(self, name):
+        return FakeQuery(self, name)
+
+
+def _reference_status(rows):
+    rows = sorted(rows, key=lambda r: r.get("date", ""))
+    frequency = _safe_numeric(rows[-1].get("frequency")) or 0
+    trend = _reference_wow([r.get("link_ctr") for r in rows])
+    is_high = frequency >= FatigueDetector.FREQUENCY_CRITICAL
+    is_declining = trend is not None and trend < -FatigueDetector.CTR_DECLINE_THRESHOLD
+    is_warning = frequency >= FatigueDetector.FREQUENCY_WARNING
+    if is_high or (is_warning and is_declining):
+        return "fatigued", trend
+    if is_warning or is_declining:
+        return "at_risk", trend
+    return "healthy", trend
+
+
+def test_check_fatigue_matches_per_ad_reference(monkeypatch):
+    rng = random.Random(3)
+    brand = uuid4()
+    end = date(2026, 3, 1)
+    ad_ids = [f"ad_{i}" for i in range(40)]
+    perf = []
+    for ad_id in ad_ids:
+        for d in range(rng.randint(1, 30)):
+            perf.append({
+                "meta_ad_id": ad_id, "brand_id": str(brand), "ad_name": f"Ad {ad_id}",
+                "date": (end - timedelta(days=d)).isoformat(),
+                "frequency": rng.choice([None, rng.uniform(1, 5)]),
+                "link_ctr": rng.choice([None, 0, rng.uniform(0.2, 3)]),
+            })
+    store = FakeStore({"meta_ads_performance": perf, "brands": [{"id": str(brand), "name": "B"}]})
+
+    async def fake_active(*a, **k):
+        return ad_ids
+
+    monkeypatch.setattr(fatigue_detector, "get_active_ad_ids", fake_active)
+    monkeypatch.setattr(fatigue_detector, "PAGE_SIZE", 50)
+    monkeypatch.setattr(fatigue_detector, "AD_ID_CHUNK_SIZE", 7)
+
+    result = asyncio.run(FatigueDetector(store).check_fatigue(brand, end, days_back=30))
+
+    by_ad = {}
+    for r in perf:
+        by_ad.setdefault(r["meta_ad_id"], []).append(r)
+    evaluated = {r["meta_ad_id"]: r for r in result.fatigued_ads + result.at_risk_ads}
+    healthy = 0
+    for ad_id, rows in by_ad.items():
+        status, trend = _reference_status(rows)
+        if status == "healthy":
+            healthy += 1
+            continue
+        assert evaluated[ad_id]["status"] == status
+        assert evaluated[ad_id]["ctr_trend_value"] == trend
+        assert evaluated[ad_id]["days_running"] == len(rows)
+    assert result.healthy_ads_count == healthy
+    assert len(evaluated) == len(by_ad) - healthy
@@ -0,0 +1,343 @@
+"""
+Tests for PerformanceFrame and the cached frames behind AdPerformanceQueryService.
+
+The reference functions below are the original dict-loop aggregators; the
+vectorized group-bys must reproduce their output exactly.
+"""
+
+import random
+from collections import defaultdict
+
+import pytest
+
+from viraltracker.services.ad_performance_frame import (
+    PERFORMANCE_COLUMNS,
+    PerformanceFrame,
+    PerformanceFrameCache,
+)
+from viraltracker.services.ad_performance_query_service import AdPerformanceQueryService
+
+BRAND = "brand-1"
+
+
+def _reference_by_ad(rows):
+    ads = defaultdict(lambda: {
+        "spend": 0, "impressions": 0, "link_clicks": 0,
+        "add_to_carts": 0, "purchases": 0, "purchase_value": 0, "reach": 0,
+    })
+    for d in rows:
+        aid = d.get("meta_ad_id")
+        if not aid:
+            continue
+        a = ads[aid]
+        a["ad_name"] = d.get("ad_name") or a.get("ad_name", "Unknown")
+        if not a.get("ad_status"):
+            a["ad_status"] = d.get("ad_status") or ""
+        a["adset_name"] = d.get("adset_name") or a.get("adset_name", "")
+        a["campaign_name"] = d.get("campaign_name") or a.get("campaign_name", "")
+        a["meta_adset_id"] = d.get("meta_adset_id") or a.get("meta_adset_id", "")
+        a["meta_campaign_id"] = d.get("meta_campaign_id") or a.get("meta_campaign_id", "")
+        if d.get("thumbnail_url") and not a.get("thumbnail_url"):
+            a["thumbnail_url"] = d["thumbnail_url"]
+        a["spend"] += float(d.get("spend") or 0)
+        a["impressions"] += int(d.get("impressions") or 0)
+        a["link_clicks"] += int(d.get("link_clicks") or 0)
+        a["add_to_carts"] += int(d.get("add_to_carts") or 0)
+        a["purchases"] += int(d.get("purchases") or 0)
+        a["purchase_value"] += float(d.get("purchase_value") or 0)
+        a["reach"] += int(d.get("reach") or 0)
+
+    result = []
+    for aid, a in ads.items():
+        imp, clicks, spend, pv = a["impressions"], a["link_clicks"], a["spend"], a["purchase_value"]
+        result.append({
+            "meta_ad_id": aid, "ad_name": a["ad_name"], "ad_status": a["ad_status"],
+            "adset_name": a["adset_name"], "campaign_name": a["campaign_name"],
+            "meta_adset_id": a["meta_adset_id"], "meta_campaign_id": a["meta_campaign_id"],
+            "thumbnail_url": a.get("thumbnail_url", ""),
+            "spend": spend, "impressions": imp, "reach": a["reach"], "link_clicks": clicks,
+            "ctr": (clicks / imp * 100) if imp > 0 else 0,
+            "cpm": (spend / imp * 1000) if imp > 0 else 0,
+            "cpc": (spend / clicks) if clicks > 0 else 0,
+            "add_to_carts": a["add_to_carts"], "purchases": a["purchases"], "purchase_value": pv,
+            "roas": (pv / spend) if spend > 0 else 0,
+            "cpa": (spend / a["purchases"]) if a["purchases"] > 0 else 0,
+            "conversion_rate": (a["purchases"] / clicks * 100) if clicks > 0 else 0,
+            "frequency": (imp / a["reach"]) if a["reach"] > 0 else 0,
+        })
+    return result
+
+
+def _reference_by_campaign(rows):
+    campaigns = defaultdict(lambda: {
+        "spend": 0, "impressions": 0, "link_clicks": 0, "add_to_carts": 0,
+        "purchases": 0, "purchase_value": 0, "ad_ids": set(), "adset_ids": set(),
+    })
+    for d in rows:
+        cid = d.get("meta_campaign_id")
+        if not cid:
+            continue
+        c = campaigns[cid]
+        c["campaign_name"] = d.get("campaign_name") or c.get("campaign_name", "Unknown")
+        for k in ("spend", "purchase_value"):
+            c[k] += float(d.get(k) or 0)
+        for k in ("impressions", "link_clicks", "add_to_carts", "purchases"):
+            c[k] += int(d.get(k) or 0)
+        if d.get("meta_adset_id"):
+            c["adset_ids"].add(d["meta_adset_id"])
+        if d.get("meta_ad_id"):
+            c["ad_ids"].add(d["meta_ad_id"])
+    return [
+        (cid, c["campaign_name"], c["spend"], c["impressions"], c["link_clicks"],
+         c["add_to_carts"], c["purchases"], c["purchase_value"], len(c["adset_ids"]), len(c["ad_ids"]))
+        for cid, c in campaigns.items()
+    ]
+
+
+def _reference_by_adset(rows):
+    adsets = defaultdict(lambda: {
+        "spend": 0, "impressions": 0, "link_clicks": 0, "add_to_carts": 0,
+        "purchases": 0, "purchase_value": 0, "ad_ids": set(),
+    })
+    for d in rows:
+        asid = d.get("meta_adset_id")
+        if not asid:
+            continue
+        a = adsets[asid]
+        a["adset_name"] = d.get("adset_name") or a.get("adset_name", "Unknown")
+        a["campaign_name"] = d.get("campaign_name") or a.get("campaign_name", "")
+        a["meta_campaign_id"] = d.get("meta_campaign_id") or a.get("meta_campaign_id", "")
+        for k in ("spend", "purchase_value"):
+            a[k] += float(d.get(k) or 0)
+        for k in ("impressions", "link_clicks", "add_to_carts", "purchases"):
+            a[k] += int(d.get(k) or 0)
+        if d.get("meta_ad_id"):
+            a["ad_ids"].add(d["meta_ad_id"])
+    return [
+        (asid, a["adset_name"], a["campaign_name"], a["meta_campaign_id"], a["spend"],
+         a["impressions"], a["link_clicks"], a["add_to_carts"], a["purchases"],
+         a["purchase_value"], len(a["ad_ids"]))
+        for asid, a in adsets.items()
+    ]
+
+
+def _rows(n_ads=60, days=20, seed=7):
+    rng = random.Random(seed)
+    rows = []
+    for a in range(n_ads):
+        for d in range(rng.randint(1, days)):
+            rows.append({
+                "meta_ad_id": f"ad{a}" if a % 13 else None,
+                "meta_adset_id": f"set{a % 9}" if a % 7 else "",
+                "meta_campaign_id": f"camp{a % 4}" if a % 11 else None,
+                "date": f"2026-02-{d + 1:02d}",
+                "ad_name": rng.choice([f"Ad {a}", f"Ad {a} (copy)", None, ""]),
+                "ad_status": rng.choice(["ACTIVE", "PAUSED", None]),
+                "adset_name": rng.choice([f"Set {a % 9}", None]),
+                "campaign_name": rng.choice([f"Campaign {a % 4}", ""]),
+                "thumbnail_url": rng.choice(["", None, f"https://cdn/{a}/{d}.jpg"]),
+                "spend": rng.choice([None, round(rng.uniform(0, 80), 2)]),
+                "purchase_value": rng.choice([None, round(rng.uniform(0, 250), 2)]),
+                "impressions": rng.randint(0, 8000),
+                "link_clicks": rng.choice([None, rng.randint(0, 150)]),
+                "add_to_carts": rng.randint(0, 8),
+                "purchases": rng.choice([0, 1, 2, None]),
+                "reach": rng.randint(0, 4000),
+            })
+    return rows
+
+
+class TestPerformanceFrameAggregations:
+    def test_by_ad_matches_reference(self):
+        rows = _rows()
+        assert PerformanceFrame.from_rows(rows).aggregate_by_ad() == _reference_by_ad(rows)
+
+    def test_by_campaign_matches_reference(self):
+        rows = _rows(seed=8)
+        got = [
+            (c["meta_campaign_id"], c["campaign_name"], c["spend"], c["impressions"],
+             c["link_clicks"], c["add_to_carts"], c["purchases"], c["purchase_value"],
+             c["adset_count"], c["ad_count"])
+            for c in PerformanceFrame.from_rows(rows).aggregate_by_campaign()
+        ]
+        assert got == _reference_by_campaign(rows)
+
+    def test_by_adset_matches_reference(self):
+        rows = _rows(seed=9)
+        got = [
+            (a["meta_adset_id"], a["adset_name"], a["campaign_name"], a["meta_campaign_id"],
+             a["spend"], a["impressions"], a["link_clicks"], a["add_to_carts"], a["purchases"],
+             a["purchase_value"], a["ad_count"])
+            for a in PerformanceFrame.from_rows(rows).aggregate_by_adset()
+        ]
+        assert got == _reference_by_adset(rows)
+
+    def test_period_totals(self):
+        rows = _rows(seed=10)
+        totals = PerformanceFrame.from_rows(rows).period_totals()
+        assert totals["spend"] == sum(float(r.get("spend") or 0) for r in rows)
+        assert totals["link_clicks"] == sum(int(r.get("link_clicks") or 0) for r in rows)
+        assert totals["unique_ads"] == len({r["meta_ad_id"] for r in rows if r["meta_ad_id"]})
+        assert totals["unique_campaigns"] == len({r["meta_campaign_id"] for r in rows if r["meta_campaign_id"]})
+
+    def test_empty_frame(self):
+        frame = PerformanceFrame.from_rows([])
+        assert len(frame) == 0
+        assert frame.aggregate_by_ad() == []
+        assert frame.period_totals()["spend"] == 0
+        assert frame.period_totals()["unique_ads"] == 0
+
+
+class FakeQuery:
+    def __init__(self, table, store):
+        self.table = table
+        self.store = store
+        self.filters = []
+        self._page_range = None
+
+    def select(self, columns):
+        self.store.selects.append((self.table, columns))
+        return self
+
+    def eq(self, col, val):
+        self.filters.append(lambda r: r.get(col) == val)
+        return self
+
+    def in_(self, col, vals):
+        vals = set(vals)
+        self.filters.append(lambda r: r.get(col) in vals)
+        return self
+
+    def gte(self, col, val):
+        self.filters.append(lambda r: r.get(col) >= val)
+        return self
+
+    def lte(self, col, val):
+        self.filters.append(lambda r: r.get(col) <= val)
+        return self
+
+    def order(self, col, desc=False):
+        return self
+
+    def range(self, start, end):
+        self._page_range = (start, end)
+        return self
+
+    def execute(self):
+        self.store.calls.append(self.table)
+        rows = [r for r in self.store.data.get(self.table, []) if all(f(r) for f in self.filters)]
+        if self._page_range:
+            rows = rows[self._page_range[0]:self._page_range[1] + 1]
+        return type("R", (), {"data": rows})()
+
+
+class FakeStore:
+    def __init__(self, data):
+        self.data = data
+        self.calls = []
+        self.selects = []
+
+    def table(self, name):
+        return FakeQuery(name, self)
+
+
+def _perf(ad_id, day, spend, **extra):
+    row = {
+        "brand_id": BRAND, "meta_ad_id": ad_id, "date": day, "spend": spend,
+        "impressions": 1000, "link_clicks": 20, "purchases": 1, "purchase_value": spend * 2,
+        "ad_status": "ACTIVE", "meta_campaign_id": "camp-1",
+    }
+    row.update(extra)
+    return row
+
+
+@pytest.fixture
+def store():
+    return FakeStore({
+        "meta_ads_performance": [
+            _perf("ad-1", "2026-02-02", 10.0),
+            _perf("ad-1", "2026-02-01", 5.0),
+            _perf("ad-2", "2026-02-02", 30.0, ad_status="PAUSED"),
+            _perf("ad-3", "2026-02-01", 7.0),
+        ],
+        "ad_creative_classifications": [
+            {"brand_id": BRAND, "meta_ad_id": "ad-1", "creative_awareness_level": "problem_aware",
+             "creative_format": "video_ugc", "video_length_bucket": None, "landing_page_id": None},
+            {"brand_id": BRAND, "meta_ad_id": "ad-2", "creative_awareness_level": "problem_aware",
+             "creative_format": "image_static", "video_length_bucket": None, "landing_page_id": None},
+        ],
+    })
+
+
+@pytest.fixture
+def service(store):
+    return AdPerformanceQueryService(store, frame_cache=PerformanceFrameCache())
+
+
+RANGE = {"date_start": "2026-02-01", "date_end": "2026-02-28"}
+
+
+class TestCachedFrames:
+    def test_back_to_back_tools_fetch_once(self, service, store):
+        service.get_top_ads(BRAND, **RANGE)
+        service.get_account_summary(BRAND, **RANGE)
+        service.get_breakdown_by_media_type(BRAND, **RANGE)
+        service.get_breakdown_by_awareness(BRAND, **RANGE)
+        service.get_top_ads_by_awareness(BRAND, "problem_aware", **RANGE)
+
+        assert store.calls.count("meta_ads_performance") == 1
+        # get_top_ads enriches its top N itself; the breakdowns share one lookup
+        assert store.calls.count("ad_creative_classifications") == 2
+
+    def test_selects_only_needed_columns(self, service, store):
+        service.get_top_ads(BRAND, **RANGE)
+        columns = [c for table, c in store.selects if table == "meta_ads_performance"]
+        assert columns == [", ".join(PERFORMANCE_COLUMNS)]
+
+    def test_invalidate_refetches(self, service, store):
+        service.get_account_summary(BRAND, **RANGE)
+        service._frames.invalidate(BRAND)
+        service.get_account_summary(BRAND, **RANGE)
+        assert store.calls.count("meta_ads_performance") == 2
+
+    def test_ttl_expiry_refetches(self, store):
+        service = AdPerformanceQueryService(store, frame_cache=PerformanceFrameCache(ttl_seconds=0))
+        service.get_account_summary(BRAND, **RANGE)
+        service.get_account_summary(BRAND, **RANGE)
+        assert store.calls.count("meta_ads_performance") == 2
+
+    def test_results_are_not_shared_between_calls(self, service):
+        first = service.get_top_ads(BRAND, **RANGE)
+        first["ads"][0]["spend"] = -1
+        second = service.get_top_ads(BRAND, **RANGE)
+        assert second["ads"][0]["spend"] != -1
+
+
+class TestClassifiedBreakdowns:
+    def test_media_type(self, service):
+        groups = service.get_breakdown_by_media_type(BRAND, **RANGE)["groups"]
+        assert [(g["media_type"], g["spend"], g["ad_count"]) for g in groups] == [
+            ("Image", 30.0, 1), ("Video", 15.0, 1),
+        ]
+
+    def test_awareness(self, service):
+        result = service.get_breakdown_by_awareness(BRAND, **RANGE)
+        level = next(l for l in result["levels"] if l["awareness_level"] == "problem_aware")
+        assert level["ad_count"] == 2
+        assert level["active_count"] == 1
+        assert level["spend"] == 45.0
+        assert level["mean_cpa"] == (7.5 + 30.0) / 2
+        assert result["total_classified"] == 2
+        assert result["total_unclassified"] == 1
+        assert "unaware" in result["gaps"]
+
+    def test_top_ads_by_awareness(self, service):
+        ads = service.get_top_ads_by_awareness(BRAND, "problem_aware", **RANGE)["ads"]
+        assert [(a["meta_ad_id"], a["creative_format"], a["spend"]) for a in ads] == [
+            ("ad-1", "video_ugc", 15.0), ("ad-2", "image_static", 30.0),
+        ]
+
+    def test_ad_details_daily_trend(self, service):
+        result = service.get_ad_details(BRAND, "ad-1", **RANGE)
+        assert result["ad"]["spend"] == 15.0
+        assert [d["date"] for d in result["daily"]] == ["2026-02-01", "2026-02-02"]
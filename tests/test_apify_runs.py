@@ -0,0 +1,211 @@
+"""Tests for concurrent Apify run orchestration (scrapers/apify_runs.py).
+
+The Apify REST API is faked at requests.get and the ApifyClient with a
+MagicMock, so runs "finish" after a configurable number of polls.
+"""
+import threading
+from unittest.mock import MagicMock
+
+import pandas as pd
+import pytest
+
+from viraltracker.scrapers import apify_runs
+from viraltracker.scrapers.apify_runs import ApifyRunOrchestrator
+from viraltracker.scrapers.tiktok import TikTokScraper
+from viraltracker.scrapers.twitter import TwitterScraper
+
+
+class FakeApify:
+    """Fake actor runs: run N succeeds after polls[N] status checks."""
+
+    def __init__(self, polls, datasets, statuses=None):
+        self.polls = dict(polls)
+        self.datasets = datasets
+        self.statuses = statuses or {}
+        self.started = []
+        self.finished = []
+        self.aborted = []
+        self.inputs = {}
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+        self.client = MagicMock()
+        self.client.actor.return_value.start.side_effect = self._start
+        self.client.run.side_effect = lambda run_id: MagicMock(
+            abort=lambda: self.aborted.append(run_id)
+        )
+
+    def _start(self, run_input, **kwargs):
+        with self.lock:
+            run_id = f"run-{len(self.started)}"
+            self.started.append(run_id)
+            self.inputs[run_id] = run_input
+            self.max_in_flight = max(self.max_in_flight, len(self.started) - len(self.finished))
+        return {"id": run_id, "defaultDatasetId": f"ds-{run_id}", "status": "READY"}
+
+    def get(self, url, headers=None, params=None):
+        response = MagicMock()
+        if "/actor-runs/" in url:
+            run_id = url.rsplit("/", 1)[1]
+            with self.lock:
+                self.polls[run_id] -= 1
+                done = self.polls[run_id] <= 0
+                if done:
+                    self.finished.append(run_id)
+            status = self.statuses.get(run_id, "SUCCEEDED") if done else "RUNNING"
+            response.json.return_value = {"data": {"status": status, "defaultDatasetId": f"ds-{run_id}"}}
+        else:
+            run_id = url.split("/datasets/ds-", 1)[1].split("/", 1)[0]
+            items = self.datasets.get(run_id, [])
+            response.json.return_value = items[params["offset"]:params["offset"] + params["limit"]]
+        return response
+
+
+@pytest.fixture(autouse=True)
+def fast_polling(monkeypatch):
+    monkeypatch.setattr(apify_runs, "POLL_INITIAL_SECONDS", 0.01)
+    monkeypatch.setattr(apify_runs, "POLL_MAX_SECONDS", 0.02)
+
+
+def _orchestrator(fake, monkeypatch, **kwargs):
+    monkeypatch.setattr(apify_runs.requests, "get", fake.get)
+    return ApifyRunOrchestrator(fake.client, "token", "actor", **kwargs)
+
+
+def test_all_runs_start_before_any_finishes(monkeypatch):
+    fake = FakeApify(
+        polls={f"run-{i}": 3 for i in range(10)},
+        datasets={f"run-{i}": [{"id": i}] for i in range(10)},
+    )
+    orchestrator = _orchestrator(fake, monkeypatch)
+
+    pages = list(orchestrator.iter_pages([(i, {"n": i}) for i in range(10)]))
+
+    assert len(fake.started) == 10
+    assert fake.max_in_flight == 10
+    assert sorted(key for key, _ in pages) == list(range(10))
+    assert fake.client.actor.return_value.call.call_count == 0  # non-blocking start only
+    assert {run.status for run in orchestrator.runs.values()} == {"SUCCEEDED"}
+
+
+def test_max_concurrent_runs_limits_runs_in_flight(monkeypatch):
+    fake = FakeApify(polls={f"run-{i}": 2 for i in range(4)}, datasets={})
+    orchestrator = _orchestrator(fake, monkeypatch, max_concurrent_runs=1)
+
+    assert list(orchestrator.iter_pages([(i, {}) for i in range(4)])) == []
+    assert fake.finished == ["run-0", "run-1", "run-2", "run-3"]
+
+
+def test_dataset_streamed_in_pages(monkeypatch):
+    items = [{"id": i} for i in range(5)]
+    fake = FakeApify(polls={"run-0": 1}, datasets={"run-0": items})
+    orchestrator = _orchestrator(fake, monkeypatch, page_size=2)
+
+    pages = [page for _, page in orchestrator.iter_pages([("q", {})])]
+
+    assert [len(page) for page in pages] == [2, 2, 1]
+    assert sum(pages, []) == items
+    assert orchestrator.runs["q"].item_count == 5
+
+
+def test_failed_run_raises_after_other_runs_are_streamed(monkeypatch):
+    fake = FakeApify(
+        polls={"run-0": 1, "run-1": 1},
+        datasets={"run-0": [{"id": 1}], "run-1": [{"id": 2}]},
+        statuses={"run-0": "FAILED"},
+    )
+    orchestrator = _orchestrator(fake, monkeypatch)
+    pages = []
+
+    with pytest.raises(RuntimeError, match="FAILED"):
+        for key, items in orchestrator.iter_pages([("a", {}), ("b", {})]):
+            pages.append((key, items))
+
+    assert pages == [("b", [{"id": 2}])]
+    assert isinstance(orchestrator.runs["a"].error, RuntimeError)
+
+
+def test_timeout_aborts_run(monkeypatch):
+    fake = FakeApify(polls={"run-0": 10**6}, datasets={})
+    orchestrator = _orchestrator(fake, monkeypatch)
+
+    with pytest.raises(TimeoutError):
+        list(orchestrator.iter_pages([("slow", {})], timeout=0.1))
+
+    assert fake.aborted == ["run-0"]
+
+
+def test_scrape_search_saves_each_page_and_dedupes(monkeypatch):
+    def tweet(tweet_id):
+        return {
+            "id": tweet_id,
+            "url": f"https://x.com/u/status/{tweet_id}",
+            "text": "hi",
+            "author": {"userName": "u"},
+            "createdAt": "Fri Nov 24 17:49:36 +0000 2023",
+        }
+
+    fake = FakeApify(
+        polls={"run-0": 2, "run-1": 1},
+        datasets={"run-0": [tweet("1"), tweet("2")], "run-1": [tweet("2"), tweet("3")]},
+    )
+    monkeypatch.setattr(apify_runs.requests, "get", fake.get)
+
+    scraper = TwitterScraper.__new__(TwitterScraper)
+    scraper.apify_token = "token"
+    scraper.apify_actor_id = "actor"
+    scraper.apify_client = fake.client
+    scraper.platform_id = "platform"
+    saved = []
+
+    def fake_save(df, project_id=None, import_source="search"):
+        saved.append(list(df["post_id"]))
+        return list(df["post_id"])
+
+    scraper.save_posts_to_db = fake_save
+
+    result = scraper.scrape_search(
+        [f"term{i}" for i in range(7)], max_tweets=50, raw_query=True
+    )
+
+    assert len(fake.started) == 2
+    assert fake.max_in_flight == 1  # the tweet actor allows one run at a time
+    assert sorted(len(run_input["searchTerms"]) for run_input in fake.inputs.values()) == [2, 5]
+    assert len(saved) == 2  # one save per page
+    assert sorted(result["post_ids"]) == ["1", "2", "3"]
+    assert result["tweets_count"] == 3
+    assert result["apify_run_id"] in ("run-0", "run-1")
+
+
+def test_tiktok_keywords_run_concurrently_and_filter_per_term(monkeypatch):
+    def post(post_id, views):
+        return {
+            "id": post_id, "playCount": views, "authorMeta": {"name": "creator", "fans": 10},
+            "createTimeISO": pd.Timestamp.now(tz="UTC").isoformat(),
+        }
+
+    fake = FakeApify(
+        polls={"run-0": 2, "run-1": 2},
+        datasets={"run-0": [post("1", 500_000), post("2", 10)], "run-1": [post("3", 200_000)]},
+    )
+    monkeypatch.setattr(apify_runs.requests, "get", fake.get)
+
+    scraper = TikTokScraper.__new__(TikTokScraper)
+    scraper.apify_token = "token"
+    scraper.apify_actor_id = "actor"
+    scraper.apify_client = fake.client
+    scraper.platform_id = "platform"
+    streamed = []
+
+    results = scraper.search_by_keywords(
+        ["apps", "#tools"], on_results=lambda term, df: streamed.append(term)
+    )
+
+    assert sorted(str(v) for v in fake.inputs.values()) == sorted(
+        str(scraper._keyword_search_input(k)) for k in ["apps", "#tools"]
+    )
+    total = {term: count for term, (_, count) in results.items()}
+    kept = {term: list(df["post_id"]) for term, (df, _) in results.items()}
+    assert sum(total.values()) == 3
+    assert sorted(sum(kept.values(), [])) == ["1", "3"]
+    assert sorted(streamed) == ["#tools", "apps"]
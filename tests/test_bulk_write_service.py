@@ -0,0 +1,166 @@
+"""
+Unit tests for BulkWriteService.
+
+Covers:
+- Insert vs update vs skip routing on natural keys
+- Ids aligned to input, duplicate keys within the input
+- Unique-key upserts (ON CONFLICT DO NOTHING races)
+- Chunking, row-by-row fallback, chunked/paginated lookups
+
+Run with: pytest tests/test_bulk_write_service.py -v
+"""
+
+import pytest
+from unittest.mock import MagicMock
+
+from viraltracker.services.seo_pipeline.services import bulk_write_service
+from viraltracker.services.seo_pipeline.services.bulk_write_service import (
+    SEO_CLUSTER_SPOKES,
+    SEO_KEYWORDS,
+    SEO_OPPORTUNITIES,
+    BulkWriteService,
+)
+
+
+@pytest.fixture
+def mock_supabase():
+    return MagicMock()
+
+
+@pytest.fixture
+def writer(mock_supabase):
+    return BulkWriteService(supabase_client=mock_supabase)
+
+
+def _lookup(mock_supabase):
+    """The select -> in_ -> in_ -> order -> range chain used for key lookups."""
+    table = mock_supabase.table.return_value
+    return table.select.return_value.in_.return_value.in_.return_value.order.return_value.range.return_value
+
+
+def _kw(keyword, found=1):
+    return {"project_id": "p1", "keyword": keyword, "found_in_seeds": found, "status": "discovered"}
+
+
+class TestRouting:
+    def test_inserts_new_updates_existing(self, writer, mock_supabase):
+        _lookup(mock_supabase).execute.return_value = MagicMock(
+            data=[{"id": "old-1", "project_id": "p1", "keyword": "b"}]
+        )
+        table = mock_supabase.table.return_value
+        table.insert.return_value.execute.return_value = MagicMock(data=[
+            {"id": "new-c", "project_id": "p1", "keyword": "c"},
+            {"id": "new-a", "project_id": "p1", "keyword": "a"},
+        ])
+
+        result = writer.upsert(
+            SEO_KEYWORDS, [_kw("a"), _kw("b", 3), _kw("c"), _kw("a", 2)],
+            update_columns=("found_in_seeds",),
+        )
+
+        assert result.ids == ["new-a", "old-1", "new-c", "new-a"]
+        assert result.inserted_ids == ["new-a", "new-c"]
+        assert (result.inserted, result.updated, result.skipped, result.failed) == (2, 1, 1, 0)
+        # Last duplicate wins
+        inserted = table.insert.call_args.args[0]
+        assert [r["found_in_seeds"] for r in inserted if r["keyword"] == "a"] == [2]
+        assert table.upsert.call_args.args[0] == [
+            {"project_id": "p1", "keyword": "b", "found_in_seeds": 3, "id": "old-1"}
+        ]
+        assert table.upsert.call_args.kwargs["on_conflict"] == "id"
+
+    def test_skip_existing_on_unique_table(self, writer, mock_supabase):
+        table = mock_supabase.table.return_value
+        # k1 already exists and k3 lost a race; neither comes back
+        table.upsert.return_value.execute.return_value = MagicMock(
+            data=[{"id": "s2", "cluster_id": "c1", "keyword_id": "k2"}]
+        )
+
+        rows = [{"cluster_id": "c1", "keyword_id": k} for k in ("k1", "k2", "k3")]
+        result = writer.upsert(SEO_CLUSTER_SPOKES, rows, skip_existing=True)
+
+        table.select.assert_not_called()
+        assert result.ids == [None, "s2", None]
+        assert [r["keyword_id"] for r in result.records] == ["k2"]
+        assert result.inserted_ids == ["s2"]
+        assert (result.inserted, result.updated, result.skipped) == (1, 0, 2)
+        table.upsert.assert_called_once()
+        assert table.upsert.call_args.args[0] == rows
+        assert table.upsert.call_args.kwargs == {
+            "on_conflict": "cluster_id,keyword_id", "ignore_duplicates": True,
+        }
+
+    def test_unique_table_upserts_on_key_without_lookup(self, writer, mock_supabase):
+        table = mock_supabase.table.return_value
+        table.upsert.return_value.execute.side_effect = lambda: MagicMock(data=[
+            {"id": f"o-{r['keyword']}", **r} for r in table.upsert.call_args.args[0]
+        ])
+
+        rows = [{"article_id": "a1", "keyword": str(i), "score": i} for i in range(5)]
+        result = writer.upsert(SEO_OPPORTUNITIES, rows, chunk_size=2)
+
+        table.select.assert_not_called()
+        table.insert.assert_not_called()
+        assert table.upsert.call_count == 3
+        assert {c.kwargs["on_conflict"] for c in table.upsert.call_args_list} == {"article_id,keyword"}
+        assert result.ids == [f"o-{i}" for i in range(5)]
+        assert (result.upserted, result.written, result.inserted_ids) == (5, 5, [])
+
+    def test_null_key_is_never_looked_up(self, writer, mock_supabase):
+        table = mock_supabase.table.return_value
+        table.insert.return_value.execute.return_value = MagicMock(data=[])
+
+        result = writer.upsert(SEO_KEYWORDS, [{"project_id": None, "keyword": "k"}])
+
+        table.select.assert_not_called()
+        assert result.inserted == 1
+
+    def test_empty(self, writer, mock_supabase):
+        result = writer.upsert(SEO_KEYWORDS, [])
+        assert result.ids == [] and result.written == 0
+        mock_supabase.table.assert_not_called()
+
+
+class TestChunking:
+    def test_writes_in_chunks(self, writer, mock_supabase):
+        _lookup(mock_supabase).execute.return_value = MagicMock(data=[])
+        table = mock_supabase.table.return_value
+        table.insert.return_value.execute.side_effect = lambda: MagicMock(data=[
+            {"id": f"id-{r['keyword']}", **r} for r in table.insert.call_args.args[0]
+        ])
+
+        result = writer.upsert(SEO_KEYWORDS, [_kw(str(i)) for i in range(5)], chunk_size=2)
+
+        assert table.insert.call_count == 3
+        assert result.ids == [f"id-{i}" for i in range(5)]
+
+    def test_failed_chunk_retried_row_by_row(self, writer, mock_supabase):
+        _lookup(mock_supabase).execute.return_value = MagicMock(data=[])
+        table = mock_supabase.table.return_value
+        table.insert.return_value.execute.side_effect = [
+            Exception("chunk rejected"),
+            MagicMock(data=[{"id": "id-a", "project_id": "p1", "keyword": "a"}]),
+            Exception("bad row"),
+        ]
+
+        result = writer.upsert(SEO_KEYWORDS, [_kw("a"), _kw("b")])
+
+        assert result.ids == ["id-a", None]
+        assert (result.inserted, result.failed) == (1, 1)
+
+    def test_lookup_is_chunked_and_paginated(self, writer, mock_supabase, monkeypatch):
+        monkeypatch.setattr(bulk_write_service, "LOOKUP_CHUNK", 2)
+        monkeypatch.setattr(bulk_write_service, "PAGE_SIZE", 1)
+        lookup = _lookup(mock_supabase)
+        pages = iter([
+            [{"id": "x1", "project_id": "p1", "keyword": "a"}], [],
+            [{"id": "x3", "project_id": "p1", "keyword": "c"}], [],
+        ])
+        lookup.execute.side_effect = lambda: MagicMock(data=next(pages))
+
+        result = writer.upsert(SEO_KEYWORDS, [_kw("a"), _kw("b"), _kw("c")], skip_existing=True)
+
+        # 2 keyword chunks x 2 pages each
+        assert lookup.execute.call_count == 4
+        assert result.ids[0] == "x1" and result.ids[2] == "x3"
+        assert result.skipped == 2
@@ -291,6 +291,35 @@ class TestBulkAssign:
         # kid1 should be skipped (already assigned), kid2 should be added
         assert len(results) <= 1  # Only kid2 (or 0 if mock doesn't differentiate)
 
+    def test_writes_spokes_in_one_request(self, service, mock_supabase, cluster_id):
+        kid1, kid2, kid3 = str(uuid4()), str(uuid4()), str(uuid4())
+        table = mock_supabase.table.return_value
+        table.select.return_value.in_.return_value.execute.return_value = MagicMock(
+            data=[{"id": kid2, "keyword_difficulty": 20, "search_volume": 100}]
+        )
+        table.upsert.return_value.execute.return_value = MagicMock(data=[
+            {"id": "s2", "cluster_id": cluster_id, "keyword_id": kid2},
+            {"id": "s3", "cluster_id": cluster_id, "keyword_id": kid3},
+        ])
+
+        with patch.object(service, "_update_spoke_count") as spoke_count, \
+                patch.object(service, "recompute_centroid") as recompute:
+            results = service.bulk_assign_keywords(cluster_id, [kid1, kid2, kid3, kid2])
+
+        assert [r["id"] for r in results] == ["s2", "s3"]
+        # kid1 is already assigned: the database skips it (ON CONFLICT DO NOTHING)
+        (spokes,) = table.upsert.call_args.args
+        assert [s["keyword_id"] for s in spokes] == [kid1, kid2, kid3]
+        assert table.upsert.call_args.kwargs["ignore_duplicates"] is True
+        assert spokes[1]["target_kd"] == 20 and spokes[2]["target_kd"] is None
+        table.update.return_value.in_.assert_called_once_with("id", [kid2, kid3])
+        spoke_count.assert_called_once_with(cluster_id)
+        recompute.assert_called_once_with(cluster_id)
+
+    def test_invalid_role(self, service, cluster_id):
+        with pytest.raises(ValueError):
+            service.bulk_assign_keywords(cluster_id, [str(uuid4())], role="bogus")
+
 
 class TestUpdateSpoke:
     def test_updates_spoke_fields(self, service, mock_supabase):
@@ -423,6 +452,55 @@ class TestAutoAssignKeywords:
         results = service.auto_assign_keywords(project_id, dry_run=True)
         # In dry_run, no spoke is created (add_spoke not called)
 
+    def test_embedding_scores_against_centroids(self, service, mock_supabase, project_id):
+        _table_mock(mock_supabase, {
+            "seo_clusters": [
+                {"id": "c1", "name": "alpha", "pillar_keyword": "", "centroid_embedding": "[1,0,0]"},
+                {"id": "c2", "name": "beta", "pillar_keyword": "", "centroid_embedding": [0.0, 1.0, 0.0]},
+                {"id": "c3", "name": "gamma words", "pillar_keyword": "", "centroid_embedding": None},
+            ],
+            "seo_cluster_spokes": [],
+            "seo_keywords": [
+                {"id": "k1", "keyword": "first", "embedding": "[0.9,0.1,0]"},
+                {"id": "k2", "keyword": "gamma words here", "embedding": None},
+            ],
+        })
+
+        results = service.auto_assign_keywords(project_id, dry_run=True)
+        by_id = {r["keyword_id"]: r for r in results}
+
+        assert by_id["k1"]["method"] == "embedding"
+        assert by_id["k1"]["cluster_id"] == "c1"
+        assert by_id["k1"]["score"] == pytest.approx(0.9939, abs=1e-4)
+        assert by_id["k1"]["confidence"] == "HIGH"
+        # No embedding: word overlap against every cluster
+        assert by_id["k2"]["method"] == "word_overlap"
+        assert by_id["k2"]["cluster_id"] == "c3"
+
+
+class TestCentroids:
+    def test_recompute_centroid_is_normalized_mean(self, service, mock_supabase, cluster_id):
+        _table_mock(mock_supabase, {
+            "seo_cluster_spokes": [
+                {"seo_keywords": {"embedding": "[2,0]"}},
+                {"seo_keywords": {"embedding": [0.0, 2.0]}},
+                {"seo_keywords": {"embedding": None}},
+            ],
+        })
+        updates = []
+        mock_supabase.table.side_effect, table_side_effect = None, mock_supabase.table.side_effect
+
+        def _table(name):
+            table = table_side_effect(name)
+            table.update.side_effect = lambda payload: updates.append(payload) or table.select.return_value
+            return table
+
+        mock_supabase.table.side_effect = _table
+        service.recompute_centroid(cluster_id)
+
+        (payload,) = updates
+        assert payload["centroid_embedding"] == pytest.approx([0.7071, 0.7071], abs=1e-4)
+
 
 # ---------------------------------------------------------------------------
 # Pre-Write Check
@@ -0,0 +1,150 @@
+"""Tests for the token-bucket limiter and Embedder.embed_texts_concurrent.
+
+Run with: pytest tests/test_embedder_concurrent.py -v
+"""
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from viraltracker.core.embedding_cache import InMemoryEmbeddingCache
+from viraltracker.core.embeddings import Embedder
+from viraltracker.core.rate_limit import TokenBucket, backoff_delay
+
+
+class _FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestTokenBucket:
+    def test_burst_then_waits_at_rate(self):
+        clock = _FakeClock()
+        bucket = TokenBucket(rate=2.0, capacity=2, clock=clock)
+        assert bucket.reserve() == 0.0
+        assert bucket.reserve() == 0.0
+        # Bucket empty: each further token is 0.5s further out
+        assert bucket.reserve() == pytest.approx(0.5)
+        assert bucket.reserve() == pytest.approx(1.0)
+
+    def test_refills_up_to_capacity(self):
+        clock = _FakeClock()
+        bucket = TokenBucket(rate=1.0, capacity=3, clock=clock)
+        for _ in range(3):
+            bucket.reserve()
+        clock.now = 100.0
+        waits = [bucket.reserve() for _ in range(4)]
+        assert waits[:3] == [0.0, 0.0, 0.0]
+        assert waits[3] == pytest.approx(1.0)
+
+    def test_per_minute_and_validation(self):
+        assert TokenBucket.per_minute(120).rate == pytest.approx(2.0)
+        with pytest.raises(ValueError):
+            TokenBucket(rate=0)
+
+    def test_acquire_async_sleeps_for_debt(self):
+        bucket = TokenBucket(rate=1000.0, capacity=1)
+        waited = asyncio.run(_acquire_twice(bucket))
+        assert waited[0] == 0.0
+        assert waited[1] > 0.0
+
+    def test_backoff_delay_is_capped(self):
+        for attempt in range(10):
+            assert 0.0 <= backoff_delay(attempt, base=1.0, cap=5.0) <= 5.0
+
+
+async def _acquire_twice(bucket):
+    return [await bucket.acquire_async(), await bucket.acquire_async()]
+
+
+def _embedder(embed_side_effect, **kwargs):
+    with patch("viraltracker.core.embeddings.make_genai_client") as make_client:
+        client = MagicMock()
+        client.models.embed_content.side_effect = embed_side_effect
+        make_client.return_value = client
+        embedder = Embedder(
+            api_key="test", dimensions=2, requests_per_minute=60_000, **kwargs
+        )
+    return embedder, client
+
+
+def _vectors(contents):
+    return SimpleNamespace(embeddings=[SimpleNamespace(values=[float(t), 0.0]) for t in contents])
+
+
+class TestEmbedTextsConcurrent:
+    def test_returns_input_order_with_batches_in_flight(self):
+        in_flight = {"now": 0, "max": 0}
+        lock = threading.Lock()
+
+        def _embed(model, contents, config):
+            with lock:
+                in_flight["now"] += 1
+                in_flight["max"] = max(in_flight["max"], in_flight["now"])
+            # Later batches finish first
+            time.sleep(0.05 if contents[0] == "0" else 0.01)
+            with lock:
+                in_flight["now"] -= 1
+            return _vectors(contents)
+
+        embedder, client = _embedder(_embed, use_cache=False)
+        texts = [str(i) for i in range(450)]
+
+        vectors = embedder.embed_texts_concurrent(texts, max_concurrency=4)
+
+        assert [v[0] for v in vectors] == [float(i) for i in range(450)]
+        assert client.models.embed_content.call_count == 5
+        assert 1 < in_flight["max"] <= 4
+
+    def test_retries_only_failed_batch(self):
+        failures = {"left": 2}
+        lock = threading.Lock()
+
+        def _embed(model, contents, config):
+            if contents[0] == "100":
+                with lock:
+                    if failures["left"]:
+                        failures["left"] -= 1
+                        raise RuntimeError("429 RESOURCE_EXHAUSTED")
+            return _vectors(contents)
+
+        embedder, client = _embedder(_embed, use_cache=False)
+        with patch("viraltracker.core.embeddings.backoff_delay", return_value=0.0):
+            vectors = embedder.embed_texts_concurrent([str(i) for i in range(300)])
+
+        assert len(vectors) == 300
+        first_items = [c.kwargs["contents"][0] for c in client.models.embed_content.call_args_list]
+        assert sorted(first_items) == ["0", "100", "100", "100", "200"]
+
+    def test_raises_after_max_attempts(self):
+        def _embed(model, contents, config):
+            raise RuntimeError("boom")
+
+        embedder, client = _embedder(_embed, use_cache=False)
+        with patch("viraltracker.core.embeddings.backoff_delay", return_value=0.0):
+            with pytest.raises(RuntimeError, match="boom"):
+                embedder.embed_texts_concurrent(["1"], max_attempts=2)
+        assert client.models.embed_content.call_count == 2
+
+    def test_uses_cache_for_hits(self):
+        embedder, client = _embedder(
+            lambda model, contents, config: _vectors(contents), cache=InMemoryEmbeddingCache()
+        )
+        embedder.embed_texts(["1", "2"])
+        vectors = embedder.embed_texts_concurrent(["2", "3", "1"])
+
+        assert vectors == [[2.0, 0.0], [3.0, 0.0], [1.0, 0.0]]
+        assert client.models.embed_content.call_args.kwargs["contents"] == ["3"]
+
+    def test_async_wrapper(self):
+        embedder, _ = _embedder(lambda model, contents, config: _vectors(contents), use_cache=False)
+        vectors = asyncio.run(embedder.embed_texts_async(["4", "5"]))
+        assert vectors == [[4.0, 0.0], [5.0, 0.0]]
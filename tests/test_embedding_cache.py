@@ -0,0 +1,125 @@
+"""Tests for the content-addressed embedding cache and its Embedder wiring.
+
+Run with: pytest tests/test_embedding_cache.py -v
+"""
+from __future__ import annotations
+
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from viraltracker.core.config import Config
+from viraltracker.core.embedding_cache import (
+    EmbeddingCache,
+    InMemoryEmbeddingCache,
+    SQLiteEmbeddingCache,
+    default_embedding_cache,
+    embedding_cache_key,
+)
+from viraltracker.core.embeddings import Embedder
+
+
+def _fake_response(contents):
+    return SimpleNamespace(
+        embeddings=[SimpleNamespace(values=[float(len(t)), 0.5]) for t in contents]
+    )
+
+
+def _embedder(cache):
+    with patch("viraltracker.core.embeddings.make_genai_client") as make_client:
+        client = MagicMock()
+        client.models.embed_content.side_effect = lambda model, contents, config: _fake_response(contents)
+        make_client.return_value = client
+        embedder = Embedder(api_key="test", cache=cache, dimensions=2)
+    return embedder, client
+
+
+class TestEmbeddingCacheKey:
+    def test_key_varies_by_model_dims_and_task(self):
+        base = embedding_cache_key("m", 768, "RETRIEVAL_DOCUMENT", "hello")
+        assert base == embedding_cache_key("m", 768, "RETRIEVAL_DOCUMENT", "hello")
+        assert base != embedding_cache_key("m2", 768, "RETRIEVAL_DOCUMENT", "hello")
+        assert base != embedding_cache_key("m", 3072, "RETRIEVAL_DOCUMENT", "hello")
+        assert base != embedding_cache_key("m", 768, "RETRIEVAL_QUERY", "hello")
+        assert base != embedding_cache_key("m", 768, "RETRIEVAL_DOCUMENT", "hello!")
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def cache(request, tmp_path):
+    if request.param == "memory":
+        return InMemoryEmbeddingCache(max_entries=3)
+    return SQLiteEmbeddingCache(str(tmp_path / "emb.sqlite3"), max_entries=3)
+
+
+class TestEmbeddingCacheStores:
+    def test_round_trip_and_counters(self, cache):
+        cache.set_many({"a": [0.25, -1.5], "b": [1.0, 2.0]})
+        found = cache.get_many(["a", "b", "c"])
+        assert found == {"a": [0.25, -1.5], "b": [1.0, 2.0]}
+        stats = cache.stats()
+        assert stats["hits"] == 2
+        assert stats["misses"] == 1
+        assert stats["entries"] == 2
+
+    def test_lru_eviction(self, cache):
+        cache.set_many({"a": [1.0], "b": [2.0], "c": [3.0]})
+        cache.get_many(["a"])  # a is now most recently used
+        cache.set_many({"d": [4.0]})
+        assert len(cache) == 3
+        assert set(cache.get_many(["a", "b", "c", "d"])) == {"a", "c", "d"}
+
+    def test_default_cache_lives_in_configured_dir(self, monkeypatch):
+        monkeypatch.delenv("EMBEDDING_CACHE", raising=False)
+        cache = default_embedding_cache()
+        assert cache.path == f"{Config.CACHE_DIR}/embeddings.sqlite3"
+        cache.close()
+
+    def test_base_class_is_abstract(self):
+        with pytest.raises(TypeError):
+            EmbeddingCache()
+
+    def test_sqlite_persists_across_instances(self, tmp_path):
+        path = str(tmp_path / "emb.sqlite3")
+        SQLiteEmbeddingCache(path).set_many({"k": [0.5, 0.25]})
+        assert SQLiteEmbeddingCache(path).get_many(["k"]) == {"k": [0.5, 0.25]}
+
+
+class TestEmbedderCaching:
+    def test_only_misses_are_sent_to_api(self):
+        embedder, client = _embedder(InMemoryEmbeddingCache())
+
+        first = embedder.embed_texts(["aa", "bbb"])
+        second = embedder.embed_texts(["bbb", "c", "aa", "c"])
+
+        assert first == [[2.0, 0.5], [3.0, 0.5]]
+        assert second == [[3.0, 0.5], [1.0, 0.5], [2.0, 0.5], [1.0, 0.5]]
+        sent = [c.kwargs["contents"] for c in client.models.embed_content.call_args_list]
+        assert sent == [["aa", "bbb"], ["c"]]
+        assert embedder.cache_stats()["hits"] == 2
+
+    def test_task_type_is_part_of_key(self):
+        embedder, client = _embedder(InMemoryEmbeddingCache())
+        embedder.embed_texts(["aa"], task_type="RETRIEVAL_DOCUMENT")
+        embedder.embed_texts(["aa"], task_type="RETRIEVAL_QUERY")
+        assert client.models.embed_content.call_count == 2
+
+    def test_default_cache_opens_in_cache_dir(self, tmp_path, monkeypatch):
+        monkeypatch.delenv("EMBEDDING_CACHE", raising=False)
+        monkeypatch.chdir(tmp_path)
+        with patch("viraltracker.core.embeddings.make_genai_client"):
+            embedder = Embedder(api_key="test", cache_dir=str(tmp_path / "emb"))
+        assert embedder.cache.path == str(tmp_path / "emb" / "embeddings.sqlite3")
+        assert not (tmp_path / "cache").exists()  # no stray ./cache
+        embedder.cache.close()
+
+    def test_use_cache_false_bypasses_cache(self):
+        with patch("viraltracker.core.embeddings.make_genai_client") as make_client:
+            client = MagicMock()
+            client.models.embed_content.side_effect = lambda model, contents, config: _fake_response(contents)
+            make_client.return_value = client
+            embedder = Embedder(api_key="test", use_cache=False)
+        embedder.embed_texts(["aa"])
+        embedder.embed_texts(["aa"])
+        assert embedder.cache is None
+        assert client.models.embed_content.call_count == 2
@@ -452,6 +452,92 @@ class TestSuggestLinks:
                 assert s["priority"] == LinkPriority.MEDIUM.value
 
 
+class TestSuggestLinksEmbeddings:
+    """Matrix-based cosine scoring with batch-loaded keyword embeddings."""
+
+    EMBEDDINGS = {
+        "how to build a gaming pc": [1.0, 0.0, 0.0],
+        "best gaming monitor for pc": [0.9, 0.1, 0.0],
+        "best graphics card for gaming": [0.6, 0.8, 0.0],
+        "cooking recipes for beginners": [0.0, 0.0, 1.0],
+    }
+
+    def _setup(self, service, source_article, target_articles):
+        source = dict(source_article, keyword_id="kw-src")
+        targets = [dict(t, keyword_id=f"kw-{i}") for i, t in enumerate(target_articles)]
+        mock_exec = MagicMock()
+        mock_exec.data = [source]
+        service._supabase.table.return_value.select.return_value.eq.return_value.execute.return_value = mock_exec
+        service._get_keyword_embeddings = MagicMock(return_value=dict(self.EMBEDDINGS))
+        return source, targets
+
+    def test_cosine_scores_loaded_in_one_batch(self, service, source_article, target_articles):
+        _, targets = self._setup(service, source_article, target_articles)
+        service._get_project_articles = MagicMock(return_value=targets)
+
+        result = service.suggest_links("art-source-001", min_similarity=0.5, save=False)
+
+        service._get_keyword_embeddings.assert_called_once()
+        ids = [s["target_article_id"] for s in result["suggestions"]]
+        assert ids == ["art-target-001", "art-target-002"]
+        top = result["suggestions"][0]
+        assert top["similarity"] == pytest.approx(0.9 / (0.82 ** 0.5), abs=1e-3)
+        assert top["priority"] == LinkPriority.HIGH.value
+
+    def test_target_without_keyword_id_uses_jaccard(self, service, source_article, target_articles):
+        _, targets = self._setup(service, source_article, target_articles)
+        targets[0].pop("keyword_id")
+        service._get_project_articles = MagicMock(return_value=targets)
+
+        result = service.suggest_links("art-source-001", min_similarity=0.5, save=False)
+
+        ids = [s["target_article_id"] for s in result["suggestions"]]
+        # Jaccard("how to build a gaming pc", "best gaming monitor for pc") < 0.5
+        assert ids == ["art-target-002"]
+
+    def test_project_mode_matches_per_article(self, service, source_article, target_articles):
+        source, targets = self._setup(service, source_article, target_articles)
+        articles = [source] + targets
+        service._get_project_articles = MagicMock(
+            side_effect=lambda project_id, exclude_id=None: [
+                a for a in articles if a["id"] != exclude_id
+            ]
+        )
+        by_id = {a["id"]: a for a in articles}
+        service._get_article = MagicMock(side_effect=lambda aid: by_id.get(aid))
+
+        bulk = service.suggest_links_for_project("proj-001", min_similarity=0.3, save=False)
+
+        assert set(bulk) == set(by_id)
+        for article in articles:
+            single = service.suggest_links(article["id"], min_similarity=0.3, save=False)
+            assert bulk[article["id"]] == single
+
+    def test_interlink_project_scope(self, service):
+        service.suggest_links_for_project = MagicMock(return_value={
+            "a": {"suggestion_count": 2},
+            "b": {"suggestion_count": 1},
+        })
+        result = service.interlink("project", project_id="proj-001")
+        service.suggest_links_for_project.assert_called_once_with("proj-001", save=True)
+        assert result == {"scope": "project", "articles_processed": 2, "suggestion_count": 3}
+
+    def test_get_keyword_embeddings_falls_back_by_text(self, service):
+        service._paginate = MagicMock(return_value=[
+            {"id": "k1", "keyword": "alpha", "embedding": "[1.0, 0.0]"},
+            {"id": "k2", "keyword": "unrelated", "embedding": "[0.0, 1.0]"},
+        ])
+        in_query = service._supabase.table.return_value.select.return_value.in_
+        in_query.return_value.not_.is_.return_value.execute.return_value = MagicMock(
+            data=[{"keyword": "beta", "embedding": [0.5, 0.5]}]
+        )
+
+        found = service._get_keyword_embeddings("proj-001", ["alpha", "beta", "gamma"])
+
+        assert found == {"alpha": [1.0, 0.0], "beta": [0.5, 0.5]}
+        assert sorted(in_query.call_args.args[1]) == ["beta", "gamma"]
+
+
 # =============================================================================
 # AUTO-LINK ARTICLE (FULL FLOW WITH MOCKED DB)
 # =============================================================================
@@ -6,6 +6,8 @@ Covers:
 - _filter_keyword(): word count, character validation, edge cases
 - discover_keywords(): end-to-end with mocked autocomplete + DB
 - _save_keyword(): dedup, upsert logic
+- _fetch_autocomplete_many(): concurrency bound, cross-seed dedup, TTL cache
+- _save_keywords_bulk(): chunked insert + found_in_seeds refresh
 - get_keywords() / update_keyword_status()
 
 Run with: pytest tests/test_keyword_discovery_service.py -v
@@ -18,6 +20,7 @@ from uuid import uuid4
 import httpx
 
 from viraltracker.services.seo_pipeline.services.keyword_discovery_service import (
+    AutocompleteCache,
     KeywordDiscoveryService,
     MODIFIERS,
     SUFFIXES,
@@ -341,6 +344,154 @@ class TestDiscoverKeywords:
         assert result["keywords"] == []
 
 
+# ---------------------------------------------------------------------------
+# _fetch_autocomplete_many() — concurrent fan-out + response cache
+# ---------------------------------------------------------------------------
+
+
+def _patched_client(get):
+    """Patch httpx.AsyncClient with an async-context client using `get`."""
+    mock_client = AsyncMock()
+    mock_client.get = get
+    mock_client.__aenter__ = AsyncMock(return_value=mock_client)
+    mock_client.__aexit__ = AsyncMock(return_value=False)
+    return patch("httpx.AsyncClient", return_value=mock_client)
+
+
+def _response(query, suggestions):
+    resp = MagicMock()
+    resp.raise_for_status = MagicMock()
+    resp.json.return_value = [query, suggestions]
+    return resp
+
+
+class TestFetchAutocompleteMany:
+    @pytest.mark.asyncio
+    async def test_bounded_concurrency_and_all_results(self, service_no_db):
+        import asyncio as _asyncio
+
+        state = {"now": 0, "max": 0}
+
+        async def get(url, params=None):
+            state["now"] += 1
+            state["max"] = max(state["max"], state["now"])
+            await _asyncio.sleep(0.01)
+            state["now"] -= 1
+            return _response(params["q"], [params["q"] + " suggestion here"])
+
+        queries = [f"q{i}" for i in range(20)]
+        with _patched_client(get), \
+                patch("viraltracker.services.seo_pipeline.services.keyword_discovery_service.REQUEST_DELAY", 0.0001):
+            results = await service_no_db._fetch_autocomplete_many(
+                queries, max_concurrency=4, use_cache=False
+            )
+
+        assert results == {q: [q + " suggestion here"] for q in queries}
+        assert 1 < state["max"] <= 4
+
+    @pytest.mark.asyncio
+    async def test_cache_hits_skip_http_and_failures_are_not_cached(self, tmp_path):
+        cache = AutocompleteCache(str(tmp_path / "ac.sqlite3"))
+        svc = KeywordDiscoveryService(supabase_client=MagicMock(), autocomplete_cache=cache)
+        calls = []
+
+        async def get(url, params=None):
+            calls.append(params["q"])
+            if params["q"] == "bad":
+                raise httpx.ConnectError("down")
+            return _response(params["q"], ["x y z"])
+
+        with _patched_client(get):
+            first = await svc._fetch_autocomplete_many(["good", "bad"])
+            second = await svc._fetch_autocomplete_many(["good", "bad"])
+
+        assert first == second == {"good": ["x y z"], "bad": []}
+        assert sorted(calls) == ["bad", "bad", "good"]
+
+    def test_cache_ttl(self, tmp_path):
+        cache = AutocompleteCache(str(tmp_path / "ac.sqlite3"), ttl_seconds=60)
+        cache.set_many({"q": ["a b c"]})
+        assert cache.get_many(["q", "other"]) == {"q": ["a b c"]}
+        cache.ttl_seconds = -1
+        assert cache.get_many(["q"]) == {}
+
+    @pytest.mark.asyncio
+    async def test_duplicate_queries_fetched_once_but_counted_per_seed(self, service):
+        calls = []
+
+        async def get(url, params=None):
+            calls.append(params["q"])
+            return _response(params["q"], ["shared long tail keyword"])
+
+        service._save_keywords_bulk = MagicMock(return_value=[])
+        with _patched_client(get), \
+                patch("viraltracker.services.seo_pipeline.services.keyword_discovery_service.REQUEST_DELAY", 0.0001):
+            result = await service.discover_keywords(
+                str(uuid4()), ["minecraft", "Minecraft "], use_cache=False
+            )
+
+        variations = service._generate_variations("minecraft")
+        assert sorted(calls) == sorted(variations)
+        (kw,) = result["keywords"]
+        assert kw["found_in_seeds"] == 2 * len(variations)
+        assert kw["seed_keyword"] == "minecraft"
+
+
+# ---------------------------------------------------------------------------
+# _save_keywords_bulk() — mocked DB
+# ---------------------------------------------------------------------------
+
+
+class TestSaveKeywordsBulk:
+    def _kw(self, keyword, found=1):
+        return {"keyword": keyword, "word_count": 3, "seed_keyword": "s", "found_in_seeds": found}
+
+    def test_inserts_new_and_refreshes_existing(self, service):
+        table = service.supabase.table.return_value
+        lookup = table.select.return_value.in_.return_value.in_.return_value.order.return_value.range.return_value
+        lookup.execute.return_value = MagicMock(
+            data=[{"id": "old-1", "project_id": "p1", "keyword": "old keyword here"}]
+        )
+        table.insert.return_value.execute.return_value = MagicMock(
+            data=[{"id": "new-1"}, {"id": "new-2"}]
+        )
+
+        ids = service._save_keywords_bulk("p1", [
+            self._kw("old keyword here", found=4),
+            self._kw("new keyword one"),
+            self._kw("new keyword two"),
+        ])
+
+        assert ids == ["new-1", "new-2"]
+        (inserted,) = [c.args[0] for c in table.insert.call_args_list]
+        assert [r["keyword"] for r in inserted] == ["new keyword one", "new keyword two"]
+        assert all(r["status"] == "discovered" for r in inserted)
+        upserted = table.upsert.call_args
+        assert upserted.kwargs["on_conflict"] == "id"
+        assert upserted.args[0] == [
+            {"id": "old-1", "project_id": "p1", "keyword": "old keyword here", "found_in_seeds": 4}
+        ]
+
+    def test_failed_chunk_falls_back_to_single_inserts(self, service):
+        table = service.supabase.table.return_value
+        lookup = table.select.return_value.in_.return_value.in_.return_value.order.return_value.range.return_value
+        lookup.execute.return_value = MagicMock(data=[])
+        table.insert.return_value.execute.side_effect = [
+            Exception("bulk rejected"),
+            MagicMock(data=[{"id": "id-a", "project_id": "p1", "keyword": "aaa bbb ccc"}]),
+            Exception("bad row"),
+        ]
+
+        ids = service._save_keywords_bulk("p1", [self._kw("aaa bbb ccc"), self._kw("ddd eee fff")])
+
+        assert ids == ["id-a"]
+        assert table.insert.call_count == 3
+
+    def test_empty(self, service):
+        assert service._save_keywords_bulk("p1", []) == []
+        service.supabase.table.assert_not_called()
+
+
 # ---------------------------------------------------------------------------
 # get_keywords() / update_keyword_status()
 # ---------------------------------------------------------------------------
@@ -0,0 +1,133 @@
+"""Tests for MetaAdsService.sync_performance_to_db batched upserts.
+
+Run with: pytest tests/test_meta_performance_sync.py -v
+"""
+from __future__ import annotations
+
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+
+from viraltracker.services.meta_ads_service import MetaAdsService, PerformanceSyncResult
+
+
+def _insight(ad_id: str, date: str = "2026-01-01", **extra):
+    row = {
+        "meta_ad_account_id": "act_1",
+        "meta_ad_id": ad_id,
+        "meta_campaign_id": "c1",
+        "date": date,
+        "spend": 1.0,
+    }
+    row.update(extra)
+    return row
+
+
+def _service():
+    svc = MetaAdsService(access_token="fake")
+    svc.fetch_ad_statuses = AsyncMock(return_value={})
+    svc.sync_campaigns_to_db = AsyncMock(return_value={"c1": "OUTCOME_SALES"})
+    return svc
+
+
+def _upsert_payloads(db):
+    return [c.args[0] for c in db.table.return_value.upsert.call_args_list]
+
+
+class TestSyncPerformanceToDb:
+    @pytest.mark.asyncio
+    async def test_upserts_in_chunks(self):
+        svc = _service()
+        db = MagicMock()
+        insights = [_insight(f"ad{i}") for i in range(5)]
+        with patch("viraltracker.core.database.get_supabase_client", return_value=db):
+            result = await svc.sync_performance_to_db(insights, brand_id=uuid4(), chunk_size=2)
+
+        assert isinstance(result, PerformanceSyncResult)
+        assert [len(p) for p in _upsert_payloads(db)] == [2, 2, 1]
+        assert result.saved == 5
+        assert result.failed == 0
+        assert result.chunks == 3
+        assert result.elapsed_seconds >= 0
+        assert db.table.return_value.upsert.call_args.kwargs["on_conflict"] == "meta_ad_id,date"
+        assert _upsert_payloads(db)[0][0]["campaign_objective"] == "OUTCOME_SALES"
+
+    @pytest.mark.asyncio
+    async def test_failing_chunk_falls_back_to_rows(self):
+        svc = _service()
+        db = MagicMock()
+
+        def _execute_side_effect(*_a, **_k):
+            payload = db.table.return_value.upsert.call_args.args[0]
+            if isinstance(payload, list) and any(r["meta_ad_id"] == "bad" for r in payload):
+                raise Exception("chunk rejected")
+            if isinstance(payload, dict) and payload["meta_ad_id"] == "bad":
+                raise Exception("row rejected")
+            return MagicMock(data=[])
+
+        db.table.return_value.upsert.return_value.execute.side_effect = _execute_side_effect
+        insights = [_insight("a"), _insight("bad"), _insight("c"), _insight("d")]
+        with patch("viraltracker.core.database.get_supabase_client", return_value=db), \
+                patch("viraltracker.services.meta_ads_service.asyncio.sleep", new=AsyncMock()):
+            result = await svc.sync_performance_to_db(
+                insights, chunk_size=2, max_chunk_retries=1
+            )
+
+        assert result.saved == 3
+        assert result.failed == 1
+        assert result.chunk_retries == 1
+        assert result.row_fallbacks == 1
+        # Only the failing chunk degraded to single-row upserts
+        single_rows = [p for p in _upsert_payloads(db) if isinstance(p, dict)]
+        assert [r["meta_ad_id"] for r in single_rows] == ["a", "bad"]
+
+    @pytest.mark.asyncio
+    async def test_thumbnail_rows_sent_separately(self):
+        svc = _service()
+        db = MagicMock()
+        insights = [_insight("a"), _insight("b", thumbnail_url="https://x/t.jpg"), _insight("c")]
+        with patch("viraltracker.core.database.get_supabase_client", return_value=db):
+            result = await svc.sync_performance_to_db(insights, fetch_statuses=False)
+
+        assert result.saved == 3
+        for payload in _upsert_payloads(db):
+            assert len({tuple(r.keys()) for r in payload}) == 1
+        without_thumb = [p for p in _upsert_payloads(db) if "thumbnail_url" not in p[0]]
+        assert [r["meta_ad_id"] for r in without_thumb[0]] == ["a", "c"]
+
+    @pytest.mark.asyncio
+    async def test_duplicate_ad_dates_keep_last_row(self):
+        svc = _service()
+        db = MagicMock()
+        insights = [_insight("a", spend=1.0), _insight("a", spend=2.0)]
+        with patch("viraltracker.core.database.get_supabase_client", return_value=db):
+            result = await svc.sync_performance_to_db(insights, fetch_statuses=False)
+
+        (payload,) = _upsert_payloads(db)
+        assert len(payload) == 1
+        assert payload[0]["spend"] == 2.0
+        assert result.duplicates == 1
+        assert result.saved == 1
+
+    @pytest.mark.asyncio
+    async def test_empty_insights(self):
+        svc = _service()
+        db = MagicMock()
+        with patch("viraltracker.core.database.get_supabase_client", return_value=db):
+            result = await svc.sync_performance_to_db([])
+        assert result.saved == 0
+        assert result.rows_per_second == 0.0
+        db.table.return_value.upsert.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_saved_rows_invalidate_brand_frames(self):
+        svc = _service()
+        db = MagicMock()
+        brand_id = uuid4()
+        with patch("viraltracker.core.database.get_supabase_client", return_value=db), \
+                patch("viraltracker.services.meta_ads_service.invalidate_performance_frames") as invalidate:
+            await svc.sync_performance_to_db([_insight("a")], brand_id=brand_id, fetch_statuses=False)
+            await svc.sync_performance_to_db([], brand_id=brand_id)
+
+        invalidate.assert_called_once_with(str(brand_id))
@@ -7,7 +7,8 @@
 - Segmenter + Reconciliation (7 tests)
 - Cropper (4 tests)
 - PopupFilter (4 tests)
-- Pipeline integration (9 tests, mocked Gemini)
+- Pipeline integration (11 tests, mocked Gemini)
+- Phase cache stores and keys (5 tests)
 - Eval harness (5 tests)
 - Surgery S4 patch parsing & fence stripping (8 tests)
 - _add_important markdown stripping (2 tests)
@@ -685,6 +686,77 @@ class TestCropper:
         assert len(cropped) <= MAX_CROP_BYTES
 
 
+class TestScreenshotTiler:
+    """Test decode-once cropping."""
+
+    def _make_test_image(self, width=100, height=400, mode="RGB"):
+        from PIL import Image
+
+        img = Image.new(mode, (width, height))
+        # Distinct rows so crops differ
+        for y in range(height):
+            img.paste((y % 256, 0, 0) if mode == "RGB" else (y % 256, 0, 0, 255), (0, y, width, y + 1))
+        buf = io.BytesIO()
+        img.save(buf, format="PNG")
+        return buf.getvalue()
+
+    def _boxes(self):
+        from viraltracker.services.landing_page_analysis.multipass.cropper import NormalizedBox
+
+        return {
+            f"sec_{i}": NormalizedBox(f"sec_{i}", "s", i / 4, (i + 1) / 4)
+            for i in range(4)
+        }
+
+    def test_matches_crop_section(self):
+        from viraltracker.services.landing_page_analysis.multipass.cropper import (
+            ScreenshotTiler,
+            crop_section,
+        )
+
+        img_bytes = self._make_test_image()
+        boxes = self._boxes()
+        with ScreenshotTiler(img_bytes) as tiler:
+            crops = tiler.crop_all(boxes, max_workers=3)
+
+        assert list(crops) == list(boxes)
+        for key, box in boxes.items():
+            assert crops[key] == crop_section(img_bytes, box)
+
+    def test_decodes_once(self):
+        from PIL import Image
+        from viraltracker.services.landing_page_analysis.multipass.cropper import ScreenshotTiler
+
+        img_bytes = self._make_test_image()
+        with patch("PIL.Image.open", wraps=Image.open) as opened:
+            ScreenshotTiler(img_bytes).crop_all(self._boxes())
+        assert opened.call_count == 1
+
+    @pytest.mark.parametrize("fmt", ["JPEG", "WEBP"])
+    def test_lossy_formats(self, fmt):
+        from PIL import Image
+        from viraltracker.services.landing_page_analysis.multipass.cropper import ScreenshotTiler
+
+        tiler = ScreenshotTiler(self._make_test_image(mode="RGBA"), image_format=fmt.lower())
+        crops = tiler.crop_all(self._boxes(), add_overlap=False)
+
+        img = Image.open(io.BytesIO(crops["sec_1"]))
+        assert img.format == fmt
+        assert img.height == 100
+
+    def test_downscales_above_pixel_budget(self):
+        from viraltracker.services.landing_page_analysis.multipass.cropper import ScreenshotTiler
+
+        tiler = ScreenshotTiler(self._make_test_image(200, 800), max_pixels=200 * 800 // 4)
+        assert tiler.size == (100, 400)
+
+    def test_invalid_format(self):
+        from viraltracker.services.landing_page_analysis.multipass.cropper import ScreenshotTiler
+
+        with pytest.raises(ValueError):
+            ScreenshotTiler(self._make_test_image(), image_format="gif")
+
+
 # ---------------------------------------------------------------------------
 # PopupFilter tests
 # ---------------------------------------------------------------------------
@@ -1199,6 +1271,186 @@ class TestPipelineIntegration:
         finally:
             pipe_mod.MAX_WALL_CLOCK = original_timeout
 
+    @pytest.mark.asyncio
+    async def test_phase_cache_reuses_unchanged_phases(self):
+        import viraltracker.services.landing_page_analysis.multipass.pipeline as pipe_mod
+        from viraltracker.services.landing_page_analysis.multipass.phase_cache import (
+            InMemoryPhaseCache,
+        )
+
+        cache = InMemoryPhaseCache()
+        screenshot = self._make_test_image_b64()
+        markdown = "# Welcome\nHero body text.\n\n## Features\nFeature description."
+
+        def make_pipeline(responses):
+            calls = iter(responses)
+            mock_gemini = self._make_mock_gemini()
+            mock_gemini.analyze_image_async = AsyncMock(side_effect=lambda *a, **k: next(calls))
+            mock_gemini.analyze_text_async = AsyncMock(return_value=self._phase_2_response())
+            return MultiPassPipeline(gemini_service=mock_gemini, phase_cache=cache), mock_gemini
+
+        MultiPassPipeline = pipe_mod.MultiPassPipeline
+        phase_3 = [self._phase_3_response("sec_0"), self._phase_3_response("sec_1")]
+
+        pipeline, _ = make_pipeline(
+            [self._phase_0_response(), self._phase_1_response(), *phase_3, self._phase_4_response()]
+        )
+        first = await pipeline.generate(screenshot_b64=screenshot, page_markdown=markdown)
+        assert set(pipeline.phase_cache_status.values()) == {"miss"}
+
+        # Bumping the Phase 3 prompt version only re-runs Phase 3; its output
+        # is unchanged, so Phase 4 hits again
+        with patch.dict(pipe_mod.PROMPT_VERSIONS, {3: "bumped"}):
+            pipeline, mock_gemini = make_pipeline(phase_3)
+            second = await pipeline.generate(screenshot_b64=screenshot, page_markdown=markdown)
+
+        assert pipeline.phase_cache_status == {
+            "phase_0": "hit", "phase_1": "hit", "phase_3": "miss", "phase_4": "hit",
+        }
+        assert mock_gemini.analyze_image_async.call_count == 2
+        assert second == first
+        assert "phase_0_design_system" in pipeline.phase_snapshots
+
+    @pytest.mark.asyncio
+    async def test_phase_cache_skips_default_design_system(self):
+        from viraltracker.services.landing_page_analysis.multipass.phase_cache import (
+            InMemoryPhaseCache,
+        )
+        from viraltracker.services.landing_page_analysis.multipass.pipeline import (
+            MultiPassPipeline,
+        )
+
+        mock_gemini = self._make_mock_gemini()
+        mock_gemini.analyze_image_async = AsyncMock(side_effect=Exception("API down"))
+        mock_gemini.analyze_text_async = AsyncMock(return_value=self._phase_2_response())
+
+        pipeline = MultiPassPipeline(gemini_service=mock_gemini, phase_cache=InMemoryPhaseCache())
+        await pipeline.generate(
+            screenshot_b64=self._make_test_image_b64(),
+            page_markdown="# Test\nContent.",
+        )
+
+        # Fallback results from failed calls must not be served next time
+        assert pipeline.phase_cache_status["phase_0"] == "not_cached"
+        assert len(pipeline._phase_cache) == 0
+
+
+    @pytest.mark.asyncio
+    async def test_surgery_route_uses_phase_cache(self):
+        import viraltracker.services.landing_page_analysis.multipass.pipeline as pipe_mod
+        from viraltracker.services.landing_page_analysis.multipass.phase_cache import (
+            InMemoryPhaseCache,
+        )
+
+        cache = InMemoryPhaseCache()
+        body = "".join(
+            f"<section><h2>Heading {i}</h2><p>{'Body copy for the section. ' * 8}</p></section>"
+            for i in range(4)
+        )
+        page_html = f"<html><head></head><body>{body}</body></html>"
+        markdown = "\n\n".join(f"## Heading {i}\nBody copy for the section." for i in range(4))
+
+        outputs, statuses = [], []
+        with patch.object(pipe_mod, "MULTIPASS_PIPELINE_MODE", "surgery"), \
+                patch("viraltracker.core.database.get_supabase_client", side_effect=RuntimeError("offline")), \
+                patch(
+                    "viraltracker.services.landing_page_analysis.multipass.html_renderer.render_html_to_png_async",
+                    AsyncMock(return_value=None),
+                ):
+            for _ in range(2):
+                pipeline = pipe_mod.MultiPassPipeline(
+                    gemini_service=self._make_mock_gemini(), phase_cache=cache,
+                )
+                outputs.append(await pipeline.generate(
+                    screenshot_b64=self._make_test_image_b64(),
+                    page_markdown=markdown,
+                    page_html=page_html,
+                ))
+                statuses.append(dict(pipeline.phase_cache_status))
+
+        assert statuses == [{"surgery_s2": "miss"}, {"surgery_s2": "hit"}]
+        assert outputs[0] and outputs[1] == outputs[0]
+        assert "phase_s2_classified" in pipeline.phase_snapshots
+
+
+# ---------------------------------------------------------------------------
+# Phase cache store tests
+# ---------------------------------------------------------------------------
+
+
+class TestPhaseCache:
+    """Test phase result stores and cache keys."""
+
+    def test_key_changes_with_each_component(self):
+        from viraltracker.services.landing_page_analysis.multipass.pipeline import (
+            compute_phase_cache_key,
+        )
+
+        base = compute_phase_cache_key("3", "model-a", "v1", "<html>", {"sec_0": 1})
+        assert base == compute_phase_cache_key("3", "model-a", "v1", "<html>", {"sec_0": 1})
+        assert base != compute_phase_cache_key("3", "model-b", "v1", "<html>", {"sec_0": 1})
+        assert base != compute_phase_cache_key("3", "model-a", "v2", "<html>", {"sec_0": 1})
+        assert base != compute_phase_cache_key("3", "model-a", "v1", "<html >", {"sec_0": 1})
+        assert base != compute_phase_cache_key("3", "model-a", "v1", "<html>", {"sec_0": 2})
+
+    def test_in_memory_ttl_and_lru(self):
+        from viraltracker.services.landing_page_analysis.multipass.phase_cache import (
+            InMemoryPhaseCache,
+        )
+
+        now = [0.0]
+        cache = InMemoryPhaseCache(max_entries=2, ttl_seconds=10, clock=lambda: now[0])
+        cache.set("a", "phase_0", "A")
+        cache.set("b", "phase_0", "B")
+        assert cache.get("a") == "A"
+        cache.set("c", "phase_0", "C")  # evicts b, the least recently used
+        assert cache.get("b") is None
+        now[0] = 11
+        assert cache.get("a") is None
+        assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 2
+
+    def test_sqlite_persists_and_evicts(self, tmp_path):
+        from viraltracker.services.landing_page_analysis.multipass.phase_cache import (
+            SQLitePhaseCache,
+        )
+
+        path = str(tmp_path / "phases.sqlite3")
+        cache = SQLitePhaseCache(path, max_entries=2)
+        for key in ("a", "b", "c"):
+            cache.set(key, "phase_1", key.upper())
+        cache.close()
+
+        reopened = SQLitePhaseCache(path, max_entries=2, ttl_seconds=-1)
+        assert len(reopened) == 2
+        assert reopened.get("c") is None  # expired under the new TTL
+        assert reopened.evict() == 2
+
+    def test_tiered_backfills_local(self):
+        from viraltracker.services.landing_page_analysis.multipass.phase_cache import (
+            InMemoryPhaseCache,
+            TieredPhaseCache,
+        )
+
+        local, remote = InMemoryPhaseCache(), InMemoryPhaseCache()
+        remote.set("k", "phase_4", "V")
+        cache = TieredPhaseCache([local, remote])
+        assert cache.get("k") == "V"
+        assert local.get("k") == "V"
+
+    def test_default_phase_cache_modes(self, tmp_path, monkeypatch):
+        from viraltracker.services.landing_page_analysis.multipass.phase_cache import (
+            SQLitePhaseCache,
+            TieredPhaseCache,
+            default_phase_cache,
+        )
+
+        monkeypatch.setenv("MULTIPASS_PHASE_CACHE", "off")
+        assert default_phase_cache(str(tmp_path)) is None
+        monkeypatch.setenv("MULTIPASS_PHASE_CACHE", "disk")
+        assert isinstance(default_phase_cache(str(tmp_path)), SQLitePhaseCache)
+        monkeypatch.setenv("MULTIPASS_PHASE_CACHE", "tiered")
+        assert isinstance(default_phase_cache(str(tmp_path)), TieredPhaseCache)
+
 
 # ---------------------------------------------------------------------------
 # Eval harness tests
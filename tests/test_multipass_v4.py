@@ -37,6 +37,7 @@ B35: S0 sanitizer with Playwright-style DOM
 B36: check_scrape_consistency with richer DOM
 """
 
+import random
 import re
 from dataclasses import dataclass
 from unittest.mock import MagicMock, patch
@@ -5890,6 +5891,52 @@ class TestOverflowCSSConstraints:
 # B26: Surgery pipeline — HTMLSanitizer
 # ===========================================================================
 
+# Building blocks for random sanitizer pages: removable containers (popup,
+# cookie banner, drawer, chrome, z-index overlay) mixed with plain ones and
+# with leaves that hit every other rule, nested up to five deep.
+_SANITIZER_CONTAINERS = [
+    '<div class="newsletter-popup">', '<div id="cookie-banner">', '<section class="modal">',
+    '<aside class="overlay">', '<span class="lightbox">', '<div class="drawer">',
+    '<div id="shopify-section-footer">', '<section id="shopify-section-mega-menu">',
+    '<div style="z-index: 2147483647; color: transparent">', '<footer>', '<header>',
+    '<div class="wrap">', '<section>', '<aside>', '<span>', '<nav>', '<div>',
+    '<shopify-section id="s">',
+    '<div class="swiper-wrapper" style="transform: translate3d(0,0,0); height: 0px">',
+    '<form action="/go">', '<template>', '<template x-if="open">', '<svg>',
+]
+_SANITIZER_LEAVES = [
+    '<p>Text {i}</p>', 'plain {i} ', '<img src="/a{i}.png">',
+    '<img data-src="/lazy{i}.jpg" src="data:image/gif;base64,R0">',
+    '<img src="" srcset="s.jpg 300w, l.jpg 1200w">',
+    '<img src="https://www.facebook.com/tr?id=1" width="1" height="1">',
+    '<script>var x="<div class=popup>"</script>', '<noscript><img src="/n.png"></noscript>',
+    '<link rel="icon" href="/f.ico">', '<link rel="stylesheet" href="/t.css">',
+    '<style>.a{{background:url(/bg{i}.png)}}</style>',
+    '<video poster="/p.jpg"><source src="/v.mp4"></video>', '<video src="/clip.mp4"/>',
+    '<iframe src="https://www.youtube.com/embed/abcdefghijk"></iframe>',
+    '<a href="rel/{i}" onclick="go()">Go</a>', '<input type="submit" value="Send" class="btn">',
+    '<use href="#i"/>', '<animate attributeName="x">a</animate>', '<audio src="/s.mp3"></audio>',
+    '<br/>', '<!-- c{i} -->',
+]
+
+
+def _random_sanitizer_node(rng, depth, counter):
+    if depth > 4 or rng.random() < 0.45:
+        counter[0] += 1
+        return rng.choice(_SANITIZER_LEAVES).format(i=counter[0])
+    open_tag = rng.choice(_SANITIZER_CONTAINERS)
+    children = "".join(_random_sanitizer_node(rng, depth + 1, counter) for _ in range(rng.randint(0, 4)))
+    # a few containers are left unclosed
+    close = "</%s>" % re.match(r"<(\w[\w-]*)", open_tag).group(1) if rng.random() > 0.03 else ""
+    return open_tag + children + close
+
+
+def _random_sanitizer_page(seed):
+    rng = random.Random(seed)
+    counter = [0]
+    body = "".join(_random_sanitizer_node(rng, 0, counter) for _ in range(rng.randint(1, 6)))
+    return f"<html><head><style>.x{{background:url(a.png)}}</style></head><body>{body}</body></html>"
+
 
 class TestHTMLSanitizer:
     """B26: HTMLSanitizer strips scripts, tracking, event handlers."""
@@ -6134,6 +6181,60 @@ class TestHTMLSanitizer:
         result, stats = HTMLSanitizer().sanitize(html)
         assert 'src="only.jpg"' in result or 'src="https://' in result
 
+    @pytest.mark.parametrize("html", [
+        '<body><div class="wrap"><div class="newsletter-popup"><div><p>Join</p></div></div>'
+        '<p>Keep</p></div><aside id="cookie-banner">x</aside></body>',
+        '<body><div id="shopify-section-template--1__footer"><div><div>Links</div></div></div>'
+        '<section style="z-index: 2147483647; color: transparent">scrape</section>'
+        '<footer><div>bye</div></footer><p>Main</p></body>',
+        '<head><style>.a{background:url(/bg.png)}</style><link rel="icon" href="/f.ico">'
+        '<link rel="stylesheet" href="/t.css"></head><body>'
+        '<video poster="/p.jpg" width="640"><source src="/v.mp4"></video>'
+        '<video src="/clip.mp4" style="height:300px"/>'
+        '<iframe src="https://www.youtube.com/embed/abcdefghijk" title="Demo"></iframe>'
+        '<iframe src="https://maps.example.com/x"></iframe>'
+        '<shopify-section id="s"><div class="swiper-wrapper" style="transform: translate3d(0,0,0);">'
+        '<a href="rel/path" onclick="go()">Go</a></div></shopify-section>'
+        '<svg><use href="#i"/><animate attributeName="x">a</animate></svg></body>',
+    ])
+    def test_single_pass_matches_regex_passes(self, html):
+        from viraltracker.services.landing_page_analysis.multipass.surgery.sanitizer import (
+            HTMLSanitizer,
+        )
+        single, _ = HTMLSanitizer(mode="single_pass").sanitize(html, page_url="https://example.com/p")
+        regex, _ = HTMLSanitizer(mode="regex").sanitize(html, page_url="https://example.com/p")
+        assert single == regex
+
+    @pytest.mark.parametrize("mode", ["single_pass", "regex"])
+    def test_nested_removals_outer_wins(self, mode):
+        """A removed element nested in one removed by the same rule goes with
+        it uncounted; an earlier rule (popups before chrome) still counts."""
+        from viraltracker.services.landing_page_analysis.multipass.surgery.sanitizer import (
+            HTMLSanitizer,
+        )
+        html = (
+            '<body><section class="modal"><div class="popup"><div>a</div></div><p>b</p></section>'
+            '<div id="shopify-section-footer"><aside class="overlay">c</aside><footer>d</footer></div>'
+            '<noscript><script>e</script></noscript><p>Keep</p></body>'
+        )
+        result, stats = HTMLSanitizer(mode=mode).sanitize(html)
+        assert result == "<body><p>Keep</p></body>"
+        assert stats["popups_removed"] == 2
+        assert stats["chrome_removed"] == 1
+        assert stats["scripts_removed"] == 1
+
+    def test_single_pass_matches_regex_passes_on_random_pages(self):
+        """Output and stats match on random nested pages, including nested
+        and unclosed removable containers."""
+        from viraltracker.services.landing_page_analysis.multipass.surgery.sanitizer import (
+            HTMLSanitizer,
+        )
+        for seed in range(500):
+            html = _random_sanitizer_page(seed)
+            single = HTMLSanitizer(mode="single_pass").sanitize(html, page_url="https://example.com/p")
+            regex = HTMLSanitizer(mode="regex").sanitize(html, page_url="https://example.com/p")
+            assert single == regex, f"seed {seed}: {html}"
+
 
 # ===========================================================================
 # B27: Surgery pipeline — CSSScoper
@@ -0,0 +1,191 @@
+"""Tests for OutlierDetector: vectorized statistics and paginated fetching.
+
+The reference functions below are the original per-tweet loop implementations;
+the vectorized engine must flag the same tweets with the same metrics.
+
+Run with: pytest tests/test_outlier_detector.py -v
+"""
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+from scipy import stats
+
+from viraltracker.generation.outlier_detector import OutlierDetector, TweetMetrics
+
+
+def _detector(db=None) -> OutlierDetector:
+    # Skip __init__ (it resolves the project from the database)
+    detector = OutlierDetector.__new__(OutlierDetector)
+    detector.db = db
+    detector.project_id = "p1"
+    detector.project_slug = "proj"
+    return detector
+
+
+def _tweets(n: int, seed: int = 7):
+    rng = np.random.default_rng(seed)
+    now = datetime.now(timezone.utc)
+    likes = rng.lognormal(mean=3.0, sigma=1.5, size=n).astype(int)
+    tweets = []
+    for i in range(n):
+        t = TweetMetrics(
+            tweet_id=str(i),
+            text="",
+            author_handle="a",
+            author_followers=0,
+            posted_at=now - timedelta(hours=int(rng.integers(0, 24 * 30))),
+            views=int(likes[i] * 50 + 1),
+            likes=int(likes[i]),
+            replies=int(likes[i] // 4),
+            retweets=int(likes[i] // 3),
+        )
+        t.compute_metrics()
+        tweets.append(t)
+    return tweets
+
+
+def _reference_zscore(tweets, scores, threshold, trim_percent):
+    trim_fraction = trim_percent / 100.0
+    trimmed_mean = stats.trim_mean(scores, trim_fraction)
+    sorted_scores = np.sort(scores)
+    n = len(sorted_scores)
+    lower_cut = int(n * trim_fraction)
+    trimmed_std = np.std(sorted_scores[lower_cut:n - lower_cut], ddof=1)
+    z_scores = (scores - trimmed_mean) / trimmed_std
+    out = []
+    for tweet, z in zip(tweets, z_scores):
+        if z >= threshold:
+            pct = (np.sum(scores <= tweet.engagement_score) / len(scores)) * 100
+            out.append((tweet.tweet_id, float(z), float(pct)))
+    return out
+
+
+def _reference_percentile(tweets, scores, threshold):
+    cutoff = np.percentile(scores, 100 - threshold)
+    out = []
+    for tweet, score in zip(tweets, scores):
+        if score >= cutoff:
+            pct = (np.sum(scores <= score) / len(scores)) * 100
+            std = np.std(scores, ddof=1)
+            z = (score - np.mean(scores)) / std if std > 0 else 0.0
+            out.append((tweet.tweet_id, float(z), float(pct)))
+    return out
+
+
+def _as_tuples(results):
+    return [(r.tweet.tweet_id, r.z_score, r.percentile) for r in results]
+
+
+def _assert_same(actual, expected):
+    assert [a[0] for a in actual] == [e[0] for e in expected]
+    np.testing.assert_allclose([a[1] for a in actual], [e[1] for e in expected], rtol=1e-9)
+    assert [a[2] for a in actual] == [e[2] for e in expected]
+
+
+class TestVectorizedDetection:
+    @pytest.mark.parametrize("threshold,trim", [(2.0, 10.0), (1.0, 0.0), (3.0, 25.0)])
+    def test_zscore_matches_reference(self, threshold, trim):
+        tweets = _tweets(2000)
+        scores = np.array([t.engagement_score for t in tweets])
+        actual = _detector()._detect_zscore(tweets, scores, threshold, trim)
+        _assert_same(_as_tuples(actual), _reference_zscore(tweets, scores, threshold, trim))
+        assert actual, "fixture should produce outliers"
+
+    @pytest.mark.parametrize("threshold", [1.0, 5.0, 20.0])
+    def test_percentile_matches_reference(self, threshold):
+        tweets = _tweets(2000, seed=11)
+        scores = np.array([t.engagement_score for t in tweets])
+        actual = _detector()._detect_percentile(tweets, scores, threshold)
+        _assert_same(_as_tuples(actual), _reference_percentile(tweets, scores, threshold))
+
+    def test_ties_share_percentile(self):
+        tweets = _tweets(5)
+        scores = np.array([1.0, 5.0, 5.0, 5.0, 100.0])
+        results = _detector()._detect_percentile(tweets, scores, 80.0)
+        by_id = {r.tweet.tweet_id: r.percentile for r in results}
+        assert by_id["1"] == by_id["2"] == by_id["3"] == 80.0
+        assert by_id["4"] == 100.0
+
+    def test_zero_std_returns_empty(self):
+        tweets = _tweets(10)
+        scores = np.full(10, 3.0)
+        assert _detector()._detect_zscore(tweets, scores, 2.0, 10.0) == []
+
+    def test_time_decay_matches_per_tweet_formula(self):
+        tweets = _tweets(50)
+        original = [t.engagement_score for t in tweets]
+        _detector()._apply_time_decay(tweets, halflife_days=7)
+        now = datetime.now(timezone.utc)
+        for tweet, score in zip(tweets, original):
+            age_days = (now - tweet.posted_at).total_seconds() / 86400
+            assert tweet.engagement_score == pytest.approx(score * 2 ** (-age_days / 7), rel=1e-6)
+
+
+def _row(i: int, hours_ago: int):
+    posted = datetime.now(timezone.utc) - timedelta(hours=hours_ago)
+    return {
+        "id": f"{i:04d}",
+        "post_id": str(i),
+        "caption": f"tweet {i}",
+        "posted_at": posted.isoformat(),
+        "views": 1000,
+        "likes": i,
+        "comments": 0,
+        "shares": 0,
+        "accounts": {"platform_username": "a", "follower_count": 10},
+    }
+
+
+class TestFetchTweets:
+    def _db(self, rows, page_size):
+        """Mock posts query that honours .gt('id', ...) and .limit()."""
+        db = MagicMock()
+        query = MagicMock()
+        db.table.return_value.select.return_value = query
+        state = {"last_id": None, "limit": page_size}
+        query.eq.return_value = query
+        query.gte.return_value = query
+        query.order.return_value = query
+
+        def _gt(_col, value):
+            state["last_id"] = value
+            return query
+
+        def _limit(n):
+            state["limit"] = n
+            return query
+
+        def _execute():
+            remaining = [r for r in rows if state["last_id"] is None or r["id"] > state["last_id"]]
+            return MagicMock(data=remaining[:state["limit"]])
+
+        query.gt.side_effect = _gt
+        query.limit.side_effect = _limit
+        query.execute.side_effect = _execute
+        return db, query
+
+    def test_pages_past_first_page_with_keyset(self):
+        rows = [_row(i, hours_ago=i) for i in range(1, 6)]
+        db, query = self._db(rows, page_size=2)
+        detector = _detector(db)
+
+        pages = list(detector._iter_tweet_rows(30, 0, 0, page_size=2))
+
+        assert [len(p) for p in pages] == [2, 2, 1]
+        assert [c.args for c in query.gt.call_args_list] == [("id", "0002"), ("id", "0004")]
+        select_cols = db.table.return_value.select.call_args.args[0]
+        assert "*" not in select_cols
+
+    def test_fetch_tweets_returns_all_rows_newest_first(self):
+        rows = [_row(i, hours_ago=i) for i in range(1, 2502)]
+        db, _ = self._db(rows, page_size=1000)
+
+        tweets = _detector(db)._fetch_tweets(30, 0, 0)
+
+        assert len(tweets) == 2501
+        assert tweets[0].tweet_id == "1"
+        assert tweets[-1].tweet_id == "2501"
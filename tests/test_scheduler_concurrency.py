@@ -291,6 +291,124 @@ class TestWorkerLoop:
         assert call_count["n"] >= 2
 
 
+# ===========================================================================
+# JobWakeup — event-driven idle waits
+# ===========================================================================
+
+class _ConnectedWakeup(sc.JobWakeup):
+    """JobWakeup that behaves as if the LISTEN connection were live."""
+
+    @property
+    def connected(self):
+        return True
+
+
+class TestJobWakeup:
+
+    @pytest.fixture(autouse=True)
+    def _fresh_metrics(self):
+        sc.get_scheduler_metrics().reset()
+        yield
+        sc.get_scheduler_metrics().reset()
+
+    @pytest.mark.asyncio
+    async def test_notify_between_claim_and_wait_is_not_lost(self):
+        wakeup = sc.JobWakeup()
+        seen = wakeup.generation
+        wakeup.notify()
+        t0 = time.monotonic()
+        assert await wakeup.wait(seen, timeout=5) is True
+        assert time.monotonic() - t0 < 0.5
+
+    @pytest.mark.asyncio
+    async def test_idle_worker_wakes_on_notify_from_another_thread(self, mock_db):
+        """An idle slot must pick up new work as soon as it is notified,
+        not after the idle poll."""
+        import threading
+        wakeup = sc.JobWakeup()
+        mock_db.rpc.return_value.execute.side_effect = [
+            MagicMock(data=[]),
+            MagicMock(data=[_claim_payload()]),
+        ]
+        executed = []
+
+        async def execute_fn(claimed):
+            executed.append(claimed)
+            sc.shutdown_requested.set()
+
+        threading.Timer(0.1, wakeup.notify).start()
+        t0 = time.monotonic()
+        await sc.worker_loop(
+            mock_db, slot=0, execute_fn=execute_fn,
+            poll_idle_seconds=10, wakeup=wakeup,
+        )
+        assert len(executed) == 1
+        assert time.monotonic() - t0 < 2.0
+
+        metrics = sc.get_scheduler_metrics().snapshot()
+        assert metrics["wakeups"] == {"notify": 1}
+        assert metrics["claims"] == 1 and metrics["empty_claims"] == 1
+        assert metrics["calls_per_minute"]["claim_next_job"] == 2
+        assert metrics["claim_latency_seconds"]["max"] is not None
+
+    @pytest.mark.asyncio
+    async def test_idle_worker_wakes_when_next_run_at_arrives(self, mock_db):
+        wakeup = sc.JobWakeup()
+        mock_db.rpc.return_value.execute.side_effect = [
+            MagicMock(data=[]),
+            MagicMock(data=[_claim_payload()]),
+        ]
+
+        async def execute_fn(claimed):
+            sc.shutdown_requested.set()
+
+        wakeup.notify(time.time() + 0.2)  # future: arms the due timer only
+        assert wakeup.generation == 0
+        t0 = time.monotonic()
+        await sc.worker_loop(
+            mock_db, slot=0, execute_fn=execute_fn,
+            poll_idle_seconds=10, wakeup=wakeup,
+        )
+        assert 0.1 < time.monotonic() - t0 < 2.0
+        assert sc.get_scheduler_metrics().snapshot()["wakeups"] == {"due": 1}
+
+    @pytest.mark.asyncio
+    async def test_safety_poll_is_slow_only_when_connected(self, mock_db):
+        assert sc.JobWakeup().safety_poll_seconds == sc.IDLE_BACKOFF_SECONDS
+        connected = _ConnectedWakeup()
+        assert connected.safety_poll_seconds == sc.IDLE_SAFETY_POLL_SECONDS
+
+        # Connected workers read the earliest future next_run_at once and
+        # share it until it passes or goes stale.
+        query = mock_db.table.return_value.select.return_value.eq.return_value.gt.return_value
+        query.order.return_value.limit.return_value.execute.return_value = MagicMock(
+            data=[{"next_run_at": time.time() + 60}]
+        )
+        first = await connected.seconds_until_due(mock_db)
+        second = await connected.seconds_until_due(mock_db)
+        assert 50 < second <= first <= 60
+        assert mock_db.table.call_count == 1
+
+    def test_notify_accepts_iso_next_run_at(self):
+        from datetime import datetime, timedelta, timezone
+        wakeup = sc.JobWakeup()
+        wakeup.notify((datetime.now(timezone.utc) + timedelta(minutes=1)).isoformat())
+        assert wakeup.generation == 0
+        wakeup.notify((datetime.now(timezone.utc) - timedelta(minutes=1)).isoformat())
+        assert wakeup.generation == 1
+
+    def test_start_without_psycopg_falls_back_to_in_process(self, monkeypatch):
+        import sys
+        monkeypatch.setitem(sys.modules, "psycopg", None)  # import -> ImportError
+        saved = sc._JOB_WAKEUP
+        try:
+            wakeup = sc.start_job_wakeup("postgresql://example/db")
+            assert type(wakeup) is sc.JobWakeup
+            assert not wakeup.connected
+        finally:
+            sys.modules[sc.__name__]._JOB_WAKEUP = saved
+
+
 # ===========================================================================
 # recovery_loop
 # ===========================================================================
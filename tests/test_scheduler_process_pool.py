@@ -0,0 +1,216 @@
+"""Tests for per-job-type execution policies and the scheduler process pool.
+
+The pool tests spawn real worker processes. Pool processes import THIS module
+as their handler module, and the handlers below register only there (guarded
+by multiprocessing.parent_process()), so the parent's JOB_HANDLERS registry
+is untouched.
+"""
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+import os
+import re
+import time
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from viraltracker.worker import scheduler_concurrency as sc
+
+HANDLER_MODULE = __name__
+
+
+async def _cpu_job(job):
+    deadline = time.process_time() + job.get("cpu_seconds", 0.2)
+    n = 0
+    while time.process_time() < deadline:
+        n += 1
+    return {"pid": os.getpid(), "iterations": n}
+
+
+async def _failing_job(job):
+    raise ValueError("boom in pool")
+
+
+async def _sleep_job(job):
+    with open(job["marker"], "w") as f:
+        f.write(str(os.getpid()))
+    await asyncio.sleep(60)
+
+
+if multiprocessing.parent_process() is not None:  # spawned pool process
+    sc.register_job_handler("test_cpu", execution=sc.EXECUTION_PROCESS)(_cpu_job)
+    sc.register_job_handler("test_fail", execution=sc.EXECUTION_PROCESS)(_failing_job)
+    sc.register_job_handler("test_sleep", execution=sc.EXECUTION_PROCESS)(_sleep_job)
+
+
+@pytest.fixture(autouse=True)
+def _isolate_registry():
+    saved_handlers = dict(sc.JOB_HANDLERS)
+    saved_execution = dict(sc.JOB_EXECUTION)
+    try:
+        yield
+    finally:
+        sc.stop_process_pool(kill=True)
+        sc.JOB_HANDLERS.clear()
+        sc.JOB_HANDLERS.update(saved_handlers)
+        sc.JOB_EXECUTION.clear()
+        sc.JOB_EXECUTION.update(saved_execution)
+
+
+@pytest.fixture
+def pool():
+    p = sc.JobProcessPool(size=2, handler_module=HANDLER_MODULE)
+    p.start()
+    try:
+        yield p
+    finally:
+        p.shutdown(kill=True)
+
+
+class TestExecutionPolicy:
+
+    def test_default_policy_is_thread(self):
+        sc.register_job_handler("test_default")(_cpu_job)
+        assert sc.execution_policy("test_default") == sc.EXECUTION_THREAD
+        assert sc.execution_policy("never_registered") == sc.EXECUTION_THREAD
+
+    def test_process_policy_is_recorded(self):
+        sc.register_job_handler("test_cpu_policy", execution=sc.EXECUTION_PROCESS)(_cpu_job)
+        assert sc.execution_policy("test_cpu_policy") == sc.EXECUTION_PROCESS
+
+    def test_unknown_policy_raises(self):
+        with pytest.raises(ValueError, match="execution policy"):
+            sc.register_job_handler("test_bad", execution="gpu")
+
+    def test_cpu_heavy_worker_jobs_use_process_pool(self):
+        # Parsed from source: other test modules clear the runtime registry.
+        src = Path("viraltracker/worker/scheduler_worker.py").read_text()
+        process_types = set(re.findall(
+            r"@register_job_handler\('([^']+)', execution=EXECUTION_PROCESS\)", src
+        ))
+        assert process_types == {"scorecard", "creative_genome_update"}
+
+    def test_pool_not_started_without_process_job_types(self):
+        sc.JOB_EXECUTION.clear()
+        sc.register_job_handler("test_thread_only")(_cpu_job)
+        assert sc.start_process_pool(size=2) is None
+        sc.register_job_handler("test_cpu_policy", execution=sc.EXECUTION_PROCESS)(_cpu_job)
+        assert sc.start_process_pool(size=0) is None
+
+
+class TestThreadUsage:
+
+    @pytest.mark.asyncio
+    async def test_thread_run_reports_cpu_and_rss(self):
+        usage = {}
+        result = await sc.run_coroutine_in_thread(_cpu_job, {"cpu_seconds": 0.1}, usage=usage)
+        assert result["pid"] == os.getpid()
+        assert usage["execution_mode"] == sc.EXECUTION_THREAD
+        assert usage["cpu_seconds"] >= 0.09
+
+    @pytest.mark.asyncio
+    async def test_process_policy_falls_back_to_thread_without_pool(self):
+        sc.register_job_handler("test_cpu_policy", execution=sc.EXECUTION_PROCESS)(_cpu_job)
+        usage = {}
+        result = await sc.run_job_handler(
+            "test_cpu_policy", _cpu_job, {"cpu_seconds": 0.01}, usage=usage
+        )
+        assert result["pid"] == os.getpid()
+        assert usage["execution_mode"] == sc.EXECUTION_THREAD
+
+
+class TestJobProcessPool:
+
+    @pytest.mark.asyncio
+    async def test_cpu_jobs_run_in_separate_processes(self, pool):
+        usages = [{}, {}]
+        results = await asyncio.gather(*(
+            pool.run("test_cpu", {"cpu_seconds": 0.5}, usage=u) for u in usages
+        ))
+        pids = {r["pid"] for r in results}
+        assert os.getpid() not in pids
+        assert len(pids) == 2
+        for usage in usages:
+            assert usage["execution_mode"] == sc.EXECUTION_PROCESS
+            assert usage["cpu_seconds"] >= 0.45
+
+    @pytest.mark.asyncio
+    async def test_handler_error_carries_remote_traceback_and_usage(self, pool):
+        usage = {}
+        with pytest.raises(RuntimeError, match="boom in pool"):
+            await pool.run("test_fail", {}, usage=usage)
+        assert usage["execution_mode"] == sc.EXECUTION_PROCESS
+        # The pool survives a failing handler.
+        assert (await pool.run("test_cpu", {"cpu_seconds": 0.01}))["pid"] != os.getpid()
+
+    @pytest.mark.asyncio
+    async def test_shutdown_kill_lets_idle_processes_exit(self, pool):
+        await pool.run("test_cpu", {"cpu_seconds": 0.01})
+        processes = list(pool._executor._processes.values())
+
+        pool.shutdown(kill=True)
+
+        assert processes and all(p.exitcode == 0 for p in processes)  # not SIGKILLed
+
+    @pytest.mark.asyncio
+    async def test_shutdown_kill_stops_running_job(self, pool, tmp_path):
+        marker = tmp_path / "started"
+        task = asyncio.create_task(pool.run("test_sleep", {"marker": str(marker)}))
+        for _ in range(300):
+            if marker.exists() and marker.read_text():
+                break
+            await asyncio.sleep(0.05)
+        child_pid = int(marker.read_text())
+
+        pool.shutdown(kill=True)
+        with pytest.raises(RuntimeError, match="pool process died"):
+            await asyncio.wait_for(task, timeout=10)
+        assert not pool.running  # not restarted during shutdown
+        for _ in range(100):
+            try:
+                os.kill(child_pid, 0)
+            except ProcessLookupError:
+                break
+            await asyncio.sleep(0.05)
+        else:
+            pytest.fail("pool process still alive after shutdown(kill=True)")
+
+
+class TestRunJobInProcess:
+
+    def test_usage_buffer_flushed_after_each_job(self):
+        sc.JOB_HANDLERS["test_cpu"] = _cpu_job
+        sc.JOB_HANDLERS["test_fail"] = _failing_job
+        with patch("viraltracker.services.usage_write_buffer.flush_usage_write_buffer") as flush:
+            assert sc._run_job_in_process("test_cpu", {"cpu_seconds": 0.01})["error"] is None
+            assert "boom in pool" in sc._run_job_in_process("test_fail", {})["error"]
+        assert flush.call_count == 2
+
+
+class TestDispatcherRecordsUsage:
+
+    @pytest.mark.asyncio
+    async def test_usage_written_to_run_row(self):
+        from viraltracker.worker import scheduler_worker as sw
+
+        async def fake_handler(job):
+            return {"ok": True}
+
+        sc.JOB_HANDLERS["meta_sync"] = fake_handler
+        fake_db = MagicMock()
+        fake_db.table.return_value.select.return_value.eq.return_value.limit.return_value.execute.return_value = MagicMock(
+            data=[{"id": "job-1", "job_type": "meta_sync", "name": "test job", "brand_id": None}]
+        )
+        claimed = {"job_id": "job-1", "run_id": "run-1", "attempt_number": 1, "job_type": "meta_sync"}
+
+        with patch.object(sw, "_emit_job_started_event"), patch.object(sw, "update_job_run") as upd:
+            await sw._dispatch_claimed_job(fake_db, claimed)
+
+        upd.assert_called_once()
+        run_id, fields = upd.call_args[0]
+        assert run_id == "run-1"
+        assert fields["execution_mode"] == sc.EXECUTION_THREAD
+        assert set(fields) == {"execution_mode", "cpu_seconds", "max_rss_mb"}
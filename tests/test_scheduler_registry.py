@@ -42,7 +42,7 @@ def _parse_decorator_job_types() -> set[str]:
     set — if a decorator is in source but didn't register, something is
     very wrong with import order."""
     src = Path("viraltracker/worker/scheduler_worker.py").read_text()
-    return set(re.findall(r"@register_job_handler\('([^']+)'\)", src))
+    return set(re.findall(r"@register_job_handler\('([^']+)'[,)]", src))
 
 
 class TestRegistryPopulation:
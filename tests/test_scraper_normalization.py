@@ -0,0 +1,237 @@
+"""Tests for the columnar tweet/TikTok normalizers and upsert payloads.
+
+The reference functions below are the original per-item implementations
+(TwitterScraper._normalize_tweets / save_posts_to_db and their TikTok
+counterparts); the columnar versions must produce the same frames and
+payloads.
+"""
+import random
+import warnings
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock
+
+import pandas as pd
+import pytest
+
+from viraltracker.scrapers.tiktok import TikTokScraper
+from viraltracker.scrapers.twitter import TwitterScraper
+
+PLATFORM_ID = "platform-uuid"
+
+
+def _scraper(cls):
+    scraper = cls.__new__(cls)
+    scraper.platform_id = PLATFORM_ID
+    return scraper
+
+
+def _reference_media(tweet):
+    has_video = has_image = has_media = False
+    media_type = "text"
+    media = tweet.get("media", [])
+    if tweet.get("videos", []) or (media and any(m.get("type") == "video" for m in media)):
+        has_video = has_media = True
+        media_type = "video"
+    if tweet.get("photos", []) or (media and any(m.get("type") in ["photo", "image"] for m in media)):
+        has_image = has_media = True
+        media_type = "mixed" if has_video else "image"
+    if tweet.get("isQuote") and not has_video and not has_image:
+        media_type = "quote"
+        has_media = True
+    return {"has_video": has_video, "has_image": has_image, "has_media": has_media, "media_type": media_type}
+
+
+def _reference_tweets(items):
+    rows, skipped = [], 0
+    for tweet in items:
+        try:
+            if not isinstance(tweet, dict) or not isinstance(tweet.get("author", {}), dict):
+                skipped += 1
+                continue
+            author = tweet.get("author", {})
+            posted_at = None
+            if tweet.get("createdAt"):
+                try:
+                    posted_at = datetime.strptime(tweet["createdAt"], "%a %b %d %H:%M:%S %z %Y").isoformat()
+                except Exception:
+                    pass
+            media = _reference_media(tweet)
+            row = {
+                "post_id": str(tweet.get("id", "")), "post_url": tweet.get("url", ""),
+                "username": author.get("userName", ""), "display_name": author.get("name", ""),
+                "follower_count": author.get("followers", 0),
+                "is_verified": author.get("isVerified", False) or author.get("isBlueVerified", False),
+                "likes": tweet.get("likeCount", 0), "retweets": tweet.get("retweetCount", 0),
+                "replies": tweet.get("replyCount", 0), "quotes": tweet.get("quoteCount", 0),
+                "bookmarks": tweet.get("bookmarkCount", 0), "views": tweet.get("viewCount", 0),
+                "caption": tweet.get("text", "")[:2200], "lang": tweet.get("lang", ""),
+                "posted_at": posted_at, "is_reply": tweet.get("isReply", False),
+                "is_retweet": tweet.get("isRetweet", False), "is_quote": tweet.get("isQuote", False),
+                **media, "platform_id": PLATFORM_ID, "video_type": "post",
+            }
+            if not row["post_id"] or not row["username"]:
+                skipped += 1
+                continue
+            rows.append(row)
+        except Exception:
+            skipped += 1
+    df = pd.DataFrame(rows)
+    if len(df) > 0:
+        df = df.drop_duplicates(subset=["post_id"], keep="first")
+    return df, skipped
+
+
+def _reference_tiktok(items):
+    rows = []
+    for post in items:
+        try:
+            author, video = post.get("authorMeta", {}), post.get("videoMeta", {})
+            post_id, username = str(post.get("id", "")), author.get("name", "")
+            row = {
+                "post_id": post_id,
+                "post_url": post.get("webVideoUrl", f"https://www.tiktok.com/@{username}/video/{post_id}"),
+                "username": username, "display_name": author.get("nickName", ""),
+                "follower_count": author.get("fans", 0), "is_verified": author.get("verified", False),
+                "views": post.get("playCount", 0), "likes": post.get("diggCount", 0),
+                "comments": post.get("commentCount", 0), "shares": post.get("shareCount", 0),
+                "caption": post.get("text", "")[:2200], "length_sec": video.get("duration", 0),
+                "download_url": "", "posted_at": post.get("createTimeISO"), "platform_id": PLATFORM_ID,
+            }
+            if not row["post_id"] or not row["username"]:
+                continue
+            rows.append(row)
+        except Exception:
+            continue
+    df = pd.DataFrame(rows)
+    if len(df) > 0:
+        df = df.drop_duplicates(subset=["post_id"], keep="first")
+    return df
+
+
+def _reference_int(row, column):
+    return int(row.get(column, 0)) if pd.notna(row.get(column)) else None
+
+
+def _random_tweet(rng, i):
+    roll = rng.random()
+    if roll < 0.03:
+        return rng.choice(["not a tweet", None, 42])
+    author = {"userName": rng.choice(["alice", "bob", "carol", "", None]), "name": "N",
+              "followers": rng.randint(0, 10**6), "isVerified": rng.random() < 0.3,
+              "isBlueVerified": rng.choice([True, False, None])}
+    tweet = {
+        "id": rng.choice([str(rng.randint(0, 400)), rng.randint(0, 400), "", None]),
+        "url": f"https://x.com/u/status/{i}",
+        "text": "t" * rng.randint(0, 2500),
+        "author": author if roll > 0.06 else rng.choice([None, "x"]),
+        "likeCount": rng.randint(0, 9999), "viewCount": rng.choice([None, rng.randint(0, 10**7)]),
+        "createdAt": rng.choice([
+            "Fri Nov 24 17:49:36 +0000 2023", "Mon Jan 01 00:00:00 +0000 2024", "garbage", "", None,
+        ]),
+        "isQuote": rng.random() < 0.2,
+        "isReply": rng.random() < 0.2,
+    }
+    media_roll = rng.random()
+    if media_roll < 0.2:
+        tweet["media"] = [{"type": rng.choice(["video", "photo", "image", "gif"])}]
+    elif media_roll < 0.3:
+        tweet["photos"] = ["p.jpg"]
+    elif media_roll < 0.4:
+        tweet["videos"] = ["v.mp4"]
+        tweet["photos"] = rng.choice([[], ["p.jpg"]])
+    for key in ("retweetCount", "replyCount", "lang"):
+        if rng.random() < 0.8:
+            tweet[key] = rng.randint(0, 100) if key != "lang" else "en"
+    return tweet
+
+
+def _random_tiktok_post(rng, i):
+    roll = rng.random()
+    if roll < 0.03:
+        return rng.choice(["junk", None])
+    post = {
+        "id": rng.choice([str(rng.randint(0, 300)), ""]),
+        "text": rng.choice(["caption", "c" * 2500, None]) if roll > 0.06 else None,
+        "authorMeta": {"name": rng.choice(["creator", "other", ""]), "fans": rng.randint(0, 10**5)},
+        "videoMeta": rng.choice([{"duration": rng.randint(1, 120)}, {}]),
+        "playCount": rng.randint(0, 10**6),
+        "createTimeISO": "2025-10-10T18:25:28.000Z",
+    }
+    if rng.random() < 0.5:
+        post["webVideoUrl"] = f"https://www.tiktok.com/@creator/video/{i}"
+    return post
+
+
+def test_normalize_tweets_matches_reference():
+    rng = random.Random(5)
+    items = [_random_tweet(rng, i) for i in range(2000)]
+
+    df, skipped = _scraper(TwitterScraper)._normalize_tweets(items)
+    expected, expected_skipped = _reference_tweets(items)
+
+    assert skipped == expected_skipped
+    pd.testing.assert_frame_equal(df.reset_index(drop=True), expected.reset_index(drop=True))
+
+
+def test_normalize_tweets_all_malformed_returns_empty_frame():
+    df, skipped = _scraper(TwitterScraper)._normalize_tweets([None, {"author": None}, {"id": "1"}])
+    assert df.empty and skipped == 3
+
+
+def test_normalize_tiktok_matches_reference():
+    rng = random.Random(9)
+    items = [_random_tiktok_post(rng, i) for i in range(2000)]
+
+    df = _scraper(TikTokScraper)._normalize_search_posts(items)
+
+    pd.testing.assert_frame_equal(df.reset_index(drop=True), _reference_tiktok(items).reset_index(drop=True))
+
+
+def test_viral_filters_keep_recent_small_creator_posts_without_copy_warning():
+    now = datetime.now(timezone.utc)
+    df = pd.DataFrame({
+        "post_id": ["old", "new", "small", "big"],
+        "views": [500_000, 500_000, 10, 500_000],
+        "follower_count": [10, 10, 10, 10**6],
+        "posted_at": [(now - timedelta(days=d)).isoformat() for d in (30, 1, 1, 1)],
+    })
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", pd.errors.SettingWithCopyWarning)
+        kept = _scraper(TikTokScraper)._apply_viral_filters(df)
+
+    assert list(kept["post_id"]) == ["new"]
+    assert list(kept.columns) == list(df.columns)
+
+
+@pytest.mark.parametrize("cls", [TwitterScraper, TikTokScraper])
+def test_upsert_payload_matches_iterrows(cls):
+    rng = random.Random(1)
+    scraper = _scraper(cls)
+    if cls is TwitterScraper:
+        df, _ = scraper._normalize_tweets([_random_tweet(rng, i) for i in range(500)])
+        int_columns = {"views": "views", "likes": "likes", "comments": "replies", "shares": "retweets"}
+    else:
+        df = scraper._normalize_search_posts([_random_tiktok_post(rng, i) for i in range(500)])
+        int_columns = {"views": "views", "likes": "likes", "comments": "comments",
+                       "shares": "shares", "length_sec": "length_sec"}
+    account_ids = {"alice": "a-1", "creator": "c-1"}
+    scraper._upsert_accounts = lambda frame: account_ids
+    scraper.supabase = MagicMock()
+    scraper.save_posts_to_db(df, import_source="search")
+    payloads = [
+        post for call in scraper.supabase.table.return_value.upsert.call_args_list for post in call.args[0]
+    ]
+
+    assert len(payloads) == len(df)
+    for payload, (_, row) in zip(payloads, df.iterrows()):
+        assert payload["account_id"] == account_ids.get(row["username"])
+        assert payload["post_id"] == row["post_id"]
+        assert payload["posted_at"] == row.get("posted_at")
+        assert payload["is_own_content"] is False
+        for target, source in int_columns.items():
+            assert payload[target] == _reference_int(row, source)
+            assert payload[target] is None or type(payload[target]) is int
+        if cls is TwitterScraper:
+            assert payload["has_video"] == bool(row["has_video"])
+            assert payload["media_type"] == row["media_type"]
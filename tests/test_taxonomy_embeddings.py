@@ -0,0 +1,124 @@
+"""Tests for the taxonomy embedding cache and taxonomy relevance scoring.
+
+Run with: pytest tests/test_taxonomy_embeddings.py -v
+"""
+from __future__ import annotations
+
+import json
+import os
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+from viraltracker.core.embeddings import (
+    TaxonomyEmbeddings,
+    _hash_taxonomy_node,
+    load_taxonomy_embeddings,
+    load_taxonomy_embeddings_incremental,
+)
+from viraltracker.generation.comment_finder import relevance_from_taxonomy
+
+
+def _node(label, description="desc", exemplars=None):
+    return SimpleNamespace(label=label, description=description, exemplars=exemplars or ["ex"])
+
+
+def _embedder():
+    embedder = MagicMock()
+    embedder.embed_texts.side_effect = lambda texts, task_type: [
+        [float(len(t)), 1.0] for t in texts
+    ]
+    return embedder
+
+
+class TestIncrementalTaxonomyCache:
+    def test_first_load_embeds_all_nodes_in_one_batch(self, tmp_path):
+        embedder = _embedder()
+        nodes = [_node("a", "short"), _node("b", "longer text")]
+
+        result = load_taxonomy_embeddings_incremental("p1", nodes, embedder, cache_dir=str(tmp_path))
+
+        embedder.embed_texts.assert_called_once()
+        assert list(result) == ["a", "b"]
+        assert isinstance(result, TaxonomyEmbeddings)
+        assert sorted(os.listdir(tmp_path)) == ["taxonomy_p1.npz"]
+
+    def test_repeat_call_is_served_from_memory(self, tmp_path):
+        embedder = _embedder()
+        nodes = [_node("a")]
+        first = load_taxonomy_embeddings_incremental("p2", nodes, embedder, cache_dir=str(tmp_path))
+        os.remove(tmp_path / "taxonomy_p2.npz")
+
+        second = load_taxonomy_embeddings_incremental("p2", nodes, embedder, cache_dir=str(tmp_path))
+
+        assert second is first
+        assert embedder.embed_texts.call_count == 1
+
+    def test_only_changed_nodes_are_recomputed(self, tmp_path):
+        embedder = _embedder()
+        load_taxonomy_embeddings_incremental(
+            "p3", [_node("a"), _node("b")], embedder, cache_dir=str(tmp_path)
+        )
+
+        result = load_taxonomy_embeddings_incremental(
+            "p3", [_node("a"), _node("b", "changed description")], embedder, cache_dir=str(tmp_path)
+        )
+
+        assert embedder.embed_texts.call_args.args[0] == ["changed description ex"]
+        assert result["b"][0] == float(len("changed description ex"))
+
+    def test_reads_binary_cache_from_another_process(self, tmp_path):
+        nodes = [_node("a"), _node("b")]
+        load_taxonomy_embeddings_incremental("p4", nodes, _embedder(), cache_dir=str(tmp_path))
+
+        # Simulate a fresh worker: clear the in-process copy
+        from viraltracker.core import embeddings
+        embeddings._taxonomy_memory.clear()
+
+        embedder = _embedder()
+        result = load_taxonomy_embeddings_incremental("p4", nodes, embedder, cache_dir=str(tmp_path))
+
+        embedder.embed_texts.assert_not_called()
+        assert result["a"] == pytest.approx([len("desc ex"), 1.0])
+        assert load_taxonomy_embeddings("p4", cache_dir=str(tmp_path)) == result
+
+    def test_migrates_legacy_json_cache(self, tmp_path):
+        node = _node("a")
+        legacy = {
+            "embeddings": {"a": [0.5, 0.25]},
+            "hashes": {"a": _hash_taxonomy_node(node.label, node.description, node.exemplars)},
+            "cached_at": 0,
+        }
+        (tmp_path / "taxonomy_p5.json").write_text(json.dumps(legacy))
+        embedder = _embedder()
+
+        result = load_taxonomy_embeddings_incremental("p5", [node], embedder, cache_dir=str(tmp_path))
+
+        embedder.embed_texts.assert_not_called()
+        assert result["a"] == [0.5, 0.25]
+        assert (tmp_path / "taxonomy_p5.npz").exists()
+
+
+class TestRelevanceFromTaxonomy:
+    TAXONOMY = {"x": [1.0, 0.0], "y": [0.0, 1.0], "xy": [1.0, 1.0]}
+
+    @pytest.mark.parametrize("wrap", [dict, TaxonomyEmbeddings])
+    def test_best_topic_and_margin(self, wrap):
+        relevance, topic, best = relevance_from_taxonomy([1.0, 0.1], wrap(self.TAXONOMY))
+
+        assert topic == "x"
+        assert best == pytest.approx(0.995, abs=1e-3)
+        second = (1.0 + 0.1) / ((1.01 ** 0.5) * (2 ** 0.5))
+        assert relevance == pytest.approx(0.8 * best + 0.2 * (best - second), abs=1e-5)
+
+    def test_matrix_rebuilt_when_labels_change(self):
+        taxonomy = TaxonomyEmbeddings(self.TAXONOMY)
+        labels, _ = taxonomy.matrix()
+        taxonomy["z"] = [-1.0, 0.0]
+        new_labels, matrix = taxonomy.matrix()
+        assert new_labels == labels + ["z"]
+        assert matrix.shape == (4, 2)
+
+    def test_empty_taxonomy(self):
+        assert relevance_from_taxonomy([1.0], {}) == (0.0, "unknown", 0.0)
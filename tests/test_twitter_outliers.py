@@ -0,0 +1,150 @@
+"""Tests for TwitterScraper's bulk outlier pass.
+
+The reference function below is the original per-account
+TwitterScraper._calculate_outliers statistic; the bulk pass must flag the
+same posts with the same scores while fetching in pages and upserting all
+post_review flags together.
+"""
+import random
+
+import numpy as np
+import pytest
+
+from viraltracker.scrapers import twitter
+from viraltracker.scrapers.twitter import TwitterScraper
+
+
+class FakeQuery:
+    def __init__(self, store, table):
+        self.store = store
+        self.table = table
+        self.filters = []
+        self._range = None
+        self._upsert = None
+
+    def select(self, columns):
+        self.store.selects.append(columns)
+        return self
+
+    def eq(self, col, val):
+        self.filters.append(lambda r: r.get(col) == val)
+        return self
+
+    def in_(self, col, vals):
+        vals = set(vals)
+        self.filters.append(lambda r: r.get(col) in vals)
+        return self
+
+    def order(self, col):
+        return self
+
+    def range(self, start, end):
+        self._range = (start, end)
+        return self
+
+    def upsert(self, rows, on_conflict=None):
+        self._upsert = rows
+        return self
+
+    def execute(self):
+        if self._upsert is not None:
+            self.store.upserts.append((self.table, self._upsert))
+            return type("R", (), {"data": self._upsert})()
+        self.store.reads += 1
+        rows = sorted(
+            (r for r in self.store.data.get(self.table, []) if all(f(r) for f in self.filters)),
+            key=lambda r: r["id"],
+        )
+        if self._range:
+            rows = rows[self._range[0]:self._range[1] + 1]
+        return type("R", (), {"data": rows})()
+
+
+class FakeStore:
+    def __init__(self, data):
+        self.data = data
+        self.selects = []
+        self.upserts = []
+        self.reads = 0
+
+    def table(self, name):
+        return FakeQuery(self, name)
+
+
+def _reference_outliers(posts, threshold_sd=3.0):
+    if len(posts) < 10:
+        return {}
+    scores = [p["likes"] for p in posts if p.get("likes")]
+    if len(scores) < 10:
+        return {}
+    sorted_scores = sorted(scores)
+    trim_count = int(len(sorted_scores) * 0.1)
+    trimmed = sorted_scores[trim_count:-trim_count] if trim_count > 0 else sorted_scores
+    mean = np.mean(trimmed)
+    threshold = mean + threshold_sd * np.std(trimmed)
+    return {
+        p["id"]: (p["likes"] / mean if mean > 0 else 0)
+        for p in posts if (p.get("likes") or 0) > threshold
+    }
+
+
+def _scraper(store):
+    scraper = TwitterScraper.__new__(TwitterScraper)
+    scraper.supabase = store
+    scraper.platform_id = "twitter"
+    return scraper
+
+
+def test_bulk_outliers_match_per_account_reference(monkeypatch):
+    monkeypatch.setattr(twitter, "PAGE_SIZE", 100)
+    monkeypatch.setattr(twitter, "ACCOUNT_ID_CHUNK_SIZE", 5)
+    rng = random.Random(3)
+    accounts = [f"acct-{i:02d}" for i in range(15)]
+    posts = []
+    for account_id in accounts:
+        for j in range(rng.randint(0, 60)):
+            likes = rng.choice([None, 0, int(rng.lognormvariate(3, 1)), int(rng.lognormvariate(7, 1))])
+            posts.append({"id": f"{account_id}-{j:03d}", "account_id": account_id, "likes": likes})
+    store = FakeStore({"posts": posts})
+
+    result = _scraper(store)._calculate_outliers_bulk(accounts)
+
+    flagged = {}
+    for account_id in accounts:
+        expected = _reference_outliers(sorted(
+            (p for p in posts if p["account_id"] == account_id), key=lambda p: p["id"]
+        ))
+        assert sorted(result[account_id]) == sorted(expected)
+        flagged.update(expected)
+
+    assert any(result.values())
+    upserted = {row["post_id"]: row["outlier_score"] for _, rows in store.upserts for row in rows}
+    assert upserted == pytest.approx(flagged)
+    assert len(store.upserts) == 1  # one chunk for all accounts
+    assert set(store.selects) == {"id, account_id, likes"}
+    assert 3 < store.reads < len(accounts)  # 3 account chunks, some paginated
+
+
+def test_single_account_wrapper_and_empty_accounts():
+    posts = [{"id": f"p{i:02d}", "account_id": "a", "likes": 10} for i in range(20)]
+    posts.append({"id": "p99", "account_id": "a", "likes": 10_000})
+    store = FakeStore({"posts": posts})
+    scraper = _scraper(store)
+
+    assert scraper._calculate_outliers("a") == ["p99"]
+    assert scraper._calculate_outliers_bulk(["missing"]) == {"missing": []}
+
+
+def test_project_accounts_filtered_to_platform_in_one_query():
+    store = FakeStore({"project_accounts": [
+        {"project_id": "proj", "accounts": {"id": "1", "platform_id": "twitter", "platform_username": "a"}},
+        {"project_id": "proj", "accounts": {"id": "2", "platform_id": "tiktok", "platform_username": "b"}},
+        {"project_id": "proj", "accounts": None},
+    ]})
+    for row in store.data["project_accounts"]:
+        row["id"] = row["accounts"]["id"] if row["accounts"] else "0"
+
+    accounts = _scraper(store)._get_project_accounts("proj")
+
+    assert accounts == [{"id": "1", "platform_id": "twitter", "platform_username": "a"}]
+    assert store.reads == 1
@@ -0,0 +1,91 @@
+"""Tests for the cached usage counters behind UsageLimitService.enforce_limit.
+
+A fake Supabase client counts queries so the tests can check that the
+limit check only hits the database to seed or reconcile a counter.
+"""
+from unittest.mock import MagicMock
+
+import pytest
+
+from viraltracker.services.usage_limit_service import (
+    LimitType,
+    UsageCounterCache,
+    UsageLimitExceeded,
+    UsageLimitService,
+)
+
+
+def _service(limit_value=10.0, seeded_cost=4.0, ttl=60.0):
+    client = MagicMock()
+    limit_chain = client.table.return_value.select.return_value.eq.return_value.eq.return_value.single.return_value
+    limit_chain.execute.return_value.data = {
+        "limit_type": LimitType.MONTHLY_COST,
+        "limit_value": limit_value,
+        "period": "monthly",
+        "alert_threshold": 0.8,
+        "enabled": True,
+    }
+    client.rpc.return_value.execute.return_value.data = seeded_cost
+    counters = UsageCounterCache(ttl_seconds=ttl)
+    return UsageLimitService(client, counters=counters), client, counters
+
+
+def test_enforce_limit_seeds_once_then_reads_cache():
+    service, client, _ = _service()
+
+    for _ in range(5):
+        service.enforce_limit("org-1", LimitType.MONTHLY_COST)
+
+    assert client.rpc.call_count == 1
+    assert client.rpc.call_args[0][0] == "sum_token_usage"
+    assert client.table.call_count == 1  # limit config fetched once too
+
+
+def test_recorded_usage_bumps_counter_until_exceeded():
+    service, client, counters = _service(limit_value=10.0, seeded_cost=4.0)
+    service.enforce_limit("org-1", LimitType.MONTHLY_COST)
+
+    counters.record("org-1", {"cost_usd": 5.0, "input_tokens": 10, "output_tokens": 5})
+    counters.record("org-2", {"cost_usd": 100.0})
+    service.enforce_limit("org-1", LimitType.MONTHLY_COST)
+
+    counters.record("org-1", {"cost_usd": 1.5})
+    with pytest.raises(UsageLimitExceeded) as exc:
+        service.enforce_limit("org-1", LimitType.MONTHLY_COST)
+    assert exc.value.current_usage == pytest.approx(10.5)
+    assert client.rpc.call_count == 1
+
+
+def test_stale_counter_is_reconciled_from_db():
+    service, client, counters = _service(ttl=0.0)
+    service.enforce_limit("org-1", LimitType.MONTHLY_COST)
+    counters.record("org-1", {"cost_usd": 100.0})
+
+    service.enforce_limit("org-1", LimitType.MONTHLY_COST)
+
+    assert client.rpc.call_count == 2
+
+
+def test_set_limit_invalidates_cached_config():
+    service, client, _ = _service()
+    service.enforce_limit("org-1", LimitType.MONTHLY_COST)
+
+    service.set_limit("org-1", LimitType.MONTHLY_COST, 20.0)
+    service.enforce_limit("org-1", LimitType.MONTHLY_COST)
+
+    assert client.rpc.call_count == 2
+
+
+def test_seed_failure_fails_open_and_is_not_cached():
+    service, client, _ = _service()
+    client.rpc.side_effect = RuntimeError("rpc down")
+    client.table.return_value.select.return_value.eq.return_value.gte.return_value.execute.side_effect = (
+        RuntimeError("db down")
+    )
+
+    service.enforce_limit("org-1", LimitType.MONTHLY_COST)
+
+    client.rpc.side_effect = None
+    client.rpc.return_value.execute.return_value.data = 50.0
+    with pytest.raises(UsageLimitExceeded):
+        service.enforce_limit("org-1", LimitType.MONTHLY_COST)
@@ -0,0 +1,171 @@
+"""Tests for UsageWriteBuffer - write-behind batching of token_usage rows.
+
+A fake Supabase client records every bulk insert (and can be switched to
+raise, to stand in for an unreachable DB). Threads are left off so flushes
+happen only where the test calls them, except in the interval test.
+"""
+import json
+import os
+import time
+
+import pytest
+
+from viraltracker.services.usage_tracker import UsageRecord, UsageTracker
+from viraltracker.services.usage_write_buffer import UsageWriteBuffer
+
+
+class FakeClient:
+    def __init__(self):
+        self.batches = []
+        self.down = False
+        self.on_execute = None
+
+    def table(self, name):
+        assert name == "token_usage"
+        return self
+
+    def insert(self, rows):
+        self._pending = rows
+        return self
+
+    def execute(self):
+        if self.down:
+            raise ConnectionError("db unreachable")
+        self.batches.append(list(self._pending))
+        if self.on_execute:
+            self.on_execute()
+
+
+@pytest.fixture
+def client():
+    return FakeClient()
+
+
+def _buffer(client, tmp_path, **kw):
+    kw.setdefault("start_thread", False)
+    return UsageWriteBuffer(
+        client_factory=lambda: client,
+        spill_path=str(tmp_path / "spill.jsonl"),
+        **kw,
+    )
+
+
+def _row(i):
+    return {"organization_id": "org", "provider": "google", "model": "m", "input_tokens": i}
+
+
+def test_flush_batches_by_max_batch(client, tmp_path):
+    buf = _buffer(client, tmp_path, max_batch=3)
+    for i in range(7):
+        buf.enqueue(_row(i))
+
+    assert buf.flush() == 7
+    assert [len(b) for b in client.batches] == [3, 3, 1]
+    assert [r["input_tokens"] for b in client.batches for r in b] == list(range(7))
+    assert all(r["created_at"] for b in client.batches for r in b)
+    stats = buf.stats()
+    assert stats["queue_depth"] == 0
+    assert stats["max_queue_depth"] == 7
+    assert stats["flushed"] == 7
+    assert stats["flushes"] == 3
+
+
+def test_background_thread_flushes_on_interval(client, tmp_path):
+    buf = _buffer(client, tmp_path, flush_interval=0.05, start_thread=True)
+    buf.enqueue(_row(1))
+
+    deadline = time.time() + 2
+    while not client.batches and time.time() < deadline:
+        time.sleep(0.01)
+    buf.drain(timeout=1)
+
+    assert client.batches == [[{**_row(1), "created_at": client.batches[0][0]["created_at"]}]]
+
+
+def test_failed_flush_spills_and_replays(client, tmp_path):
+    buf = _buffer(client, tmp_path, max_batch=2)
+    client.down = True
+    for i in range(3):
+        buf.enqueue(_row(i))
+
+    assert buf.flush() == 0
+    spill = tmp_path / "spill.jsonl"
+    assert [json.loads(line)["input_tokens"] for line in spill.read_text().splitlines()] == [0, 1, 2]
+    assert buf.stats()["spilled"] == 3
+
+    client.down = False
+    buf.enqueue(_row(3))
+    assert buf.flush() == 4
+    assert not spill.exists()
+    assert [r["input_tokens"] for b in client.batches for r in b] == [0, 1, 2, 3]
+    assert buf.stats()["replayed"] == 3
+
+
+def test_rows_spilled_during_replay_are_kept(client, tmp_path):
+    buf = _buffer(client, tmp_path, max_queue=0)  # every enqueue spills
+    buf.enqueue(_row(0))
+    buf.enqueue(_row(1))
+
+    def spill_mid_replay():
+        client.on_execute = None
+        buf.enqueue(_row(2))
+
+    client.on_execute = spill_mid_replay
+    assert buf.flush() == 2
+    assert buf.flush() == 1
+    assert [r["input_tokens"] for b in client.batches for r in b] == [0, 1, 2]
+    assert not buf._has_spill()
+
+
+def test_flush_usage_write_buffer_only_when_created(client, tmp_path, monkeypatch):
+    from viraltracker.services import usage_write_buffer
+
+    monkeypatch.setattr(usage_write_buffer, "_buffer", None)
+    assert usage_write_buffer.flush_usage_write_buffer() == 0
+
+    buf = _buffer(client, tmp_path)
+    buf.enqueue(_row(1))
+    monkeypatch.setattr(usage_write_buffer, "_buffer", buf)
+    assert usage_write_buffer.flush_usage_write_buffer() == 1
+    assert len(client.batches) == 1
+
+
+def test_default_spill_path_is_absolute():
+    from viraltracker.services.usage_write_buffer import DEFAULT_SPILL_PATH
+
+    assert os.path.isabs(DEFAULT_SPILL_PATH)
+
+
+def test_queue_overflow_spills_instead_of_growing(client, tmp_path):
+    buf = _buffer(client, tmp_path, max_queue=2)
+    for i in range(4):
+        buf.enqueue(_row(i))
+
+    assert len(buf) == 2
+    assert buf.stats()["spilled"] == 2
+
+
+def test_drain_writes_everything_left(client, tmp_path):
+    buf = _buffer(client, tmp_path)
+    buf.enqueue(_row(1))
+    buf.enqueue(_row(2))
+
+    assert buf.drain() == 2
+    assert len(buf) == 0
+    assert buf.drain() == 0
+
+
+def test_tracker_enqueues_instead_of_inserting(client, tmp_path):
+    buf = _buffer(client, tmp_path)
+    direct = FakeClient()
+    tracker = UsageTracker(direct, write_buffer=buf)
+
+    tracker.track("user", "org", UsageRecord(provider="google", model="m", input_tokens=5))
+    tracker.track("user", "all", UsageRecord(provider="google", model="m"))
+
+    assert direct.batches == []
+    assert len(buf) == 1
+    buf.flush()
+    row = client.batches[0][0]
+    assert row["organization_id"] == "org"
+    assert row["input_tokens"] == 5
@@ -0,0 +1,117 @@
+"""Tests for core/vector_ops.py.
+
+Run with: pytest tests/test_vector_ops.py -v
+"""
+from __future__ import annotations
+
+import math
+
+import numpy as np
+import pytest
+
+from viraltracker.core import vector_ops
+from viraltracker.core.embeddings import cosine_similarity, embedding_similarity, parse_embedding
+
+
+def _reference_cosine(a, b):
+    dot = sum(x * y for x, y in zip(a, b))
+    na = math.sqrt(sum(x * x for x in a))
+    nb = math.sqrt(sum(y * y for y in b))
+    return dot / (na * nb) if na and nb else 0.0
+
+
+class TestParseVector:
+    def test_pgvector_string(self):
+        vec = vector_ops.parse_vector("[0.5,-1.25,3]")
+        assert vec.dtype == np.float32
+        assert vec.tolist() == [0.5, -1.25, 3.0]
+
+    def test_json_string_with_spaces(self):
+        assert vector_ops.parse_vector(" [0.5, 1.0] ").tolist() == [0.5, 1.0]
+
+    def test_list_and_array(self):
+        assert vector_ops.parse_vector([1, 2]).tolist() == [1.0, 2.0]
+        assert vector_ops.parse_vector(np.array([1.0, 2.0])).dtype == np.float32
+
+    @pytest.mark.parametrize("raw", [None, "", "[]", "not a vector", "[1,a]", [], 3.0, {"a": 1}])
+    def test_unusable_values(self, raw):
+        assert vector_ops.parse_vector(raw) is None
+
+    def test_parse_embedding_keeps_list_contract(self):
+        assert parse_embedding("[0.5,0.25]") == [0.5, 0.25]
+        raw = [0.1, 0.2]
+        assert parse_embedding(raw) is raw
+        assert parse_embedding("garbage") is None
+
+
+class TestCosine:
+    def test_matches_reference(self):
+        rng = np.random.default_rng(0)
+        a, b = rng.normal(size=768).tolist(), rng.normal(size=768).tolist()
+        assert vector_ops.cosine(a, b) == pytest.approx(_reference_cosine(a, b), abs=1e-6)
+        assert cosine_similarity(a, b) == pytest.approx(_reference_cosine(a, b), abs=1e-6)
+
+    def test_zero_vector(self):
+        assert vector_ops.cosine([0.0, 0.0], [1.0, 0.0]) == 0.0
+
+    def test_dimension_mismatch(self):
+        with pytest.raises(ValueError):
+            vector_ops.cosine([1.0, 0.0], [1.0, 0.0, 0.0])
+
+    def test_batch_and_matrix_agree_with_pairs(self):
+        rng = np.random.default_rng(1)
+        a = rng.normal(size=(5, 16)).astype(np.float32)
+        b = rng.normal(size=(7, 16)).astype(np.float32)
+        pairs = np.array([[_reference_cosine(x, y) for y in b] for x in a])
+
+        np.testing.assert_allclose(vector_ops.cosine_matrix(a, b), pairs, atol=1e-6)
+        np.testing.assert_allclose(vector_ops.cosine_batch(a[0], b), pairs[0], atol=1e-6)
+        # Input matrix is not modified
+        assert not np.allclose(np.linalg.norm(b, axis=1), 1.0)
+
+    def test_embedding_similarity_falls_back_to_jaccard(self):
+        assert embedding_similarity("a b", "a c", "[1,0]", "[1,0]") == pytest.approx(1.0)
+        assert embedding_similarity("a b", "a c", None, "[1,0]") == pytest.approx(1 / 3)
+
+
+class TestStack:
+    def test_mask_and_dimension(self):
+        matrix, mask = vector_ops.stack([None, "[1,2]", [3.0, 4.0, 5.0], [6.0, 7.0]])
+        assert matrix.shape == (4, 2)
+        assert mask.tolist() == [False, True, False, True]
+        assert matrix[0].tolist() == [0.0, 0.0]
+
+    def test_empty(self):
+        matrix, mask = vector_ops.stack([])
+        assert matrix.shape == (0, 0)
+        assert mask.size == 0
+
+
+class TestTopK:
+    def test_best_first_with_stable_ties(self):
+        scores = np.array([0.2, 0.9, 0.5, 0.9, 0.1])
+        assert vector_ops.top_k(scores, 3).tolist() == [1, 3, 2]
+        assert vector_ops.top_k(scores, 10).tolist() == [1, 3, 2, 0, 4]
+        assert vector_ops.top_k(scores, 0).tolist() == []
+
+
+class TestCentroids:
+    def test_centroid_is_normalized_mean(self):
+        c = vector_ops.centroid(["[2,0]", [0.0, 2.0], None])
+        np.testing.assert_allclose(c, [math.sqrt(0.5)] * 2, rtol=1e-6)
+        assert vector_ops.centroid([None]) is None
+
+    def test_incremental_update_matches_full_recompute(self):
+        rng = np.random.default_rng(2)
+        vectors = rng.normal(size=(6, 32)).astype(np.float32)
+        running = None
+        for n, vec in enumerate(vectors):
+            running = vector_ops.update_centroid(running, n, vec)
+        # The incremental form averages normalized centroids, so compare
+        # against the same recurrence done in float64.
+        expected = vectors[0] / np.linalg.norm(vectors[0])
+        for n, vec in enumerate(vectors[1:], start=1):
+            expected = (expected * n + vec) / (n + 1)
+            expected /= np.linalg.norm(expected)
+        np.testing.assert_allclose(running, expected, rtol=1e-5)
+        assert np.linalg.norm(running) == pytest.approx(1.0, abs=1e-6)
@@ -0,0 +1,143 @@
+"""
+Tests for the process-wide UI lookup cache and the ui.utils lookups built on it.
+
+All database calls are mocked — no real DB or API connections needed.
+"""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from viraltracker.ui import lookup_cache
+from viraltracker.ui.lookup_cache import LookupCache
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    """Fresh process cache for each test."""
+    fresh = LookupCache()
+    monkeypatch.setattr(lookup_cache, "_lookup_cache", fresh)
+    return fresh
+
+
+class TestLookupCache:
+    def test_hit_after_miss(self, cache):
+        loader = MagicMock(return_value=[{"id": "b1"}])
+        assert cache.get(lookup_cache.BRANDS, "org-1", loader) == [{"id": "b1"}]
+        assert cache.get(lookup_cache.BRANDS, "org-1", loader) == [{"id": "b1"}]
+        assert loader.call_count == 1
+        stats = cache.stats()[lookup_cache.BRANDS]
+        assert (stats["hits"], stats["misses"], stats["hit_rate"], stats["entries"]) == (1, 1, 0.5, 1)
+
+    def test_expired_entry_reloads(self):
+        cache = LookupCache(ttl_seconds=0)
+        loader = MagicMock(return_value=True)
+        cache.get(lookup_cache.SUPERUSER, "u1", loader)
+        cache.get(lookup_cache.SUPERUSER, "u1", loader)
+        assert loader.call_count == 2
+
+    def test_returned_values_are_copies(self, cache):
+        cache.get(lookup_cache.BRANDS, "org-1", lambda: [{"id": "b1", "name": "A"}])
+        brands = cache.get(lookup_cache.BRANDS, "org-1", lambda: [])
+        brands[0]["name"] = "mutated"
+        brands.append({"id": "x"})
+        assert cache.get(lookup_cache.BRANDS, "org-1", lambda: []) == [{"id": "b1", "name": "A"}]
+
+    def test_loader_errors_are_not_cached(self, cache):
+        with pytest.raises(RuntimeError):
+            cache.get(lookup_cache.SUPERUSER, "u1", MagicMock(side_effect=RuntimeError("down")))
+        assert cache.get(lookup_cache.SUPERUSER, "u1", lambda: True) is True
+
+    def test_invalidate_scope_keeps_other_scopes(self, cache):
+        cache.get(lookup_cache.FEATURES, ("org-1", "ads"), lambda: True)
+        cache.get(lookup_cache.FEATURES, ("org-1", "seo"), lambda: True)
+        cache.get(lookup_cache.FEATURES, ("org-2", "ads"), lambda: True)
+        cache.get(lookup_cache.PRODUCTS, "brand-1", lambda: [])
+
+        lookup_cache.invalidate_features("org-1")
+
+        stats = cache.stats()
+        assert stats[lookup_cache.FEATURES]["entries"] == 1
+        assert stats[lookup_cache.PRODUCTS]["entries"] == 1
+
+    def test_invalidate_all(self, cache):
+        cache.get(lookup_cache.BRANDS, "org-1", lambda: [])
+        cache.get(lookup_cache.PRODUCTS, "brand-1", lambda: [])
+        cache.invalidate()
+        assert all(s["entries"] == 0 for s in cache.stats().values())
+
+
+class TestUtilsLookups:
+    @pytest.fixture
+    def db(self):
+        db = MagicMock()
+        with patch("viraltracker.core.database.get_supabase_client", return_value=db):
+            yield db
+
+    def test_get_brands_cached_per_org(self, cache, db):
+        from viraltracker.ui.utils import get_brands
+
+        query = db.table.return_value.select.return_value
+        query.eq.return_value.order.return_value.execute.return_value.data = [{"id": "b1"}]
+
+        assert get_brands("org-1") == [{"id": "b1"}]
+        assert get_brands("org-1") == [{"id": "b1"}]
+        assert query.eq.call_count == 1
+
+        lookup_cache.invalidate_brands()
+        get_brands("org-1")
+        assert query.eq.call_count == 2
+
+    def test_get_products_invalidated_per_brand(self, cache, db):
+        from viraltracker.ui.utils import get_products_for_brand
+
+        get_products_for_brand("brand-1")
+        get_products_for_brand("brand-2")
+        lookup_cache.invalidate_products("brand-1")
+        get_products_for_brand("brand-1")
+        get_products_for_brand("brand-2")
+        assert db.table.call_count == 3
+
+    def test_has_feature_reuses_lookup_across_calls(self, cache, db):
+        from viraltracker.ui.utils import has_feature
+
+        execute = db.table.return_value.select.return_value.eq.return_value.eq.return_value.limit.return_value.execute
+        execute.return_value.data = [{"enabled": True}]
+
+        assert has_feature("ad_creator", "org-1")
+        assert has_feature("ad_creator", "org-1")
+        assert has_feature("ad_creator", "all")
+        assert execute.call_count == 1
+        db.table.assert_called_with("org_features")
+
+    def test_has_feature_unconfigured_is_cached_as_disabled(self, cache, db):
+        from viraltracker.ui.utils import has_feature
+
+        execute = db.table.return_value.select.return_value.eq.return_value.eq.return_value.limit.return_value.execute
+        execute.return_value.data = []
+
+        assert has_feature("ad_creator", "org-1") is False
+        assert has_feature("ad_creator", "org-1") is False
+        assert execute.call_count == 1
+
+    def test_has_feature_failure_not_cached(self, cache, db):
+        from viraltracker.ui.utils import has_feature
+
+        execute = db.table.return_value.select.return_value.eq.return_value.eq.return_value.limit.return_value.execute
+        execute.side_effect = [RuntimeError("timeout"), MagicMock(data=[{"enabled": True}])]
+
+        assert has_feature("ad_creator", "org-1") is False
+        assert has_feature("ad_creator", "org-1") is True
+        assert has_feature("ad_creator", "org-1") is True
+        assert execute.call_count == 2
+
+    def test_is_superuser_failure_not_cached(self, cache, db):
+        from viraltracker.ui.utils import is_superuser
+
+        execute = db.table.return_value.select.return_value.eq.return_value.single.return_value.execute
+        execute.side_effect = [RuntimeError("timeout"), MagicMock(data={"is_superuser": True})]
+
+        assert is_superuser("u1") is False
+        assert is_superuser("u1") is True
+        assert is_superuser("u1") is True
+        assert execute.call_count == 2
@@ -72,6 +72,12 @@ class Config:
     MAX_CONCURRENT_DOWNLOADS: int = int(os.getenv('MAX_CONCURRENT_DOWNLOADS', '3'))
     CHUNK_SIZE_FOR_DB_OPS: int = int(os.getenv('CHUNK_SIZE_FOR_DB_OPS', '1000'))
 
+    # Local on-disk caches (SQLite stores, spill files). Always absolute, so
+    # cache files don't depend on the working directory.
+    CACHE_DIR: str = os.path.abspath(os.path.expanduser(
+        os.getenv('VIRALTRACKER_CACHE_DIR') or str(Path(__file__).resolve().parents[2] / 'cache')
+    ))
+
     @classmethod
     def validate(cls) -> bool:
         """Validate required configuration"""
@@ -0,0 +1,254 @@
+"""
+Content-addressed embedding cache.
+
+Embeddings are keyed by (model, dimensions, task_type, text hash), so the same
+text embedded with a different model or task type is a separate entry. Vectors
+are stored as packed float32 — 3 KB per 768-dim vector instead of ~15 KB of
+indented JSON.
+
+Two stores implement the same interface:
+- SQLiteEmbeddingCache: persistent, shared by every process on the host.
+- InMemoryEmbeddingCache: per-process, for tests and short-lived jobs.
+
+Both are LRU-capped and do batch lookups, so Embedder.embed_texts only sends
+cache misses to the API.
+
+Usage:
+    cache = SQLiteEmbeddingCache(os.path.join(Config.CACHE_DIR, "embeddings.sqlite3"), max_entries=200_000)
+    embedder = Embedder(cache=cache)
+    embedder.embed_texts(texts)
+    cache.stats()  # {"hits": ..., "misses": ..., "hit_rate": ..., "entries": ...}
+"""
+
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from array import array
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional
+
+from viraltracker.core.config import Config
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_ENTRIES = 200_000
+
+# SQLite's default host-parameter limit is 999 on older builds
+_SQLITE_IN_CHUNK = 500
+
+
+def embedding_cache_key(model: str, dimensions: int, task_type: str, text: str) -> str:
+    """Cache key for one embedding request (text hashed with SHA256)."""
+    text_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+    return f"{model}:{dimensions}:{task_type}:{text_hash}"
+
+
+def _pack(vec: List[float]) -> bytes:
+    return array("f", vec).tobytes()
+
+
+def _unpack(blob: bytes) -> List[float]:
+    vec = array("f")
+    vec.frombytes(blob)
+    return vec.tolist()
+
+
+class EmbeddingCache(ABC):
+    """
+    Base class for embedding caches.
+
+    Subclasses implement _get_many/_set_many/__len__; this class keeps the
+    hit/miss counters so every store reports them the same way.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._stats_lock = threading.Lock()
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, List[float]]:
+        """Look up many keys at once. Returns only the keys that were found."""
+        keys = list(dict.fromkeys(keys))
+        if not keys:
+            return {}
+        found = self._get_many(keys)
+        with self._stats_lock:
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+        return found
+
+    def set_many(self, items: Dict[str, List[float]]) -> None:
+        """Store many vectors at once, evicting least-recently-used entries."""
+        if items:
+            self._set_many(items)
+
+    def stats(self) -> Dict[str, float]:
+        """Hit/miss counters plus current size."""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits / total) if total else 0.0,
+            "entries": len(self),
+            "max_entries": self.max_entries,
+        }
+
+    @abstractmethod
+    def _get_many(self, keys: List[str]) -> Dict[str, List[float]]:
+        """Look up deduplicated keys; return the ones found."""
+
+    @abstractmethod
+    def _set_many(self, items: Dict[str, List[float]]) -> None:
+        """Store vectors, evicting down to max_entries."""
+
+    @abstractmethod
+    def __len__(self) -> int:
+        """Number of stored entries."""
+
+
+class InMemoryEmbeddingCache(EmbeddingCache):
+    """Per-process LRU cache of packed float32 vectors."""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        super().__init__(max_entries)
+        self._data: "OrderedDict[str, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get_many(self, keys: List[str]) -> Dict[str, List[float]]:
+        found = {}
+        with self._lock:
+            for key in keys:
+                blob = self._data.get(key)
+                if blob is not None:
+                    self._data.move_to_end(key)
+                    found[key] = _unpack(blob)
+        return found
+
+    def _set_many(self, items: Dict[str, List[float]]) -> None:
+        with self._lock:
+            for key, vec in items.items():
+                self._data[key] = _pack(vec)
+                self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class SQLiteEmbeddingCache(EmbeddingCache):
+    """
+    Persistent LRU cache in a single SQLite file.
+
+    WAL mode lets several worker processes share the file. Recency is tracked
+    per row and the oldest rows are evicted once max_entries is exceeded.
+    """
+
+    def __init__(self, path: str, max_entries: int = DEFAULT_MAX_ENTRIES):
+        super().__init__(max_entries)
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings ("
+                " key TEXT PRIMARY KEY,"
+                " vec BLOB NOT NULL,"
+                " last_used INTEGER NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_embeddings_last_used ON embeddings(last_used)"
+            )
+            self._conn.commit()
+
+    def _get_many(self, keys: List[str]) -> Dict[str, List[float]]:
+        found = {}
+        now = time.time_ns()
+        try:
+            with self._lock:
+                for i in range(0, len(keys), _SQLITE_IN_CHUNK):
+                    chunk = keys[i:i + _SQLITE_IN_CHUNK]
+                    placeholders = ",".join("?" * len(chunk))
+                    rows = self._conn.execute(
+                        f"SELECT key, vec FROM embeddings WHERE key IN ({placeholders})",
+                        chunk,
+                    ).fetchall()
+                    for key, blob in rows:
+                        found[key] = _unpack(blob)
+                    if rows:
+                        self._conn.execute(
+                            f"UPDATE embeddings SET last_used = ? "
+                            f"WHERE key IN ({','.join('?' * len(rows))})",
+                            [now] + [key for key, _ in rows],
+                        )
+                self._conn.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Embedding cache read failed ({self.path}): {e}")
+        return found
+
+    def _set_many(self, items: Dict[str, List[float]]) -> None:
+        now = time.time_ns()
+        try:
+            with self._lock:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO embeddings (key, vec, last_used) VALUES (?, ?, ?)",
+                    [(key, _pack(vec), now) for key, vec in items.items()],
+                )
+                overflow = self._count() - self.max_entries
+                if overflow > 0:
+                    self._conn.execute(
+                        "DELETE FROM embeddings WHERE key IN ("
+                        " SELECT key FROM embeddings ORDER BY last_used ASC, rowid ASC LIMIT ?)",
+                        (overflow,),
+                    )
+                self._conn.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Embedding cache write failed ({self.path}): {e}")
+
+    def _count(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._count()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def default_embedding_cache(cache_dir: Optional[str] = None) -> Optional[EmbeddingCache]:
+    """
+    Persistent cache used by Embedder when none is passed.
+
+    The file lives in cache_dir, defaulting to Config.CACHE_DIR (absolute;
+    set VIRALTRACKER_CACHE_DIR to move it). Set EMBEDDING_CACHE=off to
+    disable, EMBEDDING_CACHE_MAX_ENTRIES to change the LRU cap. Falls back to
+    no cache if the file can't be opened.
+    """
+    if os.getenv("EMBEDDING_CACHE", "").lower() in ("0", "off", "false", "none"):
+        return None
+    raw_max = os.getenv("EMBEDDING_CACHE_MAX_ENTRIES")
+    try:
+        max_entries = int(raw_max) if raw_max else DEFAULT_MAX_ENTRIES
+    except ValueError:
+        logger.warning(
+            f"EMBEDDING_CACHE_MAX_ENTRIES={raw_max!r} is not an int; using default {DEFAULT_MAX_ENTRIES}"
+        )
+        max_entries = DEFAULT_MAX_ENTRIES
+    cache_dir = os.path.abspath(cache_dir or Config.CACHE_DIR)
+    try:
+        return SQLiteEmbeddingCache(os.path.join(cache_dir, "embeddings.sqlite3"), max_entries)
+    except sqlite3.Error as e:
+        logger.warning(f"Embedding cache unavailable in {cache_dir}: {e}")
+        return None
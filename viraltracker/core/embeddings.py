@@ -7,18 +7,27 @@ Used for taxonomy matching, semantic similarity, and SEO keyword matching.
 
 import os
 import json
-import math
 import time
+import asyncio
 import logging
-from pathlib import Path
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass, field
-from typing import List, Optional, Dict
+from typing import Callable, List, Optional, Dict, Tuple
 import hashlib
 
+import numpy as np
 from google import genai
 from google.genai import types
 
+from viraltracker.core.embedding_cache import (
+    EmbeddingCache,
+    default_embedding_cache,
+    embedding_cache_key,
+)
 from viraltracker.core.genai_client import make_genai_client
+from viraltracker.core import vector_ops
+from viraltracker.core.rate_limit import TokenBucket, backoff_delay
 
 logger = logging.getLogger(__name__)
 
@@ -27,30 +36,58 @@ EMBED_MODEL = "gemini-embedding-001"
 EMBED_MODEL_V2 = "gemini-embedding-2-preview"
 EMBED_DIM = 768
 
+# Gemini allows up to 100 texts per embed_content request
+EMBED_BATCH_SIZE = 100
+
+# embed_texts_concurrent defaults: batches in flight and request quota
+DEFAULT_EMBED_CONCURRENCY = 4
+DEFAULT_EMBED_RPM = 300
+
+# One bucket per (model, rpm) so every Embedder in the process shares the quota
+_rate_limiters: Dict[Tuple[str, float], TokenBucket] = {}
+_rate_limiters_lock = threading.Lock()
+
+
+def _shared_rate_limiter(model: str, requests_per_minute: float) -> TokenBucket:
+    with _rate_limiters_lock:
+        key = (model, requests_per_minute)
+        if key not in _rate_limiters:
+            _rate_limiters[key] = TokenBucket.per_minute(requests_per_minute)
+        return _rate_limiters[key]
+
 
 def _normalize(vec: List[float]) -> List[float]:
     """L2-normalize a vector. Required for Gemini Embedding 2 at non-3072 dims."""
-    norm = math.sqrt(sum(x * x for x in vec))
-    return [x / norm for x in vec] if norm > 0 else vec
+    return vector_ops.normalize(vec).tolist()
 
 
 @dataclass
 class Embedder:
     """
-    Text embedding generator using Gemini API with JSON caching.
+    Text embedding generator using Gemini API with a persistent embedding cache.
 
     Attributes:
         provider: Embedding provider (default: "gemini")
         api_key: API key for the provider
-        cache_dir: Directory for caching embeddings (default: ./cache)
+        cache_dir: Directory of the default SQLite embedding cache
+            (default: Config.CACHE_DIR)
         model: Gemini model ID (default: gemini-embedding-001)
         dimensions: Output dimensionality (default: 768)
+        cache: Embedding cache (default: SQLite store in cache_dir; see
+            core/embedding_cache.py). Pass use_cache=False to bypass it.
+        use_cache: Whether to consult/populate the cache
+        max_concurrency: Batches kept in flight by embed_texts_concurrent
+        requests_per_minute: Request quota shared by all embedders of this model
     """
     provider: str = "gemini"
     api_key: Optional[str] = None
-    cache_dir: str = "cache"
+    cache_dir: Optional[str] = None
     model: str = EMBED_MODEL
     dimensions: int = EMBED_DIM
+    cache: Optional[EmbeddingCache] = None
+    use_cache: bool = True
+    max_concurrency: int = DEFAULT_EMBED_CONCURRENCY
+    requests_per_minute: float = DEFAULT_EMBED_RPM
 
     def __post_init__(self):
         """Initialize API client"""
@@ -63,8 +100,12 @@ class Embedder:
         # Create Gemini client
         self.client = make_genai_client(self.api_key)
 
-        # Ensure cache directory exists
-        Path(self.cache_dir).mkdir(parents=True, exist_ok=True)
+        if not self.use_cache:
+            self.cache = None
+        elif self.cache is None:
+            self.cache = default_embedding_cache(self.cache_dir)
+
+        self._rate_limiter = _shared_rate_limiter(self.model, self.requests_per_minute)
 
         # Gemini Embedding 2 at non-3072 dims requires L2 normalization
         self._needs_normalize = (
@@ -75,6 +116,10 @@ class Embedder:
         """
         Embed multiple texts in a batch.
 
+        Texts already in the cache (same model, dimensions and task type) are
+        served from it; only the misses — deduplicated — are sent to the API,
+        and their vectors are written back to the cache.
+
         Args:
             texts: List of text strings to embed
             task_type: Task type for embedding
@@ -82,13 +127,93 @@ class Embedder:
         Returns:
             List of embedding vectors
         """
+        return self._embed_with_cache(texts, task_type, self._embed_uncached)
+
+    def embed_texts_concurrent(
+        self,
+        texts: List[str],
+        task_type: str = "RETRIEVAL_DOCUMENT",
+        max_concurrency: Optional[int] = None,
+        max_attempts: int = 3,
+    ) -> List[List[float]]:
+        """
+        Embed many texts with several 100-text batches in flight at once.
+
+        Same cache behaviour and return order as embed_texts. Each request
+        takes a token from the rate limiter shared by all embedders of this
+        model, so throughput follows the quota rather than round-trip latency.
+        A failed batch is retried on its own, with jittered backoff, without
+        holding up the other batches.
+
+        Args:
+            texts: List of text strings to embed
+            task_type: Task type for embedding
+            max_concurrency: Batches in flight (default: self.max_concurrency)
+            max_attempts: Attempts per batch before giving up
+
+        Returns:
+            List of embedding vectors, in input order
+
+        Raises:
+            Exception: The last error of a batch that failed every attempt
+        """
+        workers = max_concurrency or self.max_concurrency
+        return self._embed_with_cache(
+            texts, task_type,
+            lambda missing, task: self._embed_batches_concurrent(missing, task, workers, max_attempts),
+        )
+
+    async def embed_texts_async(
+        self,
+        texts: List[str],
+        task_type: str = "RETRIEVAL_DOCUMENT",
+        max_concurrency: Optional[int] = None,
+    ) -> List[List[float]]:
+        """embed_texts_concurrent without blocking the event loop."""
+        return await asyncio.to_thread(
+            self.embed_texts_concurrent, texts, task_type, max_concurrency
+        )
+
+    def _embed_with_cache(
+        self,
+        texts: List[str],
+        task_type: str,
+        embed_fn: Callable[[List[str], str], List[List[float]]],
+    ) -> List[List[float]]:
+        """Serve texts from the cache and embed the distinct misses with embed_fn."""
         if not texts:
             return []
 
+        if self.cache is None:
+            return embed_fn(texts, task_type)
+
+        keys = [
+            embedding_cache_key(self.model, self.dimensions, task_type, text)
+            for text in texts
+        ]
+        vectors = self.cache.get_many(keys)
+
+        # One API slot per distinct missing text
+        missing: Dict[str, str] = {}
+        for key, text in zip(keys, texts):
+            if key not in vectors and key not in missing:
+                missing[key] = text
+
+        if missing:
+            logger.debug(f"Embedding cache: {len(texts) - len(missing)} hits, {len(missing)} misses")
+            fresh = embed_fn(list(missing.values()), task_type)
+            new_vectors = dict(zip(missing.keys(), fresh))
+            self.cache.set_many(new_vectors)
+            vectors.update(new_vectors)
+
+        return [vectors[key] for key in keys]
+
+    def _embed_uncached(self, texts: List[str], task_type: str) -> List[List[float]]:
+        """Embed texts via the API in 100-text batches, one at a time (no cache)."""
         try:
             # Batch embed with retry
             embeddings = []
-            batch_size = 100  # Gemini allows up to 100 texts per request
+            batch_size = EMBED_BATCH_SIZE
 
             for i in range(0, len(texts), batch_size):
                 batch = texts[i:i+batch_size]
@@ -96,21 +221,7 @@ class Embedder:
                 # Retry logic
                 for attempt in range(3):
                     try:
-                        result = self.client.models.embed_content(
-                            model=self.model,
-                            contents=batch,
-                            config=types.EmbedContentConfig(
-                                task_type=task_type,
-                                output_dimensionality=self.dimensions,
-                            )
-                        )
-
-                        for embedding_obj in result.embeddings:
-                            vec = embedding_obj.values
-                            if self._needs_normalize:
-                                vec = _normalize(vec)
-                            embeddings.append(vec)
-
+                        embeddings.extend(self._embed_batch(batch, task_type))
                         break  # Success, exit retry loop
 
                     except Exception as e:
@@ -130,6 +241,70 @@ class Embedder:
             logger.error(f"Error embedding texts: {e}")
             raise
 
+    def _embed_batch(self, batch: List[str], task_type: str) -> List[List[float]]:
+        """One embed_content request (at most EMBED_BATCH_SIZE texts)."""
+        result = self.client.models.embed_content(
+            model=self.model,
+            contents=batch,
+            config=types.EmbedContentConfig(
+                task_type=task_type,
+                output_dimensionality=self.dimensions,
+            )
+        )
+        vectors = []
+        for embedding_obj in result.embeddings:
+            vec = embedding_obj.values
+            if self._needs_normalize:
+                vec = _normalize(vec)
+            vectors.append(vec)
+        return vectors
+
+    def _embed_batch_with_retry(self, batch: List[str], task_type: str, max_attempts: int) -> List[List[float]]:
+        """Rate-limited request for one batch; retries only this batch on failure."""
+        for attempt in range(max_attempts):
+            self._rate_limiter.acquire()
+            try:
+                return self._embed_batch(batch, task_type)
+            except Exception as e:
+                if attempt == max_attempts - 1:
+                    logger.error(f"Failed to embed batch after {max_attempts} attempts: {e}")
+                    raise
+                delay = backoff_delay(attempt)
+                logger.warning(
+                    f"Embedding attempt {attempt + 1} failed ({e}), retrying batch in {delay:.1f}s..."
+                )
+                time.sleep(delay)
+
+    def _embed_batches_concurrent(
+        self, texts: List[str], task_type: str, max_concurrency: int, max_attempts: int
+    ) -> List[List[float]]:
+        """Embed texts in EMBED_BATCH_SIZE batches on a thread pool, keeping input order."""
+        batches = [texts[i:i + EMBED_BATCH_SIZE] for i in range(0, len(texts), EMBED_BATCH_SIZE)]
+        results: List[Optional[List[List[float]]]] = [None] * len(batches)
+
+        pool = ThreadPoolExecutor(
+            max_workers=max(1, min(max_concurrency, len(batches))),
+            thread_name_prefix="embed",
+        )
+        try:
+            futures = {
+                pool.submit(self._embed_batch_with_retry, batch, task_type, max_attempts): idx
+                for idx, batch in enumerate(batches)
+            }
+            for future in as_completed(futures):
+                results[futures[future]] = future.result()
+        except Exception:
+            # Don't start batches that are still queued once one has failed for good
+            pool.shutdown(wait=True, cancel_futures=True)
+            raise
+        pool.shutdown(wait=True)
+
+        return [vec for batch_vectors in results for vec in batch_vectors]
+
+    def cache_stats(self) -> Dict[str, float]:
+        """Embedding cache hit/miss counters (empty dict when caching is off)."""
+        return self.cache.stats() if self.cache is not None else {}
+
     def embed_text(self, text: str, task_type: str = "RETRIEVAL_DOCUMENT") -> List[float]:
         """
         Embed a single text string.
@@ -162,18 +337,18 @@ def create_seo_embedder() -> Embedder:
 
 
 def parse_embedding(raw) -> Optional[List[float]]:
-    """Parse embedding from Supabase — may be a list already or a JSON string."""
+    """
+    Parse embedding from Supabase — may be a list already or a pgvector string.
+
+    Returns a list for callers that store or serialize the result; use
+    vector_ops.parse_vector to get a float32 array directly.
+    """
     if raw is None:
         return None
     if isinstance(raw, list):
         return raw
-    if isinstance(raw, str):
-        import json
-        try:
-            return json.loads(raw)
-        except (json.JSONDecodeError, ValueError):
-            return None
-    return None
+    vec = vector_ops.parse_vector(raw)
+    return vec.tolist() if vec is not None else None
 
 
 def embedding_similarity(
@@ -182,10 +357,10 @@ def embedding_similarity(
     emb2: Optional[List[float]] = None,
 ) -> float:
     """Cosine similarity if both embeddings available, else Jaccard word-overlap fallback."""
-    emb1 = parse_embedding(emb1)
-    emb2 = parse_embedding(emb2)
-    if emb1 is not None and emb2 is not None:
-        return cosine_similarity(emb1, emb2)
+    vec1 = vector_ops.parse_vector(emb1)
+    vec2 = vector_ops.parse_vector(emb2)
+    if vec1 is not None and vec2 is not None:
+        return vector_ops.cosine(vec1, vec2)
     return _jaccard_word_similarity(kw1, kw2)
 
 
@@ -255,20 +430,11 @@ def cosine_similarity(vec1: List[float], vec2: List[float]) -> float:
 
     Returns:
         Cosine similarity (0..1)
-    """
-    import math
 
-    if len(vec1) != len(vec2):
-        raise ValueError(f"Vector dimension mismatch: {len(vec1)} vs {len(vec2)}")
-
-    dot_product = sum(a * b for a, b in zip(vec1, vec2))
-    magnitude1 = math.sqrt(sum(a * a for a in vec1))
-    magnitude2 = math.sqrt(sum(b * b for b in vec2))
-
-    if magnitude1 == 0 or magnitude2 == 0:
-        return 0.0
-
-    return dot_product / (magnitude1 * magnitude2)
+    Raises:
+        ValueError: If the vectors have different dimensions
+    """
+    return vector_ops.cosine(vec1, vec2)
 
 
 # Tweet embedding cache
@@ -320,23 +486,112 @@ def _hash_taxonomy_node(label: str, description: str, exemplars: List[str]) -> s
     return hashlib.sha256(node_data.encode('utf-8')).hexdigest()[:16]
 
 
+class TaxonomyEmbeddings(dict):
+    """
+    label -> embedding dict that also keeps the stacked, L2-normalized matrix.
+
+    relevance_from_taxonomy scores a tweet against every node with one
+    matrix-vector product instead of re-stacking the vectors per tweet. The
+    matrix is rebuilt if labels are added or removed; treat the vectors
+    themselves as read-only.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._matrix_labels: Optional[Tuple[str, ...]] = None
+        self._matrix: Optional[np.ndarray] = None
+
+    def matrix(self) -> Tuple[List[str], np.ndarray]:
+        """(labels, normalized float32 matrix) in dict order."""
+        labels = tuple(self)
+        if self._matrix is None or labels != self._matrix_labels:
+            matrix, _ = vector_ops.stack(self.values())
+            self._matrix = vector_ops.normalize_rows(matrix)
+            self._matrix_labels = labels
+        return list(labels), self._matrix
+
+
+# Taxonomy vectors already loaded in this process, keyed by cache file path
+_taxonomy_memory: Dict[str, Tuple[Dict[str, str], TaxonomyEmbeddings]] = {}
+_taxonomy_memory_lock = threading.Lock()
+
+
+def _taxonomy_cache_path(project_id: str, cache_dir: str) -> str:
+    return os.path.abspath(os.path.join(cache_dir, f"taxonomy_{project_id}.npz"))
+
+
+def _legacy_taxonomy_cache_path(project_id: str, cache_dir: str) -> str:
+    return os.path.join(cache_dir, f"taxonomy_{project_id}.json")
+
+
+def _write_taxonomy_cache(path: str, embeddings: Dict[str, List[float]], hashes: Dict[str, str]) -> None:
+    """Write taxonomy vectors as float32 .npz via a temp file and atomic rename."""
+    labels = list(embeddings)
+    matrix, _ = vector_ops.stack(embeddings[label] for label in labels)
+    directory = os.path.dirname(path)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        os.makedirs(directory, exist_ok=True)
+        with open(tmp_path, "wb") as f:
+            np.savez(
+                f,
+                labels=np.array(labels, dtype=str),
+                hashes=np.array([hashes.get(label, "") for label in labels], dtype=str),
+                matrix=matrix,
+                cached_at=np.array(time.time()),
+            )
+        os.replace(tmp_path, path)
+    except Exception as e:
+        logger.error(f"Failed to write taxonomy cache to {path}: {e}")
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def _read_taxonomy_cache(project_id: str, cache_dir: str) -> Optional[Tuple[Dict[str, str], Dict[str, List[float]]]]:
+    """
+    Read (hashes, embeddings) from the .npz cache, falling back to the old JSON file.
+
+    Returns None if neither exists or the file can't be read.
+    """
+    path = _taxonomy_cache_path(project_id, cache_dir)
+    if os.path.exists(path):
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                labels = data["labels"].tolist()
+                hashes = {label: h for label, h in zip(labels, data["hashes"].tolist()) if h}
+                embeddings = dict(zip(labels, data["matrix"].tolist()))
+            return hashes, embeddings
+        except Exception as e:
+            logger.warning(f"Failed to load taxonomy cache from {path}: {e}")
+            return None
+
+    cache_data = cache_get(_legacy_taxonomy_cache_path(project_id, cache_dir))
+    if not cache_data:
+        return None
+    # Handle both old format (dict of embeddings) and V1.1 format (with metadata)
+    if isinstance(cache_data, dict) and 'embeddings' in cache_data:
+        return cache_data.get('hashes') or {}, cache_data['embeddings']
+    return {}, cache_data
+
+
 def cache_taxonomy_embeddings(project_id: str, taxonomy_vectors: Dict, node_hashes: Optional[Dict[str, str]] = None, cache_dir: str = "cache"):
     """
     Cache taxonomy node embeddings for a project (V1.1: with hash metadata).
 
+    Stored as taxonomy_{project_id}.npz (float32 matrix + labels + hashes),
+    written atomically so concurrent workers never read a partial file.
+
     Args:
         project_id: Project identifier
         taxonomy_vectors: Dict with taxonomy node data (label -> embedding)
         node_hashes: Dict of label -> hash (for cache invalidation)
         cache_dir: Cache directory path
     """
-    cache_data = {
-        'embeddings': taxonomy_vectors,
-        'hashes': node_hashes or {},
-        'cached_at': time.time()
-    }
-    path = os.path.join(cache_dir, f"taxonomy_{project_id}.json")
-    cache_set(path, cache_data)
+    path = _taxonomy_cache_path(project_id, cache_dir)
+    hashes = dict(node_hashes or {})
+    _write_taxonomy_cache(path, taxonomy_vectors, hashes)
+    with _taxonomy_memory_lock:
+        _taxonomy_memory[path] = (hashes, TaxonomyEmbeddings(taxonomy_vectors))
 
 
 def load_taxonomy_embeddings(project_id: str, cache_dir: str = "cache") -> Optional[Dict]:
@@ -350,18 +605,13 @@ def load_taxonomy_embeddings(project_id: str, cache_dir: str = "cache") -> Optio
     Returns:
         Taxonomy vectors dict or None (V1.1: returns embeddings only, not metadata)
     """
-    path = os.path.join(cache_dir, f"taxonomy_{project_id}.json")
-    cache_data = cache_get(path)
+    with _taxonomy_memory_lock:
+        cached = _taxonomy_memory.get(_taxonomy_cache_path(project_id, cache_dir))
+    if cached:
+        return cached[1]
 
-    if not cache_data:
-        return None
-
-    # Handle both old format (dict of embeddings) and new format (with metadata)
-    if isinstance(cache_data, dict) and 'embeddings' in cache_data:
-        return cache_data['embeddings']
-    else:
-        # Old format - just embeddings dict
-        return cache_data
+    loaded = _read_taxonomy_cache(project_id, cache_dir)
+    return TaxonomyEmbeddings(loaded[1]) if loaded else None
 
 
 def load_taxonomy_embeddings_incremental(
@@ -369,11 +619,14 @@ def load_taxonomy_embeddings_incremental(
     taxonomy_nodes: List,  # List of TaxonomyNode objects
     embedder: 'Embedder',
     cache_dir: str = "cache"
-) -> Dict:
+) -> TaxonomyEmbeddings:
     """
     Load or compute taxonomy embeddings incrementally (V1.1).
 
-    Only recomputes embeddings for nodes whose hash has changed.
+    Only recomputes embeddings for nodes whose hash has changed, in a single
+    batched embed request. Results are kept in memory for the life of the
+    process, so repeat calls with an unchanged taxonomy touch neither disk
+    nor the API.
 
     Args:
         project_id: Project identifier
@@ -384,8 +637,7 @@ def load_taxonomy_embeddings_incremental(
     Returns:
         Dict of label -> embedding (all nodes, with cached + newly computed)
     """
-    path = os.path.join(cache_dir, f"taxonomy_{project_id}.json")
-    cache_data = cache_get(path)
+    path = _taxonomy_cache_path(project_id, cache_dir)
 
     # Compute current hashes for all nodes
     current_hashes = {}
@@ -396,55 +648,48 @@ def load_taxonomy_embeddings_incremental(
             node.exemplars
         )
 
-    # Check if we have valid cache
-    if cache_data and 'embeddings' in cache_data and 'hashes' in cache_data:
-        cached_embeddings = cache_data['embeddings']
-        cached_hashes = cache_data['hashes']
-
-        # Determine which nodes need recomputation
-        nodes_to_compute = []
-        final_embeddings = {}
+    with _taxonomy_memory_lock:
+        in_memory = _taxonomy_memory.get(path)
+    if in_memory and in_memory[0] == current_hashes:
+        return in_memory[1]
 
-        for node in taxonomy_nodes:
-            current_hash = current_hashes[node.label]
-            cached_hash = cached_hashes.get(node.label)
+    cached = _read_taxonomy_cache(project_id, cache_dir)
+    cached_hashes, cached_embeddings = cached if cached else ({}, {})
 
-            if cached_hash == current_hash and node.label in cached_embeddings:
-                # Hash matches - reuse cached embedding
-                final_embeddings[node.label] = cached_embeddings[node.label]
-            else:
-                # Hash mismatch or missing - need to recompute
-                nodes_to_compute.append(node)
+    # Determine which nodes need recomputation
+    final_embeddings = {}
+    nodes_to_compute = []
+    for node in taxonomy_nodes:
+        if cached_hashes.get(node.label) == current_hashes[node.label] and node.label in cached_embeddings:
+            # Hash matches - reuse cached embedding
+            final_embeddings[node.label] = cached_embeddings[node.label]
+        else:
+            # Hash mismatch or missing - need to recompute
+            nodes_to_compute.append(node)
 
-        if nodes_to_compute:
+    if nodes_to_compute:
+        if cached:
             logger.info(f"Recomputing {len(nodes_to_compute)}/{len(taxonomy_nodes)} taxonomy embeddings (cache invalidated)")
-
-            # Compute embeddings for changed nodes
-            for node in nodes_to_compute:
-                texts_to_embed = [node.description] + node.exemplars[:3]
-                combined_text = " ".join(texts_to_embed)
-                embedding = embedder.embed_text(combined_text, task_type="RETRIEVAL_DOCUMENT")
-                final_embeddings[node.label] = embedding
-
-            # Save updated cache
-            cache_taxonomy_embeddings(project_id, final_embeddings, current_hashes, cache_dir)
         else:
-            logger.info(f"Using cached embeddings for all {len(taxonomy_nodes)} taxonomy nodes")
-
-        return final_embeddings
-
+            logger.info(f"Computing embeddings for {len(taxonomy_nodes)} taxonomy nodes (no cache)")
+
+        # One batched request for every changed node
+        combined_texts = [
+            " ".join([node.description] + node.exemplars[:3])
+            for node in nodes_to_compute
+        ]
+        vectors = embedder.embed_texts(combined_texts, task_type="RETRIEVAL_DOCUMENT")
+        for node, embedding in zip(nodes_to_compute, vectors):
+            final_embeddings[node.label] = embedding
     else:
-        # No valid cache - compute all embeddings
-        logger.info(f"Computing embeddings for {len(taxonomy_nodes)} taxonomy nodes (no cache)")
-        embeddings = {}
-
-        for node in taxonomy_nodes:
-            texts_to_embed = [node.description] + node.exemplars[:3]
-            combined_text = " ".join(texts_to_embed)
-            embedding = embedder.embed_text(combined_text, task_type="RETRIEVAL_DOCUMENT")
-            embeddings[node.label] = embedding
-
-        # Save to cache
-        cache_taxonomy_embeddings(project_id, embeddings, current_hashes, cache_dir)
-
-        return embeddings
+        logger.info(f"Using cached embeddings for all {len(taxonomy_nodes)} taxonomy nodes")
+
+    # Keep taxonomy order
+    taxonomy = TaxonomyEmbeddings(
+        (node.label, final_embeddings[node.label]) for node in taxonomy_nodes
+    )
+    if nodes_to_compute or not os.path.exists(path):
+        _write_taxonomy_cache(path, taxonomy, current_hashes)
+    with _taxonomy_memory_lock:
+        _taxonomy_memory[path] = (current_hashes, taxonomy)
+    return taxonomy
@@ -0,0 +1,86 @@
+"""
+Token-bucket rate limiting and jittered backoff for outbound API calls.
+
+TokenBucket is safe to share between threads and asyncio tasks: a caller
+reserves its tokens under a short lock, then sleeps (time.sleep or
+asyncio.sleep) outside it for however long the reservation is in debt. Many
+callers can therefore wait concurrently and are released at the bucket rate.
+
+Usage:
+    bucket = TokenBucket(rate=300 / 60, capacity=10)   # 300 req/min, bursts of 10
+    bucket.acquire()          # from a worker thread
+    await bucket.acquire_async()  # from a coroutine
+"""
+
+import asyncio
+import random
+import threading
+import time
+from typing import Callable, Optional
+
+
+class TokenBucket:
+    """
+    Token bucket that refills at `rate` tokens per second up to `capacity`.
+
+    Args:
+        rate: Tokens added per second (e.g. requests_per_minute / 60)
+        capacity: Maximum burst size (default: one second's worth, at least 1)
+        clock: Monotonic clock, injectable for tests
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if rate <= 0:
+            raise ValueError(f"rate must be positive, got {rate}")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._clock = clock
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def per_minute(cls, requests_per_minute: float, capacity: Optional[float] = None) -> "TokenBucket":
+        """Bucket for a requests-per-minute quota."""
+        return cls(rate=requests_per_minute / 60.0, capacity=capacity)
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        """
+        Take tokens now and return how long the caller must wait before using them.
+
+        The balance may go negative; later callers then queue behind the debt.
+        """
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= tokens
+            return max(0.0, -self._tokens / self.rate)
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """Block the calling thread until tokens are available. Returns seconds waited."""
+        wait = self.reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self, tokens: float = 1.0) -> float:
+        """Await until tokens are available. Returns seconds waited."""
+        wait = self.reserve(tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+
+def backoff_delay(attempt: int, base: float = 1.0, cap: float = 30.0) -> float:
+    """
+    Full-jitter exponential backoff: uniform(0, min(cap, base * 2**attempt)).
+
+    Jitter keeps parallel workers that failed together from retrying in lockstep.
+    """
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
@@ -0,0 +1,182 @@
+"""
+Vector math for embeddings, backed by NumPy float32 arrays.
+
+Every helper accepts lists, arrays or raw Supabase values, so callers can pass
+whatever they got from the API or the database:
+
+- parse_vector: decode a pgvector string ("[0.1,0.2,...]") straight to an
+  array, without a json round-trip.
+- stack: build a (n, dim) matrix plus a mask of rows that had a usable vector.
+- normalize / normalize_rows: L2 normalization (zero vectors stay zero).
+- cosine / cosine_batch / cosine_matrix: one pair, one-vs-many, many-vs-many.
+- top_k: indices of the k highest scores, best first.
+- centroid / update_centroid: full and O(1) incremental cluster centroids.
+
+Usage:
+    matrix, mask = stack(parse_vector(r["embedding"]) for r in rows)
+    scores = cosine_batch(query_vec, matrix)
+    best = top_k(scores, 5)
+"""
+
+from typing import Iterable, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+DTYPE = np.float32
+
+VectorLike = Union[Sequence[float], np.ndarray]
+
+
+def parse_vector(raw) -> Optional[np.ndarray]:
+    """
+    Decode an embedding from Supabase into a 1-D float32 array.
+
+    Accepts a list/tuple, an ndarray, or a pgvector/JSON string. Returns None
+    for missing, empty or malformed values.
+    """
+    if raw is None:
+        return None
+    if isinstance(raw, str):
+        text = raw.strip()
+        if len(text) < 2 or text[0] != "[" or text[-1] != "]":
+            return None
+        body = text[1:-1]
+        if not body.strip():
+            return None
+        try:
+            vec = np.array(body.split(","), dtype=DTYPE)
+        except ValueError:
+            return None
+    elif isinstance(raw, (list, tuple, np.ndarray)):
+        try:
+            vec = np.asarray(raw, dtype=DTYPE)
+        except (TypeError, ValueError):
+            return None
+    else:
+        return None
+    if vec.ndim != 1 or vec.size == 0:
+        return None
+    return vec
+
+
+def stack(vectors: Iterable, dim: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Stack vectors into a (n, dim) float32 matrix.
+
+    Items may be raw Supabase values; each is run through parse_vector. The
+    first usable vector fixes the dimension unless dim is given. Rows that are
+    missing or have a different dimension stay zero and are flagged False in
+    the returned mask.
+
+    Returns:
+        (matrix, mask)
+    """
+    parsed = [parse_vector(v) for v in vectors]
+    if dim is None:
+        dim = next((v.size for v in parsed if v is not None), 0)
+    matrix = np.zeros((len(parsed), dim), dtype=DTYPE)
+    mask = np.zeros(len(parsed), dtype=bool)
+    for i, vec in enumerate(parsed):
+        if vec is not None and vec.size == dim:
+            matrix[i] = vec
+            mask[i] = True
+    return matrix, mask
+
+
+def normalize(vec: VectorLike) -> np.ndarray:
+    """L2-normalize a vector. Zero vectors are returned unchanged."""
+    arr = np.asarray(vec, dtype=DTYPE)
+    norm = np.linalg.norm(arr)
+    return arr / norm if norm > 0 else arr.copy()
+
+
+def normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """L2-normalize each row in place (zero rows stay zero) and return the matrix."""
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    np.divide(matrix, norms, out=matrix, where=norms > 0)
+    return matrix
+
+
+def cosine(a: VectorLike, b: VectorLike) -> float:
+    """
+    Cosine similarity between two vectors.
+
+    Raises:
+        ValueError: If the vectors have different dimensions
+    """
+    a = np.asarray(a, dtype=DTYPE)
+    b = np.asarray(b, dtype=DTYPE)
+    if a.shape != b.shape:
+        raise ValueError(f"Vector dimension mismatch: {a.size} vs {b.size}")
+    denom = np.linalg.norm(a) * np.linalg.norm(b)
+    if denom == 0:
+        return 0.0
+    return float(np.dot(a, b) / denom)
+
+
+def cosine_batch(query: VectorLike, matrix: np.ndarray, normalized: bool = False) -> np.ndarray:
+    """
+    Cosine similarity of one query against every row of a matrix.
+
+    Pass normalized=True when the matrix rows are already unit length
+    (e.g. from normalize_rows) to skip re-normalizing them.
+
+    Returns:
+        1-D float32 array of length len(matrix)
+    """
+    q = normalize(query)
+    if matrix.shape[0] == 0:
+        return np.zeros(0, dtype=DTYPE)
+    if matrix.shape[1] != q.size:
+        raise ValueError(f"Vector dimension mismatch: {q.size} vs {matrix.shape[1]}")
+    rows = matrix if normalized else normalize_rows(np.array(matrix, dtype=DTYPE))
+    return rows @ q
+
+
+def cosine_matrix(a: np.ndarray, b: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Pairwise cosine similarities between the rows of a and b (a vs a if b is None).
+
+    Returns:
+        (len(a), len(b)) float32 array
+    """
+    a_n = normalize_rows(np.array(a, dtype=DTYPE))
+    b_n = a_n if b is None else normalize_rows(np.array(b, dtype=DTYPE))
+    return a_n @ b_n.T
+
+
+def top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k highest scores, best first (ties keep input order)."""
+    n = len(scores)
+    if k <= 0 or n == 0:
+        return np.zeros(0, dtype=np.intp)
+    if k < n:
+        # argpartition narrows to the top k before the stable sort
+        candidates = np.argpartition(-scores, k - 1)[:k]
+        candidates.sort()
+        return candidates[np.argsort(-scores[candidates], kind="stable")]
+    return np.argsort(-scores, kind="stable")
+
+
+def centroid(vectors: Iterable) -> Optional[np.ndarray]:
+    """L2-normalized mean of the usable vectors, or None if there are none."""
+    matrix, mask = stack(vectors)
+    if not mask.any():
+        return None
+    return normalize(matrix[mask].mean(axis=0))
+
+
+def update_centroid(current: Optional[VectorLike], count: int, new: VectorLike) -> np.ndarray:
+    """
+    O(1) centroid update: (current * count + new) / (count + 1), normalized.
+
+    Args:
+        current: Existing centroid (None if the cluster had no embeddings)
+        count: Number of vectors already folded into current
+        new: Vector being added
+    """
+    new = np.asarray(new, dtype=DTYPE)
+    if current is None or count <= 0:
+        return normalize(new)
+    current = np.asarray(current, dtype=DTYPE)
+    return normalize((current * count + new) / (count + 1))
@@ -17,7 +17,8 @@ from typing import Dict, List, Tuple, Optional, Any
 from dataclasses import dataclass
 from datetime import datetime, timezone
 
-from viraltracker.core.embeddings import cosine_similarity
+from viraltracker.core import vector_ops
+from viraltracker.core.embeddings import TaxonomyEmbeddings
 
 logger = logging.getLogger(__name__)
 
@@ -122,18 +123,17 @@ def relevance_from_taxonomy(
         logger.warning("No taxonomy embeddings provided")
         return 0.0, "unknown", 0.0
 
-    # Compute similarities
-    similarities = []
-    for label, node_embedding in taxonomy_embeddings.items():
-        sim = cosine_similarity(tweet_embedding, node_embedding)
-        similarities.append((label, sim))
-
-    # Sort by similarity
-    similarities.sort(key=lambda x: x[1], reverse=True)
+    # Compute similarities against every node at once; TaxonomyEmbeddings
+    # (from load_taxonomy_embeddings_incremental) keeps the matrix prebuilt
+    if not isinstance(taxonomy_embeddings, TaxonomyEmbeddings):
+        taxonomy_embeddings = TaxonomyEmbeddings(taxonomy_embeddings)
+    labels, matrix = taxonomy_embeddings.matrix()
+    similarities = vector_ops.cosine_batch(tweet_embedding, matrix, normalized=True)
 
     # Get best and second-best
-    best_label, best_sim = similarities[0]
-    second_best_sim = similarities[1][1] if len(similarities) > 1 else 0.0
+    ranked = vector_ops.top_k(similarities, 2)
+    best_label, best_sim = labels[ranked[0]], float(similarities[ranked[0]])
+    second_best_sim = float(similarities[ranked[1]]) if len(ranked) > 1 else 0.0
 
     # Calculate margin
     margin = max(0.0, best_sim - second_best_sim)
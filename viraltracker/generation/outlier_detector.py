@@ -19,17 +19,25 @@ Usage:
 """
 
 import logging
-from typing import List, Dict, Optional, Tuple
+from typing import Iterator, List, Dict, Optional, Tuple
 from datetime import datetime, timedelta, timezone
 from dataclasses import dataclass
 import numpy as np
-from scipy import stats
 
 from ..core.database import get_supabase_client
 
 
 logger = logging.getLogger(__name__)
 
+# Rows per request when paging posts (PostgREST caps responses at 1000)
+FETCH_PAGE_SIZE = 1000
+
+# Only the post columns TweetMetrics needs, plus the joins used for filtering
+TWEET_COLUMNS = (
+    'id, post_id, caption, posted_at, views, likes, comments, shares, '
+    'accounts!inner(platform_username, follower_count), project_posts!inner(project_id)'
+)
+
 
 @dataclass
 class TweetMetrics:
@@ -154,7 +162,9 @@ class OutlierDetector:
             tweets = self._apply_time_decay(tweets, decay_halflife_days)
 
         # Extract engagement scores
-        scores = np.array([t.engagement_score for t in tweets])
+        scores = np.fromiter(
+            (t.engagement_score for t in tweets), dtype=np.float64, count=len(tweets)
+        )
 
         # Detect outliers based on method
         if method == "zscore":
@@ -186,6 +196,10 @@ class OutlierDetector:
         """
         Fetch tweets from database
 
+        Pages through every matching post (see _iter_tweet_rows) and converts
+        each page to TweetMetrics as it arrives, so only one page of raw rows
+        is held in memory at a time.
+
         Args:
             days_back: Look back N days
             min_views: Minimum view count
@@ -193,53 +207,96 @@ class OutlierDetector:
             text_only: Exclude video and image posts
 
         Returns:
-            List of TweetMetrics
+            List of TweetMetrics, newest first
         """
-        cutoff = datetime.now(timezone.utc) - timedelta(days=days_back)
-
-        # Query posts linked to this project
-        query = self.db.table('posts') \
-            .select('*, accounts!inner(platform_username, follower_count), project_posts!inner(project_id)') \
-            .eq('project_posts.project_id', self.project_id) \
-            .gte('posted_at', cutoff.isoformat()) \
-            .gte('views', min_views) \
-            .gte('likes', min_likes)
+        tweets = []
+        for page in self._iter_tweet_rows(days_back, min_views, min_likes, text_only):
+            for row in page:
+                account_data = row.get('accounts')
+                if not account_data:
+                    continue
+
+                # Parse posted_at
+                posted_at = row['posted_at']
+                if isinstance(posted_at, str):
+                    posted_at = datetime.fromisoformat(posted_at.replace('Z', '+00:00'))
+
+                tweet = TweetMetrics(
+                    tweet_id=row['post_id'],
+                    text=row['caption'] or '',
+                    author_handle=account_data.get('platform_username', 'unknown'),
+                    author_followers=account_data.get('follower_count', 0),
+                    posted_at=posted_at,
+                    views=row.get('views', 0) or 0,
+                    likes=row.get('likes', 0) or 0,
+                    replies=row.get('comments', 0) or 0,
+                    retweets=row.get('shares', 0) or 0
+                )
+                tweets.append(tweet)
 
-        # Filter for text-only if requested
-        if text_only:
-            query = query.eq('media_type', 'text')
+        # Pages arrive in primary-key order; keep the newest-first ordering
+        # callers have always seen.
+        tweets.sort(key=lambda t: t.posted_at, reverse=True)
+        return tweets
 
-        result = query.order('posted_at', desc=True).execute()
+    def _iter_tweet_rows(
+        self,
+        days_back: int,
+        min_views: int,
+        min_likes: int,
+        text_only: bool = False,
+        page_size: int = FETCH_PAGE_SIZE
+    ) -> Iterator[List[Dict]]:
+        """
+        Stream matching posts one page at a time
 
-        if not result.data:
-            return []
+        Uses keyset pagination on the posts primary key (``id > last_id``), so
+        results are never truncated at the PostgREST row cap and later pages
+        cost the same as the first. Only the columns TweetMetrics needs are
+        selected.
 
-        # Convert to TweetMetrics
-        tweets = []
-        for row in result.data:
-            account_data = row.get('accounts')
-            if not account_data:
-                continue
-
-            # Parse posted_at
-            posted_at = row['posted_at']
-            if isinstance(posted_at, str):
-                posted_at = datetime.fromisoformat(posted_at.replace('Z', '+00:00'))
-
-            tweet = TweetMetrics(
-                tweet_id=row['post_id'],
-                text=row['caption'] or '',
-                author_handle=account_data.get('platform_username', 'unknown'),
-                author_followers=account_data.get('follower_count', 0),
-                posted_at=posted_at,
-                views=row.get('views', 0) or 0,
-                likes=row.get('likes', 0) or 0,
-                replies=row.get('comments', 0) or 0,
-                retweets=row.get('shares', 0) or 0
-            )
-            tweets.append(tweet)
+        Args:
+            days_back: Look back N days
+            min_views: Minimum view count
+            min_likes: Minimum like count
+            text_only: Exclude video and image posts
+            page_size: Rows per request
 
-        return tweets
+        Yields:
+            Lists of post rows (with embedded ``accounts``)
+        """
+        cutoff = datetime.now(timezone.utc) - timedelta(days=days_back)
+        last_id = None
+        total = 0
+
+        while True:
+            # Query posts linked to this project
+            query = self.db.table('posts') \
+                .select(TWEET_COLUMNS) \
+                .eq('project_posts.project_id', self.project_id) \
+                .gte('posted_at', cutoff.isoformat()) \
+                .gte('views', min_views) \
+                .gte('likes', min_likes)
+
+            # Filter for text-only if requested
+            if text_only:
+                query = query.eq('media_type', 'text')
+
+            if last_id is not None:
+                query = query.gt('id', last_id)
+
+            result = query.order('id').limit(page_size).execute()
+            rows = result.data or []
+            if not rows:
+                break
+
+            total += len(rows)
+            logger.debug(f"Fetched page of {len(rows)} tweets (total: {total})")
+            yield rows
+
+            if len(rows) < page_size:
+                break
+            last_id = rows[-1]['id']
 
     def _apply_time_decay(
         self,
@@ -258,18 +315,66 @@ class OutlierDetector:
         Returns:
             List of TweetMetrics with adjusted engagement scores
         """
+        if not tweets:
+            return tweets
+
         now = datetime.now(timezone.utc)
 
-        for tweet in tweets:
-            # Calculate age in days
-            age_days = (now - tweet.posted_at).total_seconds() / 86400
+        # Age in days for every tweet, then one vectorized decay computation:
+        # score * 2^(-age / halflife)
+        age_days = np.fromiter(
+            ((now - t.posted_at).total_seconds() for t in tweets),
+            dtype=np.float64,
+            count=len(tweets)
+        ) / 86400
+        decay_factors = np.power(2.0, -age_days / halflife_days)
 
-            # Apply exponential decay: score * 2^(-age / halflife)
-            decay_factor = 2 ** (-age_days / halflife_days)
+        for tweet, decay_factor in zip(tweets, decay_factors.tolist()):
             tweet.engagement_score *= decay_factor
 
         return tweets
 
+    @staticmethod
+    def _score_percentiles(scores: np.ndarray, sorted_scores: np.ndarray) -> np.ndarray:
+        """
+        Percentile of every score within the distribution (0-100)
+
+        Equivalent to ``np.sum(all_scores <= s) / len(all_scores) * 100`` for
+        each s, but uses a binary search over the sorted distribution:
+        O(log n) per score instead of O(n).
+
+        Args:
+            scores: Scores to look up (may be a subset of the distribution)
+            sorted_scores: The full distribution sorted ascending
+
+        Returns:
+            Array of percentiles aligned with ``scores``
+        """
+        counts = np.searchsorted(sorted_scores, scores, side='right')
+        return (counts / len(sorted_scores)) * 100
+
+    @staticmethod
+    def _build_results(
+        tweets: List[TweetMetrics],
+        outlier_idx: np.ndarray,
+        z_scores: np.ndarray,
+        percentiles: np.ndarray
+    ) -> List[OutlierResult]:
+        """Build OutlierResult objects (z_scores/percentiles align with outlier_idx)."""
+        return [
+            OutlierResult(
+                tweet=tweets[i],
+                z_score=z_score,
+                percentile=percentile,
+                is_outlier=True,
+                rank=0,  # Will be set later
+                rank_percentile=0.0  # Will be set later
+            )
+            for i, z_score, percentile in zip(
+                outlier_idx.tolist(), z_scores.tolist(), percentiles.tolist()
+            )
+        ]
+
     def _detect_zscore(
         self,
         tweets: List[TweetMetrics],
@@ -289,16 +394,15 @@ class OutlierDetector:
         Returns:
             List of OutlierResult for outliers
         """
-        # Compute trimmed mean and std
+        # Sort once: the trimmed slice gives mean/std, and the full sorted
+        # array drives the percentile lookups below.
         trim_fraction = trim_percent / 100.0
-        trimmed_mean = stats.trim_mean(scores, trim_fraction)
-
-        # For trimmed std, we need to manually trim
         sorted_scores = np.sort(scores)
         n = len(sorted_scores)
         lower_cut = int(n * trim_fraction)
         upper_cut = n - lower_cut
         trimmed_scores = sorted_scores[lower_cut:upper_cut]
+        trimmed_mean = np.mean(trimmed_scores)
         trimmed_std = np.std(trimmed_scores, ddof=1)
 
         logger.info(f"Trimmed mean: {trimmed_mean:.1f}, Trimmed std: {trimmed_std:.1f}")
@@ -311,25 +415,10 @@ class OutlierDetector:
         z_scores = (scores - trimmed_mean) / trimmed_std
 
         # Find outliers
-        outlier_results = []
-        for i, (tweet, z_score) in enumerate(zip(tweets, z_scores)):
-            is_outlier = z_score >= threshold
-
-            # Compute percentile
-            percentile = (np.sum(scores <= tweet.engagement_score) / len(scores)) * 100
-
-            if is_outlier:
-                result = OutlierResult(
-                    tweet=tweet,
-                    z_score=float(z_score),
-                    percentile=float(percentile),
-                    is_outlier=True,
-                    rank=0,  # Will be set later
-                    rank_percentile=0.0  # Will be set later
-                )
-                outlier_results.append(result)
+        outlier_idx = np.flatnonzero(z_scores >= threshold)
+        percentiles = self._score_percentiles(scores[outlier_idx], sorted_scores)
 
-        return outlier_results
+        return self._build_results(tweets, outlier_idx, z_scores[outlier_idx], percentiles)
 
     def _detect_percentile(
         self,
@@ -353,31 +442,22 @@ class OutlierDetector:
 
         logger.info(f"Percentile cutoff (top {threshold}%): {percentile_cutoff:.1f}")
 
+        # Distribution stats are computed once for the z-score reference
+        mean = np.mean(scores)
+        std = np.std(scores, ddof=1)
+
         # Find outliers
-        outlier_results = []
-        for tweet, score in zip(tweets, scores):
-            is_outlier = score >= percentile_cutoff
-
-            # Compute percentile
-            percentile = (np.sum(scores <= score) / len(scores)) * 100
-
-            # Compute z-score for reference
-            mean = np.mean(scores)
-            std = np.std(scores, ddof=1)
-            z_score = (score - mean) / std if std > 0 else 0.0
-
-            if is_outlier:
-                result = OutlierResult(
-                    tweet=tweet,
-                    z_score=float(z_score),
-                    percentile=float(percentile),
-                    is_outlier=True,
-                    rank=0,  # Will be set later
-                    rank_percentile=0.0  # Will be set later
-                )
-                outlier_results.append(result)
+        outlier_idx = np.flatnonzero(scores >= percentile_cutoff)
+        outlier_scores = scores[outlier_idx]
 
-        return outlier_results
+        if std > 0:
+            z_scores = (outlier_scores - mean) / std
+        else:
+            z_scores = np.zeros_like(outlier_scores)
+
+        percentiles = self._score_percentiles(outlier_scores, np.sort(scores))
+
+        return self._build_results(tweets, outlier_idx, z_scores, percentiles)
 
     def export_report(
         self,
@@ -0,0 +1,232 @@
+"""
+Concurrent Apify actor run orchestration
+
+Scrapers that need several actor runs (Twitter search batches, multi-term
+TikTok searches) start every run up front and poll them side by side, so a
+multi-run scrape takes about as long as its slowest run instead of the sum
+of all runs. Each dataset is streamed in offset/limit pages as soon as its
+run finishes, so callers can normalize and persist results incrementally.
+"""
+
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Hashable, Iterator, List, Optional, Sequence, Tuple
+
+import requests
+from tenacity import retry, stop_after_attempt, wait_exponential
+
+logger = logging.getLogger(__name__)
+
+
+APIFY_API_URL = "https://api.apify.com/v2"
+TERMINAL_STATUSES = ("SUCCEEDED", "FAILED", "ABORTED", "TIMED-OUT")
+
+# Per-run adaptive polling: start fast, back off while the status is
+# unchanged, drop back to the fast interval when it changes.
+POLL_INITIAL_SECONDS = 2.0
+POLL_MAX_SECONDS = 30.0
+POLL_BACKOFF = 1.5
+
+DATASET_PAGE_SIZE = 1000
+MAX_CONCURRENT_RUNS = 32
+
+_RUN_DONE = object()
+
+
+@dataclass
+class ApifyRun:
+    """State of one orchestrated actor run."""
+    key: Hashable
+    run_id: Optional[str] = None
+    dataset_id: Optional[str] = None
+    status: Optional[str] = None
+    item_count: int = 0
+    error: Optional[BaseException] = None
+
+
+class ApifyRunOrchestrator:
+    """
+    Start many runs of one Apify actor and stream their datasets
+
+    Usage:
+        orchestrator = ApifyRunOrchestrator(client, token, "apidojo/tweet-scraper")
+        for key, items in orchestrator.iter_pages([(1, input_1), (2, input_2)]):
+            ...  # normalize + persist this page
+
+    Pages of different runs interleave in completion order. After every run
+    has finished, the first run failure (failed status, timeout, HTTP error)
+    is re-raised, so pages of the runs that succeeded are never lost.
+    """
+
+    def __init__(
+        self,
+        apify_client,
+        apify_token: str,
+        actor_id: str,
+        max_concurrent_runs: Optional[int] = None,
+        page_size: int = DATASET_PAGE_SIZE
+    ):
+        """
+        Args:
+            apify_client: ApifyClient used to start (and abort) runs
+            apify_token: Apify API token for the REST polling/dataset calls
+            actor_id: Actor to run
+            max_concurrent_runs: Runs in flight at once (default: all, up to
+                MAX_CONCURRENT_RUNS). Set to 1 for actors that reject
+                concurrent runs on the account's plan.
+            page_size: Dataset items per page
+        """
+        self.apify_client = apify_client
+        self.apify_token = apify_token
+        self.actor_id = actor_id
+        self.max_concurrent_runs = max_concurrent_runs
+        self.page_size = page_size
+        self.runs: Dict[Hashable, ApifyRun] = {}
+
+    def iter_pages(
+        self,
+        run_inputs: Sequence[Tuple[Hashable, Dict]],
+        timeout: int = 900,
+        **start_kwargs
+    ) -> Iterator[Tuple[Hashable, List[Dict]]]:
+        """
+        Run the actor once per input and yield dataset pages as they arrive
+
+        Args:
+            run_inputs: (key, actor_input) pairs; keys label the yielded pages
+            timeout: Maximum seconds to wait for each run
+            **start_kwargs: Extra ActorClient.start() arguments (e.g. build)
+
+        Yields:
+            (key, items) for each dataset page
+        """
+        self.runs = {key: ApifyRun(key=key) for key, _ in run_inputs}
+        if not run_inputs:
+            return
+
+        workers = min(len(run_inputs), self.max_concurrent_runs or MAX_CONCURRENT_RUNS)
+        results: queue.Queue = queue.Queue()
+        cancel = threading.Event()
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="apify-run")
+        for key, run_input in run_inputs:
+            executor.submit(
+                self._execute, self.runs[key], run_input, timeout, start_kwargs, results, cancel
+            )
+
+        logger.info(f"Orchestrating {len(run_inputs)} Apify runs of {self.actor_id} ({workers} concurrent)")
+
+        pending = len(run_inputs)
+        try:
+            while pending:
+                key, items = results.get()
+                if items is _RUN_DONE:
+                    pending -= 1
+                    continue
+                yield key, items
+        finally:
+            if pending:
+                # Consumer stopped early: stop polling and abort runs in flight
+                cancel.set()
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        failed = [run for run in self.runs.values() if run.error is not None]
+        if failed:
+            logger.error(f"{len(failed)}/{len(self.runs)} Apify runs failed")
+            raise failed[0].error
+
+    def _execute(
+        self,
+        run: ApifyRun,
+        run_input: Dict,
+        timeout: int,
+        start_kwargs: Dict,
+        results: queue.Queue,
+        cancel: threading.Event
+    ) -> None:
+        """Start, poll and page through one run (worker thread)."""
+        try:
+            if cancel.is_set():
+                return
+            self._start_run(run, run_input, start_kwargs)
+            self._wait_for_run(run, timeout, cancel)
+            if run.dataset_id and not cancel.is_set():
+                for items in self._iter_dataset(run.dataset_id, cancel):
+                    run.item_count += len(items)
+                    results.put((run.key, items))
+                logger.info(f"Apify run {run.run_id}: streamed {run.item_count} items")
+        except BaseException as e:
+            run.error = e
+            logger.error(f"Apify run {run.run_id or run.key} failed: {e}")
+            self._abort_run(run)
+        finally:
+            results.put((run.key, _RUN_DONE))
+
+    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=2, min=2, max=8))
+    def _start_run(self, run: ApifyRun, run_input: Dict, start_kwargs: Dict) -> None:
+        """Start the run without waiting for it (ActorClient.call() would block)."""
+        started = self.apify_client.actor(self.actor_id).start(run_input=run_input, **start_kwargs)
+        run.run_id = started["id"]
+        run.dataset_id = started.get("defaultDatasetId")
+        run.status = started.get("status")
+        logger.info(f"Apify run started: {run.run_id}")
+
+    def _wait_for_run(self, run: ApifyRun, timeout: int, cancel: threading.Event) -> None:
+        """Poll the run until it reaches a terminal status."""
+        deadline = time.monotonic() + timeout
+        interval = POLL_INITIAL_SECONDS
+
+        while run.status not in TERMINAL_STATUSES:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError(f"Apify run {run.run_id} timeout after {timeout}s")
+            if cancel.wait(min(interval, remaining)):
+                raise RuntimeError(f"Apify run {run.run_id} cancelled")
+
+            data = self._get_json(f"{APIFY_API_URL}/actor-runs/{run.run_id}")["data"]
+            previous, run.status = run.status, data["status"]
+            run.dataset_id = data.get("defaultDatasetId") or run.dataset_id
+            if run.status == previous:
+                interval = min(interval * POLL_BACKOFF, POLL_MAX_SECONDS)
+            else:
+                interval = POLL_INITIAL_SECONDS
+
+        if run.status != "SUCCEEDED":
+            raise RuntimeError(f"Apify run failed with status: {run.status}")
+        logger.info(f"Apify run completed successfully. Dataset ID: {run.dataset_id}")
+
+    def _iter_dataset(self, dataset_id: str, cancel: threading.Event) -> Iterator[List[Dict]]:
+        """Page through a dataset with offset/limit."""
+        offset = 0
+        while not cancel.is_set():
+            page = self._get_json(
+                f"{APIFY_API_URL}/datasets/{dataset_id}/items",
+                params={"offset": offset, "limit": self.page_size}
+            )
+            if page:
+                yield page
+            if len(page) < self.page_size:
+                return
+            offset += len(page)
+
+    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=2, min=2, max=8))
+    def _get_json(self, url: str, params: Optional[Dict] = None):
+        response = requests.get(
+            url,
+            headers={"Authorization": f"Bearer {self.apify_token}"},
+            params=params
+        )
+        response.raise_for_status()
+        return response.json()
+
+    def _abort_run(self, run: ApifyRun) -> None:
+        """Best-effort abort of a run we gave up on, so it stops costing credits."""
+        if not run.run_id or run.status in TERMINAL_STATUSES:
+            return
+        try:
+            self.apify_client.run(run.run_id).abort()
+        except Exception as e:
+            logger.warning(f"Could not abort Apify run {run.run_id}: {e}")
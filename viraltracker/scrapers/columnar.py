@@ -0,0 +1,74 @@
+"""
+Columnar helpers for normalizing scraper output and building upsert payloads
+
+Apify datasets arrive as lists of JSON dicts. The scrapers turn them into
+DataFrames column by column (one comprehension per field instead of one dict
+per item), parse timestamps with a single pd.to_datetime call, and build the
+posts upsert payload from column lists instead of df.iterrows().
+"""
+
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+
+def field(items: Sequence[Dict], key: str, default: Any = None) -> List[Any]:
+    """dict.get(key, default) for every item."""
+    return [item.get(key, default) for item in items]
+
+
+def truncate_text(values: Sequence[Any], max_length: int) -> List[Any]:
+    """Slice text values to max_length (callers drop non-string rows first)."""
+    return [value[:max_length] for value in values]
+
+
+def parse_timestamps(values: Sequence[Any], fmt: str) -> List[Optional[str]]:
+    """
+    Parse timestamp strings in one pass and return UTC ISO-8601 strings
+
+    Args:
+        values: Raw timestamp values; non-strings and unparseable strings
+            become None
+        fmt: strptime format of the raw strings
+
+    Returns:
+        List of "YYYY-MM-DDTHH:MM:SS+00:00" strings (None where missing)
+    """
+    raw = pd.Series([value if isinstance(value, str) and value else None for value in values], dtype=object)
+    parsed = pd.to_datetime(raw, format=fmt, errors="coerce", utc=True)
+    seconds = parsed.dt.tz_localize(None).to_numpy(dtype="datetime64[s]")
+    formatted = np.datetime_as_string(seconds, unit="s").tolist()
+    return [f"{value}+00:00" if ok else None for value, ok in zip(formatted, parsed.notna().to_numpy())]
+
+
+def nullable_ints(df: pd.DataFrame, column: str) -> List[Optional[int]]:
+    """Column values as Python ints, None where NaN/None or the column is missing."""
+    if column not in df.columns:
+        return [None] * len(df)
+    numeric = pd.to_numeric(df[column])
+    if numeric.dtype.kind in "iu":  # plain numpy ints (no missing values)
+        return numeric.tolist()
+    present = numeric.notna().to_numpy()
+    ints = np.trunc(numeric.fillna(0).to_numpy(dtype=float)).astype(np.int64).tolist()
+    return [value if ok else None for value, ok in zip(ints, present)]
+
+
+def column_values(df: pd.DataFrame, column: str, default: Any = None) -> List[Any]:
+    """Column as a Python list (`default` for every row if the column is missing)."""
+    if column not in df.columns:
+        return [default] * len(df)
+    return df[column].tolist()
+
+
+def bools(df: pd.DataFrame, column: str) -> List[bool]:
+    """Column as Python bools (False for every row if the column is missing)."""
+    if column not in df.columns:
+        return [False] * len(df)
+    return [bool(value) for value in df[column].tolist()]
+
+
+def records(columns: Dict[str, List[Any]]) -> List[Dict[str, Any]]:
+    """Zip equal-length column lists into a list of row dicts."""
+    keys = list(columns)
+    return [dict(zip(keys, row)) for row in zip(*columns.values())]
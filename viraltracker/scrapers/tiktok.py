@@ -14,7 +14,7 @@ import json
 import time
 import logging
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional, Tuple, Literal
+from typing import Callable, List, Dict, Optional, Tuple, Literal
 from uuid import UUID
 
 import pandas as pd
@@ -26,6 +26,8 @@ from apify_client import ApifyClient
 
 from ..core.database import get_supabase_client
 from ..core.config import Config
+from .apify_runs import ApifyRunOrchestrator
+from .columnar import column_values, field, nullable_ints, records, truncate_text
 
 
 logger = logging.getLogger(__name__)
@@ -115,36 +117,59 @@ class TikTokScraper:
         logger.info(f"Searching TikTok for keyword: '{keyword}'")
         logger.info(f"Filters: {min_views:,}+ views, <{max_days_old} days old, <{max_follower_count:,} followers")
 
-        # Start Apify run
-        run_id = self._start_keyword_search_run(keyword, count, sort_type, publish_time)
-
-        # Poll for completion
-        result = self._poll_apify_run(run_id, timeout)
+        results = self._run_searches(
+            [(keyword, self._keyword_search_input(keyword, count))],
+            min_views=min_views,
+            max_days_old=max_days_old,
+            max_follower_count=max_follower_count,
+            timeout=timeout
+        )
+        return results[keyword]
 
-        # Fetch dataset
-        items = self._fetch_dataset(result['datasetId'])
-
-        if not items:
-            logger.warning("No results from keyword search")
-            return pd.DataFrame(), 0
-
-        # Normalize to DataFrame
-        df = self._normalize_search_posts(items)
+    def search_by_keywords(
+        self,
+        keywords: List[str],
+        count: int = 50,
+        min_views: int = 100000,
+        max_days_old: int = 10,
+        max_follower_count: int = 50000,
+        timeout: int = 300,
+        max_concurrent_runs: Optional[int] = None,
+        on_results: Optional[Callable[[str, pd.DataFrame], None]] = None
+    ) -> Dict[str, Tuple[pd.DataFrame, int]]:
+        """
+        Search TikTok for many keywords/hashtags at once
 
-        original_count = len(df)
+        One actor run per keyword (hashtags with # prefix), all started up
+        front and polled concurrently, so the wall time is close to the
+        slowest single run. Each run's dataset is normalized and filtered
+        page by page as soon as the run finishes.
 
-        # Apply filtering criteria
-        if len(df) > 0:
-            df = self._apply_viral_filters(
-                df,
-                min_views=min_views,
-                max_days_old=max_days_old,
-                max_follower_count=max_follower_count
-            )
+        Args:
+            keywords: Search keywords or #hashtags
+            count: Number of posts to fetch per keyword
+            min_views: Minimum views filter
+            max_days_old: Maximum age in days
+            max_follower_count: Maximum creator follower count
+            timeout: Apify timeout in seconds per run
+            max_concurrent_runs: Cap on runs in flight (default: all)
+            on_results: Called with (keyword, filtered_page_df) for each
+                page, e.g. to save posts incrementally
 
-        logger.info(f"Filtered from {original_count} to {len(df)} posts meeting criteria")
+        Returns:
+            Dict mapping keyword to (filtered_posts_df, total_scraped_count)
+        """
+        logger.info(f"Searching TikTok for {len(keywords)} keywords concurrently")
 
-        return df, original_count
+        return self._run_searches(
+            [(keyword, self._keyword_search_input(keyword, count)) for keyword in dict.fromkeys(keywords)],
+            min_views=min_views,
+            max_days_old=max_days_old,
+            max_follower_count=max_follower_count,
+            timeout=timeout,
+            max_concurrent_runs=max_concurrent_runs,
+            on_results=on_results
+        )
 
     def search_by_hashtag(
         self,
@@ -171,36 +196,78 @@ class TikTokScraper:
         """
         logger.info(f"Searching TikTok for hashtag: #{hashtag}")
 
-        # Start Apify run
-        run_id = self._start_hashtag_search_run(hashtag, count)
+        results = self._run_searches(
+            [(hashtag, self._hashtag_search_input(hashtag, count))],
+            min_views=min_views,
+            max_days_old=max_days_old,
+            max_follower_count=max_follower_count,
+            timeout=timeout
+        )
+        return results[hashtag]
 
-        # Poll for completion
-        result = self._poll_apify_run(run_id, timeout)
-
-        # Fetch dataset
-        items = self._fetch_dataset(result['datasetId'])
+    def _run_searches(
+        self,
+        run_inputs: List[Tuple[str, Dict]],
+        min_views: int,
+        max_days_old: int,
+        max_follower_count: int,
+        timeout: int,
+        max_concurrent_runs: Optional[int] = None,
+        on_results: Optional[Callable[[str, pd.DataFrame], None]] = None
+    ) -> Dict[str, Tuple[pd.DataFrame, int]]:
+        """
+        Run search actor inputs concurrently; normalize and filter each page
 
-        if not items:
-            logger.warning("No results from hashtag search")
-            return pd.DataFrame(), 0
+        Args:
+            run_inputs: (search term, actor input) pairs
+            min_views: Minimum views filter
+            max_days_old: Maximum age in days
+            max_follower_count: Maximum creator follower count
+            timeout: Apify timeout in seconds per run
+            max_concurrent_runs: Cap on runs in flight (default: all)
+            on_results: Called with (term, filtered_page_df) per page
 
-        # Normalize to DataFrame
-        df = self._normalize_search_posts(items)
+        Returns:
+            Dict mapping term to (filtered_posts_df, total_scraped_count)
+        """
+        orchestrator = ApifyRunOrchestrator(
+            self.apify_client, self.apify_token, self.apify_actor_id,
+            max_concurrent_runs=max_concurrent_runs
+        )
+        pages: Dict[str, List[pd.DataFrame]] = {term: [] for term, _ in run_inputs}
+        scraped: Dict[str, int] = {term: 0 for term, _ in run_inputs}
+        seen: Dict[str, set] = {term: set() for term, _ in run_inputs}
+
+        for term, items in orchestrator.iter_pages(run_inputs, timeout=timeout):
+            df = self._normalize_search_posts(items)
+            if len(df) == 0:
+                continue
 
-        original_count = len(df)
+            # Deduplicate across pages of the same run
+            df = df[~df['post_id'].isin(seen[term])]
+            seen[term].update(df['post_id'])
+            scraped[term] += len(df)
 
-        # Apply filtering criteria
-        if len(df) > 0:
             df = self._apply_viral_filters(
                 df,
                 min_views=min_views,
                 max_days_old=max_days_old,
                 max_follower_count=max_follower_count
             )
+            if len(df) > 0:
+                pages[term].append(df)
+                if on_results:
+                    on_results(term, df)
 
-        logger.info(f"Filtered from {original_count} to {len(df)} posts meeting criteria")
+        results = {}
+        for term, frames in pages.items():
+            if not scraped[term]:
+                logger.warning(f"No results from search: '{term}'")
+            df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+            logger.info(f"'{term}': filtered from {scraped[term]} to {len(df)} posts meeting criteria")
+            results[term] = (df, scraped[term])
 
-        return df, original_count
+        return results
 
     def scrape_user(
         self,
@@ -300,29 +367,13 @@ class TikTokScraper:
 
         return df
 
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=2, min=2, max=8))
-    def _start_keyword_search_run(
-        self,
-        keyword: str,
-        count: int = 50,
-        sort_type: int = 0,
-        publish_time: int = 0
-    ) -> str:
+    def _keyword_search_input(self, keyword: str, count: int = 50) -> Dict:
         """
-        Start Apify run for keyword search using Clockworks actor
+        Build Clockworks actor input for a keyword search
 
         Clockworks supports both hashtags and search queries:
         - Hashtags use "hashtags" parameter (without # prefix)
         - Search queries use "searchQueries" parameter
-
-        Args:
-            keyword: Search keyword/phrase or hashtag (with or without #)
-            count: Number of posts to retrieve
-            sort_type: Sort type (ignored by Clockworks - always relevance)
-            publish_time: Time filter (ignored by Clockworks)
-
-        Returns:
-            Apify run ID
         """
         # Determine if this is a hashtag or search query
         is_hashtag = keyword.startswith('#')
@@ -342,24 +393,10 @@ class TikTokScraper:
             actor_input["searchQueries"] = [clean_keyword]
             logger.info(f"Starting search query: '{clean_keyword}' (count={count})")
 
-        run = self.apify_client.actor(self.apify_actor_id).call(run_input=actor_input)
-
-        run_id = run["id"]
-        logger.info(f"Apify run started: {run_id}")
-        return run_id
-
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=2, min=2, max=8))
-    def _start_hashtag_search_run(self, hashtag: str, count: int = 50) -> str:
-        """
-        Start Apify run for hashtag search using Clockworks actor
+        return actor_input
 
-        Args:
-            hashtag: Hashtag name (without #)
-            count: Number of posts to retrieve
-
-        Returns:
-            Apify run ID
-        """
+    def _hashtag_search_input(self, hashtag: str, count: int = 50) -> Dict:
+        """Build Clockworks actor input for a hashtag search."""
         # Remove # prefix if present
         clean_hashtag = hashtag[1:] if hashtag.startswith('#') else hashtag
 
@@ -373,11 +410,7 @@ class TikTokScraper:
 
         logger.info(f"Starting hashtag search: #{clean_hashtag} (count={count})")
 
-        run = self.apify_client.actor(self.apify_actor_id).call(run_input=actor_input)
-
-        run_id = run["id"]
-        logger.info(f"Apify run started: {run_id}")
-        return run_id
+        return actor_input
 
     @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=2, min=2, max=8))
     def _start_user_scrape_run(self, username: str, count: int = 50) -> str:
@@ -574,58 +607,59 @@ class TikTokScraper:
         Returns:
             DataFrame with normalized posts
         """
-        normalized_data = []
-
         logger.info(f"Normalizing {len(items)} posts from Clockworks")
 
-        for post in items:
-            try:
-                # Extract nested objects
-                author_meta = post.get("authorMeta", {})
-                video_meta = post.get("videoMeta", {})
-
-                # Build post data
-                post_id = str(post.get("id", ""))
-                username = author_meta.get("name", "")
-
-                post_data = {
-                    "post_id": post_id,
-                    "post_url": post.get("webVideoUrl", f"https://www.tiktok.com/@{username}/video/{post_id}"),
-                    "username": username,
-                    "display_name": author_meta.get("nickName", ""),
-                    "follower_count": author_meta.get("fans", 0),
-                    "is_verified": author_meta.get("verified", False),
-
-                    # Engagement metrics
-                    "views": post.get("playCount", 0),
-                    "likes": post.get("diggCount", 0),
-                    "comments": post.get("commentCount", 0),
-                    "shares": post.get("shareCount", 0),
-
-                    # Video metadata
-                    "caption": post.get("text", "")[:2200],
-                    "length_sec": video_meta.get("duration", 0),
-                    "download_url": "",  # Clockworks doesn't provide download URL in basic output
-
-                    # Timestamp (ISO format from Clockworks)
-                    "posted_at": post.get("createTimeISO"),
-
-                    # Platform
-                    "platform_id": self.platform_id
-                }
-
-                # Validate essential fields
-                if not post_data["post_id"] or not post_data["username"]:
-                    logger.warning(f"Skipping post with missing essential fields")
-                    continue
-
-                normalized_data.append(post_data)
-
-            except Exception as e:
-                logger.warning(f"Error normalizing post: {e}")
-                continue
-
-        df = pd.DataFrame(normalized_data)
+        # Drop malformed items up front
+        valid = [
+            post for post in items
+            if isinstance(post, dict)
+            and isinstance(post.get("authorMeta", {}), dict)
+            and isinstance(post.get("videoMeta", {}), dict)
+            and isinstance(post.get("text", ""), str)
+        ]
+        if len(valid) < len(items):
+            logger.warning(f"Skipping {len(items) - len(valid)} malformed posts")
+
+        # Extract nested objects
+        authors = [post.get("authorMeta", {}) for post in valid]
+        video_metas = [post.get("videoMeta", {}) for post in valid]
+        post_ids = [str(value) for value in field(valid, "id", "")]
+        usernames = field(authors, "name", "")
+
+        df = pd.DataFrame({
+            "post_id": post_ids,
+            "post_url": [
+                post.get("webVideoUrl", f"https://www.tiktok.com/@{username}/video/{post_id}")
+                for post, username, post_id in zip(valid, usernames, post_ids)
+            ],
+            "username": usernames,
+            "display_name": field(authors, "nickName", ""),
+            "follower_count": field(authors, "fans", 0),
+            "is_verified": field(authors, "verified", False),
+
+            # Engagement metrics
+            "views": field(valid, "playCount", 0),
+            "likes": field(valid, "diggCount", 0),
+            "comments": field(valid, "commentCount", 0),
+            "shares": field(valid, "shareCount", 0),
+
+            # Video metadata
+            "caption": truncate_text(field(valid, "text", ""), 2200),
+            "length_sec": field(video_metas, "duration", 0),
+            "download_url": "",  # Clockworks doesn't provide download URL in basic output
+
+            # Timestamp (ISO format from Clockworks)
+            "posted_at": field(valid, "createTimeISO"),
+
+            # Platform
+            "platform_id": self.platform_id
+        }, index=pd.RangeIndex(len(valid)))
+
+        # Validate essential fields
+        essential = (df["post_id"] != "") & df["username"].astype(bool)
+        if not essential.all():
+            logger.warning(f"Skipping {int((~essential).sum())} posts with missing essential fields")
+            df = df[essential].reset_index(drop=True)
 
         if len(df) > 0:
             # Deduplicate by post_id
@@ -636,6 +670,7 @@ class TikTokScraper:
 
             logger.info(f"Normalized {len(df)} posts from {df['username'].nunique()} creators")
         else:
+            df = pd.DataFrame()
             logger.warning("No posts were successfully normalized")
 
         return df
@@ -731,9 +766,7 @@ class TikTokScraper:
         if 'posted_at' in df.columns:
             from datetime import timezone
             cutoff_date = datetime.now(timezone.utc) - timedelta(days=max_days_old)
-            df['posted_at_dt'] = pd.to_datetime(df['posted_at'], utc=True)
-            df = df[df['posted_at_dt'] >= cutoff_date]
-            df = df.drop(columns=['posted_at_dt'])
+            df = df[pd.to_datetime(df['posted_at'], utc=True) >= cutoff_date]
             logger.info(f"After recency filter (<{max_days_old} days): {len(df)}/{original_count} posts")
 
         # Filter 3: Creator size
@@ -768,26 +801,22 @@ class TikTokScraper:
         # First, upsert accounts (if they don't exist)
         account_ids = self._upsert_accounts(df)
 
-        # Prepare posts data
-        posts_data = []
-        for _, row in df.iterrows():
-            post_dict = {
-                "account_id": account_ids.get(row['username']),
-                "platform_id": self.platform_id,
-                "post_url": row['post_url'],
-                "post_id": row['post_id'],
-                "posted_at": row.get('posted_at'),
-                "views": int(row.get('views', 0)) if pd.notna(row.get('views')) else None,
-                "likes": int(row.get('likes', 0)) if pd.notna(row.get('likes')) else None,
-                "comments": int(row.get('comments', 0)) if pd.notna(row.get('comments')) else None,
-                "shares": int(row.get('shares', 0)) if pd.notna(row.get('shares')) else None,
-                "caption": row.get('caption'),
-                "length_sec": int(row.get('length_sec', 0)) if pd.notna(row.get('length_sec')) else None,
-                "import_source": import_source,
-                "is_own_content": False
-            }
-
-            posts_data.append(post_dict)
+        # Prepare posts data column by column
+        posts_data = records({
+            "account_id": [account_ids.get(username) for username in df['username'].tolist()],
+            "platform_id": [self.platform_id] * len(df),
+            "post_url": df['post_url'].tolist(),
+            "post_id": df['post_id'].tolist(),
+            "posted_at": column_values(df, 'posted_at'),
+            "views": nullable_ints(df, 'views'),
+            "likes": nullable_ints(df, 'likes'),
+            "comments": nullable_ints(df, 'comments'),
+            "shares": nullable_ints(df, 'shares'),
+            "caption": column_values(df, 'caption'),
+            "length_sec": nullable_ints(df, 'length_sec'),
+            "import_source": [import_source] * len(df),
+            "is_own_content": [False] * len(df)
+        })
 
         # Upsert posts
         post_ids = []
@@ -17,6 +17,7 @@ from datetime import datetime, timedelta, timezone
 from typing import List, Dict, Optional, Tuple
 from uuid import UUID
 
+import numpy as np
 import pandas as pd
 import requests
 from tqdm import tqdm
@@ -26,10 +27,24 @@ from apify_client import ApifyClient
 
 from ..core.database import get_supabase_client
 from ..core.config import Config
+from .apify_runs import ApifyRunOrchestrator
+from .columnar import (
+    bools,
+    column_values,
+    field,
+    nullable_ints,
+    parse_timestamps,
+    records,
+    truncate_text,
+)
 
 
 logger = logging.getLogger(__name__)
 
+# Outlier pass: account ids per .in_() filter, rows per paginated request
+ACCOUNT_ID_CHUNK_SIZE = 200
+PAGE_SIZE = 1000
+
 
 class TwitterScraper:
     """
@@ -101,11 +116,16 @@ class TwitterScraper:
         sort: str = "Latest",
         language: str = "en",
         project_slug: Optional[str] = None,
-        timeout: int = 900
+        timeout: int = 900,
+        max_concurrent_runs: Optional[int] = 1
     ) -> Dict:
         """
         Search Twitter by keywords/hashtags
 
+        Queries are batched 5 per actor run. The actor allows one concurrent
+        run, so by default batch runs go one after another; each dataset is
+        fetched in pages as soon as its run finishes and saved page by page.
+
         Args:
             search_terms: List of search terms or full Twitter queries (if raw_query=True)
             max_tweets: Tweets per term (minimum 50, enforced)
@@ -123,7 +143,9 @@ class TwitterScraper:
             sort: "Latest" or "Top"
             language: Tweet language ISO code (default: en)
             project_slug: Project slug to link results
-            timeout: Apify timeout in seconds (default: 900 = 15 minutes)
+            timeout: Apify timeout in seconds per run (default: 900 = 15 minutes)
+            max_concurrent_runs: Cap on batch runs in flight (default: 1, the
+                actor limit; None = all batches, up to MAX_CONCURRENT_RUNS)
 
         Returns:
             Dict with keys:
@@ -153,34 +175,53 @@ class TwitterScraper:
             logger.info(f"Using {len(queries)} raw queries")
 
         # Batch queries (max 5 per run)
-        all_tweets = []
         batch_size = 5
-        last_run_id = None
-        last_dataset_id = None
-
-        for i in range(0, len(queries), batch_size):
-            batch = queries[i:i + batch_size]
-            logger.info(f"Processing batch {i//batch_size + 1}: {len(batch)} queries")
-
-            # Start Apify run
-            run_id = self._start_search_run(
+        batches = [queries[i:i + batch_size] for i in range(0, len(queries), batch_size)]
+        run_inputs = [
+            (batch_no, self._search_run_input(
                 batch, max_tweets, only_verified, only_blue,
                 only_image, only_video, only_quote, sort, language
-            )
+            ))
+            for batch_no, batch in enumerate(batches, 1)
+        ]
+        logger.info(f"Starting {len(batches)} batch runs ({max_concurrent_runs or 'all'} at a time)")
+
+        project_id = None
+        if project_slug:
+            project_id = self._get_project_id(project_slug)
 
-            # Poll for completion
-            result = self._poll_apify_run(run_id, timeout)
+        # Normalize and save each dataset page as it arrives
+        orchestrator = ApifyRunOrchestrator(
+            self.apify_client, self.apify_token, self.apify_actor_id,
+            max_concurrent_runs=max_concurrent_runs
+        )
+        post_ids = []
+        seen_post_ids = set()
+        skipped_count = 0
+        fetched_count = 0
 
-            # Fetch dataset
-            items = self._fetch_dataset(result['datasetId'])
+        for batch_no, items in orchestrator.iter_pages(run_inputs, timeout=timeout):
+            fetched_count += len(items)
+            df, skipped = self._normalize_tweets(items)
+            skipped_count += skipped
+            if len(df) == 0:
+                continue
+
+            # Deduplicate across pages and batches (first occurrence wins)
+            df = df[~df['post_id'].isin(seen_post_ids)]
+            seen_post_ids.update(df['post_id'])
+            if len(df) == 0:
+                continue
 
-            all_tweets.extend(items)
+            logger.info(f"Batch {batch_no}: saving {len(df)} tweets")
+            post_ids.extend(self.save_posts_to_db(df, project_id=project_id, import_source="search"))
 
-            # Store IDs (for single batch scenarios)
-            last_run_id = run_id
-            last_dataset_id = result['datasetId']
+        # Store IDs (for single batch scenarios)
+        last_run = orchestrator.runs[len(batches)] if batches else None
+        last_run_id = last_run.run_id if last_run else None
+        last_dataset_id = last_run.dataset_id if last_run else None
 
-        if not all_tweets:
+        if not fetched_count:
             logger.warning("No tweets found")
             return {
                 'terms_count': len(search_terms),
@@ -189,17 +230,7 @@ class TwitterScraper:
                 'apify_dataset_id': last_dataset_id
             }
 
-        # Normalize to DataFrame
-        df, skipped_count = self._normalize_tweets(all_tweets)
-
-        logger.info(f"Fetched {len(df)} tweets total")
-
-        # Save to database
-        project_id = None
-        if project_slug:
-            project_id = self._get_project_id(project_slug)
-
-        post_ids = self.save_posts_to_db(df, project_id=project_id, import_source="search")
+        logger.info(f"Fetched {fetched_count} tweets total, saved {len(post_ids)}")
 
         return {
             'terms_count': len(search_terms),
@@ -222,7 +253,7 @@ class TwitterScraper:
         Scrape accounts linked to project with date chunking
 
         Automatically chunks date ranges to respect ~800 tweet limit per query.
-        Calculates 3SD outliers per account.
+        Calculates 3SD outliers per account in one pass after scraping.
 
         Args:
             project_id: Project UUID or slug (will be converted to UUID)
@@ -268,6 +299,7 @@ class TwitterScraper:
         logger.info(f"Split into {len(date_chunks)} date chunks")
 
         stats = {"accounts_processed": len(accounts), "total_tweets": 0, "outliers": 0}
+        scraped_accounts = []
 
         # Scrape each account with date chunking
         for account in accounts:
@@ -329,12 +361,18 @@ class TwitterScraper:
             post_ids = self.save_posts_to_db(df, project_id=project_id, import_source="scrape")
 
             stats["total_tweets"] += len(post_ids)
+            scraped_accounts.append(account)
 
-            # Calculate outliers for this account
-            outliers = self._calculate_outliers(account['id'], threshold_sd=3.0)
-            stats["outliers"] += len(outliers)
+            logger.info(f"@{username}: {len(post_ids)} tweets")
 
-            logger.info(f"@{username}: {len(post_ids)} tweets, {len(outliers)} outliers")
+        # Calculate outliers for all scraped accounts in one pass
+        if scraped_accounts:
+            outliers = self._calculate_outliers_bulk(
+                [account['id'] for account in scraped_accounts], threshold_sd=3.0
+            )
+            for account in scraped_accounts:
+                logger.info(f"@{account['platform_username']}: {len(outliers[account['id']])} outliers")
+            stats["outliers"] = sum(len(ids) for ids in outliers.values())
 
         return stats
 
@@ -478,7 +516,33 @@ class TwitterScraper:
         Returns:
             Apify run ID
         """
-        actor_input = {
+        actor_input = self._search_run_input(
+            search_terms, max_items, only_verified, only_blue,
+            only_image, only_video, only_quote, sort, language
+        )
+
+        logger.info(f"Starting Twitter search: {len(search_terms)} queries, {max_items} tweets each")
+
+        run = self.apify_client.actor(self.apify_actor_id).call(run_input=actor_input)
+
+        run_id = run["id"]
+        logger.info(f"Apify run started: {run_id}")
+        return run_id
+
+    def _search_run_input(
+        self,
+        search_terms: List[str],
+        max_items: int = 100,
+        only_verified: bool = False,
+        only_blue: bool = False,
+        only_image: bool = False,
+        only_video: bool = False,
+        only_quote: bool = False,
+        sort: str = "Latest",
+        language: str = "en"
+    ) -> Dict:
+        """Build the tweet-scraper actor input for a batch of queries (max 5)."""
+        return {
             "searchTerms": search_terms,
             "maxItems": max_items,
             "sort": sort,
@@ -491,14 +555,6 @@ class TwitterScraper:
             "includeSearchTerms": False  # Don't need search term in output
         }
 
-        logger.info(f"Starting Twitter search: {len(search_terms)} queries, {max_items} tweets each")
-
-        run = self.apify_client.actor(self.apify_actor_id).call(run_input=actor_input)
-
-        run_id = run["id"]
-        logger.info(f"Apify run started: {run_id}")
-        return run_id
-
     @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=2, min=2, max=8))
     def _poll_apify_run(self, run_id: str, timeout: int = 300) -> Dict:
         """
@@ -550,50 +606,52 @@ class TwitterScraper:
         Returns:
             Dict with has_video, has_image, has_media, media_type
         """
-        has_video = False
-        has_image = False
-        has_media = False
-        media_type = "text"
-
-        # Check for media fields that Apify might provide
-        media = tweet.get("media", [])
-        photos = tweet.get("photos", [])
-        videos = tweet.get("videos", [])
-
-        # Check for video
-        if videos or (media and any(m.get("type") == "video" for m in media)):
-            has_video = True
-            has_media = True
-            media_type = "video"
-
-        # Check for images/photos
-        if photos or (media and any(m.get("type") in ["photo", "image"] for m in media)):
-            has_image = True
-            has_media = True
-            # If also has video, it's mixed
-            if has_video:
-                media_type = "mixed"
-            else:
-                media_type = "image"
+        return {key: values[0] for key, values in self._detect_media_types([tweet]).items()}
+
+    def _detect_media_types(self, tweets: List[Dict]) -> Dict[str, list]:
+        """
+        Detect media types for many tweets at once
 
-        # Check for quote tweet (has media type of quote)
-        if tweet.get("isQuote") and not has_video and not has_image:
-            media_type = "quote"
-            has_media = True
+        - video: non-empty "videos", or a "media" entry of type video
+        - image: non-empty "photos", or a "media" entry of type photo/image
+        - both → "mixed"; a quote tweet without video/image → "quote"
+        - otherwise "text" (t.co links alone don't tell the media type)
+
+        Non-list "media" values and non-dict entries are ignored.
+
+        Args:
+            tweets: Raw tweet dicts from Apify
 
-        # Fallback: Check for t.co links in text (might indicate media)
-        # But we can't determine type, so leave as text
-        text = tweet.get("text", "")
-        if not has_media and "https://t.co/" in text and "pic.twitter.com" not in text:
-            # Might have media, but we can't tell type without fetching
-            # Keep as text for now
-            pass
+        Returns:
+            Dict of columns: has_video, has_image, has_media, media_type
+        """
+        media_types = [
+            {m.get("type") for m in tweet.get("media") if isinstance(m, dict)}
+            if isinstance(tweet.get("media"), list) else set()
+            for tweet in tweets
+        ]
+        has_video = np.array([
+            bool(tweet.get("videos")) or "video" in types
+            for tweet, types in zip(tweets, media_types)
+        ], dtype=bool)
+        has_image = np.array([
+            bool(tweet.get("photos")) or "photo" in types or "image" in types
+            for tweet, types in zip(tweets, media_types)
+        ], dtype=bool)
+        is_quote = np.array([bool(tweet.get("isQuote")) for tweet in tweets], dtype=bool)
+        is_quote &= ~has_video & ~has_image
+
+        media_type = np.select(
+            [has_video & has_image, has_video, has_image, is_quote],
+            ["mixed", "video", "image", "quote"],
+            default="text"
+        )
 
         return {
-            "has_video": has_video,
-            "has_image": has_image,
-            "has_media": has_media,
-            "media_type": media_type
+            "has_video": has_video.tolist(),
+            "has_image": has_image.tolist(),
+            "has_media": (has_video | has_image | is_quote).tolist(),
+            "media_type": media_type.tolist()
         }
 
     @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=2, min=2, max=8))
@@ -657,93 +715,66 @@ class TwitterScraper:
         Returns:
             Tuple of (DataFrame with normalized tweets, count of skipped malformed tweets)
         """
-        normalized_data = []
-        skipped_count = 0
-
         logger.info(f"Normalizing {len(items)} tweets")
 
-        for tweet in items:
-            try:
-                # Skip if tweet is not a dictionary (data corruption from Apify)
-                if not isinstance(tweet, dict):
-                    logger.warning(f"Skipping non-dict tweet: {type(tweet).__name__}")
-                    skipped_count += 1
-                    continue
-
-                author = tweet.get("author", {})
-
-                # Skip if author is not a dictionary (data corruption from Apify)
-                if not isinstance(author, dict):
-                    logger.warning(f"Skipping tweet with non-dict author (ID: {tweet.get('id', 'unknown')}): {type(author).__name__}")
-                    skipped_count += 1
-                    continue
-
-                # Parse timestamp
-                created_at_str = tweet.get("createdAt")
-                posted_at = None
-                if created_at_str:
-                    # Format: "Fri Nov 24 17:49:36 +0000 2023"
-                    try:
-                        posted_at = datetime.strptime(created_at_str, "%a %b %d %H:%M:%S %z %Y").isoformat()
-                    except:
-                        logger.warning(f"Could not parse date: {created_at_str}")
-
-                # Detect media type
-                media_info = self._detect_media_type(tweet)
-
-                tweet_data = {
-                    "post_id": str(tweet.get("id", "")),
-                    "post_url": tweet.get("url", ""),
-                    "username": author.get("userName", ""),
-                    "display_name": author.get("name", ""),
-                    "follower_count": author.get("followers", 0),
-                    "is_verified": author.get("isVerified", False) or author.get("isBlueVerified", False),
-
-                    # Engagement metrics
-                    "likes": tweet.get("likeCount", 0),
-                    "retweets": tweet.get("retweetCount", 0),
-                    "replies": tweet.get("replyCount", 0),
-                    "quotes": tweet.get("quoteCount", 0),
-                    "bookmarks": tweet.get("bookmarkCount", 0),
-                    "views": tweet.get("viewCount", 0),  # Twitter impressions/views
-
-                    # Content
-                    "caption": tweet.get("text", "")[:2200],
-                    "lang": tweet.get("lang", ""),
-
-                    # Metadata
-                    "posted_at": posted_at,
-                    "is_reply": tweet.get("isReply", False),
-                    "is_retweet": tweet.get("isRetweet", False),
-                    "is_quote": tweet.get("isQuote", False),
-
-                    # Media type (Phase 2)
-                    "has_video": media_info["has_video"],
-                    "has_image": media_info["has_image"],
-                    "has_media": media_info["has_media"],
-                    "media_type": media_info["media_type"],
-
-                    # Platform
-                    "platform_id": self.platform_id,
-                    "video_type": "post"  # All tweets are "post" type
-                }
-
-                # Validate essential fields
-                if not tweet_data["post_id"] or not tweet_data["username"]:
-                    logger.warning(f"Skipping tweet with missing essential fields")
-                    skipped_count += 1
-                    continue
-
-                normalized_data.append(tweet_data)
-
-            except Exception as e:
-                # Log which tweet failed and why (usually malformed data from Apify)
-                tweet_id = tweet.get("id", "unknown") if isinstance(tweet, dict) else "non-dict"
-                logger.warning(f"Skipping malformed tweet {tweet_id}: {type(e).__name__} - {str(e)}")
-                skipped_count += 1
-                continue
-
-        df = pd.DataFrame(normalized_data)
+        # Drop malformed items up front (data corruption from Apify)
+        valid = [
+            tweet for tweet in items
+            if isinstance(tweet, dict)
+            and isinstance(tweet.get("author", {}), dict)
+            and isinstance(tweet.get("text", ""), str)
+        ]
+        skipped_count = len(items) - len(valid)
+        if skipped_count:
+            logger.warning(f"Skipping {skipped_count} tweets that are not dicts or have a non-dict author or non-string text")
+
+        authors = [tweet.get("author", {}) for tweet in valid]
+        media = self._detect_media_types(valid)
+
+        df = pd.DataFrame({
+            "post_id": [str(value) for value in field(valid, "id", "")],
+            "post_url": field(valid, "url", ""),
+            "username": field(authors, "userName", ""),
+            "display_name": field(authors, "name", ""),
+            "follower_count": field(authors, "followers", 0),
+            "is_verified": [
+                author.get("isVerified", False) or author.get("isBlueVerified", False)
+                for author in authors
+            ],
+
+            # Engagement metrics
+            "likes": field(valid, "likeCount", 0),
+            "retweets": field(valid, "retweetCount", 0),
+            "replies": field(valid, "replyCount", 0),
+            "quotes": field(valid, "quoteCount", 0),
+            "bookmarks": field(valid, "bookmarkCount", 0),
+            "views": field(valid, "viewCount", 0),  # Twitter impressions/views
+
+            # Content
+            "caption": truncate_text(field(valid, "text", ""), 2200),
+            "lang": field(valid, "lang", ""),
+
+            # Metadata — format: "Fri Nov 24 17:49:36 +0000 2023"
+            "posted_at": parse_timestamps(field(valid, "createdAt"), "%a %b %d %H:%M:%S %z %Y"),
+            "is_reply": field(valid, "isReply", False),
+            "is_retweet": field(valid, "isRetweet", False),
+            "is_quote": field(valid, "isQuote", False),
+
+            # Media type (Phase 2)
+            **media,
+
+            # Platform
+            "platform_id": self.platform_id,
+            "video_type": "post"  # All tweets are "post" type
+        }, index=pd.RangeIndex(len(valid)))
+
+        # Validate essential fields
+        essential = (df["post_id"] != "") & df["username"].astype(bool)
+        if not essential.all():
+            missing = int((~essential).sum())
+            logger.warning(f"Skipping {missing} tweets with missing essential fields")
+            skipped_count += missing
+            df = df[essential].reset_index(drop=True)
 
         if len(df) > 0:
             # Deduplicate by post_id
@@ -754,6 +785,7 @@ class TwitterScraper:
 
             logger.info(f"Normalized {len(df)} tweets from {df['username'].nunique()} accounts")
         else:
+            df = pd.DataFrame()
             logger.warning("No tweets were successfully normalized")
 
         if skipped_count > 0:
@@ -785,38 +817,33 @@ class TwitterScraper:
         # First, upsert accounts
         account_ids = self._upsert_accounts(df)
 
-        # Prepare posts data
-        posts_data = []
-        for _, row in df.iterrows():
-            # Twitter metrics mapping:
-            # - viewCount → views (impressions)
-            # - likes → likes
-            # - replies → comments
-            # - retweets → shares
-            # - quotes, bookmarks → currently not stored (could add to platform_specific_data in future)
-
-            post_dict = {
-                "account_id": account_ids.get(row['username']),
-                "platform_id": self.platform_id,
-                "post_url": row['post_url'],
-                "post_id": row['post_id'],
-                "posted_at": row.get('posted_at'),
-                "views": int(row.get('views', 0)) if pd.notna(row.get('views')) else None,
-                "likes": int(row.get('likes', 0)) if pd.notna(row.get('likes')) else None,
-                "comments": int(row.get('replies', 0)) if pd.notna(row.get('replies')) else None,
-                "shares": int(row.get('retweets', 0)) if pd.notna(row.get('retweets')) else None,
-                "caption": row.get('caption'),
-                "video_type": "post",
-                "import_source": import_source,
-                "is_own_content": False,
-                # Media type (Phase 2)
-                "has_video": bool(row.get('has_video', False)),
-                "has_image": bool(row.get('has_image', False)),
-                "has_media": bool(row.get('has_media', False)),
-                "media_type": row.get('media_type', 'text')
-            }
-
-            posts_data.append(post_dict)
+        # Prepare posts data column by column
+        # Twitter metrics mapping:
+        # - viewCount → views (impressions)
+        # - likes → likes
+        # - replies → comments
+        # - retweets → shares
+        # - quotes, bookmarks → currently not stored (could add to platform_specific_data in future)
+        posts_data = records({
+            "account_id": [account_ids.get(username) for username in df['username'].tolist()],
+            "platform_id": [self.platform_id] * len(df),
+            "post_url": df['post_url'].tolist(),
+            "post_id": df['post_id'].tolist(),
+            "posted_at": column_values(df, 'posted_at'),
+            "views": nullable_ints(df, 'views'),
+            "likes": nullable_ints(df, 'likes'),
+            "comments": nullable_ints(df, 'replies'),
+            "shares": nullable_ints(df, 'retweets'),
+            "caption": column_values(df, 'caption'),
+            "video_type": ["post"] * len(df),
+            "import_source": [import_source] * len(df),
+            "is_own_content": [False] * len(df),
+            # Media type (Phase 2)
+            "has_video": bools(df, 'has_video'),
+            "has_image": bools(df, 'has_image'),
+            "has_media": bools(df, 'has_media'),
+            "media_type": column_values(df, 'media_type', 'text')
+        })
 
         # Upsert posts
         post_ids = []  # Twitter post IDs to return (e.g., "1859234234")
@@ -980,7 +1007,7 @@ class TwitterScraper:
     def _get_project_accounts(self, project_id: str) -> List[Dict]:
         """Get Twitter accounts linked to project"""
         result = self.supabase.table('project_accounts')\
-            .select('account_id, accounts(id, platform_username)')\
+            .select('account_id, accounts(id, platform_id, platform_username)')\
             .eq('project_id', project_id)\
             .execute()
 
@@ -988,22 +1015,15 @@ class TwitterScraper:
             return []
 
         # Filter to Twitter accounts
-        twitter_accounts = []
-        for link in result.data:
-            account = link.get('accounts')
-            if account:
-                # Check if this account belongs to Twitter platform
-                acc_check = self.supabase.table('accounts')\
-                    .select('id, platform_id, platform_username')\
-                    .eq('id', account['id'])\
-                    .eq('platform_id', self.platform_id)\
-                    .single()\
-                    .execute()
-
-                if acc_check.data:
-                    twitter_accounts.append(acc_check.data)
-
-        return twitter_accounts
+        return [
+            {
+                'id': account['id'],
+                'platform_id': account['platform_id'],
+                'platform_username': account['platform_username']
+            }
+            for account in (link.get('accounts') for link in result.data)
+            if account and account.get('platform_id') == self.platform_id
+        ]
 
     def _calculate_outliers(
         self,
@@ -1011,7 +1031,7 @@ class TwitterScraper:
         threshold_sd: float = 3.0
     ) -> List[str]:
         """
-        Calculate statistical outliers (3SD from trimmed mean)
+        Calculate statistical outliers (3SD from trimmed mean) for one account
 
         Args:
             account_id: Account UUID
@@ -1020,53 +1040,124 @@ class TwitterScraper:
         Returns:
             List of outlier post IDs
         """
-        # Get all posts for this account
-        result = self.supabase.table('posts')\
-            .select('id, likes')\
-            .eq('account_id', account_id)\
-            .execute()
-
-        if not result.data or len(result.data) < 10:
-            logger.warning(f"Not enough posts for outlier detection (need 10+, have {len(result.data) if result.data else 0})")
-            return []
+        return self._calculate_outliers_bulk([account_id], threshold_sd).get(account_id, [])
 
-        # Extract engagement scores (likes)
-        scores = [p['likes'] for p in result.data if p.get('likes')]
+    def _calculate_outliers_bulk(
+        self,
+        account_ids: List[str],
+        threshold_sd: float = 3.0
+    ) -> Dict[str, List[str]]:
+        """
+        Calculate statistical outliers (3SD from trimmed mean) for many accounts
 
-        if len(scores) < 10:
-            logger.warning("Not enough valid engagement scores")
-            return []
+        One pass: posts of all accounts are fetched with paginated,
+        column-projected queries, the statistics run per account group on
+        NumPy arrays, and every post_review flag is written in one chunked
+        upsert.
 
-        # Calculate trimmed mean (remove top/bottom 10%)
-        sorted_scores = sorted(scores)
-        trim_count = int(len(sorted_scores) * 0.1)
-        trimmed_scores = sorted_scores[trim_count:-trim_count] if trim_count > 0 else sorted_scores
+        Per account (needs 10+ posts with non-zero likes):
+        - trimmed mean/std of likes with the top/bottom 10% removed
+        - outlier if likes > mean + threshold_sd * std
+        - outlier_score = likes / mean
 
-        import numpy as np
-        mean = np.mean(trimmed_scores)
-        std = np.std(trimmed_scores)
+        Args:
+            account_ids: Account UUIDs
+            threshold_sd: Standard deviation threshold
 
-        threshold = mean + (threshold_sd * std)
+        Returns:
+            Dict mapping account_id to its outlier post IDs (accounts with
+            too few posts map to an empty list)
+        """
+        account_ids = list(dict.fromkeys(account_ids))
+        outliers: Dict[str, List[str]] = {account_id: [] for account_id in account_ids}
+        posts = self._fetch_account_likes(account_ids)
+        if posts.empty:
+            logger.warning("Not enough posts for outlier detection (need 10+, have 0)")
+            return outliers
+
+        now = datetime.now().isoformat()
+        review_rows = []
+
+        for account_id, group in posts.groupby('account_id', sort=False):
+            likes = group['likes'].to_numpy(dtype=float)
+
+            # Engagement scores: posts with non-zero likes
+            scores = np.sort(likes[np.nan_to_num(likes) != 0])
+            if len(scores) < 10:
+                logger.warning(
+                    f"Not enough posts for outlier detection on account {account_id} "
+                    f"(need 10+, have {len(scores)} with likes)"
+                )
+                continue
 
-        logger.info(f"Outlier detection: mean={mean:.0f}, std={std:.0f}, threshold={threshold:.0f}")
+            # Trimmed mean (remove top/bottom 10%)
+            trim_count = int(len(scores) * 0.1)
+            trimmed = scores[trim_count:-trim_count] if trim_count > 0 else scores
+            mean = np.mean(trimmed)
+            std = np.std(trimmed)
+            threshold = mean + (threshold_sd * std)
+
+            is_outlier = likes > threshold
+            outlier_ids = group['id'].to_numpy()[is_outlier].tolist()
+            outlier_likes = likes[is_outlier]
+            outlier_scores = (outlier_likes / mean if mean > 0 else np.zeros(len(outlier_likes))).tolist()
+
+            outliers[account_id] = outlier_ids
+            review_rows.extend(
+                {
+                    'post_id': post_id,
+                    'is_outlier': True,
+                    'outlier_score': score,
+                    'updated_at': now
+                }
+                for post_id, score in zip(outlier_ids, outlier_scores)
+            )
 
-        # Find outliers
-        outliers = []
-        for post in result.data:
-            if post.get('likes', 0) > threshold:
-                outliers.append(post['id'])
+            logger.debug(
+                f"Outlier detection for {account_id}: mean={mean:.0f}, std={std:.0f}, "
+                f"threshold={threshold:.0f}, outliers={len(outlier_ids)}"
+            )
 
-                # Mark as outlier in post_review table (if not already marked)
-                try:
-                    self.supabase.table('post_review').upsert({
-                        'post_id': post['id'],
-                        'is_outlier': True,
-                        'outlier_score': post['likes'] / mean if mean > 0 else 0,
-                        'updated_at': datetime.now().isoformat()
-                    }, on_conflict='post_id').execute()
-                except Exception as e:
-                    logger.warning(f"Error marking outlier: {e}")
+        # Mark outliers in post_review table (one chunked upsert)
+        chunk_size = 1000
+        for i in range(0, len(review_rows), chunk_size):
+            try:
+                self.supabase.table('post_review').upsert(
+                    review_rows[i:i + chunk_size],
+                    on_conflict='post_id'
+                ).execute()
+            except Exception as e:
+                logger.warning(f"Error marking outliers: {e}")
 
-        logger.info(f"Found {len(outliers)} outliers")
+        logger.info(f"Found {len(review_rows)} outliers across {len(account_ids)} accounts")
 
         return outliers
+
+    def _fetch_account_likes(self, account_ids: List[str]) -> pd.DataFrame:
+        """
+        Fetch id, account_id and likes of every post of the given accounts
+
+        Args:
+            account_ids: Account UUIDs (queried in chunks, each paginated)
+
+        Returns:
+            DataFrame with columns id, account_id, likes
+        """
+        rows = []
+        for i in range(0, len(account_ids), ACCOUNT_ID_CHUNK_SIZE):
+            chunk = account_ids[i:i + ACCOUNT_ID_CHUNK_SIZE]
+            offset = 0
+            while True:
+                result = self.supabase.table('posts')\
+                    .select('id, account_id, likes')\
+                    .in_('account_id', chunk)\
+                    .order('id')\
+                    .range(offset, offset + PAGE_SIZE - 1)\
+                    .execute()
+                page = result.data or []
+                rows.extend(page)
+                if len(page) < PAGE_SIZE:
+                    break
+                offset += PAGE_SIZE
+
+        return pd.DataFrame(rows, columns=['id', 'account_id', 'likes'])
@@ -3,21 +3,18 @@
 Computes p25/median/p75 percentile benchmarks per awareness level × creative format
 cohort. Supports fallback chain (exact → drop length → drop objective → drop format
 → brand-wide) and anti-noise guardrails (min sample thresholds, winsorization).
+Cohort statistics are computed for all cohorts at once by CohortStatsEngine.
 """
 
 from __future__ import annotations
 
 import logging
-import math
 from datetime import date
 from typing import Any, Dict, List, Optional
 from uuid import UUID
 
-from .helpers import (
-    _safe_numeric,
-    extract_conversion_value,
-    extract_conversions,
-)
+from .cohort_stats import CohortStats, CohortStatsEngine
+from .helpers import _safe_numeric
 from .models import BaselineSnapshot, RunConfig
 
 logger = logging.getLogger(__name__)
@@ -63,7 +60,8 @@ class BaselineService:
         2. Group into cohorts by (awareness_level, creative_format).
         3. Filter: cohort must meet min impressions + spend thresholds.
         4. Winsorize: clip extreme values.
-        5. Compute p25/median/p75 on winsorized data.
+        5. Compute p25/median/p75 on winsorized data (all cohorts in one
+           CohortStatsEngine pass).
         6. Store/upsert with run_id if provided.
 
         Args:
@@ -117,6 +115,21 @@ class BaselineService:
         # Group into cohorts
         cohorts = self._group_into_cohorts(perf_data)
 
+        # Percentiles for every cohort, awareness roll-up and the brand at once
+        cohort_stats, awareness_stats, brand_stats = CohortStatsEngine(
+            cohorts, run_config.primary_conversion_event, run_config.value_field,
+        ).compute(winsorize_pct)
+        min_sample_size = self._get_threshold(
+            run_config, "baseline_min_sample_size", self.MIN_SAMPLE_SIZE
+        )
+        snapshot_args = dict(
+            brand_id=brand_id,
+            org_id=org_id,
+            run_id=run_id,
+            date_range_start=date_range_start,
+            date_range_end=date_range_end,
+        )
+
         # Compute baselines per cohort
         baselines: List[BaselineSnapshot] = []
         for cohort_key, cohort_rows in cohorts.items():
@@ -129,7 +142,7 @@ class BaselineService:
             total_spend = sum(
                 _safe_numeric(r.get("spend")) or 0 for r in cohort_rows
             )
-            unique_ads = len(set(r.get("meta_ad_id") for r in cohort_rows if r.get("meta_ad_id")))
+            stats = cohort_stats[cohort_key]
 
             if total_impressions < min_impressions or total_spend < min_spend:
                 logger.debug(
@@ -138,65 +151,35 @@ class BaselineService:
                 )
                 continue
 
-            if unique_ads < self._get_threshold(run_config, "baseline_min_unique_ads", self.MIN_UNIQUE_ADS):
+            if stats.unique_ads < self._get_threshold(run_config, "baseline_min_unique_ads", self.MIN_UNIQUE_ADS):
                 continue
 
-            baseline = self._compute_cohort_baseline(
-                cohort_rows,
-                brand_id=brand_id,
-                org_id=org_id,
-                run_id=run_id,
-                awareness_level=awareness_level,
-                creative_format=creative_format,
-                date_range_start=date_range_start,
-                date_range_end=date_range_end,
-                winsorize_pct=winsorize_pct,
-                run_config=run_config,
-            )
-            if baseline:
-                baselines.append(baseline)
-
-        # Compute per-awareness-level roll-ups (all formats combined)
-        awareness_rollups: Dict[str, List[Dict]] = {}
-        for (awareness, fmt), rows in cohorts.items():
-            if awareness not in awareness_rollups:
-                awareness_rollups[awareness] = []
-            awareness_rollups[awareness].extend(rows)
-
-        for awareness, rows in awareness_rollups.items():
-            if len(rows) >= self._get_threshold(run_config, "baseline_min_sample_size", self.MIN_SAMPLE_SIZE):
-                awareness_baseline = self._compute_cohort_baseline(
-                    rows,
-                    brand_id=brand_id,
-                    org_id=org_id,
-                    run_id=run_id,
+            if stats.sample_size >= min_sample_size:
+                baselines.append(self._snapshot_from_stats(
+                    stats,
+                    awareness_level=awareness_level,
+                    creative_format=creative_format,
+                    **snapshot_args,
+                ))
+
+        # Per-awareness-level roll-ups (all formats combined)
+        for awareness, stats in awareness_stats.items():
+            if stats.sample_size >= min_sample_size:
+                baselines.append(self._snapshot_from_stats(
+                    stats,
                     awareness_level=awareness,
                     creative_format="all",
-                    date_range_start=date_range_start,
-                    date_range_end=date_range_end,
-                    winsorize_pct=winsorize_pct,
-                    run_config=run_config,
-                )
-                if awareness_baseline:
-                    baselines.append(awareness_baseline)
+                    **snapshot_args,
+                ))
 
         # Also compute brand-wide baseline
-        all_rows = [r for rows in cohorts.values() for r in rows]
-        if len(all_rows) >= self._get_threshold(run_config, "baseline_min_sample_size", self.MIN_SAMPLE_SIZE):
-            brand_wide = self._compute_cohort_baseline(
-                all_rows,
-                brand_id=brand_id,
-                org_id=org_id,
-                run_id=run_id,
+        if brand_stats and brand_stats.sample_size >= min_sample_size:
+            baselines.append(self._snapshot_from_stats(
+                brand_stats,
                 awareness_level="all",
                 creative_format="all",
-                date_range_start=date_range_start,
-                date_range_end=date_range_end,
-                winsorize_pct=winsorize_pct,
-                run_config=run_config,
-            )
-            if brand_wide:
-                baselines.append(brand_wide)
+                **snapshot_args,
+            ))
 
         # Store baselines
         for baseline in baselines:
@@ -264,73 +247,68 @@ class BaselineService:
 
         return None
 
-    # =========================================================================
-    # Private Methods
-    # =========================================================================
+    async def get_baselines_for_ads(
+        self,
+        meta_ad_ids: List[str],
+        brand_id: UUID,
+        latest_classifications: Dict[str, Dict],
+        date_range_start: Optional[date] = None,
+        date_range_end: Optional[date] = None,
+    ) -> Dict[str, Optional[BaselineSnapshot]]:
+        """Batched get_baseline_for_ad: same fallback chain, one baseline query.
 
-    def _get_threshold(self, run_config: RunConfig, key: str, default: Any) -> Any:
-        """Read threshold from run_config.thresholds, falling back to class default.
+        Loads every baseline for the brand/date range once, keeps the latest
+        per (awareness_level, creative_format), and resolves each ad against
+        that lookup in memory.
 
         Args:
-            run_config: Run configuration.
-            key: Threshold key name.
-            default: Default value.
+            meta_ad_ids: Meta ad IDs to resolve.
+            brand_id: Brand UUID.
+            latest_classifications: meta_ad_id -> latest classification row
+                (creative_awareness_level, creative_format). Ads missing
+                here get the brand-wide baseline.
+            date_range_start: Optional date range filter.
+            date_range_end: Optional date range filter.
 
         Returns:
-            Threshold value.
+            Dict of meta_ad_id -> best matching BaselineSnapshot or None.
         """
-        return run_config.thresholds.get(key, default)
-
-    def _winsorize(self, values: List[float], pct: float = 0.02) -> List[float]:
-        """Clip values below pct and above (1-pct) percentile.
-
-        Reduces outlier noise before percentile computation.
-
-        Args:
-            values: List of numeric values.
-            pct: Percentile to clip at (e.g., 0.02 = 2%).
+        lookup = await self._load_latest_baselines(brand_id, date_range_start, date_range_end)
 
-        Returns:
-            Winsorized list.
-        """
-        if not values or len(values) < 3:
-            return values
+        resolved: Dict[str, Optional[BaselineSnapshot]] = {}
+        for meta_ad_id in meta_ad_ids:
+            cls_data = latest_classifications.get(meta_ad_id)
+            if not cls_data:
+                resolved[meta_ad_id] = lookup.get(("all", "all"))
+                continue
 
-        sorted_vals = sorted(values)
-        n = len(sorted_vals)
-        low_idx = max(0, int(math.floor(n * pct)))
-        high_idx = min(n - 1, int(math.ceil(n * (1 - pct))))
+            awareness = cls_data.get("creative_awareness_level", "all")
+            fmt = cls_data.get("creative_format", "all")
+            resolved[meta_ad_id] = None
+            for key in [(awareness, fmt), (awareness, "all"), ("all", fmt), ("all", "all")]:
+                candidate = lookup.get(key)
+                if candidate and candidate.is_sufficient:
+                    resolved[meta_ad_id] = candidate
+                    break
 
-        low_val = sorted_vals[low_idx]
-        high_val = sorted_vals[high_idx]
+        return resolved
 
-        return [max(low_val, min(high_val, v)) for v in values]
+    # =========================================================================
+    # Private Methods
+    # =========================================================================
 
-    def _percentile(self, values: List[float], p: float) -> Optional[float]:
-        """Compute percentile using linear interpolation.
+    def _get_threshold(self, run_config: RunConfig, key: str, default: Any) -> Any:
+        """Read threshold from run_config.thresholds, falling back to class default.
 
         Args:
-            values: Sorted list of numeric values.
-            p: Percentile (0-100).
+            run_config: Run configuration.
+            key: Threshold key name.
+            default: Default value.
 
         Returns:
-            Percentile value or None if empty.
+            Threshold value.
         """
-        if not values:
-            return None
-        sorted_vals = sorted(values)
-        n = len(sorted_vals)
-        if n == 1:
-            return sorted_vals[0]
-
-        k = (n - 1) * (p / 100.0)
-        f = math.floor(k)
-        c = math.ceil(k)
-
-        if f == c:
-            return sorted_vals[int(k)]
-
-        return sorted_vals[int(f)] * (c - k) + sorted_vals[int(c)] * (k - f)
+        return run_config.thresholds.get(key, default)
 
     async def _fetch_classified_performance(
         self,
@@ -464,145 +442,83 @@ class BaselineService:
         if len(rows) < self._get_threshold(run_config, "baseline_min_sample_size", self.MIN_SAMPLE_SIZE):
             return None
 
-        unique_ads = len(set(r.get("meta_ad_id") for r in rows if r.get("meta_ad_id")))
-
-        # ------------------------------------------------------------------
-        # Aggregate raw counts per ad first, then compute derived ratios.
-        # This avoids inflated baselines from low-volume daily rows where
-        # e.g. 1 click + $80 spend yields link_cpc = $80.
-        # ------------------------------------------------------------------
-        ad_totals: Dict[str, Dict[str, float]] = {}
-        for r in rows:
-            ad_id = r.get("meta_ad_id", "unknown")
-            if ad_id not in ad_totals:
-                ad_totals[ad_id] = {
-                    "spend": 0.0, "impressions": 0.0, "link_clicks": 0.0,
-                    "add_to_carts": 0.0, "conversions": 0.0,
-                    "conversion_value": 0.0,
-                    "video_views": 0.0, "video_p25": 0.0, "video_p100": 0.0,
-                    "frequency_sum": 0.0, "frequency_count": 0,
-                }
-            t = ad_totals[ad_id]
-            t["spend"] += _safe_numeric(r.get("spend")) or 0
-            t["impressions"] += _safe_numeric(r.get("impressions")) or 0
-            t["link_clicks"] += _safe_numeric(r.get("link_clicks")) or 0
-            t["video_views"] += _safe_numeric(r.get("video_views")) or 0
-            t["video_p25"] += _safe_numeric(r.get("video_p25_watched")) or 0
-            t["video_p100"] += _safe_numeric(r.get("video_p100_watched")) or 0
-
-            # Conversions & value — use helpers to parse JSONB actions
-            conv = extract_conversions(r, run_config.primary_conversion_event)
-            if conv is not None:
-                t["conversions"] += conv
-            conv_val = None
-            if run_config.value_field == "purchase_value":
-                conv_val = _safe_numeric(r.get("purchase_value"))
-            if conv_val is None:
-                conv_val = extract_conversion_value(r, run_config.value_field)
-            if conv_val is not None:
-                t["conversion_value"] += conv_val
-
-            # Add-to-cart from raw_actions or pre-extracted column
-            atc = extract_conversions(r, "add_to_cart")
-            if atc is not None:
-                t["add_to_carts"] += atc
-
-            # Frequency — average across days (weighted equally per day)
-            freq = _safe_numeric(r.get("frequency"))
-            if freq is not None and freq >= 0:
-                t["frequency_sum"] += freq
-                t["frequency_count"] += 1
-
-        # Compute derived per-ad metrics from aggregated totals
-        cpc_values, cpm_values, ctr_values = [], [], []
-        roas_values, conv_rate_values, cpp_values, cpatc_values = [], [], [], []
-        hook_values, hold_values, completion_values = [], [], []
-        freq_values = []
-
-        for ad_id, t in ad_totals.items():
-            spend = t["spend"]
-            impressions = t["impressions"]
-            link_clicks = t["link_clicks"]
-
-            # CPC = total_spend / total_clicks
-            if link_clicks > 0:
-                cpc_values.append(spend / link_clicks)
-            # CPM = (total_spend / total_impressions) * 1000
-            if impressions > 0:
-                cpm_values.append((spend / impressions) * 1000)
-            # CTR = total_clicks / total_impressions
-            if impressions > 0:
-                ctr_values.append(link_clicks / impressions)
-
-            # ROAS = total_conversion_value / total_spend
-            if spend > 0 and t["conversion_value"] > 0:
-                roas_values.append(t["conversion_value"] / spend)
-
-            # Conversion rate = total_conversions / total_clicks * 100
-            if link_clicks > 0 and t["conversions"] > 0:
-                conv_rate_values.append((t["conversions"] / link_clicks) * 100)
-
-            # Cost per purchase = total_spend / total_conversions
-            if t["conversions"] > 0:
-                cpp_values.append(spend / t["conversions"])
-
-            # Cost per add-to-cart = total_spend / total_atc
-            if t["add_to_carts"] > 0:
-                cpatc_values.append(spend / t["add_to_carts"])
-
-            # Video metrics (already computed from raw counts, no change)
-            video_views = t["video_views"]
-            if video_views > 0 and impressions > 0:
-                hook_values.append(video_views / impressions)
-            if t["video_p25"] > 0 and video_views > 0:
-                hold_values.append(t["video_p25"] / video_views)
-            if t["video_p100"] > 0 and impressions > 0:
-                completion_values.append(t["video_p100"] / impressions)
-
-            # Frequency — average across daily rows for this ad
-            if t["frequency_count"] > 0:
-                freq_values.append(t["frequency_sum"] / t["frequency_count"])
-
-        # Winsorize all metric arrays
-        cpc_values = self._winsorize(cpc_values, winsorize_pct)
-        cpm_values = self._winsorize(cpm_values, winsorize_pct)
-        ctr_values = self._winsorize(ctr_values, winsorize_pct)
-        roas_values = self._winsorize(roas_values, winsorize_pct)
-        conv_rate_values = self._winsorize(conv_rate_values, winsorize_pct)
-        cpp_values = self._winsorize(cpp_values, winsorize_pct)
-        cpatc_values = self._winsorize(cpatc_values, winsorize_pct)
-        freq_values = self._winsorize(freq_values, winsorize_pct)
+        _, _, stats = CohortStatsEngine(
+            {(awareness_level, creative_format): rows},
+            run_config.primary_conversion_event,
+            run_config.value_field,
+        ).compute(winsorize_pct)
+
+        return self._snapshot_from_stats(
+            stats,
+            brand_id=brand_id,
+            org_id=org_id,
+            run_id=run_id,
+            awareness_level=awareness_level,
+            creative_format=creative_format,
+            date_range_start=date_range_start,
+            date_range_end=date_range_end,
+        )
 
+    def _snapshot_from_stats(
+        self,
+        stats: CohortStats,
+        brand_id: UUID,
+        org_id: Optional[UUID],
+        run_id: Optional[UUID],
+        awareness_level: str,
+        creative_format: str,
+        date_range_start: date,
+        date_range_end: date,
+    ) -> BaselineSnapshot:
+        """Build a BaselineSnapshot from engine output.
+
+        Per-ad metrics are aggregated from raw counts before ratios are taken
+        (avoids inflated baselines from low-volume daily rows where e.g.
+        1 click + $80 spend yields link_cpc = $80).
+
+        Args:
+            stats: Cohort statistics from CohortStatsEngine.
+            brand_id: Brand UUID.
+            org_id: Organization UUID.
+            run_id: Run UUID for audit linkage.
+            awareness_level: Cohort awareness level.
+            creative_format: Cohort creative format.
+            date_range_start: Start of date range.
+            date_range_end: End of date range.
+
+        Returns:
+            BaselineSnapshot.
+        """
         return BaselineSnapshot(
             brand_id=brand_id,
             organization_id=org_id,
             run_id=run_id,
             awareness_level=awareness_level,
             creative_format=creative_format,
-            sample_size=len(rows),
-            unique_ads=unique_ads,
-            median_ctr=self._percentile(ctr_values, 50),
-            p25_ctr=self._percentile(ctr_values, 25),
-            p75_ctr=self._percentile(ctr_values, 75),
-            median_cpc=self._percentile(cpc_values, 50),
-            p25_cpc=self._percentile(cpc_values, 25),
-            p75_cpc=self._percentile(cpc_values, 75),
-            median_cpm=self._percentile(cpm_values, 50),
-            p25_cpm=self._percentile(cpm_values, 25),
-            p75_cpm=self._percentile(cpm_values, 75),
-            median_roas=self._percentile(roas_values, 50),
-            p25_roas=self._percentile(roas_values, 25),
-            p75_roas=self._percentile(roas_values, 75),
-            median_conversion_rate=self._percentile(conv_rate_values, 50),
-            p25_conversion_rate=self._percentile(conv_rate_values, 25),
-            p75_conversion_rate=self._percentile(conv_rate_values, 75),
-            median_cost_per_purchase=self._percentile(cpp_values, 50),
-            median_cost_per_add_to_cart=self._percentile(cpatc_values, 50) if cpatc_values else None,
-            median_hook_rate=self._percentile(hook_values, 50) if hook_values else None,
-            median_hold_rate=self._percentile(hold_values, 50) if hold_values else None,
-            median_completion_rate=self._percentile(completion_values, 50) if completion_values else None,
-            median_frequency=self._percentile(freq_values, 50),
-            p75_frequency=self._percentile(freq_values, 75),
+            sample_size=stats.sample_size,
+            unique_ads=stats.unique_ads,
+            median_ctr=stats.get("ctr", 50),
+            p25_ctr=stats.get("ctr", 25),
+            p75_ctr=stats.get("ctr", 75),
+            median_cpc=stats.get("cpc", 50),
+            p25_cpc=stats.get("cpc", 25),
+            p75_cpc=stats.get("cpc", 75),
+            median_cpm=stats.get("cpm", 50),
+            p25_cpm=stats.get("cpm", 25),
+            p75_cpm=stats.get("cpm", 75),
+            median_roas=stats.get("roas", 50),
+            p25_roas=stats.get("roas", 25),
+            p75_roas=stats.get("roas", 75),
+            median_conversion_rate=stats.get("conversion_rate", 50),
+            p25_conversion_rate=stats.get("conversion_rate", 25),
+            p75_conversion_rate=stats.get("conversion_rate", 75),
+            median_cost_per_purchase=stats.get("cost_per_purchase", 50),
+            median_cost_per_add_to_cart=stats.get("cost_per_add_to_cart", 50),
+            median_hook_rate=stats.get("hook_rate", 50),
+            median_hold_rate=stats.get("hold_rate", 50),
+            median_completion_rate=stats.get("completion_rate", 50),
+            median_frequency=stats.get("frequency", 50),
+            p75_frequency=stats.get("frequency", 75),
             date_range_start=date_range_start,
             date_range_end=date_range_end,
         )
@@ -736,6 +652,57 @@ class BaselineService:
 
         return None
 
+    async def _load_latest_baselines(
+        self,
+        brand_id: UUID,
+        date_range_start: Optional[date] = None,
+        date_range_end: Optional[date] = None,
+    ) -> Dict[tuple, BaselineSnapshot]:
+        """Load the latest baseline per (awareness_level, creative_format).
+
+        Same filters and ordering as _query_baseline, paginated over the
+        whole brand instead of one cohort at a time.
+
+        Args:
+            brand_id: Brand UUID.
+            date_range_start: Optional date range filter.
+            date_range_end: Optional date range filter.
+
+        Returns:
+            Dict of (awareness_level, creative_format) -> BaselineSnapshot.
+        """
+        lookup: Dict[tuple, BaselineSnapshot] = {}
+        offset = 0
+        page_size = 1000
+
+        try:
+            while True:
+                query = self.supabase.table("ad_intelligence_baselines").select("*").eq(
+                    "brand_id", str(brand_id)
+                )
+                if date_range_start:
+                    query = query.eq("date_range_start", date_range_start.isoformat())
+                if date_range_end:
+                    query = query.eq("date_range_end", date_range_end.isoformat())
+
+                result = query.order("computed_at", desc=True).order("id").range(
+                    offset, offset + page_size - 1
+                ).execute()
+                rows = result.data or []
+
+                for row in rows:
+                    key = (row.get("awareness_level"), row.get("creative_format"))
+                    if key not in lookup:
+                        lookup[key] = self._row_to_model(row)
+
+                if len(rows) < page_size:
+                    break
+                offset += page_size
+        except Exception as e:
+            logger.warning(f"Error loading baselines for brand {brand_id}: {e}")
+
+        return lookup
+
     def _row_to_model(self, row: Dict) -> BaselineSnapshot:
         """Convert a DB row to a BaselineSnapshot model.
 
@@ -0,0 +1,299 @@
+"""Vectorized cohort statistics for BaselineService.
+
+Turns classified performance rows into per-cohort percentile benchmarks in
+one pass:
+
+1. Extract the per-row numeric columns once (conversions and values still go
+   through the JSONB helpers, one call per row).
+2. Sum raw counts per (segment, ad) with np.bincount, in row order, so the
+   per-ad totals are bit-identical to the accumulating Python loop.
+3. Derive per-ad ratios (CTR, CPC, ROAS, ...) as array operations.
+4. Sort every metric once by (segment, value), winsorize each segment on the
+   sorted values, and read p25/median/p75 for all segments at once.
+
+Segments are the awareness × format cohorts, the per-awareness roll-ups and
+the brand-wide cohort, evaluated together. Percentiles use the same linear
+interpolation as the original BaselineService._percentile, so the resulting
+BaselineSnapshot values match it exactly.
+"""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .helpers import (
+    _safe_numeric,
+    extract_conversion_value,
+    extract_conversions,
+)
+
+PERCENTILES = (25, 50, 75)
+
+# Metrics clipped before percentiles. Video rates are not winsorized.
+WINSORIZED_METRICS = (
+    "ctr", "cpc", "cpm", "roas", "conversion_rate",
+    "cost_per_purchase", "cost_per_add_to_cart", "frequency",
+)
+UNWINSORIZED_METRICS = ("hook_rate", "hold_rate", "completion_rate")
+METRICS = WINSORIZED_METRICS + UNWINSORIZED_METRICS
+
+_SUM_COLUMNS = (
+    "spend", "impressions", "link_clicks", "video_views", "video_p25",
+    "video_p100", "conversions", "conversion_value", "add_to_carts",
+    "frequency_sum", "frequency_count",
+)
+
+
+@dataclass
+class CohortStats:
+    """Sample counts and percentiles for one cohort."""
+
+    sample_size: int
+    unique_ads: int
+    # metric -> {25: value, 50: value, 75: value}; None when no ad had the metric
+    percentiles: Dict[str, Dict[int, Optional[float]]] = field(default_factory=dict)
+
+    def get(self, metric: str, p: int) -> Optional[float]:
+        """Percentile p of metric, or None."""
+        return self.percentiles.get(metric, {}).get(p)
+
+
+class CohortStatsEngine:
+    """Cohort percentile engine over classified performance rows.
+
+    Build once per compute_baselines call; compute() evaluates every cohort,
+    awareness roll-up and the brand-wide cohort together.
+    """
+
+    def __init__(
+        self,
+        cohorts: Dict[Tuple[str, str], List[Dict]],
+        primary_conversion_event: str,
+        value_field: str,
+    ):
+        """Extract per-row columns from the grouped rows.
+
+        Args:
+            cohorts: (awareness_level, creative_format) -> rows, as returned
+                by BaselineService._group_into_cohorts.
+            primary_conversion_event: Meta action type counted as conversion.
+            value_field: Field used for conversion value (ROAS).
+        """
+        self.cohort_keys = list(cohorts.keys())
+        self.awareness_keys = list(dict.fromkeys(k[0] for k in self.cohort_keys))
+
+        n = sum(len(rows) for rows in cohorts.values())
+        self.n_rows = n
+        self.columns = {name: np.zeros(n, dtype=np.float64) for name in _SUM_COLUMNS}
+        self.cohort_idx = np.zeros(n, dtype=np.int64)
+        self.awareness_idx = np.zeros(n, dtype=np.int64)
+        self.ad_code = np.zeros(n, dtype=np.int64)
+        self.has_ad_id = np.zeros(n, dtype=bool)
+
+        awareness_pos = {a: i for i, a in enumerate(self.awareness_keys)}
+        ad_codes: Dict[object, int] = {}
+        cols = self.columns
+
+        # Rows are laid out in cohort order, which is also the order the
+        # roll-ups and the brand-wide cohort concatenate them in.
+        i = 0
+        for c, key in enumerate(self.cohort_keys):
+            a = awareness_pos[key[0]]
+            for r in cohorts[key]:
+                self.cohort_idx[i] = c
+                self.awareness_idx[i] = a
+                ad_id = r.get("meta_ad_id", "unknown")
+                self.ad_code[i] = ad_codes.setdefault(ad_id, len(ad_codes))
+                self.has_ad_id[i] = bool(r.get("meta_ad_id"))
+
+                cols["spend"][i] = _safe_numeric(r.get("spend")) or 0
+                cols["impressions"][i] = _safe_numeric(r.get("impressions")) or 0
+                cols["link_clicks"][i] = _safe_numeric(r.get("link_clicks")) or 0
+                cols["video_views"][i] = _safe_numeric(r.get("video_views")) or 0
+                cols["video_p25"][i] = _safe_numeric(r.get("video_p25_watched")) or 0
+                cols["video_p100"][i] = _safe_numeric(r.get("video_p100_watched")) or 0
+
+                conv = extract_conversions(r, primary_conversion_event)
+                if conv is not None:
+                    cols["conversions"][i] = conv
+                conv_val = None
+                if value_field == "purchase_value":
+                    conv_val = _safe_numeric(r.get("purchase_value"))
+                if conv_val is None:
+                    conv_val = extract_conversion_value(r, value_field)
+                if conv_val is not None:
+                    cols["conversion_value"][i] = conv_val
+
+                atc = extract_conversions(r, "add_to_cart")
+                if atc is not None:
+                    cols["add_to_carts"][i] = atc
+
+                freq = _safe_numeric(r.get("frequency"))
+                if freq is not None and freq >= 0:
+                    cols["frequency_sum"][i] = freq
+                    cols["frequency_count"][i] = 1
+                i += 1
+
+        self.n_ads = max(len(ad_codes), 1)
+
+    def compute(
+        self, winsorize_pct: float
+    ) -> Tuple[Dict[Tuple[str, str], CohortStats], Dict[str, CohortStats], Optional[CohortStats]]:
+        """Compute stats for every cohort, awareness roll-up and the brand.
+
+        Args:
+            winsorize_pct: Winsorization percentile (e.g. 0.02).
+
+        Returns:
+            Tuple of (cohort key -> stats, awareness level -> stats,
+            brand-wide stats or None when there are no rows).
+        """
+        if self.n_rows == 0:
+            return {}, {}, None
+
+        n_cohorts = len(self.cohort_keys)
+        n_awareness = len(self.awareness_keys)
+        # One segment id space: cohorts, then roll-ups, then brand-wide
+        levels = [
+            self.cohort_idx,
+            self.awareness_idx + n_cohorts,
+            np.full(self.n_rows, n_cohorts + n_awareness, dtype=np.int64),
+        ]
+        n_segments = n_cohorts + n_awareness + 1
+
+        sample_size = np.zeros(n_segments, dtype=np.int64)
+        unique_ads = np.zeros(n_segments, dtype=np.int64)
+        group_segments = []
+        group_metrics: Dict[str, List[np.ndarray]] = {m: [] for m in METRICS}
+
+        for segment in levels:
+            sample_size += np.bincount(segment, minlength=n_segments)
+
+            named = np.unique(segment[self.has_ad_id] * self.n_ads + self.ad_code[self.has_ad_id])
+            unique_ads += np.bincount(named // self.n_ads, minlength=n_segments)
+
+            keys, group = np.unique(segment * self.n_ads + self.ad_code, return_inverse=True)
+            totals = {
+                name: np.bincount(group, weights=col, minlength=len(keys))
+                for name, col in self.columns.items()
+            }
+            group_segments.append(keys // self.n_ads)
+            for metric, values in _derive_ad_metrics(totals).items():
+                group_metrics[metric].append(values)
+
+        segments = np.concatenate(group_segments)
+        pct_table = {
+            metric: _segment_percentiles(
+                np.concatenate(group_metrics[metric]), segments, n_segments,
+                winsorize_pct if metric in WINSORIZED_METRICS else None,
+            )
+            for metric in METRICS
+        }
+
+        def _stats(seg: int) -> CohortStats:
+            return CohortStats(
+                sample_size=int(sample_size[seg]),
+                unique_ads=int(unique_ads[seg]),
+                percentiles={
+                    metric: {
+                        p: (None if math.isnan(v) else float(v))
+                        for p, v in zip(PERCENTILES, table[seg])
+                    }
+                    for metric, table in pct_table.items()
+                },
+            )
+
+        by_cohort = {key: _stats(i) for i, key in enumerate(self.cohort_keys)}
+        by_awareness = {a: _stats(n_cohorts + i) for i, a in enumerate(self.awareness_keys)}
+        return by_cohort, by_awareness, _stats(n_segments - 1)
+
+
+def _derive_ad_metrics(t: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """Per-ad ratio metrics from summed totals; NaN where not applicable."""
+    spend = t["spend"]
+    impressions = t["impressions"]
+    clicks = t["link_clicks"]
+    conversions = t["conversions"]
+    conv_value = t["conversion_value"]
+    atc = t["add_to_carts"]
+    views = t["video_views"]
+    p25 = t["video_p25"]
+    p100 = t["video_p100"]
+
+    def ratio(num, den, mask, scale=None):
+        out = np.full(len(num), np.nan)
+        values = num[mask] / den[mask]
+        out[mask] = values * scale if scale is not None else values
+        return out
+
+    return {
+        "cpc": ratio(spend, clicks, clicks > 0),
+        "cpm": ratio(spend, impressions, impressions > 0, 1000),
+        "ctr": ratio(clicks, impressions, impressions > 0),
+        "roas": ratio(conv_value, spend, (spend > 0) & (conv_value > 0)),
+        "conversion_rate": ratio(conversions, clicks, (clicks > 0) & (conversions > 0), 100),
+        "cost_per_purchase": ratio(spend, conversions, conversions > 0),
+        "cost_per_add_to_cart": ratio(spend, atc, atc > 0),
+        "hook_rate": ratio(views, impressions, (views > 0) & (impressions > 0)),
+        "hold_rate": ratio(p25, views, (p25 > 0) & (views > 0)),
+        "completion_rate": ratio(p100, impressions, (p100 > 0) & (impressions > 0)),
+        "frequency": ratio(t["frequency_sum"], t["frequency_count"], t["frequency_count"] > 0),
+    }
+
+
+def _segment_percentiles(
+    values: np.ndarray,
+    segments: np.ndarray,
+    n_segments: int,
+    winsorize_pct: Optional[float],
+) -> np.ndarray:
+    """PERCENTILES of values within each segment, optionally winsorized first.
+
+    Mirrors the list-based implementation: winsorize clips to the values at
+    floor(n*pct) and ceil(n*(1-pct)) of the sorted cohort (cohorts under 3
+    values are left alone), and percentiles interpolate between the sorted
+    values at floor(k) and ceil(k), k = (n-1)*p/100.
+
+    Returns:
+        (n_segments, len(PERCENTILES)) array; NaN for empty segments.
+    """
+    out = np.full((n_segments, len(PERCENTILES)), np.nan)
+    valid = ~np.isnan(values)
+    values = values[valid]
+    segments = segments[valid]
+    if not len(values):
+        return out
+
+    order = np.lexsort((values, segments))
+    v = values[order]
+    s = segments[order]
+    counts = np.bincount(s, minlength=n_segments)
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    n = counts.astype(np.float64)
+
+    if winsorize_pct is not None:
+        clip = counts >= 3
+        low_idx = np.maximum(0, np.floor(n * winsorize_pct)).astype(np.int64)
+        high_idx = np.minimum(counts - 1, np.ceil(n * (1 - winsorize_pct)).astype(np.int64))
+        low = np.full(n_segments, -np.inf)
+        high = np.full(n_segments, np.inf)
+        low[clip] = v[starts[clip] + low_idx[clip]]
+        high[clip] = v[starts[clip] + high_idx[clip]]
+        # Clipping is monotone, so v stays sorted within each segment
+        v = np.maximum(low[s], np.minimum(high[s], v))
+
+    present = counts > 0
+    last = len(v) - 1
+    for j, p in enumerate(PERCENTILES):
+        k = (n - 1) * (p / 100.0)
+        f = np.floor(k)
+        c = np.ceil(k)
+        lo = v[np.minimum(starts + f.astype(np.int64), last)]
+        hi = v[np.minimum(starts + c.astype(np.int64), last)]
+        interpolated = np.where(f == c, lo, lo * (c - k) + hi * (k - f))
+        out[present, j] = interpolated[present]
+    return out
@@ -12,12 +12,17 @@ Kill determination:
 - test_failure: CRITICAL efficiency + running > 7 days + spend > $100
 - fatigue: CRITICAL fatigue category
 - inefficient: zero conversions + spend > $200
+
+diagnose_account loads classifications, baselines and daily performance for
+all ads in a handful of chunked, paginated queries, evaluates the rules in
+memory, and upserts the diagnostics in bulk. diagnose_ad keeps the per-ad
+query path for single-ad callers.
 """
 
 from __future__ import annotations
 
 import logging
-from datetime import date, datetime, timedelta
+from datetime import date, datetime, timedelta, timezone
 from typing import Any, Callable, Dict, List, Optional, Tuple
 from uuid import UUID
 
@@ -34,9 +39,39 @@ from .models import (
     HealthStatus,
     RunConfig,
 )
+from .trend_stats import half_split_pairs
 
 logger = logging.getLogger(__name__)
 
+# meta_ad_ids per .in_() filter and rows per page for the batched loaders
+AD_ID_CHUNK_SIZE = 200
+PAGE_SIZE = 1000
+# Diagnostics per bulk upsert
+STORE_CHUNK_SIZE = 500
+# Daily series whose half-split means the trend rules read
+TREND_SERIES_METRICS = ("link_ctr", "frequency")
+
+
+def _as_date(value: Any) -> Optional[date]:
+    """Coerce a date or ISO date string (thresholds may hold either)."""
+    if value is None or isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value)[:10])
+
+
+def _as_utc(value: Any) -> Optional[datetime]:
+    """Parse a timestamp into an aware UTC datetime (naive values are UTC)."""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
 
 class DiagnosticRule:
     """A single diagnostic rule with prerequisites and evaluation logic.
@@ -301,22 +336,25 @@ def _check_frequency_above_threshold(ad_data: Dict, baseline: Optional[BaselineS
     return None
 
 
+def _series_split(ad_data: Dict, metric: str) -> Optional[Tuple[float, float]]:
+    """(first-half mean, second-half mean) of ad_data["<metric>_series"].
+
+    diagnose_account precomputes "<metric>_split" for every ad in one
+    half_split_pairs call; single-ad callers compute it here.
+    """
+    key = f"{metric}_split"
+    if key in ad_data:
+        return ad_data[key]
+    return half_split_pairs([ad_data.get(f"{metric}_series") or []])[0]
+
+
 def _check_frequency_trend_rising(ad_data: Dict, baseline: Optional[BaselineSnapshot]) -> Optional[FiredRule]:
     """Frequency trending upward over 7 days."""
-    series = ad_data.get("frequency_series", [])
-    if not series or len(series) < 5:
-        return None
-
     # Simple linear trend: compare first half vs second half
-    mid = len(series) // 2
-    first_half = [_safe_numeric(v) for v in series[:mid] if _safe_numeric(v) is not None]
-    second_half = [_safe_numeric(v) for v in series[mid:] if _safe_numeric(v) is not None]
-
-    if not first_half or not second_half:
+    split = _series_split(ad_data, "frequency")
+    if split is None:
         return None
-
-    avg_first = sum(first_half) / len(first_half)
-    avg_second = sum(second_half) / len(second_half)
+    avg_first, avg_second = split
 
     if avg_first > 0 and avg_second > avg_first * 1.2:
         increase = (avg_second - avg_first) / avg_first
@@ -338,19 +376,10 @@ def _check_frequency_trend_rising(ad_data: Dict, baseline: Optional[BaselineSnap
 
 def _check_ctr_declining_7d(ad_data: Dict, baseline: Optional[BaselineSnapshot]) -> Optional[FiredRule]:
     """CTR declining over 7-day trend."""
-    series = ad_data.get("link_ctr_series", [])
-    if not series or len(series) < 5:
+    split = _series_split(ad_data, "link_ctr")
+    if split is None:
         return None
-
-    mid = len(series) // 2
-    first_half = [_safe_numeric(v) for v in series[:mid] if _safe_numeric(v) is not None]
-    second_half = [_safe_numeric(v) for v in series[mid:] if _safe_numeric(v) is not None]
-
-    if not first_half or not second_half:
-        return None
-
-    avg_first = sum(first_half) / len(first_half)
-    avg_second = sum(second_half) / len(second_half)
+    avg_first, avg_second = split
 
     if avg_first > 0 and avg_second < avg_first * 0.85:
         decline = (avg_first - avg_second) / avg_first
@@ -645,17 +674,61 @@ class DiagnosticEngine:
         ad_data = await self._prepare_ad_data(
             meta_ad_id, brand_id, run_config, classification
         )
+        series_by_window = {
+            window_days: await self._prepare_series_data(
+                meta_ad_id, brand_id, run_config, window_days
+            )
+            for window_days in self._series_windows()
+        }
 
-        # Evaluate all rules
+        diagnostic = self._evaluate_ad(
+            meta_ad_id, brand_id, org_id, run_id,
+            classification, baseline, ad_data, series_by_window, run_config,
+        )
+
+        # Store diagnostic
+        await self._store_diagnostic(diagnostic, run_config)
+
+        return diagnostic
+
+    def _series_windows(self) -> List[int]:
+        """Distinct window_days used by daily_series rules."""
+        return sorted({r.window_days for r in self.RULES if r.aggregation == "daily_series"})
+
+    def _evaluate_ad(
+        self,
+        meta_ad_id: str,
+        brand_id: UUID,
+        org_id: UUID,
+        run_id: UUID,
+        classification: CreativeClassification,
+        baseline: Optional[BaselineSnapshot],
+        ad_data: Dict[str, Any],
+        series_by_window: Dict[int, Dict[str, Any]],
+        run_config: RunConfig,
+    ) -> AdDiagnostic:
+        """Evaluate all rules for one ad against pre-loaded data.
+
+        Args:
+            meta_ad_id: Meta ad ID string.
+            brand_id: Brand UUID.
+            org_id: Organization UUID.
+            run_id: Analysis run UUID.
+            classification: Classification selected for this run.
+            baseline: Cohort baseline (may be None).
+            ad_data: Aggregated metrics from _prepare_ad_data/_aggregate_ad_data.
+            series_by_window: window_days -> per-day metric arrays.
+            run_config: Run configuration.
+
+        Returns:
+            AdDiagnostic model (not stored).
+        """
         fired_rules: List[FiredRule] = []
         for rule in self.RULES:
             # Use appropriate aggregation view
             if rule.aggregation == "daily_series":
-                data_view = await self._prepare_series_data(
-                    meta_ad_id, brand_id, run_config, rule.window_days
-                )
                 # Merge total data for prerequisites check
-                merged = {**ad_data, **data_view}
+                merged = {**ad_data, **series_by_window.get(rule.window_days, {})}
             else:
                 merged = ad_data
 
@@ -672,7 +745,7 @@ class DiagnosticEngine:
         # Determine trend
         trend = self._determine_trend(ad_data)
 
-        diagnostic = AdDiagnostic(
+        return AdDiagnostic(
             meta_ad_id=meta_ad_id,
             brand_id=brand_id,
             organization_id=org_id,
@@ -687,11 +760,6 @@ class DiagnosticEngine:
             classification_id=classification.id,
         )
 
-        # Store diagnostic
-        await self._store_diagnostic(diagnostic, run_config)
-
-        return diagnostic
-
     async def diagnose_account(
         self,
         brand_id: UUID,
@@ -704,6 +772,11 @@ class DiagnosticEngine:
     ) -> List[AdDiagnostic]:
         """Diagnose all active ads in an account.
 
+        Set-based: classifications, baselines and performance rows for every
+        ad are loaded up front in chunked, paginated queries, rules are
+        evaluated in memory, and diagnostics are upserted in bulk. Produces
+        the same diagnostics as calling diagnose_ad per ad.
+
         Args:
             brand_id: Brand UUID.
             org_id: Organization UUID.
@@ -723,25 +796,74 @@ class DiagnosticEngine:
                 brand_wide_baseline = b
                 break
 
+        if not active_ad_ids:
+            return []
+
+        date_range_start, date_range_end = self._resolve_date_range(run_config)
+        windows = self._series_windows()
+        load_start = min(
+            [date_range_start] + [date_range_end - timedelta(days=w) for w in windows]
+        )
+
+        classification_rows = await self._load_classification_rows(brand_id, active_ad_ids)
+        performance_rows = await self._load_performance_rows(
+            brand_id, active_ad_ids, load_start, date_range_end
+        )
+
+        from .baseline_service import BaselineService
+        latest_classifications = {
+            ad_id: rows[0] for ad_id, rows in classification_rows.items() if rows
+        }
+        ad_baselines = await BaselineService(self.supabase).get_baselines_for_ads(
+            active_ad_ids, brand_id, latest_classifications,
+            date_range_start=_as_date(run_config.thresholds.get("date_range_start")),
+            date_range_end=_as_date(run_config.thresholds.get("date_range_end")),
+        )
+
+        start_key = date_range_start.isoformat()
+        end_key = date_range_end.isoformat()
+
+        series_views = {
+            meta_ad_id: {
+                w: self._series_view(performance_rows.get(meta_ad_id, []), date_range_end, w)
+                for w in windows
+            }
+            for meta_ad_id in active_ad_ids
+        }
+        self._attach_series_splits(
+            [view for views in series_views.values() for view in views.values()]
+        )
+
         diagnostics = []
         for meta_ad_id in active_ad_ids:
             try:
-                # Find best baseline for this ad
-                from .baseline_service import BaselineService
-                bs = BaselineService(self.supabase)
-                baseline = await bs.get_baseline_for_ad(
-                    meta_ad_id, brand_id,
-                    date_range_start=run_config.thresholds.get("date_range_start"),
-                    date_range_end=run_config.thresholds.get("date_range_end"),
+                classification = self._select_classification_for_run(
+                    classification_rows.get(meta_ad_id, []), run_id, run_created_at
                 )
-                if not baseline:
-                    baseline = brand_wide_baseline
-
-                diag = await self.diagnose_ad(
-                    meta_ad_id, brand_id, org_id, run_id, run_created_at,
-                    baseline, run_config
+                if not classification or not classification.id:
+                    diagnostics.append(AdDiagnostic(
+                        meta_ad_id=meta_ad_id,
+                        brand_id=brand_id,
+                        organization_id=org_id,
+                        run_id=run_id,
+                        overall_health=HealthStatus.INSUFFICIENT_DATA,
+                        fired_rules=[],
+                    ))
+                    continue
+
+                rows = performance_rows.get(meta_ad_id, [])
+                ad_data = self._aggregate_ad_data(
+                    [r for r in rows if start_key <= str(r.get("date")) <= end_key],
+                    run_config,
+                    classification,
                 )
-                diagnostics.append(diag)
+                series_by_window = series_views[meta_ad_id]
+                baseline = ad_baselines.get(meta_ad_id) or brand_wide_baseline
+
+                diagnostics.append(self._evaluate_ad(
+                    meta_ad_id, brand_id, org_id, run_id,
+                    classification, baseline, ad_data, series_by_window, run_config,
+                ))
             except Exception as e:
                 logger.error(f"Error diagnosing ad {meta_ad_id}: {e}")
                 diagnostics.append(AdDiagnostic(
@@ -753,6 +875,8 @@ class DiagnosticEngine:
                     fired_rules=[],
                 ))
 
+        await self._store_diagnostics(diagnostics, run_config)
+
         logger.info(f"Diagnosed {len(diagnostics)} ads for brand {brand_id}")
         return diagnostics
 
@@ -911,11 +1035,7 @@ class DiagnosticEngine:
         Returns:
             Dict with aggregated metrics for rules.
         """
-        date_range_end = run_config.thresholds.get("date_range_end", date.today())
-        date_range_start = run_config.thresholds.get(
-            "date_range_start",
-            date_range_end - timedelta(days=run_config.days_back) if isinstance(date_range_end, date) else date.today() - timedelta(days=run_config.days_back)
-        )
+        date_range_start, date_range_end = self._resolve_date_range(run_config)
 
         try:
             result = self.supabase.table("meta_ads_performance").select("*").eq(
@@ -923,9 +1043,9 @@ class DiagnosticEngine:
             ).eq(
                 "brand_id", str(brand_id)
             ).gte(
-                "date", date_range_start.isoformat() if isinstance(date_range_start, date) else str(date_range_start)
+                "date", date_range_start.isoformat()
             ).lte(
-                "date", date_range_end.isoformat() if isinstance(date_range_end, date) else str(date_range_end)
+                "date", date_range_end.isoformat()
             ).order("date").execute()
 
             rows = result.data or []
@@ -933,6 +1053,40 @@ class DiagnosticEngine:
             logger.error(f"Error fetching performance data for {meta_ad_id}: {e}")
             rows = []
 
+        return self._aggregate_ad_data(rows, run_config, classification)
+
+    def _resolve_date_range(self, run_config: RunConfig) -> Tuple[date, date]:
+        """Analysis window from run_config thresholds (defaults: today, days_back).
+
+        Args:
+            run_config: Run configuration.
+
+        Returns:
+            Tuple of (date_range_start, date_range_end).
+        """
+        date_range_end = _as_date(run_config.thresholds.get("date_range_end")) or date.today()
+        date_range_start = (
+            _as_date(run_config.thresholds.get("date_range_start"))
+            or date_range_end - timedelta(days=run_config.days_back)
+        )
+        return date_range_start, date_range_end
+
+    def _aggregate_ad_data(
+        self,
+        rows: List[Dict[str, Any]],
+        run_config: RunConfig,
+        classification: Optional[CreativeClassification] = None,
+    ) -> Dict[str, Any]:
+        """Aggregate date-ordered performance rows into rule inputs.
+
+        Args:
+            rows: meta_ads_performance rows for one ad, ordered by date.
+            run_config: Run configuration.
+            classification: Ad classification (for congruence score).
+
+        Returns:
+            Dict with aggregated metrics for rules.
+        """
         if not rows:
             return {"days_with_data": 0, "total_impressions": 0}
 
@@ -1037,9 +1191,7 @@ class DiagnosticEngine:
         Returns:
             Dict with per-day metric arrays.
         """
-        date_range_end = run_config.thresholds.get("date_range_end", date.today())
-        if isinstance(date_range_end, str):
-            date_range_end = date.fromisoformat(date_range_end)
+        _, date_range_end = self._resolve_date_range(run_config)
         window_start = date_range_end - timedelta(days=window_days)
 
         try:
@@ -1060,12 +1212,169 @@ class DiagnosticEngine:
             logger.warning(f"Error fetching series data for {meta_ad_id}: {e}")
             rows = []
 
+        return self._series_view(rows, date_range_end, window_days)
+
+    def _series_view(
+        self,
+        rows: List[Dict[str, Any]],
+        date_range_end: date,
+        window_days: int,
+    ) -> Dict[str, Any]:
+        """Per-day metric arrays for the trailing window of date-ordered rows.
+
+        Args:
+            rows: meta_ads_performance rows for one ad, ordered by date.
+            date_range_end: End of the analysis window.
+            window_days: Trailing window in days.
+
+        Returns:
+            Dict with per-day metric arrays.
+        """
+        start_key = (date_range_end - timedelta(days=window_days)).isoformat()
+        end_key = date_range_end.isoformat()
+        rows = [r for r in rows if start_key <= str(r.get("date")) <= end_key]
         return {
             "link_ctr_series": [r.get("link_ctr") for r in rows],
             "frequency_series": [r.get("frequency") for r in rows],
             "impressions_series": [r.get("impressions") for r in rows],
         }
 
+    def _attach_series_splits(self, views: List[Dict[str, Any]]) -> None:
+        """Precompute the trend rules' half-split means for many series views.
+
+        Adds "<metric>_split" to each view in place, evaluated across all
+        views as one array computation per metric.
+
+        Args:
+            views: Dicts from _series_view.
+        """
+        for metric in TREND_SERIES_METRICS:
+            splits = half_split_pairs([v.get(f"{metric}_series") or [] for v in views])
+            for view, split in zip(views, splits):
+                view[f"{metric}_split"] = split
+
+    # =========================================================================
+    # Batched Loading
+    # =========================================================================
+
+    async def _load_classification_rows(
+        self,
+        brand_id: UUID,
+        meta_ad_ids: List[str],
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """Load classification rows for many ads, newest first per ad.
+
+        Args:
+            brand_id: Brand UUID.
+            meta_ad_ids: Meta ad IDs.
+
+        Returns:
+            Dict of meta_ad_id -> rows ordered by classified_at desc.
+        """
+        by_ad: Dict[str, List[Dict[str, Any]]] = {}
+        for i in range(0, len(meta_ad_ids), AD_ID_CHUNK_SIZE):
+            chunk = meta_ad_ids[i:i + AD_ID_CHUNK_SIZE]
+            offset = 0
+            try:
+                while True:
+                    result = self.supabase.table("ad_creative_classifications").select("*").eq(
+                        "brand_id", str(brand_id)
+                    ).in_(
+                        "meta_ad_id", chunk
+                    ).order(
+                        "classified_at", desc=True
+                    ).order("id").range(offset, offset + PAGE_SIZE - 1).execute()
+                    rows = result.data or []
+
+                    for row in rows:
+                        by_ad.setdefault(row.get("meta_ad_id"), []).append(row)
+
+                    if len(rows) < PAGE_SIZE:
+                        break
+                    offset += PAGE_SIZE
+            except Exception as e:
+                logger.error(f"Error loading classifications for {len(chunk)} ads: {e}")
+        return by_ad
+
+    async def _load_performance_rows(
+        self,
+        brand_id: UUID,
+        meta_ad_ids: List[str],
+        date_range_start: date,
+        date_range_end: date,
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """Load daily performance rows for many ads, date-ordered per ad.
+
+        Args:
+            brand_id: Brand UUID.
+            meta_ad_ids: Meta ad IDs.
+            date_range_start: First date to load (inclusive).
+            date_range_end: Last date to load (inclusive).
+
+        Returns:
+            Dict of meta_ad_id -> rows ordered by date.
+        """
+        by_ad: Dict[str, List[Dict[str, Any]]] = {}
+        for i in range(0, len(meta_ad_ids), AD_ID_CHUNK_SIZE):
+            chunk = meta_ad_ids[i:i + AD_ID_CHUNK_SIZE]
+            offset = 0
+            try:
+                while True:
+                    result = self.supabase.table("meta_ads_performance").select("*").eq(
+                        "brand_id", str(brand_id)
+                    ).in_(
+                        "meta_ad_id", chunk
+                    ).gte(
+                        "date", date_range_start.isoformat()
+                    ).lte(
+                        "date", date_range_end.isoformat()
+                    ).order("meta_ad_id").order("date").range(
+                        offset, offset + PAGE_SIZE - 1
+                    ).execute()
+                    rows = result.data or []
+
+                    for row in rows:
+                        by_ad.setdefault(row.get("meta_ad_id"), []).append(row)
+
+                    if len(rows) < PAGE_SIZE:
+                        break
+                    offset += PAGE_SIZE
+            except Exception as e:
+                logger.error(f"Error loading performance data for {len(chunk)} ads: {e}")
+        return by_ad
+
+    def _select_classification_for_run(
+        self,
+        rows: List[Dict[str, Any]],
+        run_id: UUID,
+        run_created_at: datetime,
+    ) -> Optional[CreativeClassification]:
+        """In-memory ClassifierService.get_classification_for_run.
+
+        1) Latest where run_id == run_id
+        2) Else latest where classified_at <= run_created_at
+
+        Args:
+            rows: One ad's classification rows, classified_at desc.
+            run_id: Current run UUID.
+            run_created_at: When the run was created.
+
+        Returns:
+            CreativeClassification or None.
+        """
+        run_key = str(run_id)
+        for row in rows:
+            if str(row.get("run_id")) == run_key:
+                return self.classifier._row_to_model(row)
+
+        cutoff = _as_utc(run_created_at)
+        for row in rows:
+            classified_at = _as_utc(row.get("classified_at"))
+            if classified_at is not None and cutoff is not None and classified_at <= cutoff:
+                return self.classifier._row_to_model(row)
+
+        return None
+
     # =========================================================================
     # Storage
     # =========================================================================
@@ -1091,25 +1400,85 @@ class DiagnosticEngine:
             return
 
         try:
-            record = {
-                "organization_id": str(diagnostic.organization_id) if diagnostic.organization_id else None,
-                "brand_id": str(diagnostic.brand_id),
-                "meta_ad_id": diagnostic.meta_ad_id,
-                "run_id": str(diagnostic.run_id),
-                "overall_health": diagnostic.overall_health.value,
-                "kill_recommendation": diagnostic.kill_recommendation,
-                "kill_reason": diagnostic.kill_reason,
-                "fired_rules": [r.model_dump() for r in diagnostic.fired_rules],
-                "trend_direction": diagnostic.trend_direction,
-                "days_analyzed": diagnostic.days_analyzed,
-                "baseline_id": str(diagnostic.baseline_id) if diagnostic.baseline_id else None,
-                "classification_id": str(diagnostic.classification_id),
-            }
-
             self.supabase.table("ad_intelligence_diagnostics").upsert(
-                record,
+                self._diagnostic_record(diagnostic),
                 on_conflict="meta_ad_id,brand_id,run_id",
             ).execute()
 
         except Exception as e:
             logger.error(f"Error storing diagnostic for {diagnostic.meta_ad_id}: {e}")
+
+    async def _store_diagnostics(
+        self,
+        diagnostics: List[AdDiagnostic],
+        run_config: RunConfig,
+    ) -> int:
+        """Store many diagnostics with chunked bulk upserts.
+
+        Diagnostics without a classification_id are skipped, as in
+        _store_diagnostic. A chunk that fails falls back to per-row upserts
+        so one bad record does not drop its neighbours.
+
+        Args:
+            diagnostics: AdDiagnostics to store.
+            run_config: Run configuration.
+
+        Returns:
+            Number of diagnostics stored.
+        """
+        storable = [d for d in diagnostics if d.classification_id]
+        skipped = len(diagnostics) - len(storable)
+        if skipped:
+            logger.warning(f"Skipping diagnostic storage for {skipped} ads: no classification_id")
+
+        stored = 0
+        for i in range(0, len(storable), STORE_CHUNK_SIZE):
+            chunk = storable[i:i + STORE_CHUNK_SIZE]
+            try:
+                self.supabase.table("ad_intelligence_diagnostics").upsert(
+                    [self._diagnostic_record(d) for d in chunk],
+                    on_conflict="meta_ad_id,brand_id,run_id",
+                ).execute()
+                stored += len(chunk)
+                continue
+            except Exception as e:
+                logger.warning(
+                    f"Bulk diagnostic upsert failed for {len(chunk)} rows, "
+                    f"retrying per row: {e}"
+                )
+
+            for diagnostic in chunk:
+                try:
+                    self.supabase.table("ad_intelligence_diagnostics").upsert(
+                        self._diagnostic_record(diagnostic),
+                        on_conflict="meta_ad_id,brand_id,run_id",
+                    ).execute()
+                    stored += 1
+                except Exception as e:
+                    logger.error(f"Error storing diagnostic for {diagnostic.meta_ad_id}: {e}")
+
+        return stored
+
+    def _diagnostic_record(self, diagnostic: AdDiagnostic) -> Dict[str, Any]:
+        """Build the ad_intelligence_diagnostics row for a diagnostic.
+
+        Args:
+            diagnostic: AdDiagnostic to serialize.
+
+        Returns:
+            Row dict.
+        """
+        return {
+            "organization_id": str(diagnostic.organization_id) if diagnostic.organization_id else None,
+            "brand_id": str(diagnostic.brand_id),
+            "meta_ad_id": diagnostic.meta_ad_id,
+            "run_id": str(diagnostic.run_id),
+            "overall_health": diagnostic.overall_health.value,
+            "kill_recommendation": diagnostic.kill_recommendation,
+            "kill_reason": diagnostic.kill_reason,
+            "fired_rules": [r.model_dump() for r in diagnostic.fired_rules],
+            "trend_direction": diagnostic.trend_direction,
+            "days_analyzed": diagnostic.days_analyzed,
+            "baseline_id": str(diagnostic.baseline_id) if diagnostic.baseline_id else None,
+            "classification_id": str(diagnostic.classification_id),
+        }
@@ -1,7 +1,10 @@
 """FatigueDetector: Detects ad fatigue via frequency and CTR trend analysis.
 
 Identifies ads that are fatigued (high frequency + declining CTR),
-at-risk (approaching thresholds), or healthy.
+at-risk (approaching thresholds), or healthy. check_fatigue loads the
+trend window for all active ads in chunked, paginated queries and
+evaluates the CTR trends and thresholds for every ad as one array
+computation (see trend_stats).
 """
 
 from __future__ import annotations
@@ -11,12 +14,19 @@ from datetime import date, timedelta
 from typing import Any, Dict, List
 from uuid import UUID
 
+import numpy as np
+
 from typing import Optional
 from .helpers import _safe_numeric, get_active_ad_ids, resolve_product_ad_ids
 from .models import FatigueCheckResult
+from .trend_stats import week_over_week_change
 
 logger = logging.getLogger(__name__)
 
+# meta_ad_ids per .in_() filter and rows per page for the trend loader
+AD_ID_CHUNK_SIZE = 200
+PAGE_SIZE = 1000
+
 
 class FatigueDetector:
     """Detects ad fatigue via frequency and CTR trend analysis.
@@ -92,13 +102,11 @@ class FatigueDetector:
         at_risk: List[Dict[str, Any]] = []
         healthy_count = 0
 
-        for ad_id in active_ids:
-            ad_rows = perf_data.get(ad_id, [])
-            if not ad_rows:
-                continue
-
-            result = self._evaluate_ad_fatigue(ad_id, ad_rows, date_range_end)
-
+        evaluated = self._evaluate_ads_fatigue(
+            {ad_id: perf_data[ad_id] for ad_id in active_ids if perf_data.get(ad_id)},
+            date_range_end,
+        )
+        for result in evaluated:
             if result["status"] == "fatigued":
                 fatigued.append(result)
             elif result["status"] == "at_risk":
@@ -128,10 +136,6 @@ class FatigueDetector:
     ) -> Dict[str, Any]:
         """Evaluate a single ad for fatigue signals.
 
-        Checks:
-        1. Current frequency vs thresholds
-        2. CTR week-over-week decline
-
         Args:
             meta_ad_id: Meta ad ID.
             rows: Daily performance rows for this ad.
@@ -140,49 +144,68 @@ class FatigueDetector:
         Returns:
             Dict with status, metrics, and trend info.
         """
-        # Sort by date
-        sorted_rows = sorted(rows, key=lambda r: r.get("date", ""))
+        return self._evaluate_ads_fatigue({meta_ad_id: rows}, date_range_end)[0]
 
-        # Get latest metrics
-        latest = sorted_rows[-1] if sorted_rows else {}
-        ad_name = latest.get("ad_name", meta_ad_id)
-        frequency = _safe_numeric(latest.get("frequency")) or 0
+    def _evaluate_ads_fatigue(
+        self,
+        rows_by_ad: Dict[str, List[Dict]],
+        date_range_end: date,
+    ) -> List[Dict[str, Any]]:
+        """Evaluate many ads for fatigue signals at once.
+
+        Checks:
+        1. Current frequency vs thresholds
+        2. CTR week-over-week decline
 
-        # Calculate days running
-        first_date = sorted_rows[0].get("date", "") if sorted_rows else ""
-        last_date = sorted_rows[-1].get("date", "") if sorted_rows else ""
-        days_running = len(sorted_rows)
+        Both are evaluated for all ads as array operations.
+
+        Args:
+            rows_by_ad: meta_ad_id -> daily performance rows (non-empty).
+            date_range_end: End of analysis window.
 
-        # Compute CTR trend (WoW)
-        ctr_trend = self._compute_ctr_trend(sorted_rows)
+        Returns:
+            List of dicts with status, metrics, and trend info, in
+            rows_by_ad order.
+        """
+        ad_ids = list(rows_by_ad)
+        if not ad_ids:
+            return []
+        sorted_rows = [
+            sorted(rows_by_ad[ad_id], key=lambda r: r.get("date", "")) for ad_id in ad_ids
+        ]
+
+        # Latest frequency (0 when missing) and CTR trend (WoW) for all ads
+        frequency = np.array(
+            [_safe_numeric(rows[-1].get("frequency")) or 0 for rows in sorted_rows],
+            dtype=float,
+        )
+        ctr_trend = self._compute_ctr_trends(sorted_rows)
 
         # Determine status
-        is_high_freq = frequency >= self.FREQUENCY_CRITICAL
-        is_declining_ctr = ctr_trend is not None and ctr_trend < -self.CTR_DECLINE_THRESHOLD
-        is_warning_freq = frequency >= self.FREQUENCY_WARNING
-
-        if is_high_freq or (is_warning_freq and is_declining_ctr):
-            status = "fatigued"
-        elif is_warning_freq or is_declining_ctr:
-            status = "at_risk"
-        else:
-            status = "healthy"
-
-        return {
-            "meta_ad_id": meta_ad_id,
-            "ad_name": ad_name,
-            "frequency": round(frequency, 2),
-            "ctr_trend": f"{ctr_trend:+.1%}" if ctr_trend is not None else "N/A",
-            "ctr_trend_value": ctr_trend,
-            "days_running": days_running,
-            "status": status,
-        }
+        with np.errstate(invalid="ignore"):
+            is_high_freq = frequency >= self.FREQUENCY_CRITICAL
+            is_declining_ctr = ctr_trend < -self.CTR_DECLINE_THRESHOLD
+            is_warning_freq = frequency >= self.FREQUENCY_WARNING
+        is_fatigued = is_high_freq | (is_warning_freq & is_declining_ctr)
+        is_at_risk = ~is_fatigued & (is_warning_freq | is_declining_ctr)
+        status = np.where(is_fatigued, "fatigued", np.where(is_at_risk, "at_risk", "healthy"))
+
+        results = []
+        for i, ad_id in enumerate(ad_ids):
+            trend = None if np.isnan(ctr_trend[i]) else float(ctr_trend[i])
+            results.append({
+                "meta_ad_id": ad_id,
+                "ad_name": sorted_rows[i][-1].get("ad_name", ad_id),
+                "frequency": round(float(frequency[i]), 2),
+                "ctr_trend": f"{trend:+.1%}" if trend is not None else "N/A",
+                "ctr_trend_value": trend,
+                "days_running": len(sorted_rows[i]),
+                "status": str(status[i]),
+            })
+        return results
 
     def _compute_ctr_trend(self, rows: List[Dict]) -> float | None:
-        """Compute week-over-week CTR change.
-
-        Compares average CTR in the last 7 days vs the previous 7 days.
-        Returns fractional change (e.g., -0.15 = -15% decline).
+        """Compute week-over-week CTR change for one ad.
 
         Args:
             rows: Sorted daily performance rows.
@@ -190,32 +213,25 @@ class FatigueDetector:
         Returns:
             Fractional WoW change or None if insufficient data.
         """
-        if len(rows) < 7:
-            return None
-
-        # Split into recent week and previous week
-        recent = rows[-7:]
-        previous = rows[-14:-7] if len(rows) >= 14 else rows[:-7]
-
-        if not previous:
-            return None
-
-        recent_ctrs = [_safe_numeric(r.get("link_ctr")) for r in recent]
-        prev_ctrs = [_safe_numeric(r.get("link_ctr")) for r in previous]
-
-        recent_ctrs = [c for c in recent_ctrs if c is not None and c > 0]
-        prev_ctrs = [c for c in prev_ctrs if c is not None and c > 0]
+        trend = self._compute_ctr_trends([rows])[0]
+        return None if np.isnan(trend) else float(trend)
 
-        if not recent_ctrs or not prev_ctrs:
-            return None
+    def _compute_ctr_trends(self, sorted_rows: List[List[Dict]]) -> np.ndarray:
+        """Compute week-over-week CTR change for many ads.
 
-        recent_avg = sum(recent_ctrs) / len(recent_ctrs)
-        prev_avg = sum(prev_ctrs) / len(prev_ctrs)
+        Compares average positive CTR in the last 7 days vs the previous 7
+        days (or all earlier days when fewer than 14). Returns fractional
+        change (e.g., -0.15 = -15% decline).
 
-        if prev_avg == 0:
-            return None
+        Args:
+            sorted_rows: Date-sorted daily performance rows per ad.
 
-        return (recent_avg - prev_avg) / prev_avg
+        Returns:
+            Array of fractional WoW changes, NaN where data is insufficient.
+        """
+        return week_over_week_change(
+            [[r.get("link_ctr") for r in rows] for rows in sorted_rows], window=7
+        )
 
     async def _fetch_performance_data(
         self,
@@ -226,6 +242,9 @@ class FatigueDetector:
     ) -> Dict[str, List[Dict]]:
         """Fetch daily performance data grouped by ad ID.
 
+        Ad IDs are queried in chunks and each chunk is paginated, so long
+        windows over many ads are not truncated at the row limit.
+
         Args:
             brand_id: Brand UUID.
             meta_ad_ids: List of ad IDs.
@@ -235,32 +254,39 @@ class FatigueDetector:
         Returns:
             Dict mapping meta_ad_id → list of daily rows.
         """
-        try:
-            result = self.supabase.table("meta_ads_performance").select(
-                "meta_ad_id, ad_name, date, impressions, spend, frequency, link_ctr, link_cpc"
-            ).eq(
-                "brand_id", str(brand_id)
-            ).in_(
-                "meta_ad_id", meta_ad_ids
-            ).gte(
-                "date", start_date.isoformat()
-            ).lte(
-                "date", end_date.isoformat()
-            ).order("date").execute()
-
-            grouped: Dict[str, List[Dict]] = {}
-            for row in result.data or []:
-                ad_id = row.get("meta_ad_id")
-                if ad_id:
-                    if ad_id not in grouped:
-                        grouped[ad_id] = []
-                    grouped[ad_id].append(row)
-
-            return grouped
-
-        except Exception as e:
-            logger.error(f"Error fetching performance data: {e}")
-            return {}
+        grouped: Dict[str, List[Dict]] = {}
+        for i in range(0, len(meta_ad_ids), AD_ID_CHUNK_SIZE):
+            chunk = meta_ad_ids[i:i + AD_ID_CHUNK_SIZE]
+            offset = 0
+            try:
+                while True:
+                    result = self.supabase.table("meta_ads_performance").select(
+                        "meta_ad_id, ad_name, date, impressions, spend, frequency, link_ctr, link_cpc"
+                    ).eq(
+                        "brand_id", str(brand_id)
+                    ).in_(
+                        "meta_ad_id", chunk
+                    ).gte(
+                        "date", start_date.isoformat()
+                    ).lte(
+                        "date", end_date.isoformat()
+                    ).order("meta_ad_id").order("date").range(
+                        offset, offset + PAGE_SIZE - 1
+                    ).execute()
+                    rows = result.data or []
+
+                    for row in rows:
+                        ad_id = row.get("meta_ad_id")
+                        if ad_id:
+                            grouped.setdefault(ad_id, []).append(row)
+
+                    if len(rows) < PAGE_SIZE:
+                        break
+                    offset += PAGE_SIZE
+            except Exception as e:
+                logger.error(f"Error fetching performance data: {e}")
+
+        return grouped
 
     async def _get_brand_name(self, brand_id: UUID) -> str:
         """Look up brand name.
@@ -0,0 +1,156 @@
+"""Vectorized daily-series trend statistics for fatigue detection.
+
+FatigueDetector and the DiagnosticEngine fatigue rules compare the mean of a
+recent stretch of an ad's daily series against an earlier stretch. This
+module evaluates those comparisons for many ads at once:
+
+1. Pack the ragged per-ad series into one NaN-padded matrix plus a
+   "value present" mask (None / unparseable entries are absent).
+2. Express each window (last 7 days vs the 7 before, first half vs second
+   half) as column bounds relative to each row's length.
+3. Sum the selected values with a row-wise cumulative sum, so every mean
+   adds values in series order and matches the original Python loops
+   bit for bit.
+"""
+
+from __future__ import annotations
+
+from typing import Any, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .helpers import _safe_numeric
+
+
+class SeriesMatrix:
+    """Ragged per-ad daily series packed into a left-aligned matrix.
+
+    Attributes:
+        lengths: Series length per row (including absent values).
+        values: (rows, max_length) float matrix, NaN where absent or padded.
+        present: Same shape; True where the series had a numeric value.
+    """
+
+    def __init__(self, series: Sequence[Sequence[Any]]):
+        """Parse every value once with _safe_numeric.
+
+        Args:
+            series: One sequence of raw values (str/int/float/None) per ad.
+        """
+        self.lengths = np.array([len(s) for s in series], dtype=np.int64)
+        width = int(self.lengths.max()) if len(series) else 0
+        self.values = np.full((len(series), width), np.nan)
+        self.present = np.zeros((len(series), width), dtype=bool)
+
+        rows = np.repeat(np.arange(len(series)), self.lengths)
+        cols = np.arange(len(rows)) - np.repeat(np.cumsum(self.lengths) - self.lengths, self.lengths)
+        parsed = [_safe_numeric(v) for s in series for v in s]
+        found = np.array([v is not None for v in parsed], dtype=bool)
+        flat = np.array([np.nan if v is None else v for v in parsed], dtype=float)
+        self.values[rows[found], cols[found]] = flat[found]
+        self.present[rows[found], cols[found]] = True
+
+    def __len__(self) -> int:
+        return len(self.lengths)
+
+    def window_mean(
+        self,
+        start: np.ndarray,
+        stop: np.ndarray,
+        positive_only: bool = False,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Mean of the present values in columns [start, stop) of each row.
+
+        Args:
+            start: First column per row (inclusive).
+            stop: Last column per row (exclusive).
+            positive_only: Only count values > 0.
+
+        Returns:
+            Tuple of (means, counts); means are NaN where counts is 0.
+        """
+        cols = np.arange(self.values.shape[1])
+        mask = self.present & (cols >= start[:, None]) & (cols < stop[:, None])
+        if positive_only:
+            with np.errstate(invalid="ignore"):
+                mask &= self.values > 0
+        counts = mask.sum(axis=1)
+        sums = np.zeros(len(self))
+        if self.values.shape[1]:
+            # cumsum accumulates left to right, like sum() over the list
+            sums = np.cumsum(np.where(mask, self.values, 0.0), axis=1)[:, -1]
+        means = np.full(len(self), np.nan)
+        np.divide(sums, counts, out=means, where=counts > 0)
+        return means, counts
+
+
+def week_over_week_change(
+    series: Sequence[Sequence[Any]],
+    window: int = 7,
+) -> np.ndarray:
+    """Fractional change of the last `window` days vs the window before.
+
+    Only positive values count. The previous window is the `window` days
+    before the recent one, or everything before it for shorter series.
+
+    Args:
+        series: Date-ordered daily values per ad (e.g. link_ctr).
+        window: Days per window.
+
+    Returns:
+        Array of fractional changes (-0.15 = 15% decline), NaN where a
+        series is too short or a window has no positive values.
+    """
+    matrix = SeriesMatrix(series)
+    n = matrix.lengths
+    recent, recent_count = matrix.window_mean(n - window, n, positive_only=True)
+    previous, previous_count = matrix.window_mean(
+        np.maximum(n - 2 * window, 0), n - window, positive_only=True
+    )
+
+    ok = (n > window) & (recent_count > 0) & (previous_count > 0) & (previous != 0)
+    change = np.full(len(matrix), np.nan)
+    np.divide(recent - previous, previous, out=change, where=ok)
+    return change
+
+
+def half_split_means(
+    series: Sequence[Sequence[Any]],
+    min_length: int = 5,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Mean of the first and second half of each series.
+
+    The second half gets the extra element of odd-length series.
+
+    Args:
+        series: Date-ordered daily values per ad (e.g. frequency).
+        min_length: Shorter series yield NaN.
+
+    Returns:
+        Tuple of (first_half_means, second_half_means), NaN where a series
+        is too short or a half has no values.
+    """
+    matrix = SeriesMatrix(series)
+    n = matrix.lengths
+    mid = n // 2
+    first, first_count = matrix.window_mean(np.zeros_like(n), mid)
+    second, second_count = matrix.window_mean(mid, n)
+
+    ok = (n >= min_length) & (first_count > 0) & (second_count > 0)
+    return np.where(ok, first, np.nan), np.where(ok, second, np.nan)
+
+
+def half_split_pairs(
+    series: Sequence[Sequence[Any]],
+    min_length: int = 5,
+) -> List[Optional[Tuple[float, float]]]:
+    """half_split_means as (first, second) float pairs, None where unavailable.
+
+    A half whose values include NaN also yields None; no threshold
+    comparison can pass on a NaN mean anyway.
+    """
+    first, second = half_split_means(series, min_length)
+    return [
+        None if np.isnan(f) or np.isnan(s) else (f, s)
+        for f, s in zip(first.tolist(), second.tolist())
+    ]
@@ -0,0 +1,453 @@
+"""
+Columnar performance frames for AdPerformanceQueryService.
+
+A PerformanceFrame holds the meta_ads_performance rows of one brand and date
+range as NumPy columns: numeric metrics as float/int arrays, text fields as
+object arrays, and the ad/adset/campaign ids factorized to integer codes.
+Breakdowns group over those codes with np.bincount, which sums in row order,
+so totals are bit-identical to the original accumulating dict loops.
+
+Frames are cached per (brand, date range) in a process-wide TTL cache so
+back-to-back agent tools on the same brand reuse one fetch. Meta performance
+syncs invalidate the brand's frames (see MetaAdsService.sync_performance_to_db);
+writers in other processes are covered by the TTL.
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Columns fetched from meta_ads_performance (instead of select("*"))
+PERFORMANCE_COLUMNS = (
+    "meta_ad_id", "meta_adset_id", "meta_campaign_id", "date",
+    "ad_name", "ad_status", "adset_name", "campaign_name", "thumbnail_url",
+    "spend", "purchase_value", "impressions", "link_clicks", "add_to_carts",
+    "purchases", "reach", "frequency", "video_views", "hook_rate", "hold_rate",
+)
+
+ID_COLUMNS = ("meta_ad_id", "meta_adset_id", "meta_campaign_id")
+TEXT_COLUMNS = ID_COLUMNS + (
+    "date", "ad_name", "ad_status", "adset_name", "campaign_name", "thumbnail_url",
+)
+FLOAT_COLUMNS = ("spend", "purchase_value", "frequency", "hook_rate", "hold_rate")
+INT_COLUMNS = ("impressions", "link_clicks", "add_to_carts", "purchases", "reach", "video_views")
+
+# Columns summed by the group-bys
+SUM_FLOAT_COLUMNS = ("spend", "purchase_value")
+SUM_INT_COLUMNS = ("impressions", "link_clicks", "add_to_carts", "purchases", "reach")
+
+FRAME_TTL_SECONDS = 300.0
+MAX_CACHED_FRAMES = 64
+
+
+def _factorize(values: Sequence[Any]) -> Tuple[np.ndarray, List[Any]]:
+    """Integer codes in first-appearance order; -1 for empty values."""
+    index: Dict[Any, int] = {}
+    codes = np.fromiter(
+        (index.setdefault(v, len(index)) if v else -1 for v in values),
+        dtype=np.int64,
+        count=len(values),
+    )
+    return codes, list(index)
+
+
+class PerformanceGroups:
+    """Rows of a PerformanceFrame grouped by integer codes.
+
+    Groups are numbered in order of first appearance, matching the insertion
+    order of the dict-based aggregators; rows with a negative code are left
+    out, like rows the loops skipped.
+    """
+
+    def __init__(self, frame: "PerformanceFrame", codes: np.ndarray):
+        self.frame = frame
+        self.rows = np.flatnonzero(codes >= 0)
+        keys, first, inverse = np.unique(
+            codes[self.rows], return_index=True, return_inverse=True
+        )
+        order = np.argsort(first, kind="stable")
+        rank = np.empty(len(order), dtype=np.int64)
+        rank[order] = np.arange(len(order))
+        self.codes = keys[order]
+        self.group = rank[inverse.reshape(-1)]
+        self.n = len(keys)
+
+    def sum(self, column: str) -> np.ndarray:
+        """Per-group sum of a numeric column, accumulated in row order."""
+        values = self.frame.columns[column][self.rows]
+        totals = np.bincount(self.group, weights=values, minlength=self.n)
+        if values.dtype.kind == "i":
+            return totals.astype(np.int64)
+        return totals
+
+    def totals(self) -> Dict[str, np.ndarray]:
+        """Per-group sums of every SUM_*_COLUMNS column."""
+        return {c: self.sum(c) for c in SUM_FLOAT_COLUMNS + SUM_INT_COLUMNS}
+
+    def pick(self, column: str, last: bool = False, default: Any = "") -> List[Any]:
+        """First (or last) non-empty value of a text column per group."""
+        present = self.frame.present[column][self.rows]
+        groups = self.group[present]
+        values = self.frame.columns[column][self.rows][present]
+        if last:
+            groups, values = groups[::-1], values[::-1]
+        out = [default] * self.n
+        hit, idx = np.unique(groups, return_index=True)
+        for g, v in zip(hit.tolist(), values[idx].tolist()):
+            out[g] = v
+        return out
+
+    def count_distinct(self, id_column: str) -> np.ndarray:
+        """Number of distinct non-empty ids of id_column per group."""
+        codes = self.frame.codes[id_column][self.rows]
+        named = codes >= 0
+        if not named.any():
+            return np.zeros(self.n, dtype=np.int64)
+        base = int(codes.max()) + 1
+        pairs = np.unique(self.group[named] * base + codes[named])
+        return np.bincount(pairs // base, minlength=self.n)
+
+
+class PerformanceFrame:
+    """Daily meta_ads_performance rows stored column-wise.
+
+    Text columns keep the raw row values (``present`` marks the truthy
+    ones); numeric columns are coerced like the row loops did
+    (``float(x or 0)`` / ``int(x or 0)``). ``ad_attrs`` holds optional per-ad
+    attributes (classification fields) indexed by meta_ad_id code.
+    """
+
+    def __init__(
+        self,
+        columns: Dict[str, np.ndarray],
+        present: Dict[str, np.ndarray],
+        codes: Dict[str, np.ndarray],
+        keys: Dict[str, List[Any]],
+        ad_attrs: Optional[Dict[str, List[Any]]] = None,
+    ):
+        self.columns = columns
+        self.present = present
+        self.codes = codes
+        self.keys = keys
+        self.ad_attrs = ad_attrs or {}
+
+    @classmethod
+    def from_rows(cls, rows: List[Dict]) -> "PerformanceFrame":
+        """Build a frame from performance row dicts (in their given order)."""
+        n = len(rows)
+        columns: Dict[str, np.ndarray] = {}
+        present: Dict[str, np.ndarray] = {}
+        codes: Dict[str, np.ndarray] = {}
+        keys: Dict[str, List[Any]] = {}
+
+        for c in TEXT_COLUMNS:
+            values = np.empty(n, dtype=object)
+            values[:] = [r.get(c) for r in rows]
+            columns[c] = values
+            present[c] = np.fromiter((bool(v) for v in values), dtype=bool, count=n)
+        for c in ID_COLUMNS:
+            codes[c], keys[c] = _factorize(columns[c])
+        for c in FLOAT_COLUMNS:
+            columns[c] = np.fromiter((float(r.get(c) or 0) for r in rows), dtype=np.float64, count=n)
+        for c in INT_COLUMNS:
+            columns[c] = np.fromiter((int(r.get(c) or 0) for r in rows), dtype=np.int64, count=n)
+
+        return cls(columns, present, codes, keys)
+
+    def __len__(self) -> int:
+        return len(self.columns["spend"])
+
+    # -------------------------------------------------------------------------
+    # Selection
+    # -------------------------------------------------------------------------
+
+    def take(self, mask: np.ndarray) -> "PerformanceFrame":
+        """Rows selected by a boolean mask (or index array), order preserved."""
+        return PerformanceFrame(
+            {c: v[mask] for c, v in self.columns.items()},
+            {c: v[mask] for c, v in self.present.items()},
+            {c: v[mask] for c, v in self.codes.items()},
+            self.keys,
+            self.ad_attrs,
+        )
+
+    def ad_ids(self) -> List[str]:
+        """Distinct non-empty meta_ad_ids present in the frame."""
+        codes = np.unique(self.codes["meta_ad_id"])
+        keys = self.keys["meta_ad_id"]
+        return [keys[c] for c in codes.tolist() if c >= 0]
+
+    def ad_mask(self, ad_ids: Iterable[str]) -> np.ndarray:
+        """Row mask for rows whose meta_ad_id is in ad_ids."""
+        wanted = set(ad_ids)
+        keys = self.keys["meta_ad_id"]
+        hits = np.array([k in wanted for k in keys] + [False], dtype=bool)
+        # Code -1 (no ad id) indexes the trailing False
+        return hits[self.codes["meta_ad_id"]]
+
+    def filter_ad_ids(self, ad_ids: Iterable[str]) -> "PerformanceFrame":
+        """Rows whose meta_ad_id is in ad_ids."""
+        return self.take(self.ad_mask(ad_ids))
+
+    def ad_attr(self, name: str) -> np.ndarray:
+        """Per-row view of a per-ad attribute (None for rows without one)."""
+        values = np.empty(len(self.keys["meta_ad_id"]) + 1, dtype=object)
+        values[:-1] = self.ad_attrs.get(name) or [None] * (len(values) - 1)
+        values[-1] = None
+        return values[self.codes["meta_ad_id"]]
+
+    def with_classifications(self, cls_map: Dict[str, Dict]) -> "PerformanceFrame":
+        """Rows of classified ads, carrying the classification fields per ad."""
+        attrs: Dict[str, List[Any]] = {
+            name: [] for name in (
+                "creative_awareness_level", "creative_format",
+                "video_length_bucket", "landing_page_id",
+            )
+        }
+        classified = []
+        for aid in self.keys["meta_ad_id"]:
+            c = cls_map.get(aid)
+            classified.append(c is not None)
+            for name, values in attrs.items():
+                values.append(c.get(name) if c else None)
+        hits = np.array(classified + [False], dtype=bool)
+        frame = self.take(hits[self.codes["meta_ad_id"]])
+        frame.ad_attrs = attrs
+        return frame
+
+    def group_by(self, codes: np.ndarray) -> PerformanceGroups:
+        """Group rows by integer codes (-1 skips the row)."""
+        return PerformanceGroups(self, codes)
+
+    def group_by_labels(self, ad_labels: Sequence[Any]) -> Tuple[PerformanceGroups, List[Any]]:
+        """Group rows by a label assigned to each ad (falsy label skips the ad).
+
+        Returns:
+            Tuple of (groups, label per group).
+        """
+        label_codes, labels = _factorize(ad_labels)
+        per_row = np.append(label_codes, -1)[self.codes["meta_ad_id"]]
+        groups = self.group_by(per_row)
+        return groups, [labels[c] for c in groups.codes.tolist()]
+
+    # -------------------------------------------------------------------------
+    # Aggregations (same output as the original dict-loop aggregators)
+    # -------------------------------------------------------------------------
+
+    def aggregate_by_ad(self) -> List[Dict]:
+        """Per-ad summaries (ads in order of first appearance)."""
+        g = self.group_by(self.codes["meta_ad_id"])
+        t = g.totals()
+        ad_keys = self.keys["meta_ad_id"]
+        names = g.pick("ad_name", last=True, default="Unknown")
+        statuses = g.pick("ad_status")
+        adset_names = g.pick("adset_name", last=True)
+        campaign_names = g.pick("campaign_name", last=True)
+        adset_ids = g.pick("meta_adset_id", last=True)
+        campaign_ids = g.pick("meta_campaign_id", last=True)
+        thumbnails = g.pick("thumbnail_url")
+
+        result = []
+        for i, code in enumerate(g.codes.tolist()):
+            spend = float(t["spend"][i])
+            imp = int(t["impressions"][i])
+            clicks = int(t["link_clicks"][i])
+            purchases = int(t["purchases"][i])
+            pv = float(t["purchase_value"][i])
+            reach = int(t["reach"][i])
+            result.append({
+                "meta_ad_id": ad_keys[code],
+                "ad_name": names[i],
+                "ad_status": statuses[i],
+                "adset_name": adset_names[i],
+                "campaign_name": campaign_names[i],
+                "meta_adset_id": adset_ids[i],
+                "meta_campaign_id": campaign_ids[i],
+                "thumbnail_url": thumbnails[i],
+                "spend": spend,
+                "impressions": imp,
+                "reach": reach,
+                "link_clicks": clicks,
+                "ctr": (clicks / imp * 100) if imp > 0 else 0,
+                "cpm": (spend / imp * 1000) if imp > 0 else 0,
+                "cpc": (spend / clicks) if clicks > 0 else 0,
+                "add_to_carts": int(t["add_to_carts"][i]),
+                "purchases": purchases,
+                "purchase_value": pv,
+                "roas": (pv / spend) if spend > 0 else 0,
+                "cpa": (spend / purchases) if purchases > 0 else 0,
+                "conversion_rate": (purchases / clicks * 100) if clicks > 0 else 0,
+                "frequency": (imp / reach) if reach > 0 else 0,
+            })
+        return result
+
+    def aggregate_by_campaign(self) -> List[Dict]:
+        """Per-campaign summaries (campaigns in order of first appearance)."""
+        g = self.group_by(self.codes["meta_campaign_id"])
+        t = g.totals()
+        campaign_keys = self.keys["meta_campaign_id"]
+        names = g.pick("campaign_name", last=True, default="Unknown")
+        adset_counts = g.count_distinct("meta_adset_id")
+        ad_counts = g.count_distinct("meta_ad_id")
+
+        result = []
+        for i, code in enumerate(g.codes.tolist()):
+            spend = float(t["spend"][i])
+            imp = int(t["impressions"][i])
+            clicks = int(t["link_clicks"][i])
+            purchases = int(t["purchases"][i])
+            pv = float(t["purchase_value"][i])
+            result.append({
+                "meta_campaign_id": campaign_keys[code],
+                "campaign_name": names[i],
+                "spend": spend,
+                "impressions": imp,
+                "link_clicks": clicks,
+                "ctr": (clicks / imp * 100) if imp > 0 else 0,
+                "cpm": (spend / imp * 1000) if imp > 0 else 0,
+                "cpc": (spend / clicks) if clicks > 0 else 0,
+                "add_to_carts": int(t["add_to_carts"][i]),
+                "purchases": purchases,
+                "purchase_value": pv,
+                "roas": (pv / spend) if spend > 0 else 0,
+                "cpa": (spend / purchases) if purchases > 0 else 0,
+                "conversion_rate": (purchases / clicks * 100) if clicks > 0 else 0,
+                "adset_count": int(adset_counts[i]),
+                "ad_count": int(ad_counts[i]),
+            })
+        return result
+
+    def aggregate_by_adset(self) -> List[Dict]:
+        """Per-adset summaries (adsets in order of first appearance)."""
+        g = self.group_by(self.codes["meta_adset_id"])
+        t = g.totals()
+        adset_keys = self.keys["meta_adset_id"]
+        names = g.pick("adset_name", last=True, default="Unknown")
+        campaign_names = g.pick("campaign_name", last=True)
+        campaign_ids = g.pick("meta_campaign_id", last=True)
+        ad_counts = g.count_distinct("meta_ad_id")
+
+        result = []
+        for i, code in enumerate(g.codes.tolist()):
+            spend = float(t["spend"][i])
+            imp = int(t["impressions"][i])
+            clicks = int(t["link_clicks"][i])
+            purchases = int(t["purchases"][i])
+            pv = float(t["purchase_value"][i])
+            result.append({
+                "meta_adset_id": adset_keys[code],
+                "adset_name": names[i],
+                "campaign_name": campaign_names[i],
+                "meta_campaign_id": campaign_ids[i],
+                "spend": spend,
+                "impressions": imp,
+                "link_clicks": clicks,
+                "ctr": (clicks / imp * 100) if imp > 0 else 0,
+                "cpm": (spend / imp * 1000) if imp > 0 else 0,
+                "cpc": (spend / clicks) if clicks > 0 else 0,
+                "add_to_carts": int(t["add_to_carts"][i]),
+                "purchases": purchases,
+                "purchase_value": pv,
+                "roas": (pv / spend) if spend > 0 else 0,
+                "cpa": (spend / purchases) if purchases > 0 else 0,
+                "conversion_rate": (purchases / clicks * 100) if clicks > 0 else 0,
+                "ad_count": int(ad_counts[i]),
+            })
+        return result
+
+    def period_totals(self) -> Dict[str, Any]:
+        """Totals over every row of the frame."""
+        g = self.group_by(np.zeros(len(self), dtype=np.int64))
+        t = g.totals() if g.n else {c: [0] for c in SUM_FLOAT_COLUMNS + SUM_INT_COLUMNS}
+        spend = float(t["spend"][0])
+        impressions = int(t["impressions"][0])
+        link_clicks = int(t["link_clicks"][0])
+        purchases = int(t["purchases"][0])
+        purchase_value = float(t["purchase_value"][0])
+        add_to_carts = int(t["add_to_carts"][0])
+        reach = int(t["reach"][0])
+
+        return {
+            "spend": spend,
+            "impressions": impressions,
+            "reach": reach,
+            "link_clicks": link_clicks,
+            "ctr": (link_clicks / impressions * 100) if impressions > 0 else 0,
+            "cpm": (spend / impressions * 1000) if impressions > 0 else 0,
+            "cpc": (spend / link_clicks) if link_clicks > 0 else 0,
+            "add_to_carts": add_to_carts,
+            "purchases": purchases,
+            "purchase_value": purchase_value,
+            "roas": (purchase_value / spend) if spend > 0 else 0,
+            "cpa": (spend / purchases) if purchases > 0 else 0,
+            "conversion_rate": (purchases / link_clicks * 100) if link_clicks > 0 else 0,
+            "unique_ads": len(np.unique(self.codes["meta_ad_id"][self.present["meta_ad_id"]])),
+            "unique_campaigns": len(np.unique(
+                self.codes["meta_campaign_id"][self.present["meta_campaign_id"]]
+            )),
+        }
+
+
+class PerformanceFrameCache:
+    """
+    Process-wide cache of PerformanceFrames.
+
+    Entries are keyed by (brand_id, date_start, date_end, kind), where kind
+    separates the raw frame from its classified view. A miss or an entry
+    older than the TTL is (re)built via the loader; the oldest entries are
+    evicted beyond max_entries. Thread-safe.
+    """
+
+    def __init__(self, ttl_seconds: float = FRAME_TTL_SECONDS, max_entries: int = MAX_CACHED_FRAMES):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        # key -> (frame, built_at (monotonic))
+        self._frames: Dict[Tuple[str, str, str, str], Tuple[PerformanceFrame, float]] = {}
+
+    def get(
+        self,
+        brand_id: str,
+        date_start: str,
+        date_end: str,
+        kind: str,
+        loader: Callable[[], PerformanceFrame],
+    ) -> PerformanceFrame:
+        """Return the cached frame, building it via loader when missing or stale."""
+        key = (str(brand_id), date_start, date_end, kind)
+        with self._lock:
+            entry = self._frames.get(key)
+            if entry is not None and time.monotonic() - entry[1] < self.ttl_seconds:
+                return entry[0]
+
+        frame = loader()
+        with self._lock:
+            self._frames.pop(key, None)
+            self._frames[key] = (frame, time.monotonic())
+            while len(self._frames) > self.max_entries:
+                del self._frames[next(iter(self._frames))]
+        return frame
+
+    def invalidate(self, brand_id: Optional[str] = None) -> None:
+        """Forget cached frames (for one brand, or all)."""
+        with self._lock:
+            if brand_id is None:
+                self._frames.clear()
+                return
+            for key in [k for k in self._frames if k[0] == str(brand_id)]:
+                del self._frames[key]
+
+
+_frame_cache = PerformanceFrameCache()
+
+
+def get_performance_frame_cache() -> PerformanceFrameCache:
+    """Get the process-wide performance frame cache."""
+    return _frame_cache
+
+
+def invalidate_performance_frames(brand_id: Optional[str] = None) -> None:
+    """Drop cached performance frames after meta_ads_performance changes."""
+    _frame_cache.invalidate(brand_id)
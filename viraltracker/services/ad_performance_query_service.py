@@ -12,21 +12,35 @@ Provides 7 query methods for conversational ad performance querying:
 
 All methods are sync (Supabase client is sync). Returns structured dicts.
 Aggregation logic ported from viraltracker/ui/pages/30_Ad_Performance.py.
+
+Performance rows are loaded once per (brand, date range) into a columnar
+PerformanceFrame (see ad_performance_frame.py), cached with a TTL and
+invalidated on Meta performance syncs; every breakdown is a vectorized
+group-by over that frame.
 """
 
 import logging
-from collections import defaultdict
 from datetime import date, datetime, timedelta
 from typing import Any, Dict, List, Optional, Tuple
 
+import numpy as np
+
+from .ad_performance_frame import (
+    PERFORMANCE_COLUMNS,
+    PerformanceFrame,
+    PerformanceFrameCache,
+    get_performance_frame_cache,
+)
+
 logger = logging.getLogger(__name__)
 
 
 class AdPerformanceQueryService:
     """Service for querying ad performance data from meta_ads_performance."""
 
-    def __init__(self, supabase_client):
+    def __init__(self, supabase_client, frame_cache: Optional[PerformanceFrameCache] = None):
         self.supabase = supabase_client
+        self._frames = frame_cache or get_performance_frame_cache()
 
     # -------------------------------------------------------------------------
     # Public query methods
@@ -65,12 +79,12 @@ class AdPerformanceQueryService:
             Dict with 'ads' list, 'meta' dict with query params and date range.
         """
         start, end = self._resolve_date_range(days_back, date_start, date_end)
-        rows = self._fetch_performance_rows(brand_id, start, end)
+        frame = self._get_performance_frame(brand_id, start, end)
 
-        if not rows:
+        if not len(frame):
             return {"ads": [], "meta": {"date_start": start.isoformat(), "date_end": end.isoformat(), "total_rows": 0}}
 
-        ads = self._aggregate_by_ad(rows)
+        ads = frame.aggregate_by_ad()
 
         # Product filter (two-tier: landing page + name match)
         if product_id:
@@ -156,14 +170,13 @@ class AdPerformanceQueryService:
             and optional 'change' with percentage deltas.
         """
         start, end = self._resolve_date_range(days_back, date_start, date_end)
-        rows = self._fetch_performance_rows(brand_id, start, end)
+        frame = self._get_performance_frame(brand_id, start, end)
 
-        if product_id and rows:
-            ad_ids = list({r.get("meta_ad_id") for r in rows if r.get("meta_ad_id")})
-            product_ad_ids = self._resolve_product_ad_ids(brand_id, product_id, ad_ids)
-            rows = [r for r in rows if r.get("meta_ad_id") in product_ad_ids]
+        if product_id and len(frame):
+            product_ad_ids = self._resolve_product_ad_ids(brand_id, product_id, frame.ad_ids())
+            frame = frame.filter_ad_ids(product_ad_ids)
 
-        current = self._compute_period_totals(rows)
+        current = frame.period_totals()
 
         result: Dict[str, Any] = {
             "current": current,
@@ -180,13 +193,14 @@ class AdPerformanceQueryService:
             prev_end = start - timedelta(days=1)
             prev_start = prev_end - timedelta(days=period_days - 1)
 
-            prev_rows = self._fetch_performance_rows(brand_id, prev_start, prev_end)
-            if product_id and prev_rows:
-                prev_ad_ids = list({r.get("meta_ad_id") for r in prev_rows if r.get("meta_ad_id")})
-                prev_product_ids = self._resolve_product_ad_ids(brand_id, product_id, prev_ad_ids)
-                prev_rows = [r for r in prev_rows if r.get("meta_ad_id") in prev_product_ids]
+            prev_frame = self._get_performance_frame(brand_id, prev_start, prev_end)
+            if product_id and len(prev_frame):
+                prev_product_ids = self._resolve_product_ad_ids(
+                    brand_id, product_id, prev_frame.ad_ids()
+                )
+                prev_frame = prev_frame.filter_ad_ids(prev_product_ids)
 
-            previous = self._compute_period_totals(prev_rows)
+            previous = prev_frame.period_totals()
 
             result["previous"] = previous
             result["previous_meta"] = {
@@ -225,20 +239,19 @@ class AdPerformanceQueryService:
             Dict with 'items' list and 'meta' dict.
         """
         start, end = self._resolve_date_range(days_back, date_start, date_end)
-        rows = self._fetch_performance_rows(brand_id, start, end)
+        frame = self._get_performance_frame(brand_id, start, end)
 
-        if product_id and rows:
-            ad_ids = list({r.get("meta_ad_id") for r in rows if r.get("meta_ad_id")})
-            product_ad_ids = self._resolve_product_ad_ids(brand_id, product_id, ad_ids)
-            rows = [r for r in rows if r.get("meta_ad_id") in product_ad_ids]
+        if product_id and len(frame):
+            product_ad_ids = self._resolve_product_ad_ids(brand_id, product_id, frame.ad_ids())
+            frame = frame.filter_ad_ids(product_ad_ids)
 
-        if not rows:
+        if not len(frame):
             return {"items": [], "meta": {"date_start": start.isoformat(), "date_end": end.isoformat(), "level": level, "product_id": product_id}}
 
         if level == "adset":
-            items = self._aggregate_by_adset(rows)
+            items = frame.aggregate_by_adset()
         else:
-            items = self._aggregate_by_campaign(rows)
+            items = frame.aggregate_by_campaign()
 
         items.sort(key=lambda x: x.get(sort_by, 0) or 0, reverse=True)
 
@@ -276,22 +289,26 @@ class AdPerformanceQueryService:
             Dict with 'ad' summary, 'daily' trend data, and 'meta' dict.
         """
         start, end = self._resolve_date_range(days_back, date_start, date_end)
-        rows = self._fetch_performance_rows(brand_id, start, end)
+        frame = self._get_performance_frame(brand_id, start, end)
 
-        if not rows:
+        if not len(frame):
             return {"ad": None, "daily": [], "meta": {"ad_identifier": ad_identifier, "error": "No performance data found"}}
 
         # Try exact ID match first
-        ad_rows = [r for r in rows if r.get("meta_ad_id") == ad_identifier]
+        ad_frame = frame.filter_ad_ids([ad_identifier])
 
         # Fallback to name search
-        if not ad_rows:
+        if not len(ad_frame):
             search_lower = ad_identifier.lower()
-            ad_rows = [r for r in rows if search_lower in (r.get("ad_name") or "").lower()]
+            ad_frame = frame.take(np.fromiter(
+                (search_lower in (name or "").lower() for name in frame.columns["ad_name"]),
+                dtype=bool,
+                count=len(frame),
+            ))
 
-        if not ad_rows:
+        if not len(ad_frame):
             # Return available ad names for user to refine
-            all_ads = self._aggregate_by_ad(rows)
+            all_ads = frame.aggregate_by_ad()
             suggestions = [{"ad_name": a["ad_name"], "meta_ad_id": a["meta_ad_id"], "spend": a["spend"]} for a in all_ads[:10]]
             return {
                 "ad": None,
@@ -304,29 +321,28 @@ class AdPerformanceQueryService:
             }
 
         # If name search matched multiple ads, pick the highest-spend one
-        if len(set(r.get("meta_ad_id") for r in ad_rows)) > 1:
-            # Group by ad_id, pick highest spend
-            by_id: Dict[str, list] = defaultdict(list)
-            for r in ad_rows:
-                by_id[r.get("meta_ad_id", "")].append(r)
-            best_id = max(by_id.keys(), key=lambda k: sum(float(r.get("spend") or 0) for r in by_id[k]))
-            ad_rows = by_id[best_id]
+        by_id = ad_frame.group_by(ad_frame.codes["meta_ad_id"])
+        if by_id.n > 1:
+            best_code = by_id.codes[int(np.argmax(by_id.sum("spend")))]
+            ad_frame = ad_frame.take(ad_frame.codes["meta_ad_id"] == best_code)
 
         # Build aggregate summary
-        agg = self._aggregate_by_ad(ad_rows)
+        agg = ad_frame.aggregate_by_ad()
         ad_summary = agg[0] if agg else {}
 
         # Build daily trend
+        cols = ad_frame.columns
+        dates = cols["date"].tolist()
         daily = []
-        for r in sorted(ad_rows, key=lambda x: x.get("date", "")):
-            spend = float(r.get("spend") or 0)
-            impressions = int(r.get("impressions") or 0)
-            link_clicks = int(r.get("link_clicks") or 0)
-            purchases = int(r.get("purchases") or 0)
-            purchase_value = float(r.get("purchase_value") or 0)
+        for i in sorted(range(len(dates)), key=lambda j: dates[j] or ""):
+            spend = float(cols["spend"][i])
+            impressions = int(cols["impressions"][i])
+            link_clicks = int(cols["link_clicks"][i])
+            purchases = int(cols["purchases"][i])
+            purchase_value = float(cols["purchase_value"][i])
 
             daily.append({
-                "date": r.get("date"),
+                "date": dates[i],
                 "spend": spend,
                 "impressions": impressions,
                 "link_clicks": link_clicks,
@@ -335,11 +351,11 @@ class AdPerformanceQueryService:
                 "purchases": purchases,
                 "purchase_value": purchase_value,
                 "roas": (purchase_value / spend) if spend > 0 else 0,
-                "reach": int(r.get("reach") or 0),
-                "frequency": float(r.get("frequency") or 0),
-                "video_views": int(r.get("video_views") or 0),
-                "hook_rate": float(r.get("hook_rate") or 0),
-                "hold_rate": float(r.get("hold_rate") or 0),
+                "reach": int(cols["reach"][i]),
+                "frequency": float(cols["frequency"][i]),
+                "video_views": int(cols["video_views"][i]),
+                "hook_rate": float(cols["hook_rate"][i]),
+                "hold_rate": float(cols["hold_rate"][i]),
             })
 
         return {
@@ -387,20 +403,16 @@ class AdPerformanceQueryService:
             Dict with 'groups' list and 'meta' dict.
         """
         start, end = self._resolve_date_range(days_back, date_start, date_end)
-        classified = self._fetch_classified_performance(brand_id, start, end)
+        classified = self._get_classified_frame(brand_id, start, end)
 
         if awareness_level:
-            classified = [
-                r for r in classified
-                if r.get("creative_awareness_level") == awareness_level
-            ]
+            classified = self._filter_awareness(classified, awareness_level)
 
-        if product_id and classified:
-            ad_ids = list({r.get("meta_ad_id") for r in classified if r.get("meta_ad_id")})
-            product_ad_ids = self._resolve_product_ad_ids(brand_id, product_id, ad_ids)
-            classified = [r for r in classified if r.get("meta_ad_id") in product_ad_ids]
+        if product_id and len(classified):
+            product_ad_ids = self._resolve_product_ad_ids(brand_id, product_id, classified.ad_ids())
+            classified = classified.filter_ad_ids(product_ad_ids)
 
-        if not classified:
+        if not len(classified):
             return {
                 "groups": [],
                 "meta": {
@@ -413,38 +425,29 @@ class AdPerformanceQueryService:
             }
 
         # Group by media type
-        buckets: Dict[str, Dict] = defaultdict(lambda: {
-            "spend": 0, "impressions": 0, "link_clicks": 0,
-            "purchases": 0, "purchase_value": 0, "ad_ids": set(),
-        })
-
-        for row in classified:
-            fmt = row.get("creative_format") or "other"
+        media_types = []
+        for fmt in classified.ad_attrs["creative_format"]:
+            fmt = fmt or "other"
             if fmt.startswith("video_"):
-                media_type = "Video"
+                media_types.append("Video")
             elif fmt.startswith("image_"):
-                media_type = "Image"
+                media_types.append("Image")
             elif fmt == "carousel":
-                media_type = "Carousel"
+                media_types.append("Carousel")
             else:
-                media_type = "Other"
+                media_types.append("Other")
 
-            b = buckets[media_type]
-            b["spend"] += float(row.get("spend") or 0)
-            b["impressions"] += int(row.get("impressions") or 0)
-            b["link_clicks"] += int(row.get("link_clicks") or 0)
-            b["purchases"] += int(row.get("purchases") or 0)
-            b["purchase_value"] += float(row.get("purchase_value") or 0)
-            if row.get("meta_ad_id"):
-                b["ad_ids"].add(row["meta_ad_id"])
+        buckets, labels = classified.group_by_labels(media_types)
+        t = buckets.totals()
+        ad_counts = buckets.count_distinct("meta_ad_id")
 
         groups = []
-        for media_type, b in buckets.items():
-            spend = b["spend"]
-            imp = b["impressions"]
-            clicks = b["link_clicks"]
-            purchases = b["purchases"]
-            pv = b["purchase_value"]
+        for i, media_type in enumerate(labels):
+            spend = float(t["spend"][i])
+            imp = int(t["impressions"][i])
+            clicks = int(t["link_clicks"][i])
+            purchases = int(t["purchases"][i])
+            pv = float(t["purchase_value"][i])
             groups.append({
                 "media_type": media_type,
                 "spend": spend,
@@ -456,7 +459,7 @@ class AdPerformanceQueryService:
                 "purchase_value": pv,
                 "roas": (pv / spend) if spend > 0 else 0,
                 "cpa": (spend / purchases) if purchases > 0 else 0,
-                "ad_count": len(b["ad_ids"]),
+                "ad_count": int(ad_counts[i]),
             })
 
         groups.sort(key=lambda x: x["spend"], reverse=True)
@@ -501,15 +504,12 @@ class AdPerformanceQueryService:
             Dict with 'items' list and 'meta' dict.
         """
         start, end = self._resolve_date_range(days_back, date_start, date_end)
-        classified = self._fetch_classified_performance(brand_id, start, end)
+        classified = self._get_classified_frame(brand_id, start, end)
 
         if awareness_level:
-            classified = [
-                r for r in classified
-                if r.get("creative_awareness_level") == awareness_level
-            ]
+            classified = self._filter_awareness(classified, awareness_level)
 
-        if not classified:
+        if not len(classified):
             return {
                 "items": [],
                 "meta": {
@@ -520,64 +520,56 @@ class AdPerformanceQueryService:
                 },
             }
 
+        # Landing page per classified ad (frame rows only cover classified ads)
+        ad_ids = classified.ad_ids()
+        lp_by_ad = dict(zip(classified.keys["meta_ad_id"], classified.ad_attrs["landing_page_id"]))
+
         # Collect unique landing_page_ids for LP metadata
-        lp_ids = list(set(
-            r["landing_page_id"] for r in classified
-            if r.get("landing_page_id")
-        ))
+        lp_ids = list(set(lp_by_ad[aid] for aid in ad_ids if lp_by_ad[aid]))
         lp_map = self._fetch_landing_pages(lp_ids) if lp_ids else {}
 
         # Fetch destination URLs for ads without landing_page_id (fallback)
-        ads_without_lp = list(set(
-            r["meta_ad_id"] for r in classified
-            if not r.get("landing_page_id") and r.get("meta_ad_id")
-        ))
+        ads_without_lp = [aid for aid in ad_ids if not lp_by_ad[aid]]
         dest_map = self._fetch_ad_destinations(ads_without_lp) if ads_without_lp else {}
 
         # Group by landing page — use LP id when available, else destination URL
-        buckets: Dict[str, Dict] = defaultdict(lambda: {
-            "spend": 0, "impressions": 0, "link_clicks": 0,
-            "purchases": 0, "purchase_value": 0, "ad_ids": set(),
-            "url": "", "page_title": "", "product_name": "",
-            "is_lp_id": False,
-        })
-
-        for row in classified:
-            lp_id = row.get("landing_page_id")
-            aid = row.get("meta_ad_id")
-
+        present = set(ad_ids)
+        ad_keys: List[Optional[str]] = []
+        bucket_info: Dict[str, Dict] = {}
+        for aid, lp_id in lp_by_ad.items():
+            if aid not in present:
+                ad_keys.append(None)
+                continue
             if lp_id:
                 # Keyed by LP UUID — has full metadata
                 key = lp_id
                 lp_info = lp_map.get(lp_id, {})
-                b = buckets[key]
-                b["url"] = lp_info.get("url", "")
-                b["page_title"] = lp_info.get("page_title", "")
-                b["product_name"] = lp_info.get("resolved_product_name", "")
-                b["is_lp_id"] = True
+                info = {
+                    "url": lp_info.get("url", ""),
+                    "page_title": lp_info.get("page_title", ""),
+                    "product_name": lp_info.get("resolved_product_name", ""),
+                    "is_lp_id": True,
+                }
             else:
                 # Fallback: group by destination URL
                 dest_url = dest_map.get(aid, "")
                 key = f"url:{dest_url}" if dest_url else "unclassified"
-                b = buckets[key]
-                if dest_url:
-                    b["url"] = dest_url
+                info = {"url": dest_url, "page_title": "", "product_name": "", "is_lp_id": False}
+            ad_keys.append(key)
+            bucket_info.setdefault(key, info)
 
-            b["spend"] += float(row.get("spend") or 0)
-            b["impressions"] += int(row.get("impressions") or 0)
-            b["link_clicks"] += int(row.get("link_clicks") or 0)
-            b["purchases"] += int(row.get("purchases") or 0)
-            b["purchase_value"] += float(row.get("purchase_value") or 0)
-            if aid:
-                b["ad_ids"].add(aid)
+        buckets, keys = classified.group_by_labels(ad_keys)
+        t = buckets.totals()
+        ad_counts = buckets.count_distinct("meta_ad_id")
 
         items = []
-        for key, b in buckets.items():
-            spend = b["spend"]
-            imp = b["impressions"]
-            clicks = b["link_clicks"]
-            purchases = b["purchases"]
-            pv = b["purchase_value"]
+        for i, key in enumerate(keys):
+            b = bucket_info[key]
+            spend = float(t["spend"][i])
+            imp = int(t["impressions"][i])
+            clicks = int(t["link_clicks"][i])
+            purchases = int(t["purchases"][i])
+            pv = float(t["purchase_value"][i])
 
             url = b["url"] or ("Unclassified" if key == "unclassified" else "Unknown")
             items.append({
@@ -594,7 +586,7 @@ class AdPerformanceQueryService:
                 "purchase_value": pv,
                 "roas": (pv / spend) if spend > 0 else 0,
                 "cpa": (spend / purchases) if purchases > 0 else 0,
-                "ad_count": len(b["ad_ids"]),
+                "ad_count": int(ad_counts[i]),
             })
 
         items.sort(key=lambda x: x.get(sort_by, 0) or 0, reverse=True)
@@ -640,15 +632,12 @@ class AdPerformanceQueryService:
             Dict with 'items' list and 'meta' dict.
         """
         start, end = self._resolve_date_range(days_back, date_start, date_end)
-        classified = self._fetch_classified_performance(brand_id, start, end)
+        classified = self._get_classified_frame(brand_id, start, end)
 
         if awareness_level:
-            classified = [
-                r for r in classified
-                if r.get("creative_awareness_level") == awareness_level
-            ]
+            classified = self._filter_awareness(classified, awareness_level)
 
-        if not classified:
+        if not len(classified):
             return {
                 "items": [],
                 "meta": {
@@ -659,18 +648,16 @@ class AdPerformanceQueryService:
                 },
             }
 
+        # Landing page per classified ad (frame rows only cover classified ads)
+        ad_ids = classified.ad_ids()
+        lp_by_ad = dict(zip(classified.keys["meta_ad_id"], classified.ad_attrs["landing_page_id"]))
+
         # Collect unique landing_page_ids
-        lp_ids = list(set(
-            r["landing_page_id"] for r in classified
-            if r.get("landing_page_id")
-        ))
+        lp_ids = list(set(lp_by_ad[aid] for aid in ad_ids if lp_by_ad[aid]))
         lp_map = self._fetch_landing_pages(lp_ids) if lp_ids else {}
 
         # Also try to match destination URLs to brand_landing_pages for product info
-        ads_without_lp = list(set(
-            r["meta_ad_id"] for r in classified
-            if not r.get("landing_page_id") and r.get("meta_ad_id")
-        ))
+        ads_without_lp = [aid for aid in ad_ids if not lp_by_ad[aid]]
         dest_map = self._fetch_ad_destinations(ads_without_lp) if ads_without_lp else {}
 
         # Build URL -> LP lookup for destination URL fallback
@@ -681,42 +668,35 @@ class AdPerformanceQueryService:
                 url_to_lp = self._fetch_landing_pages_by_url(brand_id, unique_urls)
 
         # Group by product name
-        buckets: Dict[str, Dict] = defaultdict(lambda: {
-            "spend": 0, "impressions": 0, "link_clicks": 0,
-            "purchases": 0, "purchase_value": 0, "ad_ids": set(),
-        })
-
-        for row in classified:
-            lp_id = row.get("landing_page_id")
+        present = set(ad_ids)
+        ad_products: List[Optional[str]] = []
+        for aid, lp_id in lp_by_ad.items():
+            if aid not in present:
+                ad_products.append(None)
+                continue
             lp_info = lp_map.get(lp_id, {}) if lp_id else {}
             product_name = lp_info.get("resolved_product_name")
 
             # Fallback: try matching destination URL to a known LP for product info
             if not product_name and not lp_id:
-                aid = row.get("meta_ad_id")
                 dest_url = dest_map.get(aid, "")
                 if dest_url:
                     url_lp_info = url_to_lp.get(dest_url, {})
                     product_name = url_lp_info.get("resolved_product_name")
 
-            product_name = product_name or "Unknown Product"
+            ad_products.append(product_name or "Unknown Product")
 
-            b = buckets[product_name]
-            b["spend"] += float(row.get("spend") or 0)
-            b["impressions"] += int(row.get("impressions") or 0)
-            b["link_clicks"] += int(row.get("link_clicks") or 0)
-            b["purchases"] += int(row.get("purchases") or 0)
-            b["purchase_value"] += float(row.get("purchase_value") or 0)
-            if row.get("meta_ad_id"):
-                b["ad_ids"].add(row["meta_ad_id"])
+        buckets, product_names = classified.group_by_labels(ad_products)
+        t = buckets.totals()
+        ad_counts = buckets.count_distinct("meta_ad_id")
 
         items = []
-        for product_name, b in buckets.items():
-            spend = b["spend"]
-            imp = b["impressions"]
-            clicks = b["link_clicks"]
-            purchases = b["purchases"]
-            pv = b["purchase_value"]
+        for i, product_name in enumerate(product_names):
+            spend = float(t["spend"][i])
+            imp = int(t["impressions"][i])
+            clicks = int(t["link_clicks"][i])
+            purchases = int(t["purchases"][i])
+            pv = float(t["purchase_value"][i])
             items.append({
                 "product_name": product_name,
                 "spend": spend,
@@ -728,7 +708,7 @@ class AdPerformanceQueryService:
                 "purchase_value": pv,
                 "roas": (pv / spend) if spend > 0 else 0,
                 "cpa": (spend / purchases) if purchases > 0 else 0,
-                "ad_count": len(b["ad_ids"]),
+                "ad_count": int(ad_counts[i]),
             })
 
         items.sort(key=lambda x: x.get(sort_by, 0) or 0, reverse=True)
@@ -777,30 +757,29 @@ class AdPerformanceQueryService:
         start, end = self._resolve_date_range(days_back, date_start, date_end)
 
         # Fetch all performance rows (both classified and unclassified)
-        all_perf_rows = self._fetch_performance_rows(brand_id, start, end)
-        total_all_ads = len(set(r.get("meta_ad_id") for r in all_perf_rows if r.get("meta_ad_id")))
+        all_perf = self._get_performance_frame(brand_id, start, end)
+        total_all_ads = len(all_perf.ad_ids())
 
         # Fetch classified performance
-        classified = self._fetch_classified_performance(brand_id, start, end)
+        classified = self._get_classified_frame(brand_id, start, end)
 
         # Product filter
-        if product_id and classified:
-            all_cls_ad_ids = list(set(r["meta_ad_id"] for r in classified if r.get("meta_ad_id")))
-            product_ad_ids = self._resolve_product_ad_ids(brand_id, product_id, all_cls_ad_ids)
-            classified = [r for r in classified if r.get("meta_ad_id") in product_ad_ids]
+        if product_id and len(classified):
+            product_ad_ids = self._resolve_product_ad_ids(brand_id, product_id, classified.ad_ids())
+            classified = classified.filter_ad_ids(product_ad_ids)
 
         # Also filter total ads count for product
-        if product_id and all_perf_rows:
-            all_perf_ad_ids = list(set(r.get("meta_ad_id") for r in all_perf_rows if r.get("meta_ad_id")))
-            product_perf_ids = self._resolve_product_ad_ids(brand_id, product_id, all_perf_ad_ids)
+        if product_id and len(all_perf):
+            product_perf_ids = self._resolve_product_ad_ids(brand_id, product_id, all_perf.ad_ids())
             total_all_ads = len(product_perf_ids)
 
         # Format filter (video/image)
-        if format_filter and classified:
-            if format_filter == "video":
-                classified = [r for r in classified if (r.get("creative_format") or "").startswith("video_")]
-            elif format_filter == "image":
-                classified = [r for r in classified if not (r.get("creative_format") or "").startswith("video_")]
+        if format_filter and len(classified) and format_filter in ("video", "image"):
+            is_video = np.array(
+                [(fmt or "").startswith("video_") for fmt in classified.ad_attr("creative_format")],
+                dtype=bool,
+            )
+            classified = classified.take(is_video if format_filter == "video" else ~is_video)
 
         # Canonical awareness levels
         canonical_levels = [level.value for level in AwarenessLevel]
@@ -812,84 +791,74 @@ class AdPerformanceQueryService:
             "most_aware": "Most Aware",
         }
 
-        # Build ad_id -> latest status map (rows are date desc, first seen wins)
-        ad_status_map: Dict[str, str] = {}
-        for row in classified:
-            aid = row.get("meta_ad_id")
-            if aid and aid not in ad_status_map:
-                ad_status_map[aid] = (row.get("ad_status") or "").upper()
+        # Ads per level, with their spend/purchases for the CPA distribution
+        ads_by_level: Dict[str, List[Tuple[str, float, int]]] = {level: [] for level in canonical_levels}
+
+        # Per-ad totals and latest status (rows are date desc, first seen wins)
+        ad_codes = classified.codes["meta_ad_id"]
+        by_ad = classified.group_by(ad_codes)
+        ad_keys = classified.keys["meta_ad_id"]
+        ad_spend = by_ad.sum("spend")
+        ad_purchases = by_ad.sum("purchases")
+        _, first_rows = np.unique(ad_codes, return_index=True)
+        ad_status_map = {
+            ad_keys[ad_codes[i]]: (status or "").upper()
+            for i, status in zip(first_rows.tolist(), classified.columns["ad_status"][first_rows])
+        }
 
         # Group by awareness level
+        ad_levels = [
+            level if level in ads_by_level else None
+            for level in classified.ad_attrs["creative_awareness_level"]
+        ]
+        level_groups, present_levels = classified.group_by_labels(ad_levels)
+        level_totals = level_groups.totals()
+        level_pos = {level: i for i, level in enumerate(present_levels)}
+
+        for i, code in enumerate(by_ad.codes.tolist()):
+            level = ad_levels[code]
+            if level:
+                ads_by_level[level].append((ad_keys[code], float(ad_spend[i]), int(ad_purchases[i])))
+
+        total_classified = sum(len(ads) for ads in ads_by_level.values())
+        total_unclassified = total_all_ads - total_classified
+
         buckets: Dict[str, Dict] = {}
         for level in canonical_levels:
+            i = level_pos.get(level)
             buckets[level] = {
-                "spend": 0, "impressions": 0, "link_clicks": 0,
-                "add_to_carts": 0, "purchases": 0, "purchase_value": 0,
-                "ad_ids": set(), "active_ad_ids": set(),
-                # Per-ad accumulators for CPA distribution
-                "ad_spend": defaultdict(float),
-                "ad_purchases": defaultdict(int),
+                name: (values[i] if i is not None else 0)
+                for name, values in level_totals.items()
             }
 
-        unclassified_ads = set()
-        classified_ads = set()
-
-        for row in classified:
-            level = row.get("creative_awareness_level")
-            aid = row.get("meta_ad_id")
-
-            if level and level in buckets:
-                classified_ads.add(aid)
-                b = buckets[level]
-                row_spend = float(row.get("spend") or 0)
-                row_purchases = int(row.get("purchases") or 0)
-                b["spend"] += row_spend
-                b["impressions"] += int(row.get("impressions") or 0)
-                b["link_clicks"] += int(row.get("link_clicks") or 0)
-                b["add_to_carts"] += int(row.get("add_to_carts") or 0)
-                b["purchases"] += row_purchases
-                b["purchase_value"] += float(row.get("purchase_value") or 0)
-                if aid:
-                    b["ad_ids"].add(aid)
-                    if ad_status_map.get(aid) == "ACTIVE":
-                        b["active_ad_ids"].add(aid)
-                    b["ad_spend"][aid] += row_spend
-                    b["ad_purchases"][aid] += row_purchases
-            else:
-                if aid:
-                    unclassified_ads.add(aid)
-
-        total_classified = len(classified_ads)
-        total_unclassified = total_all_ads - total_classified
-
         # Compute total spend for share calculation
-        total_spend = sum(b["spend"] for b in buckets.values())
+        total_spend = sum(float(b["spend"]) for b in buckets.values())
 
         # Build results
         levels = []
         gaps = []
         for level in canonical_levels:
             b = buckets[level]
-            spend = b["spend"]
-            imp = b["impressions"]
-            clicks = b["link_clicks"]
-            add_to_carts = b["add_to_carts"]
-            purchases = b["purchases"]
-            pv = b["purchase_value"]
-            ad_count = len(b["ad_ids"])
-            active_count = len(b["active_ad_ids"])
+            spend = float(b["spend"])
+            imp = int(b["impressions"])
+            clicks = int(b["link_clicks"])
+            add_to_carts = int(b["add_to_carts"])
+            purchases = int(b["purchases"])
+            pv = float(b["purchase_value"])
+            level_ads = ads_by_level[level]
+            ad_count = len(level_ads)
+            active_count = sum(1 for aid, _, _ in level_ads if ad_status_map.get(aid) == "ACTIVE")
 
             if ad_count == 0:
                 gaps.append(level)
 
             # Compute per-ad CPA distribution
             # "Top 75%" = 75th percentile of best performers = p25 of CPA ascending
-            ad_cpas = []
-            for aid in b["ad_ids"]:
-                a_spend = b["ad_spend"][aid]
-                a_purchases = b["ad_purchases"][aid]
-                if a_purchases > 0 and a_spend > 0:
-                    ad_cpas.append(a_spend / a_purchases)
+            ad_cpas = [
+                a_spend / a_purchases
+                for _, a_spend, a_purchases in level_ads
+                if a_purchases > 0 and a_spend > 0
+            ]
 
             ad_cpas.sort()
             mean_cpa = (sum(ad_cpas) / len(ad_cpas)) if ad_cpas else 0
@@ -957,59 +926,41 @@ class AdPerformanceQueryService:
             Dict with 'ads' list and 'meta' dict.
         """
         start, end = self._resolve_date_range(days_back, date_start, date_end)
-        classified = self._fetch_classified_performance(brand_id, start, end)
+        classified = self._get_classified_frame(brand_id, start, end)
 
         # Filter to awareness level
-        classified = [
-            r for r in classified
-            if r.get("creative_awareness_level") == awareness_level
-        ]
+        classified = self._filter_awareness(classified, awareness_level)
 
-        if not classified:
+        if not len(classified):
             return {"ads": [], "meta": {"awareness_level": awareness_level, "total": 0}}
 
         # Product filter
         if product_id:
-            all_ad_ids = list(set(r["meta_ad_id"] for r in classified if r.get("meta_ad_id")))
-            product_ad_ids = self._resolve_product_ad_ids(brand_id, product_id, all_ad_ids)
-            classified = [r for r in classified if r.get("meta_ad_id") in product_ad_ids]
+            product_ad_ids = self._resolve_product_ad_ids(brand_id, product_id, classified.ad_ids())
+            classified = classified.filter_ad_ids(product_ad_ids)
 
         # Aggregate by ad
-        ad_map: Dict[str, Dict] = defaultdict(lambda: {
-            "spend": 0, "impressions": 0, "link_clicks": 0,
-            "purchases": 0, "purchase_value": 0,
-            "ad_name": "", "thumbnail_url": "", "creative_format": "",
-        })
-
-        for row in classified:
-            aid = row.get("meta_ad_id")
-            if not aid:
-                continue
-            a = ad_map[aid]
-            a["ad_name"] = row.get("ad_name") or a["ad_name"]
-            if row.get("thumbnail_url") and not a["thumbnail_url"]:
-                a["thumbnail_url"] = row["thumbnail_url"]
-            a["creative_format"] = row.get("creative_format") or a["creative_format"]
-            a["spend"] += float(row.get("spend") or 0)
-            a["impressions"] += int(row.get("impressions") or 0)
-            a["link_clicks"] += int(row.get("link_clicks") or 0)
-            a["purchases"] += int(row.get("purchases") or 0)
-            a["purchase_value"] += float(row.get("purchase_value") or 0)
+        by_ad = classified.group_by(classified.codes["meta_ad_id"])
+        t = by_ad.totals()
+        ad_keys = classified.keys["meta_ad_id"]
+        formats = classified.ad_attrs["creative_format"]
+        names = by_ad.pick("ad_name", last=True)
+        thumbnails = by_ad.pick("thumbnail_url")
 
         ads = []
-        for aid, a in ad_map.items():
-            spend = a["spend"]
+        for i, code in enumerate(by_ad.codes.tolist()):
+            spend = float(t["spend"][i])
             if min_spend > 0 and spend < min_spend:
                 continue
-            imp = a["impressions"]
-            clicks = a["link_clicks"]
-            purchases = a["purchases"]
-            pv = a["purchase_value"]
+            imp = int(t["impressions"][i])
+            clicks = int(t["link_clicks"][i])
+            purchases = int(t["purchases"][i])
+            pv = float(t["purchase_value"][i])
             ads.append({
-                "meta_ad_id": aid,
-                "ad_name": a["ad_name"],
-                "thumbnail_url": a["thumbnail_url"],
-                "creative_format": a["creative_format"],
+                "meta_ad_id": ad_keys[code],
+                "ad_name": names[i],
+                "thumbnail_url": thumbnails[i],
+                "creative_format": formats[code] or "",
                 "spend": spend,
                 "impressions": imp,
                 "link_clicks": clicks,
@@ -1078,13 +1029,51 @@ class AdPerformanceQueryService:
         start = end - timedelta(days=d - 1)
         return start, end
 
+    def _get_performance_frame(
+        self, brand_id: str, date_start: date, date_end: date
+    ) -> PerformanceFrame:
+        """Performance rows for a brand and date range as a cached PerformanceFrame."""
+        return self._frames.get(
+            brand_id, date_start.isoformat(), date_end.isoformat(), "performance",
+            lambda: PerformanceFrame.from_rows(
+                self._fetch_performance_rows(brand_id, date_start, date_end)
+            ),
+        )
+
+    def _get_classified_frame(
+        self, brand_id: str, date_start: date, date_end: date
+    ) -> PerformanceFrame:
+        """Classified rows for a brand and date range as a cached PerformanceFrame.
+
+        Only rows of ads with a classification are kept; the latest
+        classification per ad is exposed through ``ad_attrs``
+        (creative_awareness_level, creative_format, video_length_bucket,
+        landing_page_id).
+        """
+        def load() -> PerformanceFrame:
+            frame = self._get_performance_frame(brand_id, date_start, date_end)
+            cls_map = self._fetch_latest_classifications(brand_id, frame.ad_ids())
+            return frame.with_classifications(cls_map)
+
+        return self._frames.get(
+            brand_id, date_start.isoformat(), date_end.isoformat(), "classified", load
+        )
+
+    @staticmethod
+    def _filter_awareness(frame: PerformanceFrame, awareness_level: str) -> PerformanceFrame:
+        """Rows of ads classified at awareness_level."""
+        levels = frame.ad_attrs["creative_awareness_level"]
+        hits = np.array([level == awareness_level for level in levels] + [False], dtype=bool)
+        return frame.take(hits[frame.codes["meta_ad_id"]])
+
     def _fetch_performance_rows(
         self, brand_id: str, date_start: date, date_end: date
     ) -> List[Dict]:
         """Fetch raw performance rows with pagination.
 
-        Supabase PostgREST silently truncates at 1000 rows.
-        Paginates using .range() until all rows are fetched.
+        Only PERFORMANCE_COLUMNS are selected. Supabase PostgREST silently
+        truncates at 1000 rows; paginates using .range() until all rows
+        are fetched.
         """
         all_rows: List[Dict] = []
         offset = 0
@@ -1093,7 +1082,7 @@ class AdPerformanceQueryService:
         while True:
             result = (
                 self.supabase.table("meta_ads_performance")
-                .select("*")
+                .select(", ".join(PERFORMANCE_COLUMNS))
                 .eq("brand_id", brand_id)
                 .gte("date", date_start.isoformat())
                 .lte("date", date_end.isoformat())
@@ -1118,29 +1107,16 @@ class AdPerformanceQueryService:
         )
         return all_rows
 
-    def _fetch_classified_performance(
-        self, brand_id: str, date_start: date, date_end: date
-    ) -> List[Dict]:
-        """Fetch performance rows joined with classification data.
-
-        1. Fetch performance rows (paginated via _fetch_performance_rows).
-        2. Extract unique ad_ids.
-        3. Fetch classifications (paginated) for those ads.
-        4. Build cls_map (latest classification per ad_id).
-        5. Merge performance + classification by meta_ad_id.
-
-        Only returns rows that have a matching classification.
+    def _fetch_latest_classifications(
+        self, brand_id: str, ad_ids: List[str]
+    ) -> Dict[str, Dict]:
+        """Fetch the latest classification per ad.
 
         Returns:
-            List of performance rows enriched with classification fields.
+            Dict mapping meta_ad_id to its most recent classification row.
         """
-        perf_rows = self._fetch_performance_rows(brand_id, date_start, date_end)
-        if not perf_rows:
-            return []
-
-        ad_ids = list(set(r.get("meta_ad_id") for r in perf_rows if r.get("meta_ad_id")))
         if not ad_ids:
-            return []
+            return {}
 
         # Fetch classifications with pagination (can exceed 1000 for large accounts)
         all_cls: List[Dict] = []
@@ -1180,22 +1156,7 @@ class AdPerformanceQueryService:
             f"Fetched {len(all_cls)} classification rows, "
             f"{len(cls_map)} unique ads classified"
         )
-
-        # Merge: enrich each perf row with classification fields
-        result = []
-        for row in perf_rows:
-            aid = row.get("meta_ad_id")
-            cls = cls_map.get(aid)
-            if not cls:
-                continue  # Skip unclassified ads
-            merged = dict(row)
-            merged["creative_awareness_level"] = cls.get("creative_awareness_level")
-            merged["creative_format"] = cls.get("creative_format")
-            merged["video_length_bucket"] = cls.get("video_length_bucket")
-            merged["landing_page_id"] = cls.get("landing_page_id")
-            result.append(merged)
-
-        return result
+        return cls_map
 
     def _fetch_landing_pages(self, lp_ids: List[str]) -> Dict[str, Dict]:
         """Batch-fetch landing pages with product resolution.
@@ -1380,212 +1341,25 @@ class AdPerformanceQueryService:
 
         Ported from viraltracker/ui/pages/30_Ad_Performance.py:aggregate_by_ad.
         """
-        ads: Dict[str, Dict] = defaultdict(lambda: {
-            "spend": 0, "impressions": 0, "link_clicks": 0,
-            "add_to_carts": 0, "purchases": 0, "purchase_value": 0,
-            "reach": 0,
-        })
-
-        for d in rows:
-            aid = d.get("meta_ad_id")
-            if not aid:
-                continue
-            a = ads[aid]
-            a["ad_name"] = d.get("ad_name") or a.get("ad_name", "Unknown")
-            if not a.get("ad_status"):
-                a["ad_status"] = d.get("ad_status") or ""
-            a["adset_name"] = d.get("adset_name") or a.get("adset_name", "")
-            a["campaign_name"] = d.get("campaign_name") or a.get("campaign_name", "")
-            a["meta_adset_id"] = d.get("meta_adset_id") or a.get("meta_adset_id", "")
-            a["meta_campaign_id"] = d.get("meta_campaign_id") or a.get("meta_campaign_id", "")
-            # Keep the first non-empty thumbnail (rows ordered by date desc, so most recent first)
-            if d.get("thumbnail_url") and not a.get("thumbnail_url"):
-                a["thumbnail_url"] = d["thumbnail_url"]
-            a["spend"] += float(d.get("spend") or 0)
-            a["impressions"] += int(d.get("impressions") or 0)
-            a["link_clicks"] += int(d.get("link_clicks") or 0)
-            a["add_to_carts"] += int(d.get("add_to_carts") or 0)
-            a["purchases"] += int(d.get("purchases") or 0)
-            a["purchase_value"] += float(d.get("purchase_value") or 0)
-            a["reach"] += int(d.get("reach") or 0)
-
-        result = []
-        for aid, a in ads.items():
-            imp = a["impressions"]
-            clicks = a["link_clicks"]
-            spend = a["spend"]
-            pv = a["purchase_value"]
-
-            result.append({
-                "meta_ad_id": aid,
-                "ad_name": a["ad_name"],
-                "ad_status": a["ad_status"],
-                "adset_name": a["adset_name"],
-                "campaign_name": a["campaign_name"],
-                "meta_adset_id": a["meta_adset_id"],
-                "meta_campaign_id": a["meta_campaign_id"],
-                "thumbnail_url": a.get("thumbnail_url", ""),
-                "spend": spend,
-                "impressions": imp,
-                "reach": a["reach"],
-                "link_clicks": clicks,
-                "ctr": (clicks / imp * 100) if imp > 0 else 0,
-                "cpm": (spend / imp * 1000) if imp > 0 else 0,
-                "cpc": (spend / clicks) if clicks > 0 else 0,
-                "add_to_carts": a["add_to_carts"],
-                "purchases": a["purchases"],
-                "purchase_value": pv,
-                "roas": (pv / spend) if spend > 0 else 0,
-                "cpa": (spend / a["purchases"]) if a["purchases"] > 0 else 0,
-                "conversion_rate": (a["purchases"] / clicks * 100) if clicks > 0 else 0,
-                "frequency": (imp / a["reach"]) if a["reach"] > 0 else 0,
-            })
-
-        return result
+        return PerformanceFrame.from_rows(rows).aggregate_by_ad()
 
     def _aggregate_by_campaign(self, rows: List[Dict]) -> List[Dict]:
         """Aggregate daily rows into per-campaign summaries.
 
         Ported from viraltracker/ui/pages/30_Ad_Performance.py:aggregate_by_campaign.
         """
-        campaigns: Dict[str, Dict] = defaultdict(lambda: {
-            "spend": 0, "impressions": 0, "link_clicks": 0,
-            "add_to_carts": 0, "purchases": 0, "purchase_value": 0,
-            "ad_ids": set(), "adset_ids": set(),
-        })
-
-        for d in rows:
-            cid = d.get("meta_campaign_id")
-            if not cid:
-                continue
-            c = campaigns[cid]
-            c["campaign_name"] = d.get("campaign_name") or c.get("campaign_name", "Unknown")
-            c["spend"] += float(d.get("spend") or 0)
-            c["impressions"] += int(d.get("impressions") or 0)
-            c["link_clicks"] += int(d.get("link_clicks") or 0)
-            c["add_to_carts"] += int(d.get("add_to_carts") or 0)
-            c["purchases"] += int(d.get("purchases") or 0)
-            c["purchase_value"] += float(d.get("purchase_value") or 0)
-            if d.get("meta_adset_id"):
-                c["adset_ids"].add(d["meta_adset_id"])
-            if d.get("meta_ad_id"):
-                c["ad_ids"].add(d["meta_ad_id"])
-
-        result = []
-        for cid, c in campaigns.items():
-            imp = c["impressions"]
-            clicks = c["link_clicks"]
-            spend = c["spend"]
-            pv = c["purchase_value"]
-
-            result.append({
-                "meta_campaign_id": cid,
-                "campaign_name": c["campaign_name"],
-                "spend": spend,
-                "impressions": imp,
-                "link_clicks": clicks,
-                "ctr": (clicks / imp * 100) if imp > 0 else 0,
-                "cpm": (spend / imp * 1000) if imp > 0 else 0,
-                "cpc": (spend / clicks) if clicks > 0 else 0,
-                "add_to_carts": c["add_to_carts"],
-                "purchases": c["purchases"],
-                "purchase_value": pv,
-                "roas": (pv / spend) if spend > 0 else 0,
-                "cpa": (spend / c["purchases"]) if c["purchases"] > 0 else 0,
-                "conversion_rate": (c["purchases"] / clicks * 100) if clicks > 0 else 0,
-                "adset_count": len(c["adset_ids"]),
-                "ad_count": len(c["ad_ids"]),
-            })
-
-        return result
+        return PerformanceFrame.from_rows(rows).aggregate_by_campaign()
 
     def _aggregate_by_adset(self, rows: List[Dict]) -> List[Dict]:
         """Aggregate daily rows into per-adset summaries.
 
         Ported from viraltracker/ui/pages/30_Ad_Performance.py:aggregate_by_adset.
         """
-        adsets: Dict[str, Dict] = defaultdict(lambda: {
-            "spend": 0, "impressions": 0, "link_clicks": 0,
-            "add_to_carts": 0, "purchases": 0, "purchase_value": 0,
-            "ad_ids": set(),
-        })
-
-        for d in rows:
-            asid = d.get("meta_adset_id")
-            if not asid:
-                continue
-            a = adsets[asid]
-            a["adset_name"] = d.get("adset_name") or a.get("adset_name", "Unknown")
-            a["campaign_name"] = d.get("campaign_name") or a.get("campaign_name", "")
-            a["meta_campaign_id"] = d.get("meta_campaign_id") or a.get("meta_campaign_id", "")
-            a["spend"] += float(d.get("spend") or 0)
-            a["impressions"] += int(d.get("impressions") or 0)
-            a["link_clicks"] += int(d.get("link_clicks") or 0)
-            a["add_to_carts"] += int(d.get("add_to_carts") or 0)
-            a["purchases"] += int(d.get("purchases") or 0)
-            a["purchase_value"] += float(d.get("purchase_value") or 0)
-            if d.get("meta_ad_id"):
-                a["ad_ids"].add(d["meta_ad_id"])
-
-        result = []
-        for asid, a in adsets.items():
-            imp = a["impressions"]
-            clicks = a["link_clicks"]
-            spend = a["spend"]
-            pv = a["purchase_value"]
-
-            result.append({
-                "meta_adset_id": asid,
-                "adset_name": a["adset_name"],
-                "campaign_name": a["campaign_name"],
-                "meta_campaign_id": a["meta_campaign_id"],
-                "spend": spend,
-                "impressions": imp,
-                "link_clicks": clicks,
-                "ctr": (clicks / imp * 100) if imp > 0 else 0,
-                "cpm": (spend / imp * 1000) if imp > 0 else 0,
-                "cpc": (spend / clicks) if clicks > 0 else 0,
-                "add_to_carts": a["add_to_carts"],
-                "purchases": a["purchases"],
-                "purchase_value": pv,
-                "roas": (pv / spend) if spend > 0 else 0,
-                "cpa": (spend / a["purchases"]) if a["purchases"] > 0 else 0,
-                "conversion_rate": (a["purchases"] / clicks * 100) if clicks > 0 else 0,
-                "ad_count": len(a["ad_ids"]),
-            })
-
-        return result
+        return PerformanceFrame.from_rows(rows).aggregate_by_adset()
 
     def _compute_period_totals(self, rows: List[Dict]) -> Dict[str, Any]:
         """Compute aggregate totals for a set of rows."""
-        spend = sum(float(r.get("spend") or 0) for r in rows)
-        impressions = sum(int(r.get("impressions") or 0) for r in rows)
-        link_clicks = sum(int(r.get("link_clicks") or 0) for r in rows)
-        purchases = sum(int(r.get("purchases") or 0) for r in rows)
-        purchase_value = sum(float(r.get("purchase_value") or 0) for r in rows)
-        add_to_carts = sum(int(r.get("add_to_carts") or 0) for r in rows)
-        reach = sum(int(r.get("reach") or 0) for r in rows)
-
-        unique_ads = len(set(r.get("meta_ad_id") for r in rows if r.get("meta_ad_id")))
-        unique_campaigns = len(set(r.get("meta_campaign_id") for r in rows if r.get("meta_campaign_id")))
-
-        return {
-            "spend": spend,
-            "impressions": impressions,
-            "reach": reach,
-            "link_clicks": link_clicks,
-            "ctr": (link_clicks / impressions * 100) if impressions > 0 else 0,
-            "cpm": (spend / impressions * 1000) if impressions > 0 else 0,
-            "cpc": (spend / link_clicks) if link_clicks > 0 else 0,
-            "add_to_carts": add_to_carts,
-            "purchases": purchases,
-            "purchase_value": purchase_value,
-            "roas": (purchase_value / spend) if spend > 0 else 0,
-            "cpa": (spend / purchases) if purchases > 0 else 0,
-            "conversion_rate": (purchases / link_clicks * 100) if link_clicks > 0 else 0,
-            "unique_ads": unique_ads,
-            "unique_campaigns": unique_campaigns,
-        }
+        return PerformanceFrame.from_rows(rows).period_totals()
 
     def _compute_change(
         self, current: Dict[str, Any], previous: Dict[str, Any]
@@ -3688,6 +3688,7 @@ OUTPUT: Return ONLY the rewritten HTML. No explanations, no code fences, no wrap
         import concurrent.futures
         from viraltracker.core.observability import get_logfire
         from viraltracker.services.gemini_service import GeminiService
+        from .multipass.phase_cache import default_phase_cache
         from .multipass.pipeline import MultiPassPipeline
 
         lf = get_logfire()
@@ -3710,6 +3711,7 @@ OUTPUT: Return ONLY the rewritten HTML. No explanations, no code fences, no wrap
         pipeline = MultiPassPipeline(
             gemini_service=gemini,
             progress_callback=progress_callback,
+            phase_cache=default_phase_cache(),
         )
 
         async def _run():
@@ -5,8 +5,16 @@ deterministic invariant enforcement between each pass.
 """
 
 from .pipeline import MultiPassPipeline, PipelineRateLimiter
+from .phase_cache import (
+    PhaseCache,
+    InMemoryPhaseCache,
+    SQLitePhaseCache,
+    SupabasePhaseCache,
+    TieredPhaseCache,
+    default_phase_cache,
+)
 from .segmenter import SegmenterSection, segment_markdown
-from .cropper import NormalizedBox, normalize_bounding_boxes, crop_section
+from .cropper import NormalizedBox, ScreenshotTiler, normalize_bounding_boxes, crop_section
 from .invariants import (
     PipelineInvariants,
     SectionInvariant,
@@ -30,11 +38,18 @@ from ._url_validator import validate_image_url
 __all__ = [
     "MultiPassPipeline",
     "PipelineRateLimiter",
+    "PhaseCache",
+    "InMemoryPhaseCache",
+    "SQLitePhaseCache",
+    "SupabasePhaseCache",
+    "TieredPhaseCache",
+    "default_phase_cache",
     "SegmenterSection",
     "segment_markdown",
     "NormalizedBox",
     "normalize_bounding_boxes",
     "crop_section",
+    "ScreenshotTiler",
     "PipelineInvariants",
     "SectionInvariant",
     "capture_pipeline_invariants",
@@ -3,17 +3,24 @@
 Primary: Phase 1 model-produced bounding boxes, normalized.
 Fallback: Char-ratio from segmenter.
 Both: PIL img.crop() with 5% overlap padding, 2MB per-crop size cap.
+ScreenshotTiler decodes the screenshot once for all of a page's crops.
 """
 
 import io
 import logging
+import math
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Mapping, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
 OVERLAP_PADDING = 0.05  # 5% overlap on each side
 MAX_CROP_BYTES = 2 * 1024 * 1024  # 2MB per crop
+MAX_DECODED_PIXELS = 40_000_000  # ~160MB RGBA; larger screenshots are downscaled
+CROP_FORMATS = ("PNG", "JPEG", "WEBP")
+DEFAULT_CROP_QUALITY = 85  # JPEG/WEBP crops
+DEFAULT_ENCODE_WORKERS = 4
 
 
 @dataclass
@@ -129,6 +136,165 @@ def boxes_from_char_ratios(
     return boxes
 
 
+class ScreenshotTiler:
+    """Decode a full-page screenshot once and cut section crops from it.
+
+    crop_section() decodes the screenshot on every call; a page with N
+    sections cropped in two phases was decoded 2N times. The tiler holds
+    the decoded pixels and cuts every crop from them.
+
+    Memory: screenshots above max_pixels are downscaled once at decode
+    time, and crop_all() cuts each crop inside its encoding worker so at
+    most max_workers crops are alive at once.
+
+    Args:
+        image_bytes: Full screenshot as bytes (PNG/JPEG).
+        image_format: Output format for crops: "PNG", "JPEG" or "WEBP".
+        quality: Encoder quality for JPEG/WEBP output.
+        max_pixels: Decoded pixel budget (width * height).
+    """
+
+    def __init__(
+        self,
+        image_bytes: bytes,
+        image_format: str = "PNG",
+        quality: int = DEFAULT_CROP_QUALITY,
+        max_pixels: int = MAX_DECODED_PIXELS,
+    ):
+        from PIL import Image
+
+        fmt = image_format.upper()
+        if fmt not in CROP_FORMATS:
+            raise ValueError(f"Unsupported crop format: {image_format!r}. Valid: {CROP_FORMATS}")
+        self.image_format = fmt
+        self.quality = quality
+
+        img = Image.open(io.BytesIO(image_bytes))
+        if img.width * img.height > max_pixels:
+            # Integer-factor reduce is cheap; JPEG sources decode at reduced size
+            factor = math.ceil(math.sqrt(img.width * img.height / max_pixels))
+            img.draft(img.mode, (img.width // factor, img.height // factor))
+            if img.width * img.height > max_pixels:
+                img = img.reduce(math.ceil(math.sqrt(img.width * img.height / max_pixels)))
+            logger.info(f"Screenshot downscaled to {img.width}x{img.height} (max_pixels={max_pixels})")
+        img.load()
+        self._img = img
+
+    @property
+    def size(self) -> Tuple[int, int]:
+        """(width, height) of the decoded screenshot."""
+        return self._img.size
+
+    def close(self) -> None:
+        """Release the decoded pixel buffer."""
+        if self._img is not None:
+            self._img.close()
+            self._img = None
+
+    def __enter__(self) -> "ScreenshotTiler":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def crop(self, box: NormalizedBox, add_overlap: bool = True) -> bytes:
+        """Crop and encode one section.
+
+        Args:
+            box: Normalized bounding box for this section.
+            add_overlap: Whether to add 5% overlap padding on each side.
+
+        Returns:
+            Encoded crop, capped at MAX_CROP_BYTES.
+        """
+        if self._img is None:
+            raise ValueError("ScreenshotTiler is closed")
+        width, height = self._img.size
+
+        y_start = box.y_start_pct
+        y_end = box.y_end_pct
+
+        if add_overlap:
+            y_start = max(0.0, y_start - OVERLAP_PADDING)
+            y_end = min(1.0, y_end + OVERLAP_PADDING)
+
+        top = int(y_start * height)
+        bottom = int(y_end * height)
+
+        # Ensure minimum crop height of 10px
+        if bottom - top < 10:
+            bottom = min(height, top + 10)
+
+        return self._encode(self._img.crop((0, top, width, bottom)))
+
+    def crop_all(
+        self,
+        boxes: Mapping[str, NormalizedBox],
+        add_overlap: bool = True,
+        max_workers: int = DEFAULT_ENCODE_WORKERS,
+    ) -> Dict[str, bytes]:
+        """Crop and encode every section, encoding in parallel.
+
+        Pillow releases the GIL while encoding, so threads give real
+        parallelism. A crop that fails is logged and left out.
+
+        Args:
+            boxes: Section key -> bounding box.
+            add_overlap: Whether to add 5% overlap padding on each side.
+            max_workers: Encoding threads (1 = sequential).
+
+        Returns:
+            Section key -> encoded crop, in the order of `boxes`.
+        """
+        keys = list(boxes)
+        results: Dict[str, Optional[bytes]] = {}
+
+        def _crop(key: str) -> Optional[bytes]:
+            try:
+                return self.crop(boxes[key], add_overlap)
+            except Exception as e:
+                logger.warning(f"Failed to crop section {key}: {e}")
+                return None
+
+        if max_workers <= 1 or len(keys) <= 1:
+            for key in keys:
+                results[key] = _crop(key)
+        else:
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(keys))) as pool:
+                for key, data in zip(keys, pool.map(_crop, keys)):
+                    results[key] = data
+
+        return {key: data for key, data in results.items() if data is not None}
+
+    def _encode(self, cropped) -> bytes:
+        """Encode a crop in the configured format, then apply the size cap."""
+        if self.image_format == "PNG":
+            data = _save(cropped, "PNG")
+            # Size cap: reduce quality if too large
+            if len(data) > MAX_CROP_BYTES:
+                data = _save(cropped, "JPEG", quality=75)
+        else:
+            data = _save(cropped, self.image_format, quality=self.quality)
+
+        if len(data) > MAX_CROP_BYTES:
+            # Last resort: resize
+            scale = (MAX_CROP_BYTES / len(data)) ** 0.5
+            new_size = (int(cropped.width * scale), int(cropped.height * scale))
+            cropped = cropped.resize(new_size)
+            fmt = "JPEG" if self.image_format == "PNG" else self.image_format
+            data = _save(cropped, fmt, quality=70)
+
+        return data
+
+
+def _save(img, fmt: str, **params) -> bytes:
+    if fmt == "JPEG" and img.mode not in ("RGB", "L"):
+        img = img.convert("RGB")
+    buf = io.BytesIO()
+    img.save(buf, format=fmt, **params)
+    return buf.getvalue()
+
+
 def crop_section(
     image_bytes: bytes,
     box: NormalizedBox,
@@ -136,6 +302,9 @@ def crop_section(
 ) -> bytes:
     """Crop a section from the full-page screenshot.
 
+    Decodes the screenshot on every call; use ScreenshotTiler to crop
+    several sections from one screenshot.
+
     Args:
         image_bytes: Full screenshot as bytes (PNG/JPEG).
         box: Normalized bounding box for this section.
@@ -144,45 +313,5 @@ def crop_section(
     Returns:
         Cropped image as PNG bytes, capped at MAX_CROP_BYTES.
     """
-    from PIL import Image
-
-    img = Image.open(io.BytesIO(image_bytes))
-    width, height = img.size
-
-    y_start = box.y_start_pct
-    y_end = box.y_end_pct
-
-    if add_overlap:
-        y_start = max(0.0, y_start - OVERLAP_PADDING)
-        y_end = min(1.0, y_end + OVERLAP_PADDING)
-
-    top = int(y_start * height)
-    bottom = int(y_end * height)
-
-    # Ensure minimum crop height of 10px
-    if bottom - top < 10:
-        bottom = min(height, top + 10)
-
-    cropped = img.crop((0, top, width, bottom))
-
-    # Convert to PNG bytes
-    buf = io.BytesIO()
-    cropped.save(buf, format="PNG")
-    png_bytes = buf.getvalue()
-
-    # Size cap: reduce quality if too large
-    if len(png_bytes) > MAX_CROP_BYTES:
-        buf = io.BytesIO()
-        cropped.save(buf, format="JPEG", quality=75)
-        png_bytes = buf.getvalue()
-
-    if len(png_bytes) > MAX_CROP_BYTES:
-        # Last resort: resize
-        scale = (MAX_CROP_BYTES / len(png_bytes)) ** 0.5
-        new_size = (int(cropped.width * scale), int(cropped.height * scale))
-        cropped = cropped.resize(new_size)
-        buf = io.BytesIO()
-        cropped.save(buf, format="JPEG", quality=70)
-        png_bytes = buf.getvalue()
-
-    return png_bytes
+    with ScreenshotTiler(image_bytes) as tiler:
+        return tiler.crop(box, add_overlap)
@@ -0,0 +1,445 @@
+"""Content-addressed cache for multipass phase results.
+
+Each phase result is stored under a key derived from the phase, model id,
+prompt version and a hash of every phase input (see
+pipeline.compute_phase_cache_key), so a re-analysis of an unchanged page
+reuses the earlier LLM output, and bumping one phase's prompt version only
+invalidates that phase and the phases downstream of it.
+
+Stores share one interface:
+- InMemoryPhaseCache: per-process LRU, for tests and one-off runs.
+- SQLitePhaseCache: local disk, shared by every process on the host.
+- SupabasePhaseCache: the multipass_phase_cache table, shared by all workers.
+- TieredPhaseCache: local first, then remote; remote hits are copied local.
+
+Every store evicts entries older than its TTL; the local stores also cap
+the entry count (least recently used first).
+
+run_cached_phase() wraps one phase with a store; both MultiPassPipeline and
+SurgeryPipeline route their LLM phases through it.
+
+Usage:
+    cache = default_phase_cache()           # MULTIPASS_PHASE_CACHE env
+    pipeline = MultiPassPipeline(gemini, phase_cache=cache)
+    cache.stats()  # {"hits": ..., "misses": ..., "hit_rate": ..., ...}
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from viraltracker.core.config import Config
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL_SECONDS = 30 * 24 * 3600
+DEFAULT_MAX_ENTRIES = 5_000
+
+SUPABASE_TABLE = "multipass_phase_cache"
+
+
+class PhaseCache(ABC):
+    """Base class for phase result stores.
+
+    Subclasses implement _get/_set/evict/__len__; this class keeps the
+    hit/miss counters so every store reports them the same way. Values are
+    opaque strings (the pipeline stores JSON).
+    """
+
+    def __init__(self, ttl_seconds: float = DEFAULT_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._stats_lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached value, or None on a miss or expired entry."""
+        value = self._get(key)
+        with self._stats_lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def set(self, key: str, phase: str, value: str) -> None:
+        """Store a phase result."""
+        self._set(key, phase, value)
+
+    def stats(self) -> Dict[str, float]:
+        """Hit/miss counters plus current size."""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits / total) if total else 0.0,
+            "entries": len(self),
+        }
+
+    @abstractmethod
+    def evict(self) -> int:
+        """Drop expired entries. Returns how many were removed."""
+
+    @abstractmethod
+    def _get(self, key: str) -> Optional[str]:
+        """Stored value for key, or None if missing or expired."""
+
+    @abstractmethod
+    def _set(self, key: str, phase: str, value: str) -> None:
+        """Store value under key."""
+
+    @abstractmethod
+    def __len__(self) -> int:
+        """Number of stored entries."""
+
+
+class InMemoryPhaseCache(PhaseCache):
+    """Per-process LRU cache."""
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        clock=time.time,
+    ):
+        super().__init__(ttl_seconds)
+        self.max_entries = max_entries
+        self._clock = clock
+        self._data: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            if self._clock() - entry[0] > self.ttl_seconds:
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return entry[1]
+
+    def _set(self, key: str, phase: str, value: str) -> None:
+        with self._lock:
+            self._data[key] = (self._clock(), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def evict(self) -> int:
+        cutoff = self._clock() - self.ttl_seconds
+        with self._lock:
+            expired = [k for k, (created, _) in self._data.items() if created < cutoff]
+            for key in expired:
+                del self._data[key]
+        return len(expired)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class SQLitePhaseCache(PhaseCache):
+    """Persistent cache in a single SQLite file.
+
+    WAL mode lets several worker processes share the file. Expired rows are
+    dropped on write; the least recently used rows go once max_entries is
+    exceeded.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+    ):
+        super().__init__(ttl_seconds)
+        self.path = path
+        self.max_entries = max_entries
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS phase_results ("
+                " key TEXT PRIMARY KEY,"
+                " phase TEXT NOT NULL,"
+                " value TEXT NOT NULL,"
+                " created_at REAL NOT NULL,"
+                " last_used REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_phase_results_last_used ON phase_results(last_used)"
+            )
+            self._conn.commit()
+
+    def _get(self, key: str) -> Optional[str]:
+        now = time.time()
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT value FROM phase_results WHERE key = ? AND created_at >= ?",
+                    (key, now - self.ttl_seconds),
+                ).fetchone()
+                if row is not None:
+                    self._conn.execute(
+                        "UPDATE phase_results SET last_used = ? WHERE key = ?", (now, key)
+                    )
+                    self._conn.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Phase cache read failed ({self.path}): {e}")
+            return None
+        return row[0] if row else None
+
+    def _set(self, key: str, phase: str, value: str) -> None:
+        now = time.time()
+        try:
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO phase_results (key, phase, value, created_at, last_used)"
+                    " VALUES (?, ?, ?, ?, ?)",
+                    (key, phase, value, now, now),
+                )
+                self._evict_locked(now)
+                self._conn.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Phase cache write failed ({self.path}): {e}")
+
+    def _evict_locked(self, now: float) -> int:
+        removed = self._conn.execute(
+            "DELETE FROM phase_results WHERE created_at < ?", (now - self.ttl_seconds,)
+        ).rowcount
+        overflow = self._count() - self.max_entries
+        if overflow > 0:
+            removed += self._conn.execute(
+                "DELETE FROM phase_results WHERE key IN ("
+                " SELECT key FROM phase_results ORDER BY last_used ASC, rowid ASC LIMIT ?)",
+                (overflow,),
+            ).rowcount
+        return removed
+
+    def evict(self) -> int:
+        try:
+            with self._lock:
+                removed = self._evict_locked(time.time())
+                self._conn.commit()
+                return removed
+        except sqlite3.Error as e:
+            logger.warning(f"Phase cache eviction failed ({self.path}): {e}")
+            return 0
+
+    def _count(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM phase_results").fetchone()[0]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._count()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class SupabasePhaseCache(PhaseCache):
+    """Cache rows in the multipass_phase_cache table.
+
+    Freshness is enforced in application code (rows older than the TTL are
+    ignored on read and removed by evict()). Network errors degrade to a
+    miss rather than failing the pipeline.
+    """
+
+    def __init__(self, supabase_client=None, ttl_seconds: float = DEFAULT_TTL_SECONDS):
+        super().__init__(ttl_seconds)
+        self._supabase = supabase_client
+
+    @property
+    def supabase(self):
+        """Lazy-load Supabase client."""
+        if self._supabase is None:
+            from viraltracker.core.database import get_supabase_client
+            self._supabase = get_supabase_client()
+        return self._supabase
+
+    def _cutoff(self) -> str:
+        return (datetime.now(timezone.utc) - timedelta(seconds=self.ttl_seconds)).isoformat()
+
+    def _get(self, key: str) -> Optional[str]:
+        try:
+            rows = (
+                self.supabase.table(SUPABASE_TABLE)
+                .select("value")
+                .eq("cache_key", key)
+                .gte("created_at", self._cutoff())
+                .limit(1)
+                .execute()
+            ).data or []
+        except Exception as e:
+            logger.warning(f"Phase cache read failed ({SUPABASE_TABLE}): {e}")
+            return None
+        return rows[0]["value"] if rows else None
+
+    def _set(self, key: str, phase: str, value: str) -> None:
+        try:
+            self.supabase.table(SUPABASE_TABLE).upsert({
+                "cache_key": key,
+                "phase": phase,
+                "value": value,
+                "created_at": datetime.now(timezone.utc).isoformat(),
+            }, on_conflict="cache_key").execute()
+        except Exception as e:
+            logger.warning(f"Phase cache write failed ({SUPABASE_TABLE}): {e}")
+
+    def evict(self) -> int:
+        try:
+            result = (
+                self.supabase.table(SUPABASE_TABLE)
+                .delete()
+                .lt("created_at", self._cutoff())
+                .execute()
+            )
+            return len(result.data or [])
+        except Exception as e:
+            logger.warning(f"Phase cache eviction failed ({SUPABASE_TABLE}): {e}")
+            return 0
+
+    def __len__(self) -> int:
+        try:
+            result = (
+                self.supabase.table(SUPABASE_TABLE)
+                .select("cache_key", count="exact")
+                .limit(1)
+                .execute()
+            )
+            return result.count or 0
+        except Exception:
+            return 0
+
+
+class TieredPhaseCache(PhaseCache):
+    """Read local stores first, then remote ones; copy remote hits down.
+
+    Writes go to every tier.
+    """
+
+    def __init__(self, tiers: List[PhaseCache]):
+        super().__init__(min(t.ttl_seconds for t in tiers))
+        self.tiers = tiers
+
+    def _get(self, key: str) -> Optional[str]:
+        for i, tier in enumerate(self.tiers):
+            value = tier.get(key)
+            if value is not None:
+                for upper in self.tiers[:i]:
+                    upper.set(key, "backfill", value)
+                return value
+        return None
+
+    def _set(self, key: str, phase: str, value: str) -> None:
+        for tier in self.tiers:
+            tier.set(key, phase, value)
+
+    def evict(self) -> int:
+        return sum(tier.evict() for tier in self.tiers)
+
+    def __len__(self) -> int:
+        return len(self.tiers[0])
+
+
+async def run_cached_phase(
+    cache: Optional[PhaseCache],
+    label: str,
+    key: str,
+    run: Callable[[], Awaitable[Any]],
+    snapshots: Dict[str, str],
+    encode: Callable[[Any], str] = json.dumps,
+    decode: Callable[[str], Any] = json.loads,
+    cacheable: Optional[Callable[[Any], bool]] = None,
+) -> Tuple[Any, Optional[str]]:
+    """Return a cached phase result, or run the phase and cache it.
+
+    Snapshots the phase writes into `snapshots` are stored with its result
+    and restored on a hit, so debugging output is the same either way.
+    Results are only cached when `cacheable` accepts them; exceptions from
+    `run` propagate and nothing is stored.
+
+    Returns:
+        (result, status) where status is "hit", "miss" or "not_cached",
+        or None when cache is None.
+    """
+    if cache is None:
+        return await run(), None
+
+    try:
+        raw = cache.get(key)
+    except Exception as e:
+        logger.warning(f"Phase cache read failed for {label}: {e}")
+        raw = None
+    if raw is not None:
+        try:
+            entry = json.loads(raw)
+            result = decode(entry["value"])
+            snapshots.update(entry.get("snapshots", {}))
+            return result, "hit"
+        except Exception as e:
+            logger.warning(f"Phase cache entry for {label} unreadable: {e}")
+
+    snapshots_before = dict(snapshots)
+    result = await run()
+    if cacheable and not cacheable(result):
+        return result, "not_cached"
+
+    written = {k: v for k, v in snapshots.items() if snapshots_before.get(k) is not v}
+    try:
+        cache.set(key, label, json.dumps({"value": encode(result), "snapshots": written}))
+    except Exception as e:
+        logger.warning(f"Phase cache write failed for {label}: {e}")
+    return result, "miss"
+
+
+def default_phase_cache(cache_dir: Optional[str] = None) -> Optional[PhaseCache]:
+    """Phase cache for production runs, chosen by MULTIPASS_PHASE_CACHE.
+
+    "disk" (default) = SQLite in cache_dir (default Config.CACHE_DIR),
+    "supabase" = shared table,
+    "tiered" = disk then Supabase, "off" = no caching.
+    MULTIPASS_PHASE_CACHE_TTL_DAYS overrides the 30-day TTL.
+    """
+    mode = os.getenv("MULTIPASS_PHASE_CACHE", "disk").lower()
+    if mode in ("0", "off", "false", "none"):
+        return None
+    if mode not in ("disk", "supabase", "tiered"):
+        logger.warning(f"Unknown MULTIPASS_PHASE_CACHE={mode!r}, using disk")
+        mode = "disk"
+
+    ttl = DEFAULT_TTL_SECONDS
+    raw_ttl = os.getenv("MULTIPASS_PHASE_CACHE_TTL_DAYS")
+    if raw_ttl:
+        try:
+            ttl = float(raw_ttl) * 24 * 3600
+        except ValueError:
+            logger.warning(f"Ignoring invalid MULTIPASS_PHASE_CACHE_TTL_DAYS={raw_ttl!r}")
+
+    cache_dir = os.path.abspath(cache_dir or Config.CACHE_DIR)
+    disk: Optional[PhaseCache] = None
+    if mode in ("disk", "tiered"):
+        try:
+            disk = SQLitePhaseCache(os.path.join(cache_dir, "multipass_phases.sqlite3"), ttl_seconds=ttl)
+        except sqlite3.Error as e:
+            logger.warning(f"Phase cache unavailable in {cache_dir}: {e}")
+
+    if mode == "disk":
+        return disk
+    remote = SupabasePhaseCache(ttl_seconds=ttl)
+    if mode == "supabase" or disk is None:
+        return remote
+    return TieredPhaseCache([disk, remote])
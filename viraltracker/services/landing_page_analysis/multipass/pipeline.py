@@ -13,7 +13,7 @@ import logging
 import os
 import re
 import time
-from dataclasses import dataclass, field
+from dataclasses import asdict, dataclass, field, is_dataclass
 from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from viraltracker.core.config import Config
@@ -22,8 +22,8 @@ from viraltracker.services.gemini_service import GeminiService, RateLimitError
 
 from .cropper import (
     NormalizedBox,
+    ScreenshotTiler,
     boxes_from_char_ratios,
-    crop_section,
     normalize_bounding_boxes,
 )
 from .invariants import (
@@ -42,8 +42,13 @@ from .html_extractor import (
     _word_jaccard,
 )
 from .patch_applier import PatchApplier
+from .phase_cache import PhaseCache, run_cached_phase
 from .popup_filter import PopupFilter
 from .prompts import (
+    PHASE_1_CLASSIFY_PROMPT_VERSION,
+    PHASE_1A_VISUAL_AUDIT_VERSION,
+    PHASE_1C_SKELETON_CODEGEN_VERSION,
+    PHASE_3_CSS_PROMPT_VERSION,
     PROMPT_VERSIONS,
     build_phase_0_prompt,
     build_phase_1_prompt,
@@ -73,6 +78,9 @@ MULTIPASS_PHASE1_MODE = os.environ.get("MULTIPASS_PHASE1_MODE", "template")
 # Pipeline mode: "reconstruct" (original v4), "surgery" (new v5 — operate on original HTML)
 MULTIPASS_PIPELINE_MODE = os.environ.get("MULTIPASS_PIPELINE_MODE", "surgery")
 
+# Encoding for per-section screenshot crops sent to vision calls: "png", "jpeg", "webp"
+MULTIPASS_CROP_FORMAT = os.environ.get("MULTIPASS_CROP_FORMAT", "png")
+
 # Claude model for skeleton codegen (Step 1C)
 MULTIPASS_SKELETON_MODEL = os.environ.get(
     "MULTIPASS_SKELETON_MODEL", Config.DEFAULT_MODEL
@@ -236,6 +244,56 @@ def compute_cache_key(
     return h.hexdigest()[:32]
 
 
+def _cache_json_default(obj: Any) -> Any:
+    if is_dataclass(obj):
+        return asdict(obj)
+    return repr(obj)
+
+
+def compute_phase_cache_key(
+    phase: str,
+    model: str,
+    prompt_version: str,
+    *inputs: Any,
+) -> str:
+    """Cache key for a whole phase result.
+
+    Strings and bytes are hashed as-is; anything else (dicts, dataclasses,
+    lists of sections) is hashed as canonical JSON.
+    """
+    h = hashlib.sha256()
+    h.update(f"phase={phase}".encode())
+    h.update(f"model={model}".encode())
+    h.update(f"prompt_v={prompt_version}".encode())
+    for value in inputs:
+        if not isinstance(value, (str, bytes)):
+            value = json.dumps(value, sort_keys=True, default=_cache_json_default)
+        if isinstance(value, str):
+            value = value.encode()
+        h.update(hashlib.sha256(value).digest())
+    return h.hexdigest()[:32]
+
+
+def _encode_phase_1(result: Tuple[str, Dict[str, NormalizedBox], Dict]) -> str:
+    skeleton_html, section_map, layout_map = result
+    return json.dumps({
+        "skeleton_html": skeleton_html,
+        "section_map": {k: asdict(box) for k, box in section_map.items()},
+        "layout_map": {k: asdict(hint) for k, hint in (layout_map or {}).items()},
+    })
+
+
+def _decode_phase_1(raw: str) -> Tuple[str, Dict[str, NormalizedBox], Dict]:
+    from .layout_analyzer import LayoutHint
+
+    data = json.loads(raw)
+    return (
+        data["skeleton_html"],
+        {k: NormalizedBox(**box) for k, box in data["section_map"].items()},
+        {k: LayoutHint(**hint) for k, hint in data["layout_map"].items()},
+    )
+
+
 def _truncate_markdown(markdown: str, max_chars: int = MARKDOWN_BUDGET) -> str:
     """Truncate markdown at a heading boundary."""
     if len(markdown) <= max_chars:
@@ -1225,12 +1283,18 @@ class MultiPassPipeline:
         self,
         gemini_service: GeminiService,
         progress_callback: Optional[Callable] = None,
+        phase_cache: Optional[PhaseCache] = None,
     ):
         self._gemini = gemini_service
         self._progress = progress_callback
         self._limiter = PipelineRateLimiter()
         self._start_time = 0.0
         self._cache: Dict[str, str] = {}
+        #: Phase result cache (see phase_cache.py). None disables caching.
+        self._phase_cache = phase_cache
+        #: phase label -> "hit" / "miss" / "not_cached" for the current run
+        self.phase_cache_status: Dict[str, str] = {}
+        self._failed_calls = 0
         #: Phase snapshots for debugging: phase_name -> raw HTML at that stage.
         #: Populated during generate() so callers can inspect intermediate output.
         self.phase_snapshots: Dict[str, str] = {}
@@ -1289,12 +1353,15 @@ class MultiPassPipeline:
                 and page_html
                 and '<body' in (page_html[:200000].lower())):
             from .surgery.pipeline import SurgeryPipeline
-            surgery = SurgeryPipeline(self._gemini, self._progress)
+            surgery = SurgeryPipeline(
+                self._gemini, self._progress, phase_cache=self._phase_cache,
+            )
             result = await surgery.generate(
                 screenshot_b64, page_markdown, page_url or "",
                 element_detection, page_html,
             )
             self.phase_snapshots.update(surgery.phase_snapshots)
+            self.phase_cache_status.update(surgery.phase_cache_status)
             if result:
                 return result
             # Empty result = surgery fallback → continue with reconstruction
@@ -1342,6 +1409,9 @@ class MultiPassPipeline:
 
             # Decode screenshot for cropping
             screenshot_bytes = base64.b64decode(screenshot_b64)
+            # Phase cache keys hash the screenshot once
+            screenshot_digest = hashlib.sha256(screenshot_b64.encode()).hexdigest()
+            page_html_digest = hashlib.sha256((page_html or "").encode()).hexdigest()
 
             # Truncate markdown for prompts
             truncated_md = _truncate_markdown(page_markdown)
@@ -1485,7 +1555,15 @@ class MultiPassPipeline:
             # Phase 0: Design System Extraction
             # -----------------------------------------------------------
             self._report_progress(0, "Extracting design system...")
-            design_system = await self._run_phase_0(screenshot_b64, truncated_md)
+            design_system = await self._run_cached_phase(
+                "phase_0",
+                compute_phase_cache_key(
+                    "0", PHASE_MODELS[0], PROMPT_VERSIONS[0],
+                    screenshot_digest, truncated_md,
+                ),
+                lambda: self._run_phase_0(screenshot_b64, truncated_md),
+                cacheable=lambda ds: ds != DEFAULT_DESIGN_SYSTEM,
+            )
 
             # Snapshot: Phase 0 design system (unconditional — before augmentation)
             self.phase_snapshots["phase_0_design_system"] = _wrap_json_as_html(design_system)
@@ -1507,26 +1585,49 @@ class MultiPassPipeline:
             if phase1_mode == "v2":
                 # v2 pipeline: Gemini sees, Claude builds
                 self._report_progress(1, "Phase 1 v2: visual audit + skeleton codegen...")
-                skeleton_html, section_map, layout_map = await self._run_phase_1_v2(
+                phase_1_run = lambda: self._run_phase_1_v2(  # noqa: E731
                     screenshot_b64, design_system, sections,
                     layout_hints=layout_hints,
                     extracted_css=extracted_css,
                     page_html=page_html,
                 )
+                phase_1_model = f"{PHASE_MODELS[1]}+{MULTIPASS_SKELETON_MODEL}"
+                phase_1_version = f"{PHASE_1A_VISUAL_AUDIT_VERSION}+{PHASE_1C_SKELETON_CODEGEN_VERSION}"
             elif use_templates_this_run:
                 # Template pipeline: classification + deterministic skeleton
                 self._report_progress(1, "Classifying layouts...")
-                skeleton_html, section_map, layout_map = await self._run_phase_1_classify(
+                phase_1_run = lambda: self._run_phase_1_classify(  # noqa: E731
                     screenshot_b64, design_system, sections,
                     layout_hints=layout_hints,
                     extracted_css=extracted_css,
                 )
+                phase_1_model = PHASE_MODELS[1]
+                phase_1_version = PHASE_1_CLASSIFY_PROMPT_VERSION
             else:
                 # Original path: LLM-generated skeleton
                 self._report_progress(1, "Building layout skeleton...")
-                skeleton_html, section_map = await self._run_phase_1(
-                    screenshot_b64, design_system, sections
-                )
+
+                async def phase_1_run():
+                    skeleton, boxes = await self._run_phase_1(
+                        screenshot_b64, design_system, sections
+                    )
+                    return skeleton, boxes, {}
+
+                phase_1_model = PHASE_MODELS[1]
+                phase_1_version = PROMPT_VERSIONS[1]
+
+            # Layout hints and extracted CSS are derived from page_html and
+            # sections, so those stand in for them in the key
+            skeleton_html, section_map, layout_map = await self._run_cached_phase(
+                "phase_1",
+                compute_phase_cache_key(
+                    f"1:{phase1_mode}:{use_templates_this_run}", phase_1_model, phase_1_version,
+                    screenshot_digest, design_system, sections, page_html_digest, page_url or "",
+                ),
+                phase_1_run,
+                encode=_encode_phase_1,
+                decode=_decode_phase_1,
+            )
             if self._budget_exceeded(max_api_calls):
                 self._lf.warning("Budget exceeded after Phase 1, returning skeleton")
                 self.phase_snapshots["phase_1_skeleton"] = skeleton_html
@@ -1675,31 +1776,49 @@ class MultiPassPipeline:
             elif use_templates_this_run and MULTIPASS_PHASE3_MODE in ("fullpage", "per_section"):
                 # Template pipeline: CSS-only Phase 3
                 self._report_progress(3, "Applying CSS refinements...")
-                refined_html = await self._run_phase_3_css(
-                    content_html,
-                    screenshot_bytes,
-                    screenshot_b64,
-                    section_map,
-                    sections,
-                    design_system,
-                    baseline,
+                refined_html = await self._run_cached_phase(
+                    "phase_3",
+                    compute_phase_cache_key(
+                        f"3:css:{MULTIPASS_PHASE3_MODE}:{MULTIPASS_CROP_FORMAT}",
+                        PHASE_MODELS[3], PHASE_3_CSS_PROMPT_VERSION,
+                        content_html, screenshot_digest, section_map, sections, design_system,
+                    ),
+                    lambda: self._run_phase_3_css(
+                        content_html,
+                        screenshot_bytes,
+                        screenshot_b64,
+                        section_map,
+                        sections,
+                        design_system,
+                        baseline,
+                    ),
                 )
                 self.phase_snapshots["phase_3_refined"] = refined_html
             else:
                 # Original path: per-section HTML refinement
                 self._report_progress(3, "Refining sections visually...")
-                refined_html, stats = await self._run_phase_3(
-                    content_html,
-                    screenshot_bytes,
-                    screenshot_b64,
-                    section_map,
-                    sections,
-                    design_system,
-                    baseline,
-                    page_url,
-                    page_markdown,
-                    image_registry=image_registry,
-                    responsive_css=responsive_css,
+                # Image registry and responsive CSS derive from page_html
+                refined_html, stats = await self._run_cached_phase(
+                    "phase_3",
+                    compute_phase_cache_key(
+                        f"3:sections:{MULTIPASS_CROP_FORMAT}", PHASE_MODELS[3], PROMPT_VERSIONS[3],
+                        content_html, screenshot_digest, section_map, sections, design_system,
+                        page_url or "", page_markdown, page_html_digest,
+                    ),
+                    lambda: self._run_phase_3(
+                        content_html,
+                        screenshot_bytes,
+                        screenshot_b64,
+                        section_map,
+                        sections,
+                        design_system,
+                        baseline,
+                        page_url,
+                        page_markdown,
+                        image_registry=image_registry,
+                        responsive_css=responsive_css,
+                    ),
+                    decode=lambda raw: tuple(json.loads(raw)),
                 )
                 self.phase_snapshots["phase_3_refined"] = refined_html
 
@@ -1711,11 +1830,18 @@ class MultiPassPipeline:
             # Phase 4: Targeted Patch Pass
             # -----------------------------------------------------------
             self._report_progress(4, "Applying visual patches...")
-            patched_html = await self._run_phase_4(
-                refined_html,
-                screenshot_b64,
-                section_map,
-                baseline,
+            patched_html = await self._run_cached_phase(
+                "phase_4",
+                compute_phase_cache_key(
+                    "4", PHASE_MODELS[4], PROMPT_VERSIONS[4],
+                    refined_html, screenshot_digest, section_map,
+                ),
+                lambda: self._run_phase_4(
+                    refined_html,
+                    screenshot_b64,
+                    section_map,
+                    baseline,
+                ),
             )
 
             # -----------------------------------------------------------
@@ -1777,6 +1903,45 @@ class MultiPassPipeline:
 
             return final_html
 
+    # -------------------------------------------------------------------
+    # Phase result cache
+    # -------------------------------------------------------------------
+
+    async def _run_cached_phase(
+        self,
+        label: str,
+        key: str,
+        run: Callable[[], Any],
+        encode: Callable[[Any], str] = json.dumps,
+        decode: Callable[[str], Any] = json.loads,
+        cacheable: Optional[Callable[[Any], bool]] = None,
+    ) -> Any:
+        """Return a cached phase result, or run the phase and cache it.
+
+        Snapshots the phase writes are stored with its result and restored
+        on a hit, so debugging output is the same either way. Results are
+        only cached when no API call failed during the phase (failures fall
+        back to defaults, which must not stick) and `cacheable` accepts them.
+        Hit/miss per phase is recorded in phase_snapshots["phase_cache"].
+        """
+        failures_before = self._failed_calls
+
+        def _cacheable(result: Any) -> bool:
+            return self._failed_calls == failures_before and (cacheable is None or cacheable(result))
+
+        result, status = await run_cached_phase(
+            self._phase_cache, label, key, run, self.phase_snapshots,
+            encode=encode, decode=decode, cacheable=_cacheable,
+        )
+        if status is not None:
+            self._record_phase_cache(label, status)
+        return result
+
+    def _record_phase_cache(self, label: str, status: str) -> None:
+        self.phase_cache_status[label] = status
+        self._lf.info("Phase cache {label}: {status}", label=label, status=status)
+        self.phase_snapshots["phase_cache"] = _wrap_json_as_html(self.phase_cache_status)
+
     # -------------------------------------------------------------------
     # Phase implementations
     # -------------------------------------------------------------------
@@ -2330,15 +2495,15 @@ class MultiPassPipeline:
                 parser.feed(content_html)
                 section_htmls = parser.sections
 
+                crops = self._crop_sections(screenshot_bytes, {
+                    sec_id: section_map[sec_id]
+                    for sec_id in section_ids if sec_id in section_htmls
+                })
+
                 for sec_id in section_ids:
-                    if sec_id not in section_htmls:
-                        continue
-                    box = section_map[sec_id]
-                    try:
-                        cropped_bytes = crop_section(screenshot_bytes, box)
-                        cropped_b64 = base64.b64encode(cropped_bytes).decode('utf-8')
-                    except Exception:
+                    if sec_id not in crops:
                         continue
+                    cropped_b64 = base64.b64encode(crops[sec_id]).decode('utf-8')
 
                     section_html_frag = (
                         f'<section data-section="{sec_id}">'
@@ -2517,20 +2682,21 @@ class MultiPassPipeline:
             tasks = []
             section_ids = sorted(section_map.keys(), key=lambda x: int(x.split("_")[1]))
 
+            # Crop every section from one decode of the screenshot
+            crops = self._crop_sections(screenshot_bytes, {
+                sec_id: section_map[sec_id]
+                for sec_id in section_ids if sec_id in section_htmls
+            })
+
             for sec_id in section_ids:
                 if sec_id not in section_htmls:
                     self._lf.info("Phase 3: section {sec_id} not in parsed HTML, skipping", sec_id=sec_id)
                     continue
 
-                box = section_map[sec_id]
-
-                # Crop screenshot for this section
-                try:
-                    cropped_bytes = crop_section(screenshot_bytes, box)
-                    cropped_b64 = base64.b64encode(cropped_bytes).decode('utf-8')
-                except Exception as e:
-                    self._lf.warning("Phase 3: failed to crop {sec_id}: {error}", sec_id=sec_id, error=str(e))
+                if sec_id not in crops:
+                    self._lf.warning("Phase 3: failed to crop {sec_id}", sec_id=sec_id)
                     continue
+                cropped_b64 = base64.b64encode(crops[sec_id]).decode('utf-8')
 
                 section_html = (
                     f'<section data-section="{sec_id}">'
@@ -2741,6 +2907,23 @@ class MultiPassPipeline:
     # Gemini call helpers
     # -------------------------------------------------------------------
 
+    def _crop_sections(
+        self, screenshot_bytes: bytes, boxes: Dict[str, NormalizedBox]
+    ) -> Dict[str, bytes]:
+        """Crop all sections from one decode of the screenshot.
+
+        Returns:
+            Section id -> encoded crop; sections that failed are omitted.
+        """
+        if not boxes:
+            return {}
+        try:
+            with ScreenshotTiler(screenshot_bytes, image_format=MULTIPASS_CROP_FORMAT) as tiler:
+                return tiler.crop_all(boxes)
+        except Exception as e:
+            self._lf.warning("Screenshot crop failed: {error}", error=str(e))
+            return {}
+
     async def _call_gemini_vision(
         self, model: str, image_b64: str, prompt: str
     ) -> str:
@@ -2767,6 +2950,7 @@ class MultiPassPipeline:
                 return result
             except RateLimitError:
                 self._limiter.release(rate_limited=True)
+                self._failed_calls += 1
                 self._lf.warning(
                     "Gemini vision call #{call_number} RATE LIMITED (RPM now {rpm})",
                     call_number=self._limiter.call_count,
@@ -2775,6 +2959,7 @@ class MultiPassPipeline:
                 raise
             except Exception as e:
                 self._limiter.release(success=False)
+                self._failed_calls += 1
                 self._lf.error(
                     "Gemini vision call #{call_number} FAILED: {error}",
                     call_number=self._limiter.call_count,
@@ -2806,6 +2991,7 @@ class MultiPassPipeline:
                 return result
             except RateLimitError:
                 self._limiter.release(rate_limited=True)
+                self._failed_calls += 1
                 self._lf.warning(
                     "Gemini text call #{call_number} RATE LIMITED (RPM now {rpm})",
                     call_number=self._limiter.call_count,
@@ -2814,6 +3000,7 @@ class MultiPassPipeline:
                 raise
             except Exception as e:
                 self._limiter.release(success=False)
+                self._failed_calls += 1
                 self._lf.error(
                     "Gemini text call #{call_number} FAILED: {error}",
                     call_number=self._limiter.call_count,
@@ -2863,6 +3050,7 @@ class MultiPassPipeline:
                 return response_text
             except Exception as e:
                 self._limiter.release(success=False, provider="anthropic")
+                self._failed_calls += 1
                 self._lf.error(
                     "Claude text call #{call_number} FAILED: {error}",
                     call_number=self._limiter.call_count,
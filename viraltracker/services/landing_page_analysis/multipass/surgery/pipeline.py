@@ -8,14 +8,17 @@ Coordinates 5 passes (S0-S4) of HTML surgery:
   S4: Visual QA patches (conditional)
 """
 
+import hashlib
 import logging
 import os
 import re
 import time
-from typing import Any, Callable, Dict, List, Optional, Tuple
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 
 from viraltracker.services.gemini_service import GeminiService
 
+from ..phase_cache import PhaseCache, run_cached_phase
+
 logger = logging.getLogger(__name__)
 
 # Gemini model for surgery vision calls (S2 classification, S4 QA)
@@ -44,11 +47,16 @@ class SurgeryPipeline:
         gemini_service: GeminiService,
         progress_callback: Optional[Callable] = None,
         supabase_client=None,
+        phase_cache: Optional[PhaseCache] = None,
     ):
         self._gemini = gemini_service
         self._progress = progress_callback
         self._supabase = supabase_client
         self._start_time = 0.0
+        #: Phase result cache for the LLM passes (S2, S4). None disables it.
+        self._phase_cache = phase_cache
+        #: phase label -> "hit" / "miss" / "not_cached" for the current run
+        self.phase_cache_status: Dict[str, str] = {}
         #: Phase snapshots for debugging/eval
         self.phase_snapshots: Dict[str, str] = {}
 
@@ -83,6 +91,7 @@ class SurgeryPipeline:
         """
         self._start_time = time.time()
         api_calls = 0
+        screenshot_digest = hashlib.sha256(screenshot_b64.encode()).hexdigest()
 
         # ------------------------------------------------------------------
         # S0: Sanitize & Resolve CSS
@@ -119,7 +128,6 @@ class SurgeryPipeline:
             from viraltracker.core.database import get_supabase_client
 
             supabase = self._supabase or get_supabase_client()
-            import hashlib
             url_hash = hashlib.sha256(page_url.encode()).hexdigest()[:12]
             sanitized_html, proxy_stats = proxy_images_to_storage(
                 sanitized_html,
@@ -170,12 +178,25 @@ class SurgeryPipeline:
         self._report_progress(2, "Classifying elements...")
 
         from .element_classifier import ElementClassifier
+        from .prompts import SURGERY_CLASSIFY_PROMPT_VERSION
+        from ..pipeline import compute_phase_cache_key
         classifier = ElementClassifier()
 
-        classified_html, classify_stats = classifier.classify(
-            segmented_html, sections, screenshot_b64, self._gemini
+        async def run_s2() -> Tuple[str, dict]:
+            return classifier.classify(
+                segmented_html, sections, screenshot_b64, self._gemini
+            )
+
+        classified_html, classify_stats = await self._run_cached_phase(
+            "surgery_s2",
+            compute_phase_cache_key(
+                "s2", SURGERY_VISION_MODEL, SURGERY_CLASSIFY_PROMPT_VERSION,
+                segmented_html, sections, screenshot_digest,
+            ),
+            run_s2,
         )
-        api_calls += classify_stats.get("api_calls", 0)
+        if self.phase_cache_status.get("surgery_s2") != "hit":
+            api_calls += classify_stats.get("api_calls", 0)
 
         self.phase_snapshots["phase_s2_classified"] = classified_html
         self.phase_snapshots["_s2_stats"] = _wrap_json(classify_stats)
@@ -258,7 +279,12 @@ class SurgeryPipeline:
 
                 if ssim_score < S4_SSIM_THRESHOLD:
                     # Apply QA patches via LLM
-                    from .prompts import build_surgery_patch_prompt, _extract_selector_summary
+                    from .prompts import (
+                        SURGERY_PATCH_PROMPT_VERSION,
+                        build_surgery_patch_prompt,
+                        _extract_selector_summary,
+                    )
+                    from ..pipeline import compute_phase_cache_key
                     from ..patch_applier import PatchApplier
                     from ..invariants import _extract_slots
 
@@ -271,7 +297,7 @@ class SurgeryPipeline:
                         selector_summary=selector_summary,
                     )
 
-                    try:
+                    async def run_s4() -> str:
                         response = await self._gemini.generate_content_async(
                             model=SURGERY_VISION_MODEL,
                             contents=[
@@ -280,9 +306,19 @@ class SurgeryPipeline:
                                 prompt,
                             ],
                         )
-                        api_calls += 1
+                        return response.text if hasattr(response, 'text') else str(response)
 
-                        patches_text = response.text if hasattr(response, 'text') else str(response)
+                    try:
+                        patches_text = await self._run_cached_phase(
+                            "surgery_s4",
+                            compute_phase_cache_key(
+                                "s4", SURGERY_VISION_MODEL, SURGERY_PATCH_PROMPT_VERSION,
+                                screenshot_digest, scoped_html, prompt,
+                            ),
+                            run_s4,
+                        )
+                        if self.phase_cache_status.get("surgery_s4") != "hit":
+                            api_calls += 1
 
                         if "NO_PATCHES_NEEDED" in patches_text:
                             logger.info("S4 QA: LLM says no patches needed")
@@ -382,6 +418,22 @@ class SurgeryPipeline:
 
         return final_html
 
+    async def _run_cached_phase(
+        self,
+        label: str,
+        key: str,
+        run: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        """Run one pass through the phase cache (see phase_cache.run_cached_phase)."""
+        result, status = await run_cached_phase(
+            self._phase_cache, label, key, run, self.phase_snapshots,
+        )
+        if status is not None:
+            self.phase_cache_status[label] = status
+            logger.info(f"Phase cache {label}: {status}")
+            self.phase_snapshots["phase_cache"] = _wrap_json(self.phase_cache_status)
+        return result
+
     def _inject_fallback_slot(self, html: str) -> str:
         """Inject a data-slot='headline' on the first <h1> or <h2>."""
         import re
@@ -1,5 +1,10 @@
 """LLM prompts for surgery pipeline S2 classification and S4 QA patches."""
 
+# Bump when a prompt (or, for S2, the classification it refines) changes so
+# cached phase results are not reused
+SURGERY_CLASSIFY_PROMPT_VERSION = "v1"
+SURGERY_PATCH_PROMPT_VERSION = "v1"
+
 
 def build_surgery_classify_prompt(html_preview: str) -> str:
     """Build prompt for S2 LLM refinement of element classification.
@@ -4,17 +4,34 @@ Cleans raw FireCrawl HTML into a self-contained, renderable document.
 Strips scripts, tracking, event handlers; resolves lazy images;
 absolutizes relative URLs; strips dangerous SVG elements.
 
+The default "single_pass" mode walks the document once with a tag tokenizer
+and applies every element/attribute rule as the tags go by. "regex" mode
+(SURGERY_SANITIZER_MODE=regex) runs the original sequence of whole-document
+regex passes; output and stats are the same either way.
+
+Nested removals: each removal rule removes the outermost match in document
+order, and an element nested inside it is dropped with it without being
+counted (outer wins). Rules that run earlier in the pass order (scripts
+before videos before popups before chrome ...) have already applied inside
+a later rule's element, so they still count there.
+
 Zero LLM calls.
 """
 
+import copy
+import functools
 import logging
+import os
 import re
 from html.parser import HTMLParser
-from typing import List, Optional, Set, Tuple
+from typing import Dict, List, Optional, Set, Tuple
 from urllib.parse import urljoin, urlparse
 
 logger = logging.getLogger(__name__)
 
+# "single_pass" (tokenizer) or "regex" (one regex pass per rule)
+SANITIZER_MODE = os.environ.get("SURGERY_SANITIZER_MODE", "single_pass")
+
 # Max output size (10MB)
 _MAX_SANITIZED_SIZE = 10 * 1024 * 1024
 
@@ -25,6 +42,10 @@ _MIN_VISIBLE_TEXT = 500
 _STRIP_TAGS_WITH_CONTENT = frozenset([
     "script", "noscript", "template", "audio",
 ])
+_STRIP_TAGS_RE = re.compile(
+    r'<(%s)\b[^>]*>.*?</\1\s*>' % "|".join(sorted(_STRIP_TAGS_WITH_CONTENT)),
+    re.DOTALL | re.IGNORECASE,
+)
 
 # Regex to convert <video> elements to poster/placeholder images.
 # Shopify/Replo themes often use autoplay muted loop videos as hero visuals.
@@ -109,6 +130,12 @@ _DANGEROUS_SVG_ELEMENTS = frozenset([
     "animate", "animateMotion", "animatemotion",
     "animateTransform", "animatetransform", "set",
 ])
+_DANGEROUS_SVG_RE = re.compile(
+    r'<(?:{0})\b[^>]*/\s*>|<({0})\b[^>]*>.*?</\1\s*>'.format(
+        "|".join(sorted({e.lower() for e in _DANGEROUS_SVG_ELEMENTS}))
+    ),
+    re.DOTALL | re.IGNORECASE,
+)
 
 # Shopify custom element wrapper
 _SHOPIFY_SECTION_RE = re.compile(
@@ -128,10 +155,122 @@ _SUBMIT_INPUT_RE = re.compile(
     re.IGNORECASE,
 )
 
+# Start/end tags for the single-pass tokenizer. Quoted attribute values may
+# contain ">"; a tag with an unbalanced quote ends at the first ">" instead.
+_TAG_RE = re.compile(
+    r'<(/?)([A-Za-z][^\s/>]*)((?:"[^"]*"|\'[^\']*\'|[^>"\'])*|[^>]*)>'
+)
+
+# Leading word of a tag name: what the regex passes' `<tag\b` matches on
+_TAG_BASE_RE = re.compile(r'\w+')
+
+_SELF_CLOSING_RE = re.compile(r'/\s*>$')
+
+# Elements the tokenizer drops together with their content
+_DANGEROUS_SVG_TAGS = frozenset(e.lower() for e in _DANGEROUS_SVG_ELEMENTS)
+
+_POPUP_TAGS = frozenset(["div", "section", "aside", "span"])
+_CHROME_TAGS = frozenset(["div", "section"])
+# Substrings every chrome match contains (id pattern or anti-scrape style)
+_CHROME_HINT_RE = re.compile(r'shopify-section|z-index', re.IGNORECASE)
+_POPUP_OPEN_RE = re.compile(r'<(div|section|aside|span)\b([^>]*)>', re.IGNORECASE)
+_CHROME_OPEN_RE = re.compile(r'<(div|section)\b([^>]*)>', re.IGNORECASE)
+_FOOTER_OPEN_RE = re.compile(r'<(footer)\b([^>]*)>', re.IGNORECASE)
+
+# Regex pass order of the rules that remove an element's content. Inside an
+# element being removed, the single pass only applies rules ranked below it.
+(_RANK_VIDEO, _RANK_IFRAME, _RANK_TRACKER, _RANK_POPUP, _RANK_CHROME,
+ _RANK_FOOTER, _RANK_SHOPIFY, _RANK_SVG, _RANK_NONE) = range(1, 10)
+
+# Attribute/CSS URL patterns for _absolutize_urls
+_URL_ATTRS = ("src", "href", "poster", "data-src", "data-srcset", "data-lazy-src")
+_URL_ATTR_RES = [
+    re.compile(rf'({attr})\s*=\s*(["\'])([^"\']*)\2', re.IGNORECASE)
+    for attr in _URL_ATTRS
+]
+_SRCSET_ATTR_RE = re.compile(r'srcset\s*=\s*(["\'])([^"\']*)\1', re.IGNORECASE)
+_CSS_URL_RE = re.compile(r'url\s*\(\s*([^)]+)\s*\)')
+
+
+@functools.lru_cache(maxsize=None)
+def _inline_prop_patterns(class_kw: str, props: Tuple[str, ...]):
+    """Patterns for HTMLSanitizer._strip_inline_props."""
+    # Opening tag with class containing keyword AND a style attr
+    tag_re = re.compile(
+        rf'(<[^>]*class="[^"]*{re.escape(class_kw)}[^"]*"[^>]*?)style="([^"]*)"',
+        re.IGNORECASE,
+    )
+    # Prop-stripping patterns
+    prop_patterns = [
+        re.compile(
+            rf'{re.escape(p)}\s*:\s*[^;"]+(;|\s*(?="))',
+            re.IGNORECASE,
+        )
+        for p in props
+    ]
+    return tag_re, prop_patterns
+
+
+@functools.lru_cache(maxsize=None)
+def _close_tag_re(tag: str) -> "re.Pattern":
+    return re.compile(rf'</{tag}\s*>', re.IGNORECASE)
+
+
+class _CloseTagFinder:
+    """First closing tag at or after a position, memoized per tag name.
+
+    The tokenizer only moves forward, so a previous search answers every
+    later query that starts before the match it found; total search work
+    stays linear in the document size.
+    """
+
+    def __init__(self, html: str):
+        self._html = html
+        self._last: Dict[str, Tuple[int, Optional[re.Match]]] = {}
+
+    def find(self, tag: str, pos: int) -> Optional[re.Match]:
+        last = self._last.get(tag)
+        if last is not None:
+            searched_from, match = last
+            if searched_from <= pos and (match is None or pos <= match.start()):
+                return match
+        match = _close_tag_re(tag).search(self._html, pos)
+        self._last[tag] = (pos, match)
+        return match
+
+
+class _Removal:
+    """An element the single pass is dropping, up to its closing tag.
+
+    Popups, chrome and footers end at the matching close (same-name opens
+    nest, like _find_matching_close); videos, iframes and SVG elements at
+    the first close, like their non-greedy patterns. That close may turn
+    out to sit inside something an earlier rule removes, so those keep the
+    walk's state at their start tag to go back to if none is reached.
+    """
+
+    __slots__ = ("rank", "tag", "nests", "depth", "placeholder", "restart")
+
+    def __init__(self, rank: int, tag: Optional[str], nests: bool = False,
+                 placeholder: Optional[str] = None, restart: Optional[tuple] = None):
+        self.rank = rank
+        self.tag = tag
+        self.nests = nests
+        self.depth = 1
+        self.placeholder = placeholder
+        self.restart = restart
+
 
 class HTMLSanitizer:
     """Pass S0: Clean raw HTML into a self-contained, renderable document."""
 
+    def __init__(self, mode: Optional[str] = None):
+        """
+        Args:
+            mode: "single_pass" or "regex". Defaults to SURGERY_SANITIZER_MODE.
+        """
+        self.mode = mode or SANITIZER_MODE
+
     def sanitize(
         self,
         raw_html: str,
@@ -164,6 +303,60 @@ class HTMLSanitizer:
             "svg_elements_stripped": 0,
         }
 
+        if self.mode == "regex":
+            html = self._run_regex_passes(html, page_url, detected_overlays, stats)
+        else:
+            html = self._run_single_pass(html, page_url, stats)
+            # PopupFilter removes whole elements by class/id hint, which the
+            # attribute rewrites above never touch, so running it afterwards
+            # gives the same result as running it right after step 4c.
+            if detected_overlays:
+                from ..popup_filter import PopupFilter
+                html = PopupFilter().filter(html, detected_overlays)
+            if stats["chrome_removed"]:
+                logger.info(f"S0: stripped {stats['chrome_removed']} navigation chrome element(s)")
+
+        # 12. Inject Swiper/carousel fallback CSS so renders are
+        # self-contained even if the external swiper-bundle.css fails to load.
+        # height:auto!important overrides swiper-bundle's height:100% on
+        # .swiper-wrapper and .swiper-slide, which without JS causes
+        # containers to inflate to viewport height (800px gap bug).
+        if ".swiper" in html or "swiper-wrapper" in html:
+            swiper_fallback = (
+                '<style data-sanitizer="swiper-fallback">'
+                '.swiper{overflow:hidden;position:relative}'
+                '.swiper-wrapper{display:flex;box-sizing:content-box;'
+                'transform:translate3d(0,0,0);height:auto!important}'
+                '.swiper-slide{flex-shrink:0;box-sizing:border-box;'
+                'max-width:100%;height:auto!important}'
+                '</style>'
+            )
+            html = html.replace('</head>', swiper_fallback + '</head>', 1)
+
+        # 13. Size guard
+        if len(html) > _MAX_SANITIZED_SIZE:
+            logger.warning(
+                f"Sanitized HTML exceeds {_MAX_SANITIZED_SIZE} bytes "
+                f"({len(html)}), truncating from bottom"
+            )
+            html = html[:_MAX_SANITIZED_SIZE]
+
+        # Check viability
+        visible_text = self._extract_visible_text(html)
+        stats["visible_text_len"] = len(visible_text)
+        stats["viable"] = len(visible_text) >= _MIN_VISIBLE_TEXT
+        stats["output_size"] = len(html)
+
+        return html, stats
+
+    def _run_regex_passes(
+        self,
+        html: str,
+        page_url: str,
+        detected_overlays: Optional[list],
+        stats: dict,
+    ) -> str:
+        """Steps 0-11 as separate whole-document regex passes."""
         # 0. Unwrap Alpine.js/carousel <template> tags BEFORE stripping.
         # Alpine x-if/x-for and Swiper lazy templates contain product
         # images that would be destroyed by _strip_tags_with_content.
@@ -196,16 +389,16 @@ class HTMLSanitizer:
         html, count = self._strip_popup_elements(html)
         stats["popups_removed"] = count
 
-        # 4b. Also use PopupFilter for detected overlays
-        if detected_overlays:
-            from ..popup_filter import PopupFilter
-            html = PopupFilter().filter(html, detected_overlays)
-
         # 4c. Strip navigation chrome (header, footer, mega-menu, anti-scraping overlays).
         # Safety net for elements that survived Playwright capture removal.
         html, count = self._strip_chrome_elements(html)
         stats["chrome_removed"] = count
 
+        # 4b. Also use PopupFilter for detected overlays
+        if detected_overlays:
+            from ..popup_filter import PopupFilter
+            html = PopupFilter().filter(html, detected_overlays)
+
         # 5. Resolve lazy-loaded images
         html, count = self._resolve_lazy_images(html)
         stats["lazy_images_resolved"] = count
@@ -237,55 +430,269 @@ class HTMLSanitizer:
         html, count = self._fix_js_inline_styles(html)
         stats["js_styles_fixed"] = count
 
-        # 12. Inject Swiper/carousel fallback CSS so renders are
-        # self-contained even if the external swiper-bundle.css fails to load.
-        # height:auto!important overrides swiper-bundle's height:100% on
-        # .swiper-wrapper and .swiper-slide, which without JS causes
-        # containers to inflate to viewport height (800px gap bug).
-        if ".swiper" in html or "swiper-wrapper" in html:
-            swiper_fallback = (
-                '<style data-sanitizer="swiper-fallback">'
-                '.swiper{overflow:hidden;position:relative}'
-                '.swiper-wrapper{display:flex;box-sizing:content-box;'
-                'transform:translate3d(0,0,0);height:auto!important}'
-                '.swiper-slide{flex-shrink:0;box-sizing:border-box;'
-                'max-width:100%;height:auto!important}'
-                '</style>'
-            )
-            html = html.replace('</head>', swiper_fallback + '</head>', 1)
+        return html
 
-        # 13. Size guard
-        if len(html) > _MAX_SANITIZED_SIZE:
-            logger.warning(
-                f"Sanitized HTML exceeds {_MAX_SANITIZED_SIZE} bytes "
-                f"({len(html)}), truncating from bottom"
-            )
-            html = html[:_MAX_SANITIZED_SIZE]
+    def _run_single_pass(self, html: str, page_url: str, stats: dict) -> str:
+        """Steps 0-11 (except 4b) in one left-to-right walk over the tags.
 
-        # Check viability
-        visible_text = self._extract_visible_text(html)
-        stats["visible_text_len"] = len(visible_text)
-        stats["viable"] = len(visible_text) >= _MIN_VISIBLE_TEXT
-        stats["output_size"] = len(html)
+        Element rules decide per start tag whether to drop the tag, skip to
+        its first closing tag (script, template, ...), or drop everything up
+        to its close (videos, popups, chrome, ...), so no rule rescans the
+        document. Every surviving start tag then goes through the attribute
+        rules in the regex passes' order; each rule is the same helper,
+        applied to the tag text instead of the page. Inside an element being
+        dropped, only the rules whose passes run before its own still apply.
+        """
+        stats.update({
+            "templates_unwrapped": 0,
+            "videos_converted": 0,
+            "iframes_converted": 0,
+            "chrome_removed": 0,
+            "srcset_populated": 0,
+            "js_styles_fixed": 0,
+        })
+        return self._rewrite(html, page_url, stats)
+
+    def _rewrite(self, html: str, page_url: str, stats: dict, rank: int = _RANK_NONE) -> str:
+        """Single-pass rewrite of html. A rank below _RANK_NONE means html
+        sits inside an element of that rank being dropped: only lower-ranked
+        rules apply (for their stats) and nothing is output.
+        """
+        out: List[str] = []
+        closes = _CloseTagFinder(html)
+        # Step 0 decides on the raw page, like _unwrap_content_templates:
+        # the open tag and first </template> of each unwrapped template
+        # are dropped, and other templates pair with the next close left
+        unwrapped: Set[int] = set()
+        dropped_closes: Set[int] = set()
+        for t in self._CONTENT_TEMPLATE_RE.finditer(html):
+            if self._is_content_template(t.group(1), t.group(2)):
+                unwrapped.add(t.start())
+                dropped_closes.add(t.end(2))
+        stats["templates_unwrapped"] += len(unwrapped)
+        # out index of the <shopify-section> waiting for its first close
+        # (-1 if it is inside an SVG element being removed); like
+        # _SHOPIFY_SECTION_RE, that close unwraps it and opens seen in
+        # between are kept
+        open_shopify: Optional[int] = None
+        removing: List[_Removal] = [] if rank == _RANK_NONE else [_Removal(rank, None)]
+        unclosed: Set[int] = set()  # start tags whose close was never reached
+        pos = 0
+
+        def snapshot(start: int) -> tuple:
+            shopify_tag = out[open_shopify] if open_shopify is not None and open_shopify >= 0 else None
+            return (start, len(out), dict(stats), open_shopify, shopify_tag,
+                    [copy.copy(r) for r in removing])
+
+        while True:
+            m = _TAG_RE.search(html, pos)
+            if m is None:
+                restart = next((r.restart for r in reversed(removing) if r.restart), None)
+                if restart is None:
+                    if not removing:
+                        out.append(html[pos:])
+                    break
+                pos, out_len, saved, open_shopify, shopify_tag, removing = restart
+                del out[out_len:]
+                if shopify_tag is not None:
+                    out[open_shopify] = shopify_tag
+                stats.clear()
+                stats.update(saved)
+                unclosed.add(pos)
+                continue
+            top = removing[-1] if removing else None
+            rank = top.rank if top else _RANK_NONE
+            emit = top is None
+            if emit and m.start() > pos:
+                out.append(html[pos:m.start()])
+            pos = m.end()
+            tag = m.group(0)
+            name = m.group(2).lower()
+
+            # -- End tags ------------------------------------------------
+            if m.group(1):
+                if top is not None and name == top.tag and not m.group(3).strip():
+                    top.depth -= 1
+                    if top.depth == 0:
+                        removing.pop()
+                        if top.placeholder is not None:
+                            replacement = self._rewrite(
+                                top.placeholder, page_url, stats,
+                                removing[-1].rank if removing else _RANK_NONE,
+                            )
+                            if not removing:
+                                out.append(replacement)
+                elif m.start() in dropped_closes:
+                    pass
+                elif (name == "shopify-section" and rank > _RANK_SHOPIFY
+                        and open_shopify is not None and tag.endswith("-section>")):
+                    if open_shopify >= 0:
+                        out[open_shopify] = ""
+                    open_shopify = None
+                elif emit:
+                    out.append(tag)
+                continue
+
+            base = _TAG_BASE_RE.match(name).group()
+
+            # -- Elements consumed up to their first closing tag -------------
+            if base == "template":
+                if m.start() in unwrapped:
+                    continue
+                close = closes.find("template", pos)
+                while close is not None and close.start() in dropped_closes:
+                    close = closes.find("template", close.end())
+                if close is not None:
+                    stats["scripts_removed"] += 1
+                    pos = close.end()
+                    continue
+            elif base in _STRIP_TAGS_WITH_CONTENT:
+                close = closes.find(base, pos)
+                if close is not None:
+                    stats["scripts_removed"] += 1
+                    pos = close.end()
+                    continue
+            elif base in ("video", "iframe"):
+                own_rank = _RANK_VIDEO if base == "video" else _RANK_IFRAME
+                close = None
+                if rank > own_rank and m.start() not in unclosed:
+                    close = closes.find(base, pos)
+                if close is not None:
+                    attrs = tag[len(base) + 1:-1]
+                elif rank > own_rank and _SELF_CLOSING_RE.search(tag):
+                    attrs = tag[len(base) + 1:_SELF_CLOSING_RE.search(tag).start()]
+                else:
+                    attrs = None
+                if attrs is not None:
+                    restart = snapshot(m.start()) if close is not None else None
+                    if base == "video":
+                        stats["videos_converted"] += 1
+                        placeholder = self._video_placeholder(attrs)
+                    else:
+                        stats["iframes_converted"] += 1
+                        placeholder = self._iframe_placeholder(attrs)
+                    if close is not None:
+                        removing.append(_Removal(own_rank, base, placeholder=placeholder,
+                                                 restart=restart))
+                    else:
+                        replacement = self._rewrite(placeholder, page_url, stats, rank)
+                        if emit:
+                            out.append(replacement)
+                    continue
+            elif base in _DANGEROUS_SVG_TAGS and rank > _RANK_SVG:
+                if _SELF_CLOSING_RE.search(tag):
+                    stats["svg_elements_stripped"] += 1
+                    continue
+                if m.start() not in unclosed and closes.find(base, pos) is not None:
+                    restart = snapshot(m.start())
+                    stats["svg_elements_stripped"] += 1
+                    removing.append(_Removal(_RANK_SVG, base, restart=restart))
+                    continue
 
-        return html, stats
+            if base == "style":
+                close = closes.find("style", pos)
+                if close is not None:
+                    css = html[pos:close.start()]
+                    if emit and page_url:
+                        css, count = self._absolutize_css_urls(css, page_url)
+                        stats["urls_absolutized"] += count
+                    if emit:
+                        out.append(self._rewrite_tag(tag, base, page_url, stats))
+                        out.append(css)
+                    elif rank > _RANK_SHOPIFY:
+                        self._rewrite_tag(tag, base, page_url, stats, before_svg=True)
+                    pos = close.start()
+                    continue
+
+            # -- Whole-tag and subtree removals ----------------------------
+            if base == "link" and emit and not self._is_stylesheet_link(tag):
+                continue
+            if base == "img" and rank > _RANK_TRACKER and self._is_tracking_pixel(tag):
+                stats["trackers_removed"] += 1
+                continue
+            removed = self._removed_subtree(tag, base)
+            if removed and rank > removed[1]:
+                stats[removed[0]] += 1
+                removing.append(_Removal(removed[1], base, nests=True))
+                continue
+
+            # -- Inside a removed element: only track nesting ----------------
+            if not emit:
+                if top.nests and base == top.tag:
+                    top.depth += 1
+                elif rank > _RANK_SHOPIFY:
+                    # steps 5-8 run before the SVG elements go: count them
+                    self._rewrite_tag(tag, base, page_url, stats, before_svg=True)
+                    if name == "shopify-section" and open_shopify is None:
+                        open_shopify = -1
+                continue
+
+            if name == "shopify-section" and open_shopify is None:
+                open_shopify = len(out)
+
+            out.append(self._rewrite_tag(tag, base, page_url, stats))
+
+        return "".join(out)
+
+    def _removed_subtree(self, tag: str, base: str) -> Optional[Tuple[str, int]]:
+        """(stats key, rank) if this start tag's whole element is removed
+        (popup, chrome or footer), else None.
+
+        Cheap whole-tag pattern checks run first; the helpers then look at
+        the class/id/style values specifically.
+        """
+        if (base in _POPUP_TAGS and _POPUP_PATTERNS.search(tag)
+                and self._is_popup(tag[len(base) + 1:-1])):
+            return "popups_removed", _RANK_POPUP
+        if (base in _CHROME_TAGS and _CHROME_HINT_RE.search(tag)
+                and self._is_chrome(tag[len(base) + 1:-1])):
+            return "chrome_removed", _RANK_CHROME
+        if base == "footer":
+            return "chrome_removed", _RANK_FOOTER
+        return None
+
+    def _rewrite_tag(self, tag: str, base: str, page_url: str, stats: dict,
+                     before_svg: bool = False) -> str:
+        """Attribute rules (steps 5-11, or 5-7 if before_svg) for one start tag.
+
+        Substring checks skip rules whose patterns cannot match the tag.
+        """
+        if "=" not in tag:
+            return tag
+        if base == "img":
+            lowered = tag.lower()
+            if "data-" in lowered:
+                tag, count = self._resolve_lazy_images(tag)
+                stats["lazy_images_resolved"] += count
+            if "srcset" in lowered:
+                tag, count = self._populate_src_from_srcset(tag)
+                stats["srcset_populated"] += count
+        lowered = tag.lower()
+        if "on" in lowered:
+            tag, count = self._strip_event_handlers(tag)
+            stats["event_handlers_removed"] += count
+        if base in ("form", "input"):
+            tag = self._neuter_forms(tag)
+        if before_svg:
+            return tag
+        if page_url and ("src" in lowered or "href" in lowered or "poster" in lowered or "url" in lowered):
+            tag, count = self._absolutize_urls(tag, page_url)
+            stats["urls_absolutized"] += count
+        if "style" in lowered:
+            tag, count = self._fix_js_inline_styles(tag)
+            stats["js_styles_fixed"] += count
+        return tag
 
     # ------------------------------------------------------------------
     # Stripping helpers
     # ------------------------------------------------------------------
 
     def _strip_tags_with_content(self, html: str) -> Tuple[str, int]:
-        """Strip tags and their content for script, noscript, etc."""
-        count = 0
-        for tag in _STRIP_TAGS_WITH_CONTENT:
-            pattern = re.compile(
-                rf'<{tag}\b[^>]*>.*?</{tag}\s*>',
-                re.DOTALL | re.IGNORECASE,
-            )
-            matches = pattern.findall(html)
-            count += len(matches)
-            html = pattern.sub("", html)
-        return html, count
+        """Strip tags and their content for script, noscript, etc.
+
+        One pass for all tags, so a script inside a noscript goes with it.
+        """
+        return _STRIP_TAGS_RE.subn("", html)
 
     def _convert_videos_to_posters(self, html: str) -> Tuple[str, int]:
         """Convert <video> elements to poster/placeholder images.
@@ -299,57 +706,58 @@ class HTMLSanitizer:
 
         def _replace_video(match: re.Match) -> str:
             nonlocal count
-            attrs = match.group(1) or match.group(2) or ""
-
-            # Extract poster attribute
-            poster_match = re.search(
-                r'poster\s*=\s*["\']([^"\']+)["\']', attrs, re.IGNORECASE
-            )
+            count += 1
+            return self._video_placeholder(match.group(1) or match.group(2) or "")
 
-            # Extract style for dimensions
-            style_match = re.search(
-                r'style\s*=\s*["\']([^"\']+)["\']', attrs, re.IGNORECASE
-            )
-            style = style_match.group(1) if style_match else ""
+        html = _VIDEO_RE.sub(_replace_video, html)
+        return html, count
 
-            # Extract explicit width/height
-            w_match = re.search(
-                r'width\s*=\s*["\']?(\d+)', attrs, re.IGNORECASE
-            )
-            h_match = re.search(
-                r'height\s*=\s*["\']?(\d+)', attrs, re.IGNORECASE
-            )
+    def _video_placeholder(self, attrs: str) -> str:
+        """<img> (from poster) or sized placeholder <div> for a <video>."""
+        # Extract poster attribute
+        poster_match = re.search(
+            r'poster\s*=\s*["\']([^"\']+)["\']', attrs, re.IGNORECASE
+        )
 
-            count += 1
+        # Extract style for dimensions
+        style_match = re.search(
+            r'style\s*=\s*["\']([^"\']+)["\']', attrs, re.IGNORECASE
+        )
+        style = style_match.group(1) if style_match else ""
 
-            if poster_match:
-                poster_url = poster_match.group(1)
-                img_style = style if style else "width:100%;height:auto"
-                w_attr = f' width="{w_match.group(1)}"' if w_match else ""
-                h_attr = f' height="{h_match.group(1)}"' if h_match else ""
-                return (
-                    f'<img src="{poster_url}" style="{img_style}" '
-                    f'data-was-video="true"{w_attr}{h_attr} loading="eager">'
-                )
+        # Extract explicit width/height
+        w_match = re.search(
+            r'width\s*=\s*["\']?(\d+)', attrs, re.IGNORECASE
+        )
+        h_match = re.search(
+            r'height\s*=\s*["\']?(\d+)', attrs, re.IGNORECASE
+        )
 
-            # No poster — check for src to create a placeholder
-            src_match = re.search(
-                r'(?<!\w)src\s*=\s*["\']([^"\']+)["\']', attrs, re.IGNORECASE
-            )
-            # Use a placeholder div that preserves layout
-            placeholder_style = style if style else "width:100%;aspect-ratio:16/9"
-            if "background" not in placeholder_style:
-                placeholder_style += ";background:#e5e7eb"
-            src_note = ""
-            if src_match:
-                src_note = f' data-video-src="{src_match.group(1)}"'
+        if poster_match:
+            poster_url = poster_match.group(1)
+            img_style = style if style else "width:100%;height:auto"
+            w_attr = f' width="{w_match.group(1)}"' if w_match else ""
+            h_attr = f' height="{h_match.group(1)}"' if h_match else ""
             return (
-                f'<div data-was-video="true"{src_note} '
-                f'style="{placeholder_style}"></div>'
+                f'<img src="{poster_url}" style="{img_style}" '
+                f'data-was-video="true"{w_attr}{h_attr} loading="eager">'
             )
 
-        html = _VIDEO_RE.sub(_replace_video, html)
-        return html, count
+        # No poster — check for src to create a placeholder
+        src_match = re.search(
+            r'(?<!\w)src\s*=\s*["\']([^"\']+)["\']', attrs, re.IGNORECASE
+        )
+        # Use a placeholder div that preserves layout
+        placeholder_style = style if style else "width:100%;aspect-ratio:16/9"
+        if "background" not in placeholder_style:
+            placeholder_style += ";background:#e5e7eb"
+        src_note = ""
+        if src_match:
+            src_note = f' data-video-src="{src_match.group(1)}"'
+        return (
+            f'<div data-was-video="true"{src_note} '
+            f'style="{placeholder_style}"></div>'
+        )
 
     def _convert_iframes_to_placeholders(self, html: str) -> Tuple[str, int]:
         """Convert <iframe> embeds to thumbnail/placeholder images.
@@ -362,63 +770,59 @@ class HTMLSanitizer:
 
         def _replace_iframe(match: re.Match) -> str:
             nonlocal count
-            attrs = match.group(1) or match.group(2) or ""
-
-            # Extract src
-            src_match = re.search(
-                r'(?<!\w)src\s*=\s*["\']([^"\']+)["\']', attrs, re.IGNORECASE
-            )
-            src_url = src_match.group(1) if src_match else ""
-
-            # Extract title
-            title_match = re.search(
-                r'title\s*=\s*["\']([^"\']+)["\']', attrs, re.IGNORECASE
-            )
-            title = title_match.group(1) if title_match else ""
-
             count += 1
+            return self._iframe_placeholder(match.group(1) or match.group(2) or "")
 
-            # YouTube embed — fill parent with thumbnail image.
-            # The iframe's parent container already defines the space
-            # (aspect-ratio via CSS), so we inherit sizing, not force our own.
-            yt_match = _YOUTUBE_ID_RE.search(src_url)
-            if yt_match:
-                video_id = yt_match.group(1)
-                thumb_url = f"https://img.youtube.com/vi/{video_id}/hqdefault.jpg"
-                alt = title if title else f"YouTube video {video_id}"
-                return (
-                    f'<img src="{thumb_url}" alt="{alt}" '
-                    f'data-was-iframe="youtube" data-video-id="{video_id}" '
-                    f'style="width:100%;height:100%;object-fit:cover" '
-                    f'loading="eager">'
-                )
+        html = _IFRAME_RE.sub(_replace_iframe, html)
+        return html, count
 
-            # Other iframes — compact placeholder (avoid height:100%
-            # which can inherit a huge parent height and create a
-            # large black rectangle)
-            label = title if title else "Embedded content"
-            data_src = f' data-iframe-src="{src_url}"' if src_url else ""
+    def _iframe_placeholder(self, attrs: str) -> str:
+        """YouTube thumbnail <img> or labeled placeholder <div> for an <iframe>."""
+        # Extract src
+        src_match = re.search(
+            r'(?<!\w)src\s*=\s*["\']([^"\']+)["\']', attrs, re.IGNORECASE
+        )
+        src_url = src_match.group(1) if src_match else ""
+
+        # Extract title
+        title_match = re.search(
+            r'title\s*=\s*["\']([^"\']+)["\']', attrs, re.IGNORECASE
+        )
+        title = title_match.group(1) if title_match else ""
+
+        # YouTube embed — fill parent with thumbnail image.
+        # The iframe's parent container already defines the space
+        # (aspect-ratio via CSS), so we inherit sizing, not force our own.
+        yt_match = _YOUTUBE_ID_RE.search(src_url)
+        if yt_match:
+            video_id = yt_match.group(1)
+            thumb_url = f"https://img.youtube.com/vi/{video_id}/hqdefault.jpg"
+            alt = title if title else f"YouTube video {video_id}"
             return (
-                f'<div data-was-iframe="true"{data_src} '
-                f'style="width:100%;min-height:60px;max-height:200px;'
-                f'background:#1a1a1a;'
-                f'display:flex;align-items:center;justify-content:center;'
-                f'color:#888;font-size:14px">{label}</div>'
+                f'<img src="{thumb_url}" alt="{alt}" '
+                f'data-was-iframe="youtube" data-video-id="{video_id}" '
+                f'style="width:100%;height:100%;object-fit:cover" '
+                f'loading="eager">'
             )
 
-        html = _IFRAME_RE.sub(_replace_iframe, html)
-        return html, count
+        # Other iframes — compact placeholder (avoid height:100%
+        # which can inherit a huge parent height and create a
+        # large black rectangle)
+        label = title if title else "Embedded content"
+        data_src = f' data-iframe-src="{src_url}"' if src_url else ""
+        return (
+            f'<div data-was-iframe="true"{data_src} '
+            f'style="width:100%;min-height:60px;max-height:200px;'
+            f'background:#1a1a1a;'
+            f'display:flex;align-items:center;justify-content:center;'
+            f'color:#888;font-size:14px">{label}</div>'
+        )
 
     def _strip_non_stylesheet_links(self, html: str) -> str:
         """Strip <link> tags that aren't stylesheets."""
         def _filter_link(match: re.Match) -> str:
             tag = match.group(0)
-            rel_match = re.search(r'rel\s*=\s*["\']([^"\']*)["\']', tag, re.IGNORECASE)
-            if rel_match:
-                rel = rel_match.group(1).lower().strip()
-                if rel in _KEEP_LINK_RELS:
-                    return tag
-            return ""
+            return tag if self._is_stylesheet_link(tag) else ""
 
         return re.sub(
             r'<link\b[^>]*/?\s*>',
@@ -427,6 +831,10 @@ class HTMLSanitizer:
             flags=re.IGNORECASE,
         )
 
+    def _is_stylesheet_link(self, tag: str) -> bool:
+        rel_match = re.search(r'rel\s*=\s*["\']([^"\']*)["\']', tag, re.IGNORECASE)
+        return bool(rel_match) and rel_match.group(1).lower().strip() in _KEEP_LINK_RELS
+
     def _strip_tracking_pixels(self, html: str) -> Tuple[str, int]:
         """Remove 1x1 tracking pixels and known tracker domain images."""
         count = 0
@@ -434,84 +842,65 @@ class HTMLSanitizer:
         def _check_img(match: re.Match) -> str:
             nonlocal count
             tag = match.group(0)
-            # Check for 1x1 dimensions
-            w_match = re.search(r'width\s*=\s*["\']?1["\']?', tag, re.IGNORECASE)
-            h_match = re.search(r'height\s*=\s*["\']?1["\']?', tag, re.IGNORECASE)
-            if w_match and h_match:
+            if self._is_tracking_pixel(tag):
                 count += 1
                 return ""
-            # Check for tracker domain
-            src_match = re.search(r'src\s*=\s*["\']([^"\']*)["\']', tag, re.IGNORECASE)
-            if src_match:
-                try:
-                    domain = urlparse(src_match.group(1)).hostname or ""
-                    if domain in _TRACKER_DOMAINS:
-                        count += 1
-                        return ""
-                except Exception:
-                    pass
             return tag
 
         html = re.sub(r'<img\b[^>]*/?\s*>', _check_img, html, flags=re.IGNORECASE)
         return html, count
 
+    def _is_tracking_pixel(self, tag: str) -> bool:
+        """1x1 image or image served from a known tracker domain."""
+        # Check for 1x1 dimensions
+        w_match = re.search(r'width\s*=\s*["\']?1["\']?', tag, re.IGNORECASE)
+        h_match = re.search(r'height\s*=\s*["\']?1["\']?', tag, re.IGNORECASE)
+        if w_match and h_match:
+            return True
+        # Check for tracker domain
+        src_match = re.search(r'src\s*=\s*["\']([^"\']*)["\']', tag, re.IGNORECASE)
+        if src_match:
+            try:
+                domain = urlparse(src_match.group(1)).hostname or ""
+                if domain in _TRACKER_DOMAINS:
+                    return True
+            except Exception:
+                pass
+        return False
+
     def _strip_popup_elements(self, html: str) -> Tuple[str, int]:
         """Strip elements whose class or id matches popup/overlay patterns."""
-        count = 0
+        # Match div/section/aside/span with popup class/id patterns
+        return self._strip_outermost(html, _POPUP_OPEN_RE, self._is_popup)
 
-        def _check_element(match: re.Match) -> str:
-            nonlocal count
-            tag_content = match.group(0)
-            # Extract class and id values
-            class_match = re.search(
-                r'class\s*=\s*["\']([^"\']*)["\']', tag_content, re.IGNORECASE
-            )
-            id_match = re.search(
-                r'id\s*=\s*["\']([^"\']*)["\']', tag_content, re.IGNORECASE
-            )
-            class_val = class_match.group(1) if class_match else ""
-            id_val = id_match.group(1) if id_match else ""
-
-            if _POPUP_PATTERNS.search(class_val) or _POPUP_PATTERNS.search(id_val):
-                # Find the closing tag
-                tag_name = match.group(1)
-                # For self-closing or simple match, just remove the opening tag
-                # We need to find the full element including closing tag
-                count += 1
-                return ""
-            return tag_content
-
-        # Match div/section/aside with popup class/id patterns
-        # This is a simplified approach — find opening tags and mark for removal
-        result = html
-        for tag in ("div", "section", "aside", "span"):
-            pattern = re.compile(
-                rf'<{tag}\b([^>]*)>',
-                re.IGNORECASE,
-            )
-            removals: List[Tuple[int, int]] = []
-            for m in pattern.finditer(result):
-                attrs = m.group(1)
-                class_match = re.search(
-                    r'class\s*=\s*["\']([^"\']*)["\']', attrs, re.IGNORECASE
-                )
-                id_match = re.search(
-                    r'id\s*=\s*["\']([^"\']*)["\']', attrs, re.IGNORECASE
-                )
-                class_val = class_match.group(1) if class_match else ""
-                id_val = id_match.group(1) if id_match else ""
-
-                if _POPUP_PATTERNS.search(class_val) or _POPUP_PATTERNS.search(id_val):
-                    end = self._find_matching_close(result, tag, m.end())
-                    if end > m.start():
-                        removals.append((m.start(), end))
+    def _is_popup(self, attrs: str) -> bool:
+        """Whether an opening tag's class or id matches a popup pattern."""
+        class_match = re.search(
+            r'class\s*=\s*["\']([^"\']*)["\']', attrs, re.IGNORECASE
+        )
+        id_match = re.search(
+            r'id\s*=\s*["\']([^"\']*)["\']', attrs, re.IGNORECASE
+        )
+        class_val = class_match.group(1) if class_match else ""
+        id_val = id_match.group(1) if id_match else ""
+        return bool(_POPUP_PATTERNS.search(class_val) or _POPUP_PATTERNS.search(id_val))
 
-            # Apply removals in reverse to preserve offsets
-            for start, end in reversed(removals):
-                result = result[:start] + result[end:]
-                count += 1
+    def _strip_outermost(self, html: str, open_re: "re.Pattern", matches) -> Tuple[str, int]:
+        """Remove each element whose opening tag matches open_re (groups:
+        tag name, attrs) and matches(attrs), through its matching close.
 
-        return result, count
+        Elements are taken in document order; one nested inside an element
+        already removed goes with it and is not counted.
+        """
+        parts: List[str] = []
+        end = 0
+        for m in open_re.finditer(html):
+            if m.start() < end or not matches(m.group(2)):
+                continue
+            parts.append(html[end:m.start()])
+            end = self._find_matching_close(html, m.group(1), m.end())
+        parts.append(html[end:])
+        return "".join(parts), len(parts) - 1
 
     def _find_matching_close(self, html: str, tag: str, start: int) -> int:
         """Find the position after the matching closing tag."""
@@ -549,62 +938,37 @@ class HTMLSanitizer:
 
         Uses the same _find_matching_close() pattern as _strip_popup_elements().
         """
-        count = 0
-        result = html
-
         # Pass 1: Remove elements by Shopify section ID pattern
-        for tag in ("div", "section"):
-            pattern = re.compile(
-                rf'<{tag}\b([^>]*)>',
-                re.IGNORECASE,
-            )
-            removals: List[Tuple[int, int]] = []
-            for m in pattern.finditer(result):
-                attrs = m.group(1)
-                id_match = re.search(
-                    r'id\s*=\s*["\']([^"\']*)["\']', attrs, re.IGNORECASE
-                )
-                id_val = id_match.group(1) if id_match else ""
-
-                # Shopify chrome section IDs
-                if id_val and _SHOPIFY_CHROME_ID_PATTERN.search(id_val):
-                    end = self._find_matching_close(result, tag, m.end())
-                    if end > m.start():
-                        removals.append((m.start(), end))
-                    continue
-
-                # Anti-scraping overlay (inline style with huge z-index + transparent)
-                style_match = re.search(
-                    r'style\s*=\s*["\']([^"\']*)["\']', attrs, re.IGNORECASE
-                )
-                if style_match and _ANTI_SCRAPE_STYLE_RE.search(style_match.group(1)):
-                    end = self._find_matching_close(result, tag, m.end())
-                    if end > m.start():
-                        removals.append((m.start(), end))
-
-            for start, end in reversed(removals):
-                result = result[:start] + result[end:]
-                count += 1
+        result, count = self._strip_outermost(html, _CHROME_OPEN_RE, self._is_chrome)
 
         # Pass 2: Remove bare semantic chrome tags (<footer> only).
         # We keep <header> and <nav> for visual fidelity (announcement bar,
         # navigation). Footer is still removed as it's rarely content.
-        for tag in ("footer",):
-            pattern = re.compile(rf'<{tag}\b[^>]*>', re.IGNORECASE)
-            removals = []
-            for m in pattern.finditer(result):
-                end = self._find_matching_close(result, tag, m.end())
-                if end > m.start():
-                    removals.append((m.start(), end))
-            for start, end in reversed(removals):
-                result = result[:start] + result[end:]
-                count += 1
+        result, footers = self._strip_outermost(result, _FOOTER_OPEN_RE, lambda attrs: True)
+        count += footers
 
         if count:
             logger.info(f"S0: stripped {count} navigation chrome element(s)")
 
         return result, count
 
+    def _is_chrome(self, attrs: str) -> bool:
+        """Shopify footer/mega-menu section id, or an anti-scraping overlay."""
+        id_match = re.search(
+            r'id\s*=\s*["\']([^"\']*)["\']', attrs, re.IGNORECASE
+        )
+        id_val = id_match.group(1) if id_match else ""
+
+        # Shopify chrome section IDs
+        if id_val and _SHOPIFY_CHROME_ID_PATTERN.search(id_val):
+            return True
+
+        # Anti-scraping overlay (inline style with huge z-index + transparent)
+        style_match = re.search(
+            r'style\s*=\s*["\']([^"\']*)["\']', attrs, re.IGNORECASE
+        )
+        return bool(style_match and _ANTI_SCRAPE_STYLE_RE.search(style_match.group(1)))
+
     def _resolve_lazy_images(self, html: str) -> Tuple[str, int]:
         """Resolve lazy-loaded images: data-src → src, etc."""
         count = 0
@@ -803,49 +1167,31 @@ class HTMLSanitizer:
 
         def _maybe_unwrap(m: re.Match) -> str:
             nonlocal count
-            attrs = m.group(1)
-            inner = m.group(2)
-
-            # Always unwrap if Alpine directive present
-            if self._ALPINE_ATTR_RE.search(attrs):
-                count += 1
-                return inner
-
-            # Check if the template contains img/picture/video — likely
-            # product content worth keeping
-            if re.search(r'<(?:img|picture|video)\b', inner, re.IGNORECASE):
+            if self._is_content_template(m.group(1), m.group(2)):
                 count += 1
-                return inner
-
+                return m.group(2)
             # Leave other templates for stripping
             return m.group(0)
 
         html = self._CONTENT_TEMPLATE_RE.sub(_maybe_unwrap, html)
         return html, count
 
+    def _is_content_template(self, attrs: str, inner: str) -> bool:
+        """Whether a <template> (attrs, inner HTML) is unwrapped, not stripped."""
+        # Always unwrap if Alpine directive present
+        if self._ALPINE_ATTR_RE.search(attrs):
+            return True
+        # Check if the template contains img/picture/video — likely
+        # product content worth keeping
+        return bool(re.search(r'<(?:img|picture|video)\b', inner, re.IGNORECASE))
+
     def _strip_dangerous_svg(self, html: str) -> Tuple[str, int]:
-        """Strip dangerous elements from within <svg> subtrees."""
-        count = 0
-        for elem in _DANGEROUS_SVG_ELEMENTS:
-            # Self-closing
-            pattern_sc = re.compile(
-                rf'<{elem}\b[^>]*/\s*>',
-                re.IGNORECASE,
-            )
-            matches = pattern_sc.findall(html)
-            count += len(matches)
-            html = pattern_sc.sub("", html)
-
-            # With content
-            pattern_full = re.compile(
-                rf'<{elem}\b[^>]*>.*?</{elem}\s*>',
-                re.DOTALL | re.IGNORECASE,
-            )
-            matches = pattern_full.findall(html)
-            count += len(matches)
-            html = pattern_full.sub("", html)
+        """Strip dangerous elements from within <svg> subtrees.
 
-        return html, count
+        Self-closing or through their first close; one pass for all
+        elements, so a <set> inside an <animate> goes with it.
+        """
+        return _DANGEROUS_SVG_RE.subn("", html)
 
     # Patterns for JS-set broken inline styles
     _EMPTY_ASPECT_RATIO_RE = re.compile(
@@ -871,19 +1217,7 @@ class HTMLSanitizer:
         General-purpose helper: works for any carousel/framework that
         sets JS-computed values as inline styles at runtime.
         """
-        # Build pattern: opening tag with class containing keyword AND a style attr
-        tag_re = re.compile(
-            rf'(<[^>]*class="[^"]*{re.escape(class_kw)}[^"]*"[^>]*?)style="([^"]*)"',
-            re.IGNORECASE,
-        )
-        # Build prop-stripping patterns
-        prop_patterns = [
-            re.compile(
-                rf'{re.escape(p)}\s*:\s*[^;"]+(;|\s*(?="))',
-                re.IGNORECASE,
-            )
-            for p in props
-        ]
+        tag_re, prop_patterns = _inline_prop_patterns(class_kw, tuple(props))
         count = 0
 
         def _clean(m: re.Match) -> str:
@@ -973,14 +1307,12 @@ class HTMLSanitizer:
             count += 1
             return f'{attr_name}={quote}{resolved}{quote}'
 
-        # Handle src, href, poster attributes
-        for attr in ("src", "href", "poster", "data-src", "data-srcset", "data-lazy-src"):
-            html = re.sub(
-                rf'({attr})\s*=\s*(["\'])([^"\']*)\2',
-                _resolve_attr,
-                html,
-                flags=re.IGNORECASE,
-            )
+        # Handle src, href, poster attributes (skipping absent ones, which
+        # matters when html is a single tag)
+        lowered = html.lower()
+        for attr, pattern in zip(_URL_ATTRS, _URL_ATTR_RES):
+            if attr in lowered:
+                html = pattern.sub(_resolve_attr, html)
 
         # Handle srcset (comma-separated values)
         def _resolve_srcset(match: re.Match) -> str:
@@ -1004,14 +1336,19 @@ class HTMLSanitizer:
 
             return f'srcset={quote}{", ".join(parts)}{quote}'
 
-        html = re.sub(
-            r'srcset\s*=\s*(["\'])([^"\']*)\1',
-            _resolve_srcset,
-            html,
-            flags=re.IGNORECASE,
-        )
+        if "srcset" in lowered:
+            html = _SRCSET_ATTR_RE.sub(_resolve_srcset, html)
 
         # Handle CSS url() values in <style> blocks and inline styles
+        if "url" not in html:
+            return html, count
+        html, css_count = self._absolutize_css_urls(html, page_url)
+        return html, count + css_count
+
+    def _absolutize_css_urls(self, html: str, page_url: str) -> Tuple[str, int]:
+        """Absolutize relative CSS url() values."""
+        count = 0
+
         def _resolve_css_url(match: re.Match) -> str:
             nonlocal count
             url_val = match.group(1).strip().strip("'\"")
@@ -1026,12 +1363,7 @@ class HTMLSanitizer:
             count += 1
             return f'url("{resolved}")'
 
-        html = re.sub(
-            r'url\s*\(\s*([^)]+)\s*\)',
-            _resolve_css_url,
-            html,
-        )
-
+        html = _CSS_URL_RE.sub(_resolve_css_url, html)
         return html, count
 
     def _extract_visible_text(self, html: str) -> str:
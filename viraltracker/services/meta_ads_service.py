@@ -16,6 +16,7 @@ from typing import Optional, List, Dict, Any
 from uuid import UUID
 
 from ..core.config import Config
+from .ad_performance_frame import invalidate_performance_frames
 from .models import (
     MetaAdPerformance,
     MetaAdMapping,
@@ -30,6 +31,10 @@ logger = logging.getLogger(__name__)
 # offline combined) and is the superset, so we check it first.
 PURCHASE_ACTION_TYPES = ["omni_purchase", "purchase"]
 
+# Rows per meta_ads_performance upsert request. PostgREST handles a few hundred
+# wide rows per POST comfortably; larger chunks start hitting request-size limits.
+PERFORMANCE_UPSERT_CHUNK_SIZE = 500
+
 
 @dataclass
 class AssetDownloadResult:
@@ -39,6 +44,26 @@ class AssetDownloadResult:
     reason: Optional[str] = None        # Reason code for non-success
 
 
+@dataclass
+class PerformanceSyncResult:
+    """Result from sync_performance_to_db()."""
+    saved: int = 0                # Rows upserted into meta_ads_performance
+    failed: int = 0               # Rows that could not be written
+    total: int = 0                # Insight rows received
+    duplicates: int = 0           # Rows superseded by a later row for the same ad/date
+    chunks: int = 0               # Bulk upsert requests attempted
+    chunk_retries: int = 0        # Extra attempts spent on failing chunks
+    row_fallbacks: int = 0        # Chunks that degraded to per-row upserts
+    elapsed_seconds: float = 0.0  # Wall time for the DB write phase
+
+    @property
+    def rows_per_second(self) -> float:
+        """Write throughput for the DB phase (0.0 when nothing was timed)."""
+        if self.elapsed_seconds <= 0:
+            return 0.0
+        return self.saved / self.elapsed_seconds
+
+
 class MetaAdsService:
     """
     Service for Meta Ads API operations with rate limiting.
@@ -1470,23 +1495,32 @@ class MetaAdsService:
         self,
         insights: List[Dict[str, Any]],
         brand_id: Optional[UUID] = None,
-        fetch_statuses: bool = True
-    ) -> int:
+        fetch_statuses: bool = True,
+        chunk_size: int = PERFORMANCE_UPSERT_CHUNK_SIZE,
+        max_chunk_retries: int = 2,
+    ) -> PerformanceSyncResult:
         """
         Save performance insights to database.
 
+        Records are upserted in chunks of ``chunk_size`` rows. A chunk that
+        fails is retried up to ``max_chunk_retries`` times with backoff; if it
+        still fails, only that chunk falls back to per-row upserts so one bad
+        row cannot sink the rest.
+
         Args:
             insights: Normalized insight dicts from get_ad_insights()
             brand_id: Optional brand to associate with
             fetch_statuses: Whether to fetch current ad statuses from Meta API
+            chunk_size: Rows per bulk upsert request
+            max_chunk_retries: Retries per failing chunk before per-row fallback
 
         Returns:
-            Number of records saved
+            PerformanceSyncResult with saved/failed counts and write timing
         """
         from ..core.database import get_supabase_client
 
         supabase = get_supabase_client()
-        saved_count = 0
+        result = PerformanceSyncResult(total=len(insights))
 
         # Fetch ad statuses if requested
         ad_statuses = {}
@@ -1523,77 +1557,172 @@ class MetaAdsService:
                         "campaign_objective will be 'UNKNOWN' for all records"
                     )
 
+        # Build records keyed on the (meta_ad_id, date) conflict target. A
+        # single upsert statement cannot touch the same row twice, so later
+        # duplicates replace earlier ones (same outcome as sequential upserts).
+        records_by_key: Dict[tuple, Dict[str, Any]] = {}
         for insight in insights:
             try:
-                ad_id = insight["meta_ad_id"]
+                record = self._build_performance_record(
+                    insight, brand_id, ad_statuses, campaign_objectives
+                )
+            except Exception as e:
+                logger.error(f"Failed to build insight record for {insight.get('meta_ad_id')}: {e}")
+                result.failed += 1
+                continue
+            key = (record["meta_ad_id"], record["date"])
+            if key in records_by_key:
+                result.duplicates += 1
+            records_by_key[key] = record
+
+        # PostgREST fills keys missing from some rows of a bulk request with
+        # NULL, which would clobber thumbnail_url. Group rows by column set so
+        # every request is homogeneous.
+        groups: Dict[tuple, List[Dict[str, Any]]] = {}
+        for record in records_by_key.values():
+            groups.setdefault(tuple(record.keys()), []).append(record)
+
+        chunk_size = max(1, chunk_size)
+        write_start = time.monotonic()
+        for group in groups.values():
+            for i in range(0, len(group), chunk_size):
+                chunk = group[i:i + chunk_size]
+                await self._upsert_performance_chunk(
+                    supabase, chunk, max_chunk_retries, result
+                )
+        result.elapsed_seconds = time.monotonic() - write_start
 
-                # Prepare record - use account ID from insight (set during get_ad_insights)
-                record = {
-                    "meta_ad_account_id": insight.get("meta_ad_account_id", self._default_ad_account_id),
-                    "meta_ad_id": ad_id,
-                    "meta_adset_id": insight.get("meta_adset_id"),
-                    "adset_name": insight.get("adset_name"),
-                    "meta_campaign_id": insight["meta_campaign_id"],
-                    "campaign_name": insight.get("campaign_name"),
-                    "ad_name": insight.get("ad_name"),
-                    "date": insight["date"],
-                    "spend": insight.get("spend"),
-                    "impressions": insight.get("impressions"),
-                    "reach": insight.get("reach"),
-                    "frequency": insight.get("frequency"),
-                    "cpm": insight.get("cpm"),
-                    "link_clicks": insight.get("link_clicks"),
-                    "link_ctr": insight.get("link_ctr"),
-                    "link_cpc": insight.get("link_cpc"),
-                    "add_to_carts": insight.get("add_to_carts"),
-                    "cost_per_add_to_cart": insight.get("cost_per_add_to_cart"),
-                    "purchases": insight.get("purchases"),
-                    "purchase_value": insight.get("purchase_value"),
-                    "roas": insight.get("roas"),
-                    "conversion_rate": insight.get("conversion_rate"),
-                    "video_views": insight.get("video_views"),
-                    "video_avg_watch_time": insight.get("video_avg_watch_time"),
-                    "video_p25_watched": insight.get("video_p25_watched"),
-                    "video_p50_watched": insight.get("video_p50_watched"),
-                    "video_p75_watched": insight.get("video_p75_watched"),
-                    "video_p100_watched": insight.get("video_p100_watched"),
-                    "raw_actions": insight.get("raw_actions"),
-                    "raw_costs": insight.get("raw_costs"),
-                    # New metric columns
-                    "video_p95_watched": insight.get("video_p95_watched"),
-                    "video_thruplay": insight.get("video_thruplay"),
-                    "hold_rate": insight.get("hold_rate"),
-                    "hook_rate": insight.get("hook_rate"),
-                    "initiate_checkouts": insight.get("initiate_checkouts"),
-                    "landing_page_views": insight.get("landing_page_views"),
-                    "content_views": insight.get("content_views"),
-                    "cost_per_initiate_checkout": insight.get("cost_per_initiate_checkout"),
-                    "brand_id": str(brand_id) if brand_id else None,
-                    "ad_status": ad_statuses.get(ad_id),  # Add status if fetched
-                    "campaign_objective": campaign_objectives.get(
-                        insight.get("meta_campaign_id"), "UNKNOWN"
-                    ),
-                }
+        # Cached query frames for this brand are now stale
+        if result.saved:
+            invalidate_performance_frames(str(brand_id) if brand_id else None)
 
-                # Only include thumbnail_url when truthy — the insights API never
-                # returns it, so including None would clobber values previously
-                # enriched by update_missing_thumbnails() on re-sync.
-                if insight.get("thumbnail_url"):
-                    record["thumbnail_url"] = insight["thumbnail_url"]
+        logger.info(
+            f"Saved {result.saved}/{result.total} performance records "
+            f"(with {len(ad_statuses)} statuses) in {result.chunks} chunks, "
+            f"{result.elapsed_seconds:.1f}s ({result.rows_per_second:.0f} rows/s)"
+        )
+        if result.failed:
+            logger.warning(
+                f"{result.failed} performance records failed to save "
+                f"({result.row_fallbacks} chunks fell back to per-row upserts)"
+            )
+        return result
 
-                # Upsert (on conflict with meta_ad_id + date)
-                supabase.table("meta_ads_performance").upsert(
-                    record,
-                    on_conflict="meta_ad_id,date"
-                ).execute()
+    def _build_performance_record(
+        self,
+        insight: Dict[str, Any],
+        brand_id: Optional[UUID],
+        ad_statuses: Dict[str, str],
+        campaign_objectives: Dict[str, str],
+    ) -> Dict[str, Any]:
+        """Build a meta_ads_performance row from a normalized insight."""
+        ad_id = insight["meta_ad_id"]
+
+        # Prepare record - use account ID from insight (set during get_ad_insights)
+        record = {
+            "meta_ad_account_id": insight.get("meta_ad_account_id", self._default_ad_account_id),
+            "meta_ad_id": ad_id,
+            "meta_adset_id": insight.get("meta_adset_id"),
+            "adset_name": insight.get("adset_name"),
+            "meta_campaign_id": insight["meta_campaign_id"],
+            "campaign_name": insight.get("campaign_name"),
+            "ad_name": insight.get("ad_name"),
+            "date": insight["date"],
+            "spend": insight.get("spend"),
+            "impressions": insight.get("impressions"),
+            "reach": insight.get("reach"),
+            "frequency": insight.get("frequency"),
+            "cpm": insight.get("cpm"),
+            "link_clicks": insight.get("link_clicks"),
+            "link_ctr": insight.get("link_ctr"),
+            "link_cpc": insight.get("link_cpc"),
+            "add_to_carts": insight.get("add_to_carts"),
+            "cost_per_add_to_cart": insight.get("cost_per_add_to_cart"),
+            "purchases": insight.get("purchases"),
+            "purchase_value": insight.get("purchase_value"),
+            "roas": insight.get("roas"),
+            "conversion_rate": insight.get("conversion_rate"),
+            "video_views": insight.get("video_views"),
+            "video_avg_watch_time": insight.get("video_avg_watch_time"),
+            "video_p25_watched": insight.get("video_p25_watched"),
+            "video_p50_watched": insight.get("video_p50_watched"),
+            "video_p75_watched": insight.get("video_p75_watched"),
+            "video_p100_watched": insight.get("video_p100_watched"),
+            "raw_actions": insight.get("raw_actions"),
+            "raw_costs": insight.get("raw_costs"),
+            # New metric columns
+            "video_p95_watched": insight.get("video_p95_watched"),
+            "video_thruplay": insight.get("video_thruplay"),
+            "hold_rate": insight.get("hold_rate"),
+            "hook_rate": insight.get("hook_rate"),
+            "initiate_checkouts": insight.get("initiate_checkouts"),
+            "landing_page_views": insight.get("landing_page_views"),
+            "content_views": insight.get("content_views"),
+            "cost_per_initiate_checkout": insight.get("cost_per_initiate_checkout"),
+            "brand_id": str(brand_id) if brand_id else None,
+            "ad_status": ad_statuses.get(ad_id),  # Add status if fetched
+            "campaign_objective": campaign_objectives.get(
+                insight.get("meta_campaign_id"), "UNKNOWN"
+            ),
+        }
 
-                saved_count += 1
+        # Only include thumbnail_url when truthy — the insights API never
+        # returns it, so including None would clobber values previously
+        # enriched by update_missing_thumbnails() on re-sync.
+        if insight.get("thumbnail_url"):
+            record["thumbnail_url"] = insight["thumbnail_url"]
 
+        return record
+
+    async def _upsert_performance_chunk(
+        self,
+        supabase,
+        chunk: List[Dict[str, Any]],
+        max_retries: int,
+        result: PerformanceSyncResult,
+    ) -> None:
+        """
+        Upsert one chunk of meta_ads_performance rows, updating ``result``.
+
+        Retries the whole chunk with exponential backoff; after the last
+        retry fails, writes the chunk row by row so only the bad rows are lost.
+        """
+        result.chunks += 1
+
+        def _upsert(rows):
+            return supabase.table("meta_ads_performance").upsert(
+                rows,
+                on_conflict="meta_ad_id,date"
+            ).execute()
+
+        for attempt in range(max_retries + 1):
+            try:
+                await asyncio.to_thread(_upsert, chunk)
+                result.saved += len(chunk)
+                return
             except Exception as e:
-                logger.error(f"Failed to save insight for {insight.get('meta_ad_id')}: {e}")
+                if attempt < max_retries:
+                    result.chunk_retries += 1
+                    retry_delay = 0.5 * (2 ** attempt)
+                    logger.warning(
+                        f"Performance chunk upsert failed ({len(chunk)} rows), "
+                        f"retry {attempt + 1}/{max_retries} after {retry_delay}s: {e}"
+                    )
+                    await asyncio.sleep(retry_delay)
+                else:
+                    logger.error(
+                        f"Performance chunk upsert failed after {max_retries} retries, "
+                        f"falling back to per-row upserts for {len(chunk)} rows: {e}"
+                    )
 
-        logger.info(f"Saved {saved_count}/{len(insights)} performance records (with {len(ad_statuses)} statuses)")
-        return saved_count
+        result.row_fallbacks += 1
+        for record in chunk:
+            try:
+                await asyncio.to_thread(_upsert, record)
+                result.saved += 1
+            except Exception as e:
+                result.failed += 1
+                logger.error(f"Failed to save insight for {record.get('meta_ad_id')}: {e}")
 
     def backfill_expanded_metrics(self, brand_id: UUID, batch_size: int = 500) -> int:
         """Backfill new metric columns from raw_actions JSONB for existing rows.
@@ -0,0 +1,383 @@
+"""
+BulkWriteService - Chunked, key-aware writes for the SEO keyword tables.
+
+Keyword discovery, cluster assignment and opportunity mining all write
+thousands of rows keyed by a natural key rather than by id. Doing that one
+lookup + insert at a time costs two round-trips per row; this service does
+it in a handful of requests per few hundred rows:
+
+1. Rows are de-duplicated on their natural key (last one wins).
+2. Tables with UNIQUE(key) are written with one chunked
+   `upsert(on_conflict=<key>)` per chunk and no lookup.
+3. Tables without one look existing rows up in chunks with `in_` filters
+   on the key, insert new rows in chunks, and skip or update existing
+   rows in chunks.
+
+A chunk that fails is retried row by row so one bad row doesn't lose the
+rest. Every call returns a BulkWriteResult with ids aligned to the input
+and inserted/updated/skipped/failed counts.
+
+Usage:
+    writer = BulkWriteService(supabase)
+    result = writer.upsert(SEO_KEYWORDS, rows, update_columns=("found_in_seeds",))
+    result.inserted_ids, result.updated
+"""
+
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Values per `in_` filter when looking up existing keys (keeps URLs short)
+LOOKUP_CHUNK = 200
+# Rows per insert/upsert request
+WRITE_CHUNK = 500
+# PostgREST row cap per response
+PAGE_SIZE = 1000
+
+# Marks a row the database ignored as a duplicate (ON CONFLICT DO NOTHING)
+_SKIPPED = object()
+
+
+@dataclass(frozen=True)
+class BulkTable:
+    """
+    A table the bulk writer knows how to key.
+
+    Attributes:
+        name: Table name
+        key: Natural key columns identifying a row
+        unique: Whether the database enforces UNIQUE(key). When it does,
+            rows are upserted on the key directly, without a lookup.
+    """
+
+    name: str
+    key: Tuple[str, ...]
+    unique: bool = False
+
+
+# seo_keywords has no unique constraint on (project_id, keyword); uniqueness
+# is enforced by looking up before inserting.
+SEO_KEYWORDS = BulkTable("seo_keywords", ("project_id", "keyword"))
+SEO_CLUSTER_SPOKES = BulkTable("seo_cluster_spokes", ("cluster_id", "keyword_id"), unique=True)
+SEO_OPPORTUNITIES = BulkTable("seo_opportunities", ("article_id", "keyword"), unique=True)
+
+
+@dataclass
+class BulkWriteResult:
+    """
+    Outcome of a bulk write.
+
+    Attributes:
+        ids: Row id for each input row, in input order (None if the row
+            failed, or was skipped on a unique-key table)
+        inserted_ids: Ids of rows created by this call, in input order
+        records: Rows returned by the inserts/upserts, in input order
+        inserted / updated / upserted / skipped / failed: Row counts.
+            upserted counts unique-key upserts, where the database decides
+            between insert and update. Duplicate keys within the input count
+            as skipped.
+    """
+
+    ids: List[Optional[str]] = field(default_factory=list)
+    inserted_ids: List[str] = field(default_factory=list)
+    records: List[Dict[str, Any]] = field(default_factory=list)
+    inserted: int = 0
+    updated: int = 0
+    upserted: int = 0
+    skipped: int = 0
+    failed: int = 0
+
+    @property
+    def written(self) -> int:
+        """Rows inserted, updated or upserted."""
+        return self.inserted + self.updated + self.upserted
+
+
+def _chunks(items: Sequence, size: int) -> Iterable[Sequence]:
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+class BulkWriteService:
+    """Chunked upserts keyed on natural keys for the SEO pipeline tables."""
+
+    def __init__(self, supabase_client=None):
+        """
+        Initialize with Supabase client.
+
+        Args:
+            supabase_client: Supabase client instance. If None, will be
+                created from environment on first use.
+        """
+        self._supabase = supabase_client
+
+    @property
+    def supabase(self):
+        """Lazy-load Supabase client."""
+        if self._supabase is None:
+            from viraltracker.core.database import get_supabase_client
+            self._supabase = get_supabase_client()
+        return self._supabase
+
+    def upsert(
+        self,
+        table: BulkTable,
+        rows: List[Dict[str, Any]],
+        update_columns: Optional[Sequence[str]] = None,
+        skip_existing: bool = False,
+        chunk_size: int = WRITE_CHUNK,
+    ) -> BulkWriteResult:
+        """
+        Insert new rows and update (or skip) rows whose key already exists.
+
+        Args:
+            table: Target table spec (SEO_KEYWORDS, SEO_CLUSTER_SPOKES, ...)
+            rows: Full rows to insert; every row must contain the key columns
+            update_columns: Columns refreshed on existing rows. None updates
+                with the whole row. Unique-key tables always upsert the
+                whole row.
+            skip_existing: Leave existing rows untouched (ON CONFLICT DO
+                NOTHING on unique-key tables)
+            chunk_size: Rows per write request
+
+        Returns:
+            BulkWriteResult with ids aligned to `rows`
+        """
+        result = BulkWriteResult(ids=[None] * len(rows))
+        if not rows:
+            return result
+
+        # Last row wins for duplicate keys; remember every input position
+        positions: Dict[Tuple, List[int]] = {}
+        latest: Dict[Tuple, Dict[str, Any]] = {}
+        for i, row in enumerate(rows):
+            key = tuple(row.get(col) for col in table.key)
+            positions.setdefault(key, []).append(i)
+            latest[key] = row
+        result.skipped += len(rows) - len(latest)
+
+        key_ids: Dict[Tuple, Optional[str]] = {}
+
+        if table.unique:
+            self._upsert_on_key(table, latest, skip_existing, chunk_size, result, key_ids)
+        else:
+            self._insert_or_update(table, latest, update_columns, skip_existing, chunk_size, result, key_ids)
+
+        for key, idxs in positions.items():
+            for i in idxs:
+                result.ids[i] = key_ids.get(key)
+
+        logger.info(
+            f"Bulk write {table.name}: {result.inserted} inserted, {result.updated} updated, "
+            f"{result.upserted} upserted, {result.skipped} skipped, {result.failed} failed"
+        )
+        return result
+
+    def _upsert_on_key(
+        self,
+        table: BulkTable,
+        latest: Dict[Tuple, Dict[str, Any]],
+        skip_existing: bool,
+        chunk_size: int,
+        result: BulkWriteResult,
+        key_ids: Dict[Tuple, Optional[str]],
+    ) -> None:
+        """Unique-key table: one upsert on the key per chunk, no lookup."""
+        for chunk in _chunks(list(latest), chunk_size):
+            returned = self._write_chunk(
+                table, [latest[k] for k in chunk], mode="upsert", ignore_duplicates=skip_existing,
+            )
+            for k, row in zip(chunk, returned):
+                if row is None:
+                    result.failed += 1
+                    continue
+                if row is _SKIPPED:
+                    # ON CONFLICT DO NOTHING: the key already existed
+                    result.skipped += 1
+                    continue
+                key_ids[k] = row.get("id")
+                if row:
+                    result.records.append(row)
+                if skip_existing:
+                    # Only rows that didn't exist come back
+                    result.inserted += 1
+                    if row.get("id"):
+                        result.inserted_ids.append(row["id"])
+                else:
+                    result.upserted += 1
+
+    def _insert_or_update(
+        self,
+        table: BulkTable,
+        latest: Dict[Tuple, Dict[str, Any]],
+        update_columns: Optional[Sequence[str]],
+        skip_existing: bool,
+        chunk_size: int,
+        result: BulkWriteResult,
+        key_ids: Dict[Tuple, Optional[str]],
+    ) -> None:
+        """Table without a unique key: look existing keys up, insert the rest."""
+        existing = self._lookup_existing(table, list(latest))
+
+        new_keys = [k for k in latest if k not in existing]
+        old_keys = [k for k in latest if k in existing]
+
+        # --- New rows ---
+        for chunk in _chunks(new_keys, chunk_size):
+            returned = self._write_chunk(table, [latest[k] for k in chunk], mode="insert")
+            for k, row in zip(chunk, returned):
+                if row is None:
+                    result.failed += 1
+                    continue
+                key_ids[k] = row.get("id")
+                if row:
+                    result.records.append(row)
+                    if row.get("id"):
+                        result.inserted_ids.append(row["id"])
+                result.inserted += 1
+
+        # --- Existing rows ---
+        if skip_existing:
+            for k in old_keys:
+                key_ids[k] = existing[k]
+            result.skipped += len(old_keys)
+        else:
+            for chunk in _chunks(old_keys, chunk_size):
+                payload = [self._update_payload(table, latest[k], existing[k], update_columns) for k in chunk]
+                returned = self._write_chunk(table, payload, mode="update")
+                for k, row in zip(chunk, returned):
+                    if row is None:
+                        result.failed += 1
+                        continue
+                    key_ids[k] = existing[k]
+                    result.updated += 1
+
+    # =========================================================================
+    # HELPERS
+    # =========================================================================
+
+    def _lookup_existing(self, table: BulkTable, keys: List[Tuple]) -> Dict[Tuple, str]:
+        """
+        Map natural keys that already exist to their row ids.
+
+        Keys with a NULL component never match, so they are always treated
+        as new. Lookups
+        use one `in_` filter per key column over chunks of distinct values
+        and keep only exact key matches.
+        """
+        lookup_keys = [k for k in keys if all(v is not None for v in k)]
+        if not lookup_keys:
+            return {}
+        wanted = set(lookup_keys)
+        distinct = [sorted({k[i] for k in lookup_keys}, key=str) for i in range(len(table.key))]
+        columns = ", ".join(("id",) + table.key)
+
+        found: Dict[Tuple, str] = {}
+        for filters in self._filter_chunks(distinct):
+            def build_query(filters=filters):
+                query = self.supabase.table(table.name).select(columns)
+                for col, values in zip(table.key, filters):
+                    query = query.in_(col, list(values))
+                return query
+
+            for row in self._paginate(build_query):
+                key = tuple(row.get(col) for col in table.key)
+                if key in wanted:
+                    found.setdefault(key, row["id"])
+        return found
+
+    @staticmethod
+    def _filter_chunks(distinct: List[List[Any]]) -> Iterable[Tuple[Sequence, ...]]:
+        """Cartesian product of LOOKUP_CHUNK-sized chunks of each column's values."""
+        combos: List[Tuple[Sequence, ...]] = [()]
+        for values in distinct:
+            combos = [prefix + (chunk,) for prefix in combos for chunk in _chunks(values, LOOKUP_CHUNK)]
+        return combos
+
+    @staticmethod
+    def _paginate(build_query, page_size: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Page a filtered query ordered by id past the PostgREST row cap."""
+        page_size = page_size or PAGE_SIZE
+        rows: List[Dict[str, Any]] = []
+        offset = 0
+        while True:
+            batch = (build_query().order("id").range(offset, offset + page_size - 1).execute().data) or []
+            rows.extend(batch)
+            if len(batch) < page_size:
+                break
+            offset += page_size
+        return rows
+
+    @staticmethod
+    def _update_payload(
+        table: BulkTable,
+        row: Dict[str, Any],
+        row_id: str,
+        update_columns: Optional[Sequence[str]],
+    ) -> Dict[str, Any]:
+        """Row sent for an existing key: id + key columns + updated columns."""
+        if update_columns is None:
+            payload = dict(row)
+        else:
+            payload = {col: row[col] for col in table.key}
+            payload.update({col: row[col] for col in update_columns if col in row})
+        payload["id"] = row_id
+        return payload
+
+    def _send(
+        self,
+        table: BulkTable,
+        payload: List[Dict[str, Any]],
+        mode: str,
+        ignore_duplicates: bool,
+    ) -> List[Dict[str, Any]]:
+        query = self.supabase.table(table.name)
+        if mode == "update":
+            return query.upsert(payload, on_conflict="id").execute().data or []
+        if mode == "upsert":
+            return query.upsert(
+                payload, on_conflict=",".join(table.key), ignore_duplicates=ignore_duplicates,
+            ).execute().data or []
+        return query.insert(payload).execute().data or []
+
+    def _write_chunk(
+        self,
+        table: BulkTable,
+        payload: List[Dict[str, Any]],
+        mode: str,
+        ignore_duplicates: bool = False,
+    ) -> List[Any]:
+        """
+        Write one chunk and return one entry per payload row: the returned
+        record ({} if none came back), _SKIPPED if the database ignored it as
+        a duplicate, or None if it failed.
+        """
+        try:
+            returned = list(self._send(table, payload, mode, ignore_duplicates))
+        except Exception as e:
+            if len(payload) == 1:
+                logger.error(f"Failed to write {table.name} row: {e}")
+                return [None]
+            # One bad row shouldn't lose the chunk: retry row by row
+            logger.warning(f"Bulk {mode} of {len(payload)} {table.name} rows failed, writing individually: {e}")
+            out: List[Any] = []
+            for row in payload:
+                out.extend(self._write_chunk(table, [row], mode, ignore_duplicates))
+            return out
+
+        if mode == "update":
+            return list(payload)
+
+        # Match returned rows back to the payload by key. On an upsert with
+        # ignore_duplicates, rows missing from the response were skipped
+        # (ON CONFLICT DO NOTHING); otherwise they were written but not
+        # returned.
+        missing = _SKIPPED if mode == "upsert" and ignore_duplicates else {}
+        keys = [tuple(row.get(col) for col in table.key) for row in payload]
+        by_key = {tuple(r.get(col) for col in table.key): r for r in returned}
+        if len(returned) == len(payload) and not all(k in by_key for k in keys):
+            # Keys didn't round-trip (e.g. type coercion): match by position
+            return returned
+        return [by_key.get(k, missing) for k in keys]
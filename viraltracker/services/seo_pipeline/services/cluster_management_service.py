@@ -20,6 +20,11 @@ import math
 from datetime import datetime, timedelta, timezone
 from typing import Dict, Any, Optional, List
 
+from viraltracker.core import vector_ops
+from viraltracker.services.seo_pipeline.services.bulk_write_service import (
+    SEO_CLUSTER_SPOKES,
+    BulkWriteService,
+)
 from viraltracker.services.seo_pipeline.models import (
     ClusterStatus,
     ClusterIntent,
@@ -30,6 +35,9 @@ from viraltracker.services.seo_pipeline.models import (
 
 logger = logging.getLogger(__name__)
 
+# Ids per `in_` filter for bulk keyword reads/updates
+BULK_ID_CHUNK = 200
+
 
 class ClusterManagementService:
     """Service for managing SEO topic clusters and spokes."""
@@ -462,7 +470,8 @@ class ClusterManagementService:
         """
         Assign multiple keywords to a cluster.
 
-        Skips keywords already assigned to this cluster.
+        Skips keywords already assigned to this cluster. Spokes are written
+        in bulk, then spoke_count and the centroid are refreshed once.
 
         Args:
             cluster_id: Cluster UUID
@@ -473,26 +482,58 @@ class ClusterManagementService:
         Returns:
             List of created spoke records
         """
-        # Check existing assignments to avoid duplicates
-        existing = (
-            self.supabase.table("seo_cluster_spokes")
-            .select("keyword_id")
-            .eq("cluster_id", cluster_id)
-            .execute()
+        valid_roles = {e.value for e in SpokeRole}
+        if role not in valid_roles:
+            raise ValueError(f"Invalid role: '{role}'. Valid: {sorted(valid_roles)}")
+        if not keyword_ids:
+            return []
+
+        # Keyword metadata for target fields
+        unique_ids = list(dict.fromkeys(keyword_ids))
+        meta: Dict[str, Dict[str, Any]] = {}
+        for i in range(0, len(unique_ids), BULK_ID_CHUNK):
+            rows = (
+                self.supabase.table("seo_keywords")
+                .select("id, keyword_difficulty, search_volume")
+                .in_("id", unique_ids[i:i + BULK_ID_CHUNK])
+                .execute()
+            ).data or []
+            meta.update({row.get("id"): row for row in rows})
+
+        spokes = [
+            {
+                "cluster_id": cluster_id,
+                "keyword_id": kid,
+                "role": role,
+                "priority": priority,
+                "target_kd": meta.get(kid, {}).get("keyword_difficulty"),
+                "target_volume": meta.get(kid, {}).get("search_volume"),
+            }
+            for kid in unique_ids
+        ]
+        # Keywords already assigned to this cluster are skipped
+        result = BulkWriteService(self.supabase).upsert(
+            SEO_CLUSTER_SPOKES, spokes, skip_existing=True,
         )
-        existing_ids = {s["keyword_id"] for s in (existing.data or [])}
+        if not result.records:
+            return []
 
-        results = []
-        for kid in keyword_ids:
-            if kid in existing_ids:
-                continue
-            try:
-                spoke = self.add_spoke(cluster_id, kid, role, priority)
-                results.append(spoke)
-            except Exception as e:
-                logger.warning(f"Failed to assign keyword {kid} to cluster {cluster_id}: {e}")
+        # Sync denormalized FK on keywords
+        assigned = [spoke["keyword_id"] for spoke in result.records]
+        for i in range(0, len(assigned), BULK_ID_CHUNK):
+            self.supabase.table("seo_keywords").update(
+                {"cluster_id": cluster_id}
+            ).in_("id", assigned[i:i + BULK_ID_CHUNK]).execute()
 
-        return results
+        self._update_spoke_count(cluster_id)
+
+        # One full recompute instead of an incremental update per keyword
+        try:
+            self.recompute_centroid(cluster_id)
+        except Exception as e:
+            logger.warning(f"Centroid update failed for cluster {cluster_id}: {e}")
+
+        return result.records
 
     def assign_article_to_spoke(self, spoke_id: str, article_id: str) -> Optional[Dict[str, Any]]:
         """
@@ -695,6 +736,11 @@ class ClusterManagementService:
         for link in (links_result.data or []):
             existing_links.add((link["source_article_id"], link["target_article_id"]))
 
+        # Pairwise cosine for every spoke in one matrix product
+        kw_data = [s.get("seo_keywords") or {} for s in spokes]
+        matrix, has_embedding = vector_ops.stack(k.get("embedding") for k in kw_data)
+        similarities = vector_ops.cosine_matrix(matrix)
+
         # Build link matrix
         link_matrix = []
         missing_links = []
@@ -707,16 +753,15 @@ class ClusterManagementService:
                     continue
 
                 total_possible += 1
-                source_kw_data = source.get("seo_keywords") or {}
-                target_kw_data = target.get("seo_keywords") or {}
-                source_kw = source_kw_data.get("keyword", "")
-                target_kw = target_kw_data.get("keyword", "")
-                source_emb = source_kw_data.get("embedding")
-                target_emb = target_kw_data.get("embedding")
-
-                similarity = embedding_similarity(
-                    source_kw, target_kw, source_emb, target_emb
-                )
+                source_kw = kw_data[i].get("keyword", "")
+                target_kw = kw_data[j].get("keyword", "")
+                source_emb = kw_data[i].get("embedding")
+                target_emb = kw_data[j].get("embedding")
+
+                if has_embedding[i] and has_embedding[j]:
+                    similarity = float(similarities[i, j])
+                else:
+                    similarity = embedding_similarity(source_kw, target_kw)
                 has_link = (source["article_id"], target["article_id"]) in existing_links
 
                 # Threshold: 0.50 for embedding, 0.2 for Jaccard fallback
@@ -917,8 +962,6 @@ class ClusterManagementService:
         Returns:
             List of suggestion dicts with keyword, cluster, confidence, score
         """
-        from viraltracker.core.embeddings import cosine_similarity as _cosine
-
         # Get all clusters with centroids
         clusters_result = (
             self.supabase.table("seo_clusters")
@@ -958,31 +1001,41 @@ class ClusterManagementService:
         )
         unassigned = unassigned_result.data or []
 
+        # Score every keyword against every centroid in one matrix product
+        centroids, has_centroid = vector_ops.stack(c.get("centroid_embedding") for c in clusters)
+        vector_ops.normalize_rows(centroids)
+        kw_vectors = [vector_ops.parse_vector(kw.get("embedding")) for kw in unassigned]
+        kw_matrix, has_kw_embedding = vector_ops.stack(kw_vectors, dim=centroids.shape[1])
+        similarities = vector_ops.normalize_rows(kw_matrix) @ centroids.T
+
+        cluster_words = [
+            (
+                self._extract_words(cluster["name"]),
+                self._extract_words(cluster.get("pillar_keyword") or ""),
+                cluster_spoke_words.get(cluster["id"], set()),
+            )
+            for cluster in clusters
+        ]
+
         results = []
-        for kw in unassigned:
-            kw_embedding = self._parse_embedding(kw.get("embedding"))
+        for k, kw in enumerate(unassigned):
             kw_words = self._extract_words(kw["keyword"])
-            if not kw_words and not kw_embedding:
+            if not kw_words and kw_vectors[k] is None:
                 continue
 
             scores = []
-            use_embedding = False
-
-            for cluster in clusters:
-                centroid = self._parse_embedding(cluster.get("centroid_embedding"))
+            use_embedding = bool(has_kw_embedding[k] and has_centroid.any())
 
-                if kw_embedding and centroid:
+            for c, cluster in enumerate(clusters):
+                if has_kw_embedding[k] and has_centroid[c]:
                     # Semantic scoring
-                    use_embedding = True
-                    score = _cosine(kw_embedding, centroid)
+                    score = float(similarities[k, c])
                 else:
                     # Word-overlap fallback
+                    name_words, pillar_words, spoke_words = cluster_words[c]
                     score = 0
-                    name_words = self._extract_words(cluster["name"])
                     score += len(kw_words & name_words) * 3
-                    pillar_words = self._extract_words(cluster.get("pillar_keyword") or "")
                     score += len(kw_words & pillar_words) * 2
-                    spoke_words = cluster_spoke_words.get(cluster["id"], set())
                     score += len(kw_words & spoke_words) * 1
 
                 scores.append({
@@ -1301,8 +1354,6 @@ class ClusterManagementService:
         Returns:
             List of gap suggestions
         """
-        from viraltracker.core.embeddings import embedding_similarity
-
         # Get cluster's project, keywords, and centroid
         cluster = (
             self.supabase.table("seo_clusters")
@@ -1316,7 +1367,7 @@ class ClusterManagementService:
         project_id = cluster.data[0]["project_id"]
         cluster_name = cluster.data[0]["name"]
         pillar_keyword = cluster.data[0].get("pillar_keyword") or ""
-        centroid = self._parse_embedding(cluster.data[0].get("centroid_embedding"))
+        centroid = vector_ops.parse_vector(cluster.data[0].get("centroid_embedding"))
 
         # Build word set for fallback
         spokes_result = (
@@ -1331,9 +1382,6 @@ class ClusterManagementService:
             kw = (spoke.get("seo_keywords") or {}).get("keyword", "")
             cluster_words |= self._extract_words(kw)
 
-        # Combine cluster text for Jaccard fallback
-        cluster_combined = f"{cluster_name} {pillar_keyword}"
-
         # Get unassigned keywords with embeddings
         unassigned_result = (
             self.supabase.table("seo_keywords")
@@ -1343,17 +1391,22 @@ class ClusterManagementService:
             .execute()
         )
 
+        unassigned = unassigned_result.data or []
+
+        # Semantic similarity of every keyword to the centroid at once
+        has_embedding = [False] * len(unassigned)
+        if centroid is not None:
+            kw_matrix, has_embedding = vector_ops.stack(
+                (kw.get("embedding") for kw in unassigned), dim=centroid.size
+            )
+            centroid_similarity = vector_ops.cosine_batch(centroid, kw_matrix)
+
         suggestions = []
-        for kw in (unassigned_result.data or []):
-            kw_embedding = kw.get("embedding")
+        for i, kw in enumerate(unassigned):
             kw_words = self._extract_words(kw["keyword"])
 
-            if centroid and kw_embedding:
-                # Semantic similarity to centroid
-                similarity = embedding_similarity(
-                    kw["keyword"], cluster_combined,
-                    kw_embedding, centroid,
-                )
+            if has_embedding[i]:
+                similarity = float(centroid_similarity[i])
                 threshold = 0.50
                 method = "embedding"
             else:
@@ -1783,23 +1836,14 @@ class ClusterManagementService:
 
     @staticmethod
     def _parse_embedding(raw) -> Optional[List[float]]:
-        """Parse embedding from Supabase — may be list or JSON string."""
-        if raw is None:
-            return None
-        if isinstance(raw, list):
+        """Parse embedding from Supabase — may be list or pgvector string."""
+        if raw is None or isinstance(raw, list):
             return raw
-        if isinstance(raw, str):
-            import json
-            try:
-                return json.loads(raw)
-            except (json.JSONDecodeError, ValueError):
-                return None
-        return None
+        vec = vector_ops.parse_vector(raw)
+        return vec.tolist() if vec is not None else None
 
     def _update_centroid_incremental(self, cluster_id: str, new_embedding: List[float]) -> None:
         """O(1) centroid update: new = (old * n + new) / (n + 1), then normalize."""
-        from viraltracker.core.embeddings import _normalize
-
         # Count existing spokes with embeddings
         count_result = (
             self.supabase.table("seo_cluster_spokes")
@@ -1809,7 +1853,7 @@ class ClusterManagementService:
         )
         n = sum(
             1 for s in (count_result.data or [])
-            if self._parse_embedding((s.get("seo_keywords") or {}).get("embedding")) is not None
+            if vector_ops.parse_vector((s.get("seo_keywords") or {}).get("embedding")) is not None
         )
         # n includes the spoke we just added, so prior count is n - 1
         prior = n - 1
@@ -1820,27 +1864,17 @@ class ClusterManagementService:
             .eq("id", cluster_id)
             .execute()
         )
-        old_centroid = self._parse_embedding(
+        old_centroid = vector_ops.parse_vector(
             cluster_row.data[0].get("centroid_embedding") if cluster_row.data else None
         )
-
-        if prior <= 0 or not old_centroid:
-            centroid = _normalize(new_embedding)
-        else:
-            centroid = [
-                (old * prior + nv) / (prior + 1)
-                for old, nv in zip(old_centroid, new_embedding)
-            ]
-            centroid = _normalize(centroid)
+        centroid = vector_ops.update_centroid(old_centroid, prior, new_embedding)
 
         self.supabase.table("seo_clusters").update(
-            {"centroid_embedding": centroid}
+            {"centroid_embedding": centroid.tolist()}
         ).eq("id", cluster_id).execute()
 
     def recompute_centroid(self, cluster_id: str) -> None:
         """Full centroid recompute from all spoke embeddings."""
-        from viraltracker.core.embeddings import _normalize
-
         spokes = (
             self.supabase.table("seo_cluster_spokes")
             .select("seo_keywords!inner(embedding)")
@@ -1848,28 +1882,12 @@ class ClusterManagementService:
             .execute()
         ).data or []
 
-        embeddings = []
-        for s in spokes:
-            raw = (s.get("seo_keywords") or {}).get("embedding")
-            emb = self._parse_embedding(raw)
-            if emb:
-                embeddings.append(emb)
-
-        if not embeddings:
-            self.supabase.table("seo_clusters").update(
-                {"centroid_embedding": None}
-            ).eq("id", cluster_id).execute()
-            return
-
-        dim = len(embeddings[0])
-        centroid = [
-            sum(e[i] for e in embeddings) / len(embeddings)
-            for i in range(dim)
-        ]
-        centroid = _normalize(centroid)
+        centroid = vector_ops.centroid(
+            (s.get("seo_keywords") or {}).get("embedding") for s in spokes
+        )
 
         self.supabase.table("seo_clusters").update(
-            {"centroid_embedding": centroid}
+            {"centroid_embedding": centroid.tolist() if centroid is not None else None}
         ).eq("id", cluster_id).execute()
 
     def link_article_to_spoke(self, keyword_id: str, article_id: str) -> bool:
@@ -304,20 +304,22 @@ class ClusterResearchRegistry:
         gap_keywords = []
         if existing_embeddings:
             try:
-                from viraltracker.core.embeddings import create_seo_embedder, cosine_similarity as _cosine, parse_embedding
+                from viraltracker.core import vector_ops
+                from viraltracker.core.embeddings import create_seo_embedder
                 embedder = create_seo_embedder()
-                # Parse existing embeddings (Supabase returns VECTOR as JSON strings)
-                existing_embeddings = [
-                    (kw, parsed) for kw, raw in existing_embeddings
-                    if (parsed := parse_embedding(raw)) is not None
-                ]
-                comp_vecs = embedder.embed_texts(competitor_keywords[:500], task_type="CLUSTERING")
-
-                for comp_kw, comp_vec in zip(competitor_keywords[:500], comp_vecs):
-                    max_sim = max(
-                        (_cosine(comp_vec, ex_emb) for _, ex_emb in existing_embeddings),
-                        default=0.0,
-                    )
+                # Parse existing embeddings (Supabase returns VECTOR as pgvector strings)
+                existing_matrix, parsed = vector_ops.stack(raw for _, raw in existing_embeddings)
+                existing_matrix = existing_matrix[parsed]
+                comp_vecs = embedder.embed_texts_concurrent(competitor_keywords[:500], task_type="CLUSTERING")
+
+                # Best match for every competitor keyword in one matrix product
+                if len(existing_matrix):
+                    comp_matrix, _ = vector_ops.stack(comp_vecs)
+                    max_sims = vector_ops.cosine_matrix(comp_matrix, existing_matrix).max(axis=1)
+                else:
+                    max_sims = [0.0] * len(comp_vecs)
+
+                for comp_kw, max_sim in zip(competitor_keywords[:500], max_sims):
                     if max_sim < 0.50:
                         gap_keywords.append(comp_kw)
             except Exception as e:
@@ -21,8 +21,11 @@ import random
 import re
 import time
 from datetime import datetime, timedelta, timezone
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
 
+import numpy as np
+
+from viraltracker.core import vector_ops
 from viraltracker.services.seo_pipeline.models import (
     LinkType,
     LinkStatus,
@@ -68,6 +71,9 @@ class InterlinkingService:
     # have linked it by now) — alarm-worthy. Younger articles are expected to
     # be temporarily linkless. 7 days = one weekly scan cycle of slack.
     ORPHAN_REGRESSION_DAYS = 7
+    # Keywords per .in_() request when batch-loading embeddings by text
+    # (keeps the URL well under PostgREST/proxy length limits).
+    EMBEDDING_LOOKUP_CHUNK = 100
 
     def __init__(self, supabase_client=None, publisher_service=None):
         self._supabase = supabase_client
@@ -96,7 +102,9 @@ class InterlinkingService:
         Suggest internal links for an article using semantic similarity.
 
         Uses cosine similarity between keyword embeddings when available,
-        falls back to Jaccard word-overlap otherwise.
+        falls back to Jaccard word-overlap otherwise. Target embeddings are
+        loaded for the whole project in one paginated query and scored with a
+        single matrix-vector product.
 
         Args:
             article_id: Source article UUID
@@ -107,51 +115,44 @@ class InterlinkingService:
         Returns:
             Dict with suggestions list, count, and article info
         """
-        from viraltracker.core.embeddings import embedding_similarity
-
         article = self._get_article(article_id)
         if not article:
             raise ValueError(f"Article not found: {article_id}")
 
-        # Get source keyword embedding
         source_keyword = article.get("keyword", "")
-        source_embedding = self._get_keyword_embedding(article.get("keyword_id") or article_id, source_keyword)
 
         # Get all other articles in the same project
         project_id = article.get("project_id")
         all_articles = self._get_project_articles(project_id, exclude_id=article_id)
 
-        suggestions = []
+        # Only targets with a keyword_id are eligible for embedding similarity
+        target_keywords = [t.get("keyword", "") for t in all_articles]
+        embeddings = self._get_keyword_embeddings(
+            project_id,
+            [source_keyword] + [t.get("keyword", "") for t in all_articles if t.get("keyword_id")],
+        )
+        vectors = [embeddings.get(source_keyword)] + [
+            embeddings.get(t.get("keyword", "")) if t.get("keyword_id") else None
+            for t in all_articles
+        ]
+        matrix, has_embedding = self._embedding_matrix(vectors)
 
-        for target in all_articles:
-            target_keyword = target.get("keyword", "")
-            target_embedding = self._get_keyword_embedding(target.get("keyword_id"), target_keyword)
+        # Cosine for every target in one product; Jaccard only where a side
+        # lacks an embedding.
+        cosine = matrix[1:] @ matrix[0]
+        use_embedding = has_embedding[1:] & has_embedding[0]
 
-            use_embedding = source_embedding is not None and target_embedding is not None
-            similarity = embedding_similarity(
-                source_keyword, target_keyword,
-                source_embedding, target_embedding,
+        suggestions = []
+        for idx, target in enumerate(all_articles):
+            if use_embedding[idx]:
+                similarity = float(cosine[idx])
+            else:
+                similarity = self._jaccard_similarity(source_keyword, target_keywords[idx])
+            suggestion = self._build_suggestion(
+                source_keyword, target, similarity, bool(use_embedding[idx]), min_similarity,
             )
-
-            # Respect caller's threshold; use 0.2 floor only for Jaccard fallback
-            threshold = min_similarity if use_embedding else max(min_similarity, 0.2)
-
-            if similarity >= threshold:
-                anchor_texts = self._generate_anchor_texts(target_keyword)
-                placement = self._suggest_placement(source_keyword, target_keyword)
-                high_threshold = 0.65 if use_embedding else 0.4
-                priority = LinkPriority.HIGH if similarity > high_threshold else LinkPriority.MEDIUM
-
-                suggestions.append({
-                    "target_article_id": target["id"],
-                    "target_keyword": target_keyword,
-                    "target_url": target.get("published_url", ""),
-                    "target_title": target.get("title") or target_keyword,
-                    "similarity": round(similarity, 3),
-                    "anchor_texts": anchor_texts,
-                    "placement": placement.value,
-                    "priority": priority.value,
-                })
+            if suggestion:
+                suggestions.append(suggestion)
 
         # Sort by similarity descending, limit
         suggestions.sort(key=lambda s: s["similarity"], reverse=True)
@@ -168,6 +169,125 @@ class InterlinkingService:
             "suggestions": suggestions,
         }
 
+    def suggest_links_for_project(
+        self,
+        project_id: str,
+        min_similarity: float = 0.50,
+        max_suggestions: int = 5,
+        save: bool = True,
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Suggest internal links for every linkable article in a project at once.
+
+        Equivalent to calling suggest_links() for each article, but the project
+        articles and keyword embeddings are loaded once and all pairwise
+        similarities come from a single matrix product, with top-k selected
+        per row.
+
+        Args:
+            project_id: Project UUID
+            min_similarity: Minimum similarity threshold (default: 0.50)
+            max_suggestions: Maximum suggestions per article (default: 5)
+            save: Whether to save suggestions to seo_internal_links table
+
+        Returns:
+            Dict of article_id -> suggest_links()-shaped result
+        """
+        articles = self._get_project_articles(project_id)
+        if not articles:
+            return {}
+
+        keywords = [a.get("keyword", "") for a in articles]
+        embeddings = self._get_keyword_embeddings(project_id, keywords)
+        # As in suggest_links, the source side is always looked up while
+        # targets need a keyword_id.
+        source_vectors = [embeddings.get(k) for k in keywords]
+        target_ok = np.array([bool(a.get("keyword_id")) for a in articles], dtype=bool)
+
+        matrix, has_embedding = self._embedding_matrix(source_vectors)
+        use_embedding = np.outer(has_embedding, has_embedding & target_ok)
+        similarity = (matrix @ matrix.T).astype(np.float64)
+
+        # Jaccard only for pairs where a side lacks an embedding
+        for i, j in zip(*np.nonzero(~use_embedding)):
+            similarity[i, j] = self._jaccard_similarity(keywords[i], keywords[j])
+
+        # Respect caller's threshold; use 0.2 floor only for Jaccard fallback
+        thresholds = np.where(use_embedding, min_similarity, max(min_similarity, 0.2))
+        eligible = similarity >= thresholds
+        np.fill_diagonal(eligible, False)
+
+        results: Dict[str, Dict[str, Any]] = {}
+        for i, source in enumerate(articles):
+            source_keyword = keywords[i]
+            # Top-k by rounded similarity; stable so ties keep article order
+            candidates = np.flatnonzero(eligible[i]).tolist()
+            candidates.sort(key=lambda j: round(float(similarity[i, j]), 3), reverse=True)
+            suggestions = [
+                self._build_suggestion(
+                    source_keyword, articles[j], float(similarity[i, j]),
+                    bool(use_embedding[i, j]), min_similarity,
+                )
+                for j in candidates[:max_suggestions]
+            ]
+
+            if save and suggestions:
+                self._save_suggestions(source["id"], suggestions)
+
+            results[source["id"]] = {
+                "article_id": source["id"],
+                "keyword": source_keyword,
+                "suggestion_count": len(suggestions),
+                "suggestions": suggestions,
+            }
+
+        return results
+
+    def _build_suggestion(
+        self,
+        source_keyword: str,
+        target: Dict[str, Any],
+        similarity: float,
+        use_embedding: bool,
+        min_similarity: float,
+    ) -> Optional[Dict[str, Any]]:
+        """Suggestion dict for one source/target pair, or None below threshold."""
+        # Respect caller's threshold; use 0.2 floor only for Jaccard fallback
+        threshold = min_similarity if use_embedding else max(min_similarity, 0.2)
+        if similarity < threshold:
+            return None
+
+        target_keyword = target.get("keyword", "")
+        anchor_texts = self._generate_anchor_texts(target_keyword)
+        placement = self._suggest_placement(source_keyword, target_keyword)
+        high_threshold = 0.65 if use_embedding else 0.4
+        priority = LinkPriority.HIGH if similarity > high_threshold else LinkPriority.MEDIUM
+
+        return {
+            "target_article_id": target["id"],
+            "target_keyword": target_keyword,
+            "target_url": target.get("published_url", ""),
+            "target_title": target.get("title") or target_keyword,
+            "similarity": round(similarity, 3),
+            "anchor_texts": anchor_texts,
+            "placement": placement.value,
+            "priority": priority.value,
+        }
+
+    @staticmethod
+    def _embedding_matrix(vectors: List[Optional[List[float]]]) -> Tuple[np.ndarray, np.ndarray]:
+        """Stack embeddings into an L2-normalized float32 matrix.
+
+        The first usable vector fixes the dimension. Rows that are missing or
+        have a different dimension stay zero and are flagged False in the
+        returned mask, so callers fall back to Jaccard for them.
+
+        Returns:
+            (matrix, has_embedding) — matrix is len(vectors) x dim
+        """
+        matrix, has_embedding = vector_ops.stack(vectors)
+        return vector_ops.normalize_rows(matrix), has_embedding
+
     # =========================================================================
     # TOOL 2: AUTO-LINK (from publisher/auto-link-existing-text.js)
     # =========================================================================
@@ -628,6 +748,7 @@ class InterlinkingService:
         *,
         article_id: Optional[str] = None,
         cluster_id: Optional[str] = None,
+        project_id: Optional[str] = None,
         brand_id: Optional[str] = None,
         organization_id: Optional[str] = None,
         push_to_cms: bool = True,
@@ -645,6 +766,10 @@ class InterlinkingService:
         scope='article': single-article egocentric pass (suggest + auto-link +
         related) for articles not part of a cluster. Links against published
         project articles.
+
+        scope='project': refresh link suggestions for every linkable article in
+        the project in one all-pairs pass (suggest_links_for_project). Writes
+        suggestions only; article HTML is not touched.
         """
         if scope == "cluster":
             if not cluster_id:
@@ -700,7 +825,17 @@ class InterlinkingService:
                 "suggestion_count": suggestions.get("suggestion_count", 0),
             }
 
-        raise ValueError(f"Unknown interlink scope: {scope!r} (use 'cluster' or 'article')")
+        if scope == "project":
+            if not project_id:
+                raise ValueError("interlink(scope='project') requires project_id")
+            results = self.suggest_links_for_project(project_id, save=True)
+            return {
+                "scope": "project",
+                "articles_processed": len(results),
+                "suggestion_count": sum(r["suggestion_count"] for r in results.values()),
+            }
+
+        raise ValueError(f"Unknown interlink scope: {scope!r} (use 'cluster', 'article' or 'project')")
 
     @classmethod
     def _build_related_ids(cls, aid, pillar_article_id, published_articles):
@@ -1396,23 +1531,62 @@ class InterlinkingService:
     # DB HELPERS
     # =========================================================================
 
-    def _get_keyword_embedding(self, keyword_id: Optional[str], keyword_text: str) -> Optional[List[float]]:
-        """Get embedding for a keyword from DB, or None."""
-        if not keyword_id:
-            return None
-        try:
-            result = (
-                self.supabase.table("seo_keywords")
-                .select("embedding")
-                .eq("keyword", keyword_text)
-                .limit(1)
-                .execute()
-            )
-            if result.data:
-                return result.data[0].get("embedding")
-        except Exception:
-            pass
-        return None
+    def _get_keyword_embeddings(
+        self,
+        project_id: Optional[str],
+        keywords: List[str],
+    ) -> Dict[str, List[float]]:
+        """Batch lookup of keyword text -> parsed embedding.
+
+        One paginated query loads every embedded keyword in the project; any
+        requested keyword not found there is looked up by text across all
+        projects, in chunks. Keywords without a usable embedding are absent
+        from the result.
+        """
+        from viraltracker.core.embeddings import parse_embedding
+
+        wanted = {k for k in keywords if k}
+        found: Dict[str, List[float]] = {}
+        if not wanted:
+            return found
+
+        def _collect(rows: List[Dict[str, Any]]) -> None:
+            for row in rows:
+                keyword = row.get("keyword")
+                if keyword in wanted and keyword not in found:
+                    embedding = parse_embedding(row.get("embedding"))
+                    if embedding:
+                        found[keyword] = embedding
+
+        if project_id:
+            def _build():
+                return (
+                    self.supabase.table("seo_keywords")
+                    .select("id, keyword, embedding")
+                    .eq("project_id", project_id)
+                    .not_.is_("embedding", "null")
+                )
+            try:
+                _collect(self._paginate(_build))
+            except Exception as e:
+                logger.warning(f"Failed to load project keyword embeddings for {project_id}: {e}")
+
+        missing = sorted(wanted - found.keys())
+        for i in range(0, len(missing), self.EMBEDDING_LOOKUP_CHUNK):
+            chunk = missing[i:i + self.EMBEDDING_LOOKUP_CHUNK]
+            try:
+                result = (
+                    self.supabase.table("seo_keywords")
+                    .select("keyword, embedding")
+                    .in_("keyword", chunk)
+                    .not_.is_("embedding", "null")
+                    .execute()
+                )
+                _collect(result.data or [])
+            except Exception:
+                pass
+
+        return found
 
     def _get_article(self, article_id: str) -> Optional[Dict[str, Any]]:
         """Get article from DB."""
@@ -10,16 +10,30 @@ Key features:
 - 16 modifiers + 10 suffixes for variation generation
 - Word count filtering (3-10 words for long-tail)
 - Deduplication and cross-seed frequency tracking
-- Rate-limited requests (100ms between queries)
+- Concurrent, token-bucket rate-limited requests (10/s on average)
+- Identical queries across seeds are fetched once; responses can be cached
+  on disk with a TTL (see AutocompleteCache, AUTOCOMPLETE_CACHE_DIR)
+- Keywords are written in chunked bulk requests
 """
 
 import asyncio
+import json
 import logging
+import os
 import re
-from typing import List, Dict, Any, Optional, Set
+import sqlite3
+import threading
+import time
+from typing import List, Dict, Any, Optional, Set, Tuple
 
 import httpx
 
+from viraltracker.core.rate_limit import TokenBucket
+from viraltracker.services.seo_pipeline.services.bulk_write_service import (
+    SEO_KEYWORDS,
+    BulkWriteService,
+)
+
 logger = logging.getLogger(__name__)
 
 # Google Autocomplete endpoint (no auth needed)
@@ -41,22 +55,114 @@ SUFFIXES = [
 # Valid keyword characters
 VALID_CHARS_PATTERN = re.compile(r"^[a-z0-9\s\-']+$")
 
-# Rate limit between requests (seconds)
+# Average spacing between requests (seconds); the token bucket allows
+# 1 / REQUEST_DELAY requests per second across all in-flight queries
 REQUEST_DELAY = 0.1
 
+# Autocomplete requests in flight at once
+AUTOCOMPLETE_CONCURRENCY = 8
+
+# How long a cached autocomplete response is reused (seconds)
+AUTOCOMPLETE_CACHE_TTL = 7 * 24 * 3600
+
+
+class AutocompleteCache:
+    """
+    SQLite cache of autocomplete responses, keyed by query text.
+
+    Entries older than ttl_seconds are ignored on read and purged on write.
+    Only successful responses are stored, so a failed request is retried on
+    the next run.
+    """
+
+    def __init__(self, path: str, ttl_seconds: float = AUTOCOMPLETE_CACHE_TTL):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS autocomplete ("
+                " query TEXT PRIMARY KEY,"
+                " suggestions TEXT NOT NULL,"
+                " fetched_at REAL NOT NULL)"
+            )
+            self._conn.commit()
+
+    def get_many(self, queries: List[str]) -> Dict[str, List[str]]:
+        """Fresh cached responses for the given queries (missing/expired are absent)."""
+        found: Dict[str, List[str]] = {}
+        cutoff = time.time() - self.ttl_seconds
+        try:
+            with self._lock:
+                for i in range(0, len(queries), 500):
+                    chunk = queries[i:i + 500]
+                    rows = self._conn.execute(
+                        f"SELECT query, suggestions FROM autocomplete "
+                        f"WHERE fetched_at >= ? AND query IN ({','.join('?' * len(chunk))})",
+                        [cutoff] + chunk,
+                    ).fetchall()
+                    for query, suggestions in rows:
+                        found[query] = json.loads(suggestions)
+        except sqlite3.Error as e:
+            logger.warning(f"Autocomplete cache read failed ({self.path}): {e}")
+        return found
+
+    def set_many(self, responses: Dict[str, List[str]]) -> None:
+        """Store responses and drop expired entries."""
+        now = time.time()
+        try:
+            with self._lock:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO autocomplete (query, suggestions, fetched_at) VALUES (?, ?, ?)",
+                    [(q, json.dumps(s), now) for q, s in responses.items()],
+                )
+                self._conn.execute(
+                    "DELETE FROM autocomplete WHERE fetched_at < ?", (now - self.ttl_seconds,)
+                )
+                self._conn.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Autocomplete cache write failed ({self.path}): {e}")
+
+
+def default_autocomplete_cache() -> Optional[AutocompleteCache]:
+    """
+    Shared on-disk cache, opt-in via AUTOCOMPLETE_CACHE_DIR.
+
+    The directory is resolved to an absolute path, so the cache file does not
+    depend on the working directory. Returns None when the variable is unset
+    or the database can't be opened.
+    """
+    cache_dir = os.getenv("AUTOCOMPLETE_CACHE_DIR", "").strip()
+    if not cache_dir:
+        return None
+    cache_dir = os.path.abspath(os.path.expanduser(cache_dir))
+    try:
+        return AutocompleteCache(os.path.join(cache_dir, "autocomplete.sqlite3"))
+    except sqlite3.Error as e:
+        logger.warning(f"Autocomplete cache unavailable in {cache_dir}: {e}")
+        return None
+
 
 class KeywordDiscoveryService:
     """Service for discovering long-tail keywords via Google Autocomplete."""
 
-    def __init__(self, supabase_client=None):
+    def __init__(self, supabase_client=None, autocomplete_cache: Optional[AutocompleteCache] = None):
         """
         Initialize with optional Supabase client.
 
         Args:
             supabase_client: Supabase client instance. If None, will be
                 created from environment on first use.
+            autocomplete_cache: Response cache. If None, the shared on-disk
+                cache is opened on first use when AUTOCOMPLETE_CACHE_DIR is set.
         """
         self._supabase = supabase_client
+        self._autocomplete_cache = autocomplete_cache
 
     @property
     def supabase(self):
@@ -72,6 +178,8 @@ class KeywordDiscoveryService:
         seeds: List[str],
         min_word_count: int = 3,
         max_word_count: int = 10,
+        max_concurrency: int = AUTOCOMPLETE_CONCURRENCY,
+        use_cache: bool = True,
     ) -> Dict[str, Any]:
         """
         Discover keywords from seed keywords via Google Autocomplete.
@@ -80,11 +188,19 @@ class KeywordDiscoveryService:
         Google Autocomplete. Results are filtered by word count and
         character validity, deduplicated, and tracked for cross-seed frequency.
 
+        All variations across all seeds are fetched up front: each distinct
+        query once, up to max_concurrency at a time under the REQUEST_DELAY
+        rate, with cached responses reused. Results are then applied in
+        seed/variation order, so counts and seed attribution are the same as
+        querying one variation at a time.
+
         Args:
             project_id: SEO project UUID
             seeds: List of seed keywords
             min_word_count: Minimum words in keyword (default 3)
             max_word_count: Maximum words in keyword (default 10)
+            max_concurrency: Autocomplete requests in flight at once
+            use_cache: Reuse cached autocomplete responses (and store new ones)
 
         Returns:
             Dict with:
@@ -95,37 +211,41 @@ class KeywordDiscoveryService:
         all_keywords: Dict[str, Dict[str, Any]] = {}
         total_queries = 0
 
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            for seed in seeds:
-                seed = seed.strip().lower()
-                if not seed:
-                    continue
+        seed_variations: List[Tuple[str, List[str]]] = []
+        for seed in seeds:
+            seed = seed.strip().lower()
+            if not seed:
+                continue
+            variations = self._generate_variations(seed)
+            logger.info(f"Querying {len(variations)} variations for seed '{seed}'")
+            seed_variations.append((seed, variations))
+
+        unique_queries = list(dict.fromkeys(
+            query for _, variations in seed_variations for query in variations
+        ))
+        responses = await self._fetch_autocomplete_many(
+            unique_queries, max_concurrency=max_concurrency, use_cache=use_cache
+        )
 
-                variations = self._generate_variations(seed)
-                logger.info(f"Querying {len(variations)} variations for seed '{seed}'")
-
-                for query in variations:
-                    suggestions = await self._query_autocomplete(client, query)
-                    total_queries += 1
-
-                    for suggestion in suggestions:
-                        filtered = self._filter_keyword(
-                            suggestion, min_word_count, max_word_count
-                        )
-                        if filtered:
-                            normalized = filtered.lower().strip()
-                            if normalized in all_keywords:
-                                all_keywords[normalized]["found_in_seeds"] += 1
-                            else:
-                                all_keywords[normalized] = {
-                                    "keyword": normalized,
-                                    "word_count": len(normalized.split()),
-                                    "seed_keyword": seed,
-                                    "found_in_seeds": 1,
-                                }
-
-                    # Rate limit
-                    await asyncio.sleep(REQUEST_DELAY)
+        for seed, variations in seed_variations:
+            for query in variations:
+                total_queries += 1
+
+                for suggestion in responses.get(query, []):
+                    filtered = self._filter_keyword(
+                        suggestion, min_word_count, max_word_count
+                    )
+                    if filtered:
+                        normalized = filtered.lower().strip()
+                        if normalized in all_keywords:
+                            all_keywords[normalized]["found_in_seeds"] += 1
+                        else:
+                            all_keywords[normalized] = {
+                                "keyword": normalized,
+                                "word_count": len(normalized.split()),
+                                "seed_keyword": seed,
+                                "found_in_seeds": 1,
+                            }
 
         # Sort by cross-seed frequency (desc), then word count (desc = more specific)
         keywords_list = sorted(
@@ -136,17 +256,13 @@ class KeywordDiscoveryService:
 
         logger.info(
             f"Discovery complete: {len(keywords_list)} unique keywords "
-            f"from {total_queries} queries across {len(seeds)} seeds"
+            f"from {total_queries} queries ({len(unique_queries)} distinct) "
+            f"across {len(seeds)} seeds"
         )
 
         # Save to database
-        saved_count = 0
-        saved_ids = []
-        for kw_data in keywords_list:
-            kw_id = self._save_keyword(project_id, kw_data)
-            if kw_id:
-                saved_count += 1
-                saved_ids.append(kw_id)
+        saved_ids = self._save_keywords_bulk(project_id, keywords_list)
+        saved_count = len(saved_ids)
 
         # Batch-embed newly saved keywords (non-fatal)
         if saved_ids:
@@ -198,6 +314,59 @@ class KeywordDiscoveryService:
 
         return variations
 
+    def _get_autocomplete_cache(self) -> Optional[AutocompleteCache]:
+        if self._autocomplete_cache is None:
+            self._autocomplete_cache = default_autocomplete_cache()
+        return self._autocomplete_cache
+
+    async def _fetch_autocomplete_many(
+        self,
+        queries: List[str],
+        max_concurrency: int = AUTOCOMPLETE_CONCURRENCY,
+        use_cache: bool = True,
+    ) -> Dict[str, List[str]]:
+        """
+        Fetch suggestions for many distinct queries over one shared client.
+
+        Cached responses are served first; the rest are fetched with at most
+        max_concurrency requests in flight, paced by a token bucket at
+        1 / REQUEST_DELAY requests per second.
+
+        Returns:
+            Dict of query -> suggestions (empty list for failed queries)
+        """
+        cache = self._get_autocomplete_cache() if use_cache else None
+        results: Dict[str, List[str]] = cache.get_many(queries) if cache else {}
+        pending = [q for q in queries if q not in results]
+        if results:
+            logger.info(f"Autocomplete cache: {len(results)} hits, {len(pending)} to fetch")
+        if not pending:
+            return results
+
+        workers = max(1, max_concurrency)
+        limiter = TokenBucket(rate=1.0 / REQUEST_DELAY, capacity=workers)
+        semaphore = asyncio.Semaphore(workers)
+        fresh: Dict[str, List[str]] = {}
+
+        async with httpx.AsyncClient(
+            timeout=10.0,
+            limits=httpx.Limits(max_connections=workers, max_keepalive_connections=workers),
+        ) as client:
+            async def _fetch(query: str) -> None:
+                async with semaphore:
+                    await limiter.acquire_async()
+                    suggestions = await self._query_autocomplete(client, query)
+                # Failures come back empty; only cache real suggestions
+                if suggestions:
+                    fresh[query] = suggestions
+                results[query] = suggestions
+
+            await asyncio.gather(*(_fetch(q) for q in pending))
+
+        if cache is not None and fresh:
+            cache.set_many(fresh)
+        return results
+
     async def _query_autocomplete(
         self, client: httpx.AsyncClient, query: str
     ) -> List[str]:
@@ -308,6 +477,51 @@ class KeywordDiscoveryService:
             logger.error(f"Error saving keyword '{kw_data['keyword']}': {e}")
             return None
 
+    def _save_keywords_bulk(
+        self,
+        project_id: str,
+        keywords: List[Dict[str, Any]],
+    ) -> List[str]:
+        """
+        Save discovered keywords in bulk, with the same rules as _save_keyword.
+
+        Existing keywords in the project get their found_in_seeds refreshed;
+        new ones are inserted. See BulkWriteService for the chunking.
+
+        Args:
+            project_id: SEO project UUID
+            keywords: Keyword data dicts from discover_keywords
+
+        Returns:
+            UUIDs of newly inserted keywords
+        """
+        if not keywords:
+            return []
+
+        rows = [
+            {
+                "project_id": project_id,
+                "keyword": kw["keyword"],
+                "word_count": kw["word_count"],
+                "seed_keyword": kw["seed_keyword"],
+                "found_in_seeds": kw["found_in_seeds"],
+                "status": "discovered",
+            }
+            for kw in keywords
+        ]
+        try:
+            result = BulkWriteService(self.supabase).upsert(
+                SEO_KEYWORDS, rows, update_columns=("found_in_seeds",),
+            )
+        except Exception as e:
+            logger.error(f"Error saving keywords: {e}")
+            return []
+
+        logger.info(
+            f"Saved {result.inserted} new keywords, refreshed {result.updated} existing"
+        )
+        return result.inserted_ids
+
     def create_keyword(self, project_id: str, keyword: str) -> Dict[str, Any]:
         """
         Create a single keyword record for the workflow pipeline.
@@ -426,7 +640,7 @@ class KeywordDiscoveryService:
             texts = [r["keyword"] for r in rows]
             ids = [r["id"] for r in rows]
 
-            vectors = embedder.embed_texts(texts, task_type="CLUSTERING")
+            vectors = embedder.embed_texts_concurrent(texts, task_type="CLUSTERING")
 
             embedded = 0
             for kw_id, vec in zip(ids, vectors):
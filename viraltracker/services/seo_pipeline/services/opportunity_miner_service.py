@@ -16,6 +16,11 @@ import logging
 from datetime import datetime, timedelta, timezone
 from typing import Any, Dict, List, Optional
 
+from viraltracker.services.seo_pipeline.services.bulk_write_service import (
+    SEO_OPPORTUNITIES,
+    BulkWriteService,
+)
+
 logger = logging.getLogger(__name__)
 
 
@@ -780,27 +785,19 @@ class OpportunityMinerService:
         Uses (article_id, keyword) unique constraint for dedup.
 
         Returns:
-            Number of rows upserted
+            Number of rows inserted or updated
         """
         if not opportunities:
             return 0
 
-        total = 0
-        for i in range(0, len(opportunities), 50):
-            batch = opportunities[i:i + 50]
-            for row in batch:
-                row["updated_at"] = datetime.now(timezone.utc).isoformat()
-            try:
-                self.supabase.table("seo_opportunities").upsert(
-                    batch,
-                    on_conflict="article_id,keyword",
-                ).execute()
-                total += len(batch)
-            except Exception as e:
-                logger.error(f"Failed to upsert opportunities batch: {e}")
+        now = datetime.now(timezone.utc).isoformat()
+        for row in opportunities:
+            row["updated_at"] = now
+
+        result = BulkWriteService(self.supabase).upsert(SEO_OPPORTUNITIES, opportunities)
 
-        logger.info(f"Upserted {total} opportunities")
-        return total
+        logger.info(f"Upserted {result.written} opportunities ({result.failed} failed)")
+        return result.written
 
     # =========================================================================
     # RANK DELTA TRACKING
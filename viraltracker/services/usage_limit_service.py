@@ -11,17 +11,29 @@ Usage:
 
     service = UsageLimitService(get_supabase_client())
     service.enforce_limit(org_id, "monthly_cost")  # Raises UsageLimitExceeded if over
+
+enforce_limit reads usage from an in-process counter cache: each
+(org, limit_type, period) counter is seeded by one aggregate query, bumped
+locally by UsageTracker.track, and re-seeded from the database once it is
+older than COUNTER_TTL_SECONDS, so the cached value can only drift for one
+TTL window.
 """
 
-from typing import Optional, List
+from typing import Any, Callable, Dict, Optional, List, Tuple
 from datetime import datetime
 from decimal import Decimal
 import logging
+import threading
+import time
 
 from supabase import Client
 
 logger = logging.getLogger(__name__)
 
+# How long a cached usage counter or limit config is trusted before it is
+# reconciled against the database.
+COUNTER_TTL_SECONDS = 60.0
+
 
 class LimitType:
     """Usage limit type constants."""
@@ -44,6 +56,96 @@ class UsageLimitExceeded(Exception):
         )
 
 
+class UsageCounterCache:
+    """
+    Process-wide usage counters for limit enforcement.
+
+    Counters are keyed by (org_id, limit_type, period_start). A miss or an
+    entry older than the TTL is (re)seeded via the loader; in between,
+    record() adds each tracked usage row so the counter stays current
+    without touching the database. Limit configs are cached alongside
+    with the same TTL. Thread-safe.
+    """
+
+    def __init__(self, ttl_seconds: float = COUNTER_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        # key -> [value, seeded_at (monotonic)]
+        self._counters: Dict[Tuple[str, str, str], List[float]] = {}
+        # (org_id, limit_type) -> (limit dict or None, fetched_at)
+        self._limits: Dict[Tuple[str, str], Tuple[Optional[dict], float]] = {}
+
+    def get(
+        self,
+        org_id: str,
+        limit_type: str,
+        period_start: datetime,
+        loader: Callable[[], float],
+    ) -> float:
+        """Return the cached counter, seeding it via loader when missing or stale."""
+        key = (org_id, limit_type, period_start.isoformat())
+        with self._lock:
+            entry = self._counters.get(key)
+            if entry is not None and time.monotonic() - entry[1] < self.ttl_seconds:
+                return entry[0]
+
+        value = loader()
+        with self._lock:
+            # Drop counters for earlier periods of the same limit
+            for stale in [k for k in self._counters if k[:2] == key[:2] and k != key]:
+                del self._counters[stale]
+            self._counters[key] = [value, time.monotonic()]
+        return value
+
+    def get_limit(self, org_id: str, limit_type: str, loader: Callable[[], Optional[dict]]) -> Optional[dict]:
+        """Return the cached limit config, fetching it via loader when missing or stale."""
+        key = (org_id, limit_type)
+        with self._lock:
+            entry = self._limits.get(key)
+            if entry is not None and time.monotonic() - entry[1] < self.ttl_seconds:
+                return entry[0]
+
+        limit = loader()
+        with self._lock:
+            self._limits[key] = (limit, time.monotonic())
+        return limit
+
+    def record(self, org_id: str, row: Dict[str, Any]) -> None:
+        """Add one token_usage row to every live counter for the org."""
+        tool_name = row.get("tool_name") or ""
+        increments = {
+            LimitType.MONTHLY_COST: float(row.get("cost_usd") or 0),
+            LimitType.MONTHLY_TOKENS: float((row.get("input_tokens") or 0) + (row.get("output_tokens") or 0)),
+            LimitType.DAILY_REQUESTS: 1.0,
+            # Mirrors the LIKE '%ad%' filter used when seeding
+            LimitType.DAILY_ADS: 1.0 if "ad" in tool_name else 0.0,
+        }
+        with self._lock:
+            for (key_org, limit_type, _), entry in self._counters.items():
+                if key_org == org_id:
+                    entry[0] += increments.get(limit_type, 0.0)
+
+    def invalidate(self, org_id: Optional[str] = None) -> None:
+        """Forget cached counters and limits (for one org, or all)."""
+        with self._lock:
+            if org_id is None:
+                self._counters.clear()
+                self._limits.clear()
+                return
+            for key in [k for k in self._counters if k[0] == org_id]:
+                del self._counters[key]
+            for key in [k for k in self._limits if k[0] == org_id]:
+                del self._limits[key]
+
+
+_usage_counters = UsageCounterCache()
+
+
+def get_usage_counters() -> UsageCounterCache:
+    """Get the process-wide usage counter cache."""
+    return _usage_counters
+
+
 class UsageLimitService:
     """
     Service for managing and enforcing per-organization usage limits.
@@ -52,14 +154,16 @@ class UsageLimitService:
     doesn't exist or a query fails, the operation proceeds.
     """
 
-    def __init__(self, supabase_client: Client):
+    def __init__(self, supabase_client: Client, counters: Optional[UsageCounterCache] = None):
         """
         Initialize UsageLimitService.
 
         Args:
             supabase_client: Supabase client instance
+            counters: Counter cache for enforce_limit (default: process-wide)
         """
         self.client = supabase_client
+        self.counters = counters or _usage_counters
 
     # =========================================================================
     # CRUD
@@ -135,6 +239,7 @@ class UsageLimitService:
             },
             on_conflict="organization_id,limit_type",
         ).execute()
+        self.counters.invalidate(org_id)
         logger.info(
             f"Set limit {limit_type}={limit_value} (period={period}) for org {org_id}"
         )
@@ -154,6 +259,7 @@ class UsageLimitService:
         self.client.table("usage_limits").delete().eq(
             "organization_id", org_id
         ).eq("limit_type", limit_type).execute()
+        self.counters.invalidate(org_id)
         logger.info(f"Deleted limit {limit_type} for org {org_id}")
         return True
 
@@ -161,13 +267,17 @@ class UsageLimitService:
     # Usage Checking
     # =========================================================================
 
-    def get_current_period_usage(self, org_id: str, limit_type: str) -> dict:
+    def get_current_period_usage(
+        self, org_id: str, limit_type: str, use_cache: bool = False
+    ) -> dict:
         """
         Get current usage against a limit for the current period.
 
         Args:
             org_id: Organization ID
             limit_type: Limit type to check
+            use_cache: Read the limit and usage from the counter cache
+                (may lag the database by up to one TTL window)
 
         Returns:
             Dict with:
@@ -181,7 +291,12 @@ class UsageLimitService:
             - enabled: bool
         """
         # Get the limit config
-        limit = self.get_limit(org_id, limit_type)
+        if use_cache:
+            limit = self.counters.get_limit(
+                org_id, limit_type, lambda: self.get_limit(org_id, limit_type)
+            )
+        else:
+            limit = self.get_limit(org_id, limit_type)
         limit_value = float(limit["limit_value"]) if limit else None
         alert_threshold = float(limit.get("alert_threshold", 0.8)) if limit else 0.8
         enabled = limit.get("enabled", True) if limit else False
@@ -193,8 +308,17 @@ class UsageLimitService:
         else:
             period_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
 
-        # Get current usage based on type
-        current_usage = self._get_usage_value(org_id, limit_type, period_start)
+        # Get current usage based on type. Nothing to compare against
+        # without an enabled limit, so skip the counter entirely.
+        if use_cache and not (limit_value is not None and enabled):
+            current_usage = 0.0
+        elif use_cache:
+            current_usage = self.counters.get(
+                org_id, limit_type, period_start,
+                lambda: self._query_usage_value(org_id, limit_type, period_start),
+            )
+        else:
+            current_usage = self._get_usage_value(org_id, limit_type, period_start)
 
         # Calculate percentage
         usage_pct = (current_usage / limit_value) if limit_value and limit_value > 0 else 0.0
@@ -251,7 +375,7 @@ class UsageLimitService:
             return
 
         try:
-            status = self.get_current_period_usage(org_id, limit_type)
+            status = self.get_current_period_usage(org_id, limit_type, use_cache=True)
             logger.info(
                 f"Usage limit check: org={org_id}, type={limit_type}, "
                 f"usage={status['current_usage']:.4f}, "
@@ -287,58 +411,73 @@ class UsageLimitService:
         """
         Query the actual usage value for a limit type.
 
-        Uses direct table queries (no RPC dependency) for reliability.
-        Fetches matching rows and sums in Python.
-
         Args:
             org_id: Organization ID
             limit_type: Which metric to sum
             period_start: Start of the current period
 
         Returns:
-            Current usage value as float
+            Current usage value as float (0.0 if the query fails)
         """
         try:
-            if limit_type == LimitType.MONTHLY_COST:
-                return self._sum_column(org_id, "cost_usd", period_start)
-
-            elif limit_type == LimitType.MONTHLY_TOKENS:
-                return self._sum_column(org_id, "total_tokens", period_start)
-
-            elif limit_type == LimitType.DAILY_REQUESTS:
-                result = self.client.table("token_usage").select(
-                    "id", count="exact"
-                ).eq(
-                    "organization_id", org_id
-                ).gte(
-                    "created_at", period_start.isoformat()
-                ).execute()
-                return float(result.count) if result.count else 0.0
-
-            elif limit_type == LimitType.DAILY_ADS:
-                result = self.client.table("token_usage").select(
-                    "id", count="exact"
-                ).eq(
-                    "organization_id", org_id
-                ).gte(
-                    "created_at", period_start.isoformat()
-                ).like(
-                    "tool_name", "%ad%"
-                ).execute()
-                return float(result.count) if result.count else 0.0
-
-            return 0.0
-
+            return self._query_usage_value(org_id, limit_type, period_start)
         except Exception as e:
             logger.error(f"Failed to query usage for {limit_type}: {e}")
             return 0.0
 
+    def _query_usage_value(
+        self, org_id: str, limit_type: str, period_start: datetime
+    ) -> float:
+        """
+        Query the usage value for a limit type with one aggregate query.
+
+        Raises on query failure so the counter cache never stores a bogus 0.
+
+        Args:
+            org_id: Organization ID
+            limit_type: Which metric to sum
+            period_start: Start of the current period
+
+        Returns:
+            Current usage value as float
+        """
+        if limit_type == LimitType.MONTHLY_COST:
+            return self._sum_column(org_id, "cost_usd", period_start)
+
+        elif limit_type == LimitType.MONTHLY_TOKENS:
+            return self._sum_column(org_id, "total_tokens", period_start)
+
+        elif limit_type == LimitType.DAILY_REQUESTS:
+            result = self.client.table("token_usage").select(
+                "id", count="exact"
+            ).eq(
+                "organization_id", org_id
+            ).gte(
+                "created_at", period_start.isoformat()
+            ).limit(1).execute()
+            return float(result.count) if result.count else 0.0
+
+        elif limit_type == LimitType.DAILY_ADS:
+            result = self.client.table("token_usage").select(
+                "id", count="exact"
+            ).eq(
+                "organization_id", org_id
+            ).gte(
+                "created_at", period_start.isoformat()
+            ).like(
+                "tool_name", "%ad%"
+            ).limit(1).execute()
+            return float(result.count) if result.count else 0.0
+
+        return 0.0
+
     def _sum_column(self, org_id: str, column: str, period_start: datetime) -> float:
         """
         Sum a numeric column from token_usage for the given org and period.
 
-        Fetches values directly from the table and sums in Python,
-        avoiding dependency on database RPC functions.
+        Uses the sum_token_usage RPC so the database does the aggregation.
+        Falls back to fetching the column and summing in Python if the RPC
+        is unavailable.
 
         Args:
             org_id: Organization ID
@@ -348,7 +487,16 @@ class UsageLimitService:
         Returns:
             Sum of values as float
         """
-        # Fetch values in batches (Supabase default limit is 1000)
+        try:
+            result = self.client.rpc("sum_token_usage", {
+                "p_org_id": org_id,
+                "p_column": column,
+                "p_start_date": period_start.isoformat(),
+            }).execute()
+            return float(result.data or 0)
+        except Exception as e:
+            logger.warning(f"sum_token_usage RPC failed, summing rows instead: {e}")
+
         result = self.client.table("token_usage").select(
             column
         ).eq(
@@ -82,14 +82,17 @@ class UsageTracker:
     fail the main operation. If tracking fails, it logs a warning and continues.
     """
 
-    def __init__(self, supabase_client: Client):
+    def __init__(self, supabase_client: Client, write_buffer=None):
         """
         Initialize UsageTracker.
 
         Args:
             supabase_client: Supabase client instance
+            write_buffer: UsageWriteBuffer for track() (default: the process-wide
+                buffer, or synchronous inserts when USAGE_WRITE_BEHIND=off)
         """
         self.client = supabase_client
+        self._write_buffer = write_buffer
 
     def track(
         self,
@@ -101,7 +104,9 @@ class UsageTracker:
         Record a usage event.
 
         This method is fire-and-forget - it will never raise an exception.
-        If tracking fails, it logs a warning and returns silently.
+        If tracking fails, it logs a warning and returns silently. Rows are
+        queued on the write-behind buffer and inserted in batches off the
+        calling thread (see usage_write_buffer).
 
         Args:
             user_id: User who triggered the usage (optional for system ops)
@@ -119,22 +124,16 @@ class UsageTracker:
             if cost is None:
                 cost = self._calculate_cost(record)
 
-            # Insert record
-            self.client.table("token_usage").insert({
-                "user_id": user_id,
-                "organization_id": organization_id,
-                "provider": record.provider,
-                "model": record.model,
-                "tool_name": record.tool_name,
-                "operation": record.operation,
-                "input_tokens": record.input_tokens,
-                "output_tokens": record.output_tokens,
-                "units": float(record.units) if record.units else None,
-                "unit_type": record.unit_type,
-                "cost_usd": float(cost) if cost else None,
-                "request_metadata": record.request_metadata,
-                "duration_ms": record.duration_ms,
-            }).execute()
+            row = self._build_row(user_id, organization_id, record, cost)
+            buffer = self._get_write_buffer()
+            if buffer is not None:
+                buffer.enqueue(row)
+            else:
+                self.client.table("token_usage").insert(row).execute()
+
+            # Keep enforce_limit's cached counters current between reconciles
+            from .usage_limit_service import get_usage_counters
+            get_usage_counters().record(organization_id, row)
 
             logger.debug(
                 f"Tracked usage: {record.provider}/{record.model} "
@@ -146,6 +145,37 @@ class UsageTracker:
             # Never fail the main operation - just log and continue
             logger.warning(f"Usage tracking failed (non-fatal): {e}")
 
+    def _get_write_buffer(self):
+        """Explicit buffer, else the shared one unless write-behind is off."""
+        if self._write_buffer is not None:
+            return self._write_buffer
+        from .usage_write_buffer import WRITE_BEHIND_ENABLED, get_usage_write_buffer
+        return get_usage_write_buffer() if WRITE_BEHIND_ENABLED else None
+
+    @staticmethod
+    def _build_row(
+        user_id: Optional[str],
+        organization_id: str,
+        record: UsageRecord,
+        cost: Optional[Decimal],
+    ) -> dict:
+        """Build the token_usage row for a usage record."""
+        return {
+            "user_id": user_id,
+            "organization_id": organization_id,
+            "provider": record.provider,
+            "model": record.model,
+            "tool_name": record.tool_name,
+            "operation": record.operation,
+            "input_tokens": record.input_tokens,
+            "output_tokens": record.output_tokens,
+            "units": float(record.units) if record.units else None,
+            "unit_type": record.unit_type,
+            "cost_usd": float(cost) if cost else None,
+            "request_metadata": record.request_metadata,
+            "duration_ms": record.duration_ms,
+        }
+
     def _calculate_cost(self, record: UsageRecord) -> Optional[Decimal]:
         """
         Calculate cost based on usage and configured rates.
@@ -0,0 +1,388 @@
+"""
+Usage Write Buffer - Process-wide write-behind queue for token_usage rows.
+
+UsageTracker.track used to insert one token_usage row on the calling thread
+for every AI call, so each Gemini/Claude/OpenAI/ElevenLabs request paid an
+extra Supabase round trip. The buffer takes rows off the hot path:
+
+- track() appends the row to an in-memory queue and returns immediately.
+- A daemon thread flushes the queue as one bulk insert when it reaches
+  max_batch rows or every flush_interval seconds, whichever comes first.
+- If the insert fails (DB unreachable), the batch is appended to a local
+  JSONL spill file and replayed ahead of the next successful flush. Replay
+  first renames the file aside, so rows spilled meanwhile start a new one.
+- drain() flushes everything that is left; it runs at interpreter exit and
+  from the scheduler worker's SIGTERM path.
+
+The flush thread gets its own Supabase client (get_supabase_client is
+thread-local; httpx.Client is not thread-safe), so rows never travel over
+the caller's client.
+
+Usage:
+    from viraltracker.services.usage_write_buffer import get_usage_write_buffer
+
+    buffer = get_usage_write_buffer()
+    buffer.enqueue(row)
+    buffer.stats()  # {"queue_depth": ..., "last_flush_ms": ..., ...}
+
+Environment:
+    USAGE_WRITE_BEHIND: "on" (default) or "off" (synchronous inserts)
+    USAGE_SPILL_PATH: spill file (default usage_spill.jsonl in Config.CACHE_DIR)
+"""
+
+import atexit
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from viraltracker.core.config import Config
+
+logger = logging.getLogger(__name__)
+
+TABLE = "token_usage"
+
+DEFAULT_MAX_BATCH = 100
+DEFAULT_FLUSH_INTERVAL = 2.0
+DEFAULT_MAX_QUEUE = 10_000
+DEFAULT_SPILL_PATH = os.path.join(Config.CACHE_DIR, "usage_spill.jsonl")
+
+WRITE_BEHIND_ENABLED = os.getenv("USAGE_WRITE_BEHIND", "on").lower() not in ("0", "off", "false", "no")
+
+
+def _default_client_factory():
+    from viraltracker.core.database import get_supabase_client
+    return get_supabase_client()
+
+
+class UsageWriteBuffer:
+    """
+    Batches token_usage rows and writes them from a background thread.
+
+    Thread-safe: enqueue() may be called from any thread. Writes never raise
+    into the caller; failures are logged and the rows spilled to disk.
+    """
+
+    def __init__(
+        self,
+        client_factory: Callable[[], Any] = _default_client_factory,
+        max_batch: int = DEFAULT_MAX_BATCH,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+        max_queue: int = DEFAULT_MAX_QUEUE,
+        spill_path: Optional[str] = DEFAULT_SPILL_PATH,
+        start_thread: bool = True,
+    ):
+        """
+        Initialize the buffer.
+
+        Args:
+            client_factory: Returns a Supabase client for the calling thread
+            max_batch: Flush as soon as this many rows are queued
+            flush_interval: Flush at least this often (seconds)
+            max_queue: Rows beyond this are spilled to disk instead of queued
+            spill_path: JSONL file for rows that could not be written (None = drop)
+            start_thread: Start the flush thread on first enqueue (False for tests)
+        """
+        self.client_factory = client_factory
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self.max_queue = max_queue
+        self.spill_path = spill_path
+        self._start_thread = start_thread
+
+        self._queue: Deque[Dict[str, Any]] = deque()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._spill_lock = threading.Lock()  # every append/rename of spill_path
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self._enqueued = 0
+        self._flushed = 0
+        self._spilled = 0
+        self._replayed = 0
+        self._failed_flushes = 0
+        self._max_depth = 0
+        self._flush_count = 0
+        self._last_flush_ms = 0.0
+        self._total_flush_ms = 0.0
+
+    # ------------------------------------------------------------------
+    # Producer side
+    # ------------------------------------------------------------------
+
+    def enqueue(self, row: Dict[str, Any]) -> None:
+        """Queue one token_usage row. Never blocks on the database.
+
+        The row is stamped with created_at now, so batching and spill replay
+        keep the time of the call rather than the time of the insert.
+        """
+        row = {**row, "created_at": row.get("created_at") or datetime.now(timezone.utc).isoformat()}
+        overflow = False
+        with self._lock:
+            if len(self._queue) >= self.max_queue:
+                overflow = True
+            else:
+                self._queue.append(row)
+                self._enqueued += 1
+                depth = len(self._queue)
+                self._max_depth = max(self._max_depth, depth)
+        if overflow:
+            logger.warning(f"Usage write buffer full ({self.max_queue} rows); spilling row to disk")
+            self._spill([row])
+            return
+
+        self._ensure_thread()
+        if depth >= self.max_batch:
+            self._wake.set()
+
+    def _ensure_thread(self) -> None:
+        if not self._start_thread or self._stop.is_set():
+            return
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="usage-write-buffer", daemon=True
+                )
+                self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+    # ------------------------------------------------------------------
+    # Flushing
+    # ------------------------------------------------------------------
+
+    def flush(self) -> int:
+        """
+        Write queued rows (and any spilled rows) to token_usage.
+
+        Returns:
+            Number of rows written to the database
+        """
+        with self._flush_lock:
+            written = 0
+            db_down = False
+            if self._has_spill():
+                replayed, complete = self._replay_spill()
+                written += replayed
+                # Replay stopped early: the DB is still unreachable, so don't
+                # spend another failed round trip per queued batch.
+                db_down = not complete
+
+            while True:
+                with self._lock:
+                    batch = [self._queue.popleft() for _ in range(min(self.max_batch, len(self._queue)))]
+                if not batch:
+                    break
+                if not db_down and self._insert(batch):
+                    written += len(batch)
+                    continue
+                db_down = True
+                self._spill(batch)
+            return written
+
+    def _insert(self, rows: List[Dict[str, Any]]) -> bool:
+        start = time.perf_counter()
+        try:
+            self.client_factory().table(TABLE).insert(rows).execute()
+        except Exception as e:
+            with self._lock:
+                self._failed_flushes += 1
+            logger.warning(f"Failed to flush {len(rows)} usage row(s): {e}")
+            return False
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        with self._lock:
+            self._flushed += len(rows)
+            self._flush_count += 1
+            self._last_flush_ms = elapsed_ms
+            self._total_flush_ms += elapsed_ms
+        logger.debug(f"Flushed {len(rows)} usage row(s) in {elapsed_ms:.0f}ms")
+        return True
+
+    # ------------------------------------------------------------------
+    # Spill file
+    # ------------------------------------------------------------------
+
+    @property
+    def _replay_path(self) -> str:
+        return self.spill_path + ".replay"
+
+    def _has_spill(self) -> bool:
+        return bool(self.spill_path) and (
+            os.path.exists(self.spill_path) or os.path.exists(self._replay_path)
+        )
+
+    def _spill(self, rows: List[Dict[str, Any]]) -> None:
+        if not self.spill_path:
+            logger.warning(f"Dropping {len(rows)} usage row(s): no spill path configured")
+            return
+        try:
+            directory = os.path.dirname(self.spill_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with self._spill_lock, open(self.spill_path, "a", encoding="utf-8") as f:
+                for row in rows:
+                    f.write(json.dumps(row, default=str) + "\n")
+        except OSError as e:
+            logger.error(f"Failed to spill {len(rows)} usage row(s) to {self.spill_path}: {e}")
+            return
+        with self._lock:
+            self._spilled += len(rows)
+
+    def _replay_spill(self) -> Tuple[int, bool]:
+        """
+        Insert spilled rows in batches; keep whatever could not be written.
+
+        The spill file is renamed to <spill_path>.replay before it is read,
+        so rows enqueue() spills while the inserts run go to a new spill
+        file instead of being lost when the leftovers are written back. A
+        .replay file left by an interrupted replay is finished first.
+
+        Returns:
+            (rows written, whether every pending row was written)
+        """
+        if not os.path.exists(self._replay_path):
+            try:
+                with self._spill_lock:
+                    os.replace(self.spill_path, self._replay_path)
+            except OSError as e:
+                logger.warning(f"Could not move usage spill file {self.spill_path} aside: {e}")
+                return 0, False
+        try:
+            with open(self._replay_path, "r", encoding="utf-8") as f:
+                rows = [json.loads(line) for line in f if line.strip()]
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Could not read usage spill file {self._replay_path}: {e}")
+            return 0, False
+
+        written = 0
+        for i in range(0, len(rows), self.max_batch):
+            batch = rows[i:i + self.max_batch]
+            if not self._insert(batch):
+                break
+            written += len(batch)
+
+        remaining = rows[written:]
+        try:
+            if remaining:
+                tmp_path = self._replay_path + ".tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    for row in remaining:
+                        f.write(json.dumps(row, default=str) + "\n")
+                os.replace(tmp_path, self._replay_path)
+            else:
+                os.remove(self._replay_path)
+        except OSError as e:
+            logger.warning(f"Could not rewrite usage spill file {self._replay_path}: {e}")
+
+        if written:
+            with self._lock:
+                self._replayed += written
+            logger.info(f"Replayed {written} spilled usage row(s) ({len(remaining)} still pending)")
+        return written, not remaining
+
+    # ------------------------------------------------------------------
+    # Lifecycle and metrics
+    # ------------------------------------------------------------------
+
+    def drain(self, timeout: float = 10.0) -> int:
+        """
+        Stop the flush thread and write out every queued row.
+
+        Rows still unwritten when the database is unreachable end up in the
+        spill file. Safe to call more than once.
+
+        Args:
+            timeout: Seconds to wait for an in-progress background flush
+
+        Returns:
+            Number of rows written by the final flush
+        """
+        self._stop.set()
+        self._wake.set()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout)
+        written = self.flush()
+        with self._lock:
+            leftover = list(self._queue)
+            self._queue.clear()
+        if leftover:
+            self._spill(leftover)
+        return written
+
+    def stats(self) -> Dict[str, float]:
+        """Queue depth, throughput and flush latency counters."""
+        with self._lock:
+            return {
+                "queue_depth": len(self._queue),
+                "max_queue_depth": self._max_depth,
+                "enqueued": self._enqueued,
+                "flushed": self._flushed,
+                "spilled": self._spilled,
+                "replayed": self._replayed,
+                "failed_flushes": self._failed_flushes,
+                "flushes": self._flush_count,
+                "last_flush_ms": round(self._last_flush_ms, 1),
+                "avg_flush_ms": round(self._total_flush_ms / self._flush_count, 1) if self._flush_count else 0.0,
+            }
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+
+_buffer: Optional[UsageWriteBuffer] = None
+_buffer_lock = threading.Lock()
+
+
+def get_usage_write_buffer() -> UsageWriteBuffer:
+    """Get or create the process-wide buffer (drained at interpreter exit)."""
+    global _buffer
+    if _buffer is None:
+        with _buffer_lock:
+            if _buffer is None:
+                spill_path = os.getenv("USAGE_SPILL_PATH")
+                _buffer = UsageWriteBuffer(
+                    spill_path=os.path.abspath(spill_path) if spill_path else DEFAULT_SPILL_PATH,
+                )
+                atexit.register(_buffer.drain)
+    return _buffer
+
+
+def flush_usage_write_buffer() -> int:
+    """Flush the process-wide buffer if one was created. Returns rows written.
+
+    For processes that may be killed before their atexit drain runs (the
+    scheduler's job pool processes flush after every job).
+    """
+    if _buffer is None:
+        return 0
+    try:
+        return _buffer.flush()
+    except Exception as e:
+        logger.warning(f"Usage write buffer flush failed (non-fatal): {e}")
+        return 0
+
+
+def drain_usage_write_buffer(timeout: float = 10.0) -> int:
+    """Drain the process-wide buffer if one was created. Returns rows written."""
+    if _buffer is None:
+        return 0
+    try:
+        written = _buffer.drain(timeout)
+        logger.info(f"Usage write buffer drained: {_buffer.stats()}")
+        return written
+    except Exception as e:
+        logger.warning(f"Usage write buffer drain failed (non-fatal): {e}")
+        return 0
@@ -0,0 +1,138 @@
+"""
+Process-wide TTL cache for the lookups every Streamlit page makes on rerun.
+
+Organizations, superuser flags, feature flags, brands and products are
+read at the top of most pages, so each widget interaction used to pay
+several Supabase round-trips before any real work. Streamlit runs every
+session in one server process, so one cache here serves all sessions.
+
+Entries expire after a TTL; the pages that edit the underlying rows call
+the invalidate_* helpers so changes show up immediately. Hit/miss counts
+per namespace are exposed via stats() (shown on Platform Settings).
+
+Deliberately free of Streamlit imports so it can be unit tested.
+"""
+
+import copy
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+LOOKUP_TTL_SECONDS = 120.0
+
+# Namespaces
+ORGANIZATIONS = "organizations"   # user_id -> memberships
+SUPERUSER = "superuser"           # user_id -> bool
+FEATURES = "features"             # (org_id, feature_key) -> bool
+BRANDS = "brands"                 # org_id (or "all") -> brand rows
+PRODUCTS = "products"             # brand_id -> product rows
+
+NAMESPACES = (ORGANIZATIONS, SUPERUSER, FEATURES, BRANDS, PRODUCTS)
+
+
+class LookupCache:
+    """
+    Namespaced TTL cache with hit/miss accounting.
+
+    Keys within a namespace are either a scope id (user, org, brand) or a
+    tuple whose first element is the scope id, so invalidate(namespace,
+    scope) drops every entry for that scope. Values are deep-copied on the
+    way out so callers cannot mutate the shared copy. Thread-safe.
+    """
+
+    def __init__(self, ttl_seconds: float = LOOKUP_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        # (namespace, key) -> (value, stored_at (monotonic))
+        self._entries: Dict[Tuple[str, Hashable], Tuple[Any, float]] = {}
+        self._hits: Dict[str, int] = {ns: 0 for ns in NAMESPACES}
+        self._misses: Dict[str, int] = {ns: 0 for ns in NAMESPACES}
+
+    def get(self, namespace: str, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """Return the cached value, loading it via loader when missing or stale."""
+        with self._lock:
+            entry = self._entries.get((namespace, key))
+            if entry is not None and time.monotonic() - entry[1] < self.ttl_seconds:
+                self._hits[namespace] = self._hits.get(namespace, 0) + 1
+                return copy.deepcopy(entry[0])
+            self._misses[namespace] = self._misses.get(namespace, 0) + 1
+
+        value = loader()
+        with self._lock:
+            self._entries[(namespace, key)] = (value, time.monotonic())
+        return copy.deepcopy(value)
+
+    def invalidate(self, namespace: Optional[str] = None, scope: Optional[Hashable] = None) -> None:
+        """Drop entries: everything, one namespace, or one scope within it."""
+        with self._lock:
+            if namespace is None:
+                self._entries.clear()
+                return
+            for ns, key in list(self._entries):
+                if ns != namespace:
+                    continue
+                key_scope = key[0] if isinstance(key, tuple) else key
+                if scope is None or key_scope == scope:
+                    del self._entries[(ns, key)]
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Per-namespace hits, misses, hit rate and live entry count."""
+        with self._lock:
+            sizes: Dict[str, int] = {}
+            for ns, _ in self._entries:
+                sizes[ns] = sizes.get(ns, 0) + 1
+            result = {}
+            for ns in sorted(set(self._hits) | set(self._misses)):
+                hits = self._hits.get(ns, 0)
+                misses = self._misses.get(ns, 0)
+                total = hits + misses
+                result[ns] = {
+                    "hits": hits,
+                    "misses": misses,
+                    "hit_rate": (hits / total) if total else 0.0,
+                    "entries": sizes.get(ns, 0),
+                }
+            return result
+
+    def reset_stats(self) -> None:
+        """Zero the hit/miss counters."""
+        with self._lock:
+            self._hits = {ns: 0 for ns in NAMESPACES}
+            self._misses = {ns: 0 for ns in NAMESPACES}
+
+
+_lookup_cache = LookupCache()
+
+
+def get_lookup_cache() -> LookupCache:
+    """Get the process-wide UI lookup cache."""
+    return _lookup_cache
+
+
+def invalidate_organizations(user_id: Optional[str] = None) -> None:
+    """Forget cached memberships (one user, or all) after org/member edits."""
+    _lookup_cache.invalidate(ORGANIZATIONS, user_id)
+
+
+def invalidate_superuser(user_id: Optional[str] = None) -> None:
+    """Forget cached superuser flags (one user, or all)."""
+    _lookup_cache.invalidate(SUPERUSER, user_id)
+
+
+def invalidate_features(organization_id: Optional[str] = None) -> None:
+    """Forget cached feature flags (one org, or all) after feature edits."""
+    _lookup_cache.invalidate(FEATURES, organization_id)
+
+
+def invalidate_brands() -> None:
+    """Forget cached brand lists after a brand is created, renamed or moved.
+
+    Brand lists are keyed by organization (and "all" for superusers), so
+    every list is dropped.
+    """
+    _lookup_cache.invalidate(BRANDS)
+
+
+def invalidate_products(brand_id: Optional[str] = None) -> None:
+    """Forget cached product lists (one brand, or all) after product edits."""
+    _lookup_cache.invalidate(PRODUCTS, brand_id)
@@ -31,6 +31,7 @@ st.set_page_config(
 # initialized yet after cross-domain redirect from facebook.com)
 # =============================================================================
 from viraltracker.ui.auth import require_auth
+from viraltracker.ui.lookup_cache import invalidate_products
 
 if "code" in st.query_params and "state" in st.query_params:
     try:
@@ -461,6 +462,8 @@ def save_product_details(product_id: str, updates: dict) -> bool:
     try:
         db = get_supabase_client()
         db.table("products").update(updates).eq("id", product_id).execute()
+        # Name may have changed; product selectors read the cached list
+        invalidate_products()
         return True
     except Exception as e:
         st.error(f"Failed to save product details: {e}")
@@ -2446,6 +2449,7 @@ with st.expander("➕ Add Product", expanded=False):
                     description=new_description.strip() or None,
                 )
                 if created and created.get("id"):
+                    invalidate_products(selected_brand_id)
                     extras: dict = {}
                     if new_product_url.strip():
                         extras["product_url"] = new_product_url.strip()
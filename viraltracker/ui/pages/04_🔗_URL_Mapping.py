@@ -22,6 +22,7 @@ st.set_page_config(
 
 # Authentication
 from viraltracker.ui.auth import require_auth
+from viraltracker.ui.lookup_cache import invalidate_products
 require_auth()
 
 # Initialize session state
@@ -477,6 +478,7 @@ else:
                                     brand_id=brand_id,
                                     name=new_product_name
                                 )
+                                invalidate_products(brand_id)
                                 service.assign_url_to_product(
                                     queue_id=url_record['id'],
                                     product_id=new_product['id'],
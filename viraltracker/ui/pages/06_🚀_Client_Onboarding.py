@@ -36,6 +36,11 @@ st.set_page_config(
 # initialized yet after cross-domain redirect from facebook.com)
 # =============================================================================
 from viraltracker.ui.auth import require_auth
+from viraltracker.ui.lookup_cache import (
+    invalidate_brands,
+    invalidate_organizations,
+    invalidate_products,
+)
 
 if "code" in st.query_params and "state" in st.query_params:
     try:
@@ -292,6 +297,9 @@ def _render_meta_oauth_connect(session: dict, data: dict, service) -> None:
                     user_id=current_user,
                 )
                 if new_brand_id:
+                    # New brand (and possibly a new org) — drop cached lookups
+                    invalidate_brands()
+                    invalidate_organizations()
                     st.success("Brand created — refreshing.")
                     st.rerun()
                 else:
@@ -926,6 +934,9 @@ def render_sidebar(session: dict):
                     organization_id=org_id,
                     user_id=_get_uid(),
                 )
+                invalidate_brands()
+                invalidate_products()
+                invalidate_organizations()
                 st.sidebar.success(f"Imported! Brand ID: {result.get('brand_id')}")
                 st.rerun()
             except Exception as e:
@@ -1239,6 +1250,8 @@ def render_brand_basics_tab(session: dict):
             )
             if brand_id_eager:
                 service.update_brand_from_session(UUID(session["id"]))
+                invalidate_brands()
+                invalidate_organizations()
                 st.success("Saved! Brand record ready for Facebook OAuth.")
             else:
                 st.warning("Saved, but brand row was not created (missing brand name?)")
@@ -737,12 +737,12 @@ async def sync_ads_from_meta(
         return 0
 
     # Save to database
-    count = await service.sync_performance_to_db(
+    result = await service.sync_performance_to_db(
         insights=insights,
         brand_id=UUID(brand_id)
     )
 
-    return count
+    return result.saved
 
 def analyze_ad_creative(
     creative_file: Optional[Any] = None,
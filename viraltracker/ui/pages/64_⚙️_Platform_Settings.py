@@ -867,6 +867,46 @@ if new_webhook != (current_webhook or ""):
             st.rerun()
 
 
+# ============================================================================
+# UI Lookup Cache
+# ============================================================================
+st.markdown("---")
+st.subheader("⚡ UI Lookup Cache")
+st.caption(
+    "Organization, superuser, feature, brand and product lookups made at the top of "
+    "every page are cached for all sessions in this server process."
+)
+
+from viraltracker.ui.lookup_cache import get_lookup_cache
+
+_lookup_cache = get_lookup_cache()
+_lookup_stats = _lookup_cache.stats()
+st.dataframe(
+    [
+        {
+            "Lookup": ns,
+            "Hits": s["hits"],
+            "Misses": s["misses"],
+            "Hit rate": f"{s['hit_rate']:.0%}",
+            "Cached entries": s["entries"],
+        }
+        for ns, s in _lookup_stats.items()
+    ],
+    hide_index=True,
+    use_container_width=True,
+)
+st.caption(f"TTL: {_lookup_cache.ttl_seconds:.0f}s")
+col_clear, col_reset = st.columns(2)
+with col_clear:
+    if st.button("Clear Cache", key="lookup_cache_clear"):
+        _lookup_cache.invalidate()
+        st.rerun()
+with col_reset:
+    if st.button("Reset Counters", key="lookup_cache_reset"):
+        _lookup_cache.reset_stats()
+        st.rerun()
+
+
 # Display current configuration summary
 st.markdown("---")
 st.subheader("Current LLM Configuration Snapshot")
@@ -15,6 +15,7 @@ from viraltracker.ui.utils import (
     get_current_organization_id,
     is_superuser,
 )
+from viraltracker.ui.lookup_cache import invalidate_features, invalidate_organizations
 import pandas as pd
 
 
@@ -151,6 +152,8 @@ with tab_orgs:
                             get_supabase_client().table("organizations").update(
                                 updates
                             ).eq("id", edit_org["id"]).execute()
+                            # Memberships embed the org name
+                            invalidate_organizations()
                             st.success(f"Updated {new_name}.")
                             st.rerun()
                         else:
@@ -169,6 +172,7 @@ with tab_orgs:
             if submitted and new_org_name and new_org_owner:
                 try:
                     org = org_service.create_organization(new_org_name, new_org_owner)
+                    invalidate_organizations(new_org_owner)
                     st.success(f"Created organization: {org['name']}")
                     st.rerun()
                 except Exception as e:
@@ -297,6 +301,7 @@ with tab_users:
                     else:
                         try:
                             org_service.update_member_role(tab_org, selected_member["user_id"], new_role)
+                            invalidate_organizations(selected_member["user_id"])
                             st.success(f"Role updated to {new_role}.")
                             st.rerun()
                         except Exception as e:
@@ -316,6 +321,7 @@ with tab_users:
             ):
                 try:
                     org_service.remove_member(tab_org, selected_member["user_id"])
+                    invalidate_organizations(selected_member["user_id"])
                     st.success("Member removed.")
                     st.rerun()
                 except Exception as e:
@@ -334,6 +340,7 @@ with tab_users:
         if add_submitted and new_user_id:
             try:
                 org_service.add_member(tab_org, new_user_id, new_role)
+                invalidate_organizations(new_user_id)
                 st.success(f"Added user as {new_role}.")
                 st.rerun()
             except Exception as e:
@@ -469,6 +476,7 @@ with tab_features:
     with col_enable:
         if st.button("Enable All", key="admin_enable_all_features"):
             feature_service.enable_all_features(tab_org)
+            invalidate_features(tab_org)
             try:
                 from viraltracker.ui.nav import _get_org_features_cached
                 _get_org_features_cached.clear()
@@ -480,6 +488,7 @@ with tab_features:
         if st.button("Disable All", key="admin_disable_all_features"):
             for fk in all_feature_keys:
                 feature_service.disable_feature(tab_org, fk)
+            invalidate_features(tab_org)
             try:
                 from viraltracker.ui.nav import _get_org_features_cached
                 _get_org_features_cached.clear()
@@ -536,6 +545,7 @@ with tab_features:
         if st.button("Save Feature Changes", type="primary", key="admin_save_features"):
             for fk, enabled in all_changes.items():
                 feature_service.set_feature(tab_org, fk, enabled)
+            invalidate_features(tab_org)
             # Clear nav cache so sidebar updates immediately
             try:
                 from viraltracker.ui.nav import _get_org_features_cached
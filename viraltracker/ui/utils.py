@@ -2,7 +2,9 @@
 
 import logging
 import streamlit as st
-from typing import Optional, Tuple
+from typing import List, Optional, Tuple
+
+from viraltracker.ui import lookup_cache
 
 logger = logging.getLogger(__name__)
 
@@ -119,7 +121,8 @@ def is_superuser(user_id: str) -> bool:
     """
     Check if user is a superuser.
 
-    Superusers can see data from all organizations.
+    Superusers can see data from all organizations. Cached process-wide
+    (see lookup_cache); failed lookups are not cached.
 
     Args:
         user_id: User ID to check
@@ -129,15 +132,38 @@ def is_superuser(user_id: str) -> bool:
     """
     from viraltracker.core.database import get_supabase_client
 
-    try:
+    def load() -> bool:
         result = get_supabase_client().table("user_profiles").select(
             "is_superuser"
         ).eq("user_id", user_id).single().execute()
         return result.data.get("is_superuser", False) if result.data else False
+
+    try:
+        return lookup_cache.get_lookup_cache().get(lookup_cache.SUPERUSER, user_id, load)
     except Exception:
         return False
 
 
+def get_user_organizations(user_id: str) -> List[dict]:
+    """
+    Get a user's organization memberships (cached process-wide).
+
+    Args:
+        user_id: User ID
+
+    Returns:
+        List of membership dicts from OrganizationService.get_user_organizations
+    """
+    from viraltracker.services.organization_service import OrganizationService
+    from viraltracker.core.database import get_supabase_client
+
+    return lookup_cache.get_lookup_cache().get(
+        lookup_cache.ORGANIZATIONS,
+        user_id,
+        lambda: OrganizationService(get_supabase_client()).get_user_organizations(user_id),
+    )
+
+
 def _on_workspace_change() -> None:
     """
     Callback fired by the workspace selectbox *before* the page reruns.
@@ -188,15 +214,12 @@ def render_organization_selector() -> Optional[str]:
         Selected organization ID, "all" for superuser mode, or None
     """
     from viraltracker.ui.auth import get_current_user_id
-    from viraltracker.services.organization_service import OrganizationService
-    from viraltracker.core.database import get_supabase_client
 
     user_id = get_current_user_id()
     if not user_id:
         return None
 
-    service = OrganizationService(get_supabase_client())
-    orgs = service.get_user_organizations(user_id)
+    orgs = get_user_organizations(user_id)
 
     if not orgs:
         st.sidebar.warning("No organizations found")
@@ -251,6 +274,10 @@ def has_feature(feature_key: str, organization_id: Optional[str] = None) -> bool
     """
     Check if current organization has a feature enabled.
 
+    Results are cached process-wide (see lookup_cache) and invalidated when
+    features are edited on the Admin page. An unconfigured feature is cached
+    as disabled; failed lookups return False and are not cached.
+
     Args:
         feature_key: Feature to check (use FeatureKey constants)
         organization_id: Org ID to check, or None to use current session org
@@ -258,7 +285,6 @@ def has_feature(feature_key: str, organization_id: Optional[str] = None) -> bool
     Returns:
         True if feature is enabled
     """
-    from viraltracker.services.feature_service import FeatureService
     from viraltracker.core.database import get_supabase_client
 
     if organization_id is None:
@@ -267,8 +293,25 @@ def has_feature(feature_key: str, organization_id: Optional[str] = None) -> bool
     if not organization_id:
         return False
 
-    service = FeatureService(get_supabase_client())
-    return service.has_feature(organization_id, feature_key)
+    # Superuser mode - all features enabled, nothing to look up
+    if organization_id == "all":
+        return True
+
+    # Queried here rather than via FeatureService.has_feature, which turns
+    # DB errors into False and would cache them as "disabled".
+    def load() -> bool:
+        result = get_supabase_client().table("org_features").select("enabled").eq(
+            "organization_id", organization_id
+        ).eq("feature_key", feature_key).limit(1).execute()
+        return bool(result.data and result.data[0].get("enabled", False))
+
+    try:
+        return lookup_cache.get_lookup_cache().get(
+            lookup_cache.FEATURES, (organization_id, feature_key), load
+        )
+    except Exception as e:
+        logger.warning(f"Feature lookup failed for {feature_key} (org {organization_id}): {e}")
+        return False
 
 
 def _auto_init_organization() -> Optional[str]:
@@ -283,16 +326,13 @@ def _auto_init_organization() -> Optional[str]:
         Organization ID if resolved, None if unable to determine
     """
     from viraltracker.ui.auth import get_current_user_id
-    from viraltracker.services.organization_service import OrganizationService
-    from viraltracker.core.database import get_supabase_client
 
     user_id = get_current_user_id()
     if not user_id:
         return None
 
     try:
-        service = OrganizationService(get_supabase_client())
-        orgs = service.get_user_organizations(user_id)
+        orgs = get_user_organizations(user_id)
 
         if not orgs:
             return None
@@ -382,6 +422,9 @@ def get_brands(organization_id: Optional[str] = None):
     """
     Fetch brands from database, filtered by organization.
 
+    Cached process-wide (see lookup_cache); Brand Manager and client
+    onboarding invalidate the cache when brands change.
+
     Args:
         organization_id: Organization ID to filter by.
             - If None, uses current org from session state
@@ -397,25 +440,34 @@ def get_brands(organization_id: Optional[str] = None):
     if organization_id is None:
         organization_id = get_current_organization_id()
 
-    db = get_supabase_client()
-    query = db.table("brands").select("id, name, organization_id")
+    def load():
+        db = get_supabase_client()
+        query = db.table("brands").select("id, name, organization_id")
+
+        # Filter by org unless "all" (superuser mode)
+        if organization_id and organization_id != "all":
+            query = query.eq("organization_id", organization_id)
 
-    # Filter by org unless "all" (superuser mode)
-    if organization_id and organization_id != "all":
-        query = query.eq("organization_id", organization_id)
+        result = query.order("name").execute()
+        return result.data or []
 
-    result = query.order("name").execute()
-    return result.data or []
+    return lookup_cache.get_lookup_cache().get(
+        lookup_cache.BRANDS, organization_id or "all", load
+    )
 
 
 def get_products_for_brand(brand_id: str):
-    """Fetch products for a brand."""
+    """Fetch products for a brand (cached process-wide, see lookup_cache)."""
     from viraltracker.core.database import get_supabase_client
-    db = get_supabase_client()
-    result = db.table("products").select("id, name").eq(
-        "brand_id", brand_id
-    ).order("name").execute()
-    return result.data or []
+
+    def load():
+        db = get_supabase_client()
+        result = db.table("products").select("id, name").eq(
+            "brand_id", brand_id
+        ).order("name").execute()
+        return result.data or []
+
+    return lookup_cache.get_lookup_cache().get(lookup_cache.PRODUCTS, brand_id, load)
 
 
 def render_brand_selector(
@@ -22,14 +22,23 @@ Two-table model (do NOT conflate):
 from __future__ import annotations
 
 import asyncio
+import collections
+import importlib
 import logging
+import multiprocessing
 import os
+import pickle
 import random
 import secrets
+import signal
 import threading
 import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from dataclasses import dataclass, field
-from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Set, Tuple, Union
 
 logger = logging.getLogger(__name__)
 
@@ -44,10 +53,48 @@ logger = logging.getLogger(__name__)
 DEFAULT_POOL_SIZE = int(os.environ.get("SCHEDULER_POOL_SIZE", "2"))
 
 # How long the no-work / cap-hit backoff is. Lower = lower latency, higher
-# DB load when the queue is empty. 2s is a sane idle cadence.
+# DB load when the queue is empty. 2s is a sane idle cadence. This is the
+# idle poll when NO notification source is connected (see JobWakeup).
 IDLE_BACKOFF_SECONDS = 2.0
 CAP_HIT_BACKOFF_SECONDS = 0.5
 
+# Idle poll while the Postgres LISTEN connection is up. Notifications and
+# the next_run_at timer do the real waking; this is only a safety net for
+# a missed NOTIFY. ~2 claim RPCs/min per idle slot instead of ~30.
+IDLE_SAFETY_POLL_SECONDS = 30.0
+
+# LISTEN/NOTIFY wakeups. The channel is fed by the triggers in
+# migrations/2026-06-13_scheduler_wakeup_notify.sql. The listener needs a
+# direct Postgres DSN (the Supabase REST client cannot LISTEN) and psycopg;
+# without either, workers fall back to in-process wakeups + 2s polling.
+WAKEUP_CHANNEL = "scheduler_wakeup"
+NOTIFY_DSN = os.environ.get("SCHEDULER_NOTIFY_DSN", "")
+LISTEN_TIMEOUT_SECONDS = 5.0
+LISTEN_RECONNECT_SECONDS = 5.0
+
+# Handler execution policies (see register_job_handler). "thread" runs the
+# handler in its own thread of the worker process; "process" sends it to the
+# pre-warmed subprocess pool so CPU-bound handlers don't share one GIL.
+EXECUTION_THREAD = "thread"
+EXECUTION_PROCESS = "process"
+EXECUTION_POLICIES = (EXECUTION_THREAD, EXECUTION_PROCESS)
+
+# Subprocess pool size. 0 disables the pool: every job runs in a thread.
+PROCESS_POOL_SIZE = int(os.environ.get("SCHEDULER_PROCESS_POOL_SIZE", "2"))
+# Recycle each pool process after this many jobs to bound leaked memory.
+PROCESS_TASKS_PER_CHILD = 20
+# shutdown(kill=True) gives pool processes this long to exit on their own
+# (idle ones get the exit sentinel and run their atexit drain) before SIGKILL.
+PROCESS_EXIT_GRACE_SECONDS = 2.0
+# Module whose import registers every handler; pool processes import it once
+# at start-up (pre-warm) so jobs don't pay the import cost.
+HANDLER_MODULE = "viraltracker.worker.scheduler_worker"
+
+# Rolling window for the RPC-per-minute metric, and how many recent claim
+# latencies the percentiles are computed over.
+METRICS_WINDOW_SECONDS = 60.0
+CLAIM_LATENCY_SAMPLES = 500
+
 # Recovery cadence + jitter. Jitter prevents multiple containers from firing
 # recovery at the same instant after a deploy.
 RECOVERY_INTERVAL_SECONDS = 60.0
@@ -118,18 +165,34 @@ def boot_id() -> str:
 # the dict is read but execute_job_sync is never called.
 
 JOB_HANDLERS: Dict[str, Callable[..., Any]] = {}
+# job_type -> EXECUTION_THREAD / EXECUTION_PROCESS
+JOB_EXECUTION: Dict[str, str] = {}
 
 
-def register_job_handler(job_type: str):
+def register_job_handler(job_type: str, *, execution: str = EXECUTION_THREAD):
     """Decorator that registers a handler for a job_type.
 
     Usage:
         @register_job_handler('meta_sync')
         async def execute_meta_sync_job(job: Dict) -> Dict: ...
 
+        @register_job_handler('scorecard', execution=EXECUTION_PROCESS)
+        async def execute_scorecard_job(job: Dict) -> Dict: ...
+
+    execution picks where the handler runs: EXECUTION_THREAD (default, own
+    thread + event loop in the worker process) or EXECUTION_PROCESS (the
+    subprocess pool; for CPU-bound handlers — the job dict and result must
+    be picklable).
+
     Raises RuntimeError at import time if two handlers register the same
     job_type. That's exactly the bug class the registry is meant to catch.
     """
+    if execution not in EXECUTION_POLICIES:
+        raise ValueError(
+            f"Unknown execution policy {execution!r} for job_type={job_type!r}; "
+            f"expected one of {EXECUTION_POLICIES}"
+        )
+
     def deco(fn: Callable[..., Any]) -> Callable[..., Any]:
         existing = JOB_HANDLERS.get(job_type)
         if existing is not None and existing is not fn:
@@ -139,10 +202,16 @@ def register_job_handler(job_type: str):
                 f"new={fn.__module__}.{fn.__qualname__}"
             )
         JOB_HANDLERS[job_type] = fn
+        JOB_EXECUTION[job_type] = execution
         return fn
     return deco
 
 
+def execution_policy(job_type: str) -> str:
+    """Registered execution policy for job_type (thread if unregistered)."""
+    return JOB_EXECUTION.get(job_type, EXECUTION_THREAD)
+
+
 def dispatch_job(job_type: str) -> Callable[..., Any]:
     """Look up a handler by job_type. Raises a clear KeyError if missing.
 
@@ -231,6 +300,396 @@ class _CapCache:
 _CAP_CACHE = _CapCache()
 
 
+# ============================================================================
+# Scheduler metrics
+# ============================================================================
+#
+# Claim latency (wakeup signal -> successful claim) and DB calls per minute,
+# process-wide. Written from the event loop and the listener thread, so it
+# uses a threading.Lock. run_scheduler logs a snapshot periodically.
+
+class SchedulerMetrics:
+    """Rolling claim-latency and RPC-rate counters for the worker pool."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: Dict[str, Deque[float]] = collections.defaultdict(collections.deque)
+        self._claim_latencies: Deque[float] = collections.deque(maxlen=CLAIM_LATENCY_SAMPLES)
+        self._rpc_seconds: Deque[float] = collections.deque(maxlen=CLAIM_LATENCY_SAMPLES)
+        self._wakeups: Dict[str, int] = collections.Counter()
+        self.claims = 0
+        self.empty_claims = 0
+
+    def _trim(self, now: float) -> None:
+        cutoff = now - METRICS_WINDOW_SECONDS
+        for stamps in self._calls.values():
+            while stamps and stamps[0] < cutoff:
+                stamps.popleft()
+
+    def record_call(self, kind: str, seconds: Optional[float] = None) -> None:
+        """Count one DB call (e.g. 'claim_next_job', 'next_due')."""
+        now = time.monotonic()
+        with self._lock:
+            self._calls[kind].append(now)
+            self._trim(now)
+            if kind == "claim_next_job" and seconds is not None:
+                self._rpc_seconds.append(seconds)
+
+    def record_claim(self, claimed: bool, latency: Optional[float] = None) -> None:
+        """Count a claim attempt; latency is wakeup -> claim when known."""
+        with self._lock:
+            if claimed:
+                self.claims += 1
+                if latency is not None:
+                    self._claim_latencies.append(max(latency, 0.0))
+            else:
+                self.empty_claims += 1
+
+    def record_wakeup(self, source: str) -> None:
+        """Count why an idle worker woke: 'notify', 'due' or 'poll'."""
+        with self._lock:
+            self._wakeups[source] += 1
+
+    @staticmethod
+    def _percentiles(values: List[float]) -> Dict[str, Optional[float]]:
+        if not values:
+            return {"p50": None, "p95": None, "max": None}
+        ordered = sorted(values)
+        pick = lambda q: ordered[min(len(ordered) - 1, int(q * len(ordered)))]  # noqa: E731
+        return {"p50": pick(0.5), "p95": pick(0.95), "max": ordered[-1]}
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Point-in-time metrics dict (safe to log or serve as JSON)."""
+        now = time.monotonic()
+        with self._lock:
+            self._trim(now)
+            calls_per_minute = {kind: len(stamps) for kind, stamps in self._calls.items()}
+            return {
+                "rpc_per_minute": sum(calls_per_minute.values()),
+                "calls_per_minute": calls_per_minute,
+                "claims": self.claims,
+                "empty_claims": self.empty_claims,
+                "claim_latency_seconds": self._percentiles(list(self._claim_latencies)),
+                "claim_rpc_seconds": self._percentiles(list(self._rpc_seconds)),
+                "wakeups": dict(self._wakeups),
+            }
+
+    def reset(self) -> None:
+        """Zero every counter."""
+        with self._lock:
+            self._calls.clear()
+            self._claim_latencies.clear()
+            self._rpc_seconds.clear()
+            self._wakeups.clear()
+            self.claims = 0
+            self.empty_claims = 0
+
+
+_METRICS = SchedulerMetrics()
+
+
+def get_scheduler_metrics() -> SchedulerMetrics:
+    """Process-wide scheduler metrics."""
+    return _METRICS
+
+
+# ============================================================================
+# Job wakeups (LISTEN/NOTIFY, with an in-process stand-in)
+# ============================================================================
+#
+# Idle workers block on a JobWakeup instead of polling claim_next_job every
+# 2s. A wakeup is signalled when a scheduled_job_runs row may have become
+# claimable (job enqueued/re-armed with next_run_at <= now, or a running
+# run finished and freed a cap slot). Future next_run_at values are kept as
+# a due timer so workers wake exactly when the earliest job comes due.
+#
+# JobWakeup itself is the in-process implementation: notify() from any
+# thread (e.g. a handler that chains a follow-up job). PgNotifyJobWakeup adds
+# a LISTEN thread fed by Postgres triggers, so enqueues from other processes
+# (UI "run now", other containers) wake this pool too.
+#
+# Lost-wakeup guard: workers read `generation` BEFORE claiming and pass it to
+# wait(); a notify that lands between the empty claim and the wait bumps the
+# generation, so wait() returns immediately.
+
+def _as_epoch(value: Union[None, float, str, datetime]) -> Optional[float]:
+    """Coerce a next_run_at (epoch, ISO string or datetime) to epoch seconds."""
+    if value is None or value == "":
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        if isinstance(value, str):
+            try:
+                return float(value)
+            except ValueError:
+                value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        if value.tzinfo is None:
+            return value.astimezone().timestamp()
+        return value.timestamp()
+    except (ValueError, TypeError, AttributeError):
+        return None
+
+
+class JobWakeup:
+    """In-process wakeup source for idle workers (no DB connection).
+
+    Without a notification feed from Postgres, other processes' enqueues are
+    only seen by polling, so the idle poll stays at IDLE_BACKOFF_SECONDS.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._last_signal: Optional[float] = None
+        self._waiters: Set[Tuple[asyncio.AbstractEventLoop, asyncio.Event]] = set()
+        # Earliest known future next_run_at (epoch) and when it was fetched.
+        self._next_due: Optional[float] = None
+        self._next_due_fetched: Optional[float] = None
+
+    # ---- configuration ----------------------------------------------------
+
+    @property
+    def connected(self) -> bool:
+        """True while an external notification feed is live."""
+        return False
+
+    @property
+    def safety_poll_seconds(self) -> float:
+        """Idle poll interval; slow only while notifications are flowing."""
+        return IDLE_SAFETY_POLL_SECONDS if self.connected else IDLE_BACKOFF_SECONDS
+
+    def start(self) -> None:
+        """Start background listening (no-op in process)."""
+
+    def stop(self) -> None:
+        """Stop background listening (no-op in process)."""
+
+    # ---- signalling -------------------------------------------------------
+
+    @property
+    def generation(self) -> int:
+        """Counter bumped by every wake signal."""
+        with self._lock:
+            return self._generation
+
+    @property
+    def last_signal_at(self) -> Optional[float]:
+        """time.monotonic() of the latest wake signal."""
+        with self._lock:
+            return self._last_signal
+
+    def notify(self, next_run_at: Union[None, float, str, datetime] = None) -> None:
+        """Signal that a job may be claimable. Thread-safe.
+
+        Args:
+            next_run_at: When the job comes due. A future time arms the due
+                timer instead of waking workers now; None or a past time
+                wakes them immediately.
+        """
+        due = _as_epoch(next_run_at)
+        if due is not None and due > time.time():
+            with self._lock:
+                if self._next_due is None or self._next_due <= time.time() or due < self._next_due:
+                    self._next_due = due
+            return
+
+        with self._lock:
+            self._generation += 1
+            self._last_signal = time.monotonic()
+            waiters = list(self._waiters)
+        for loop, event in waiters:
+            try:
+                loop.call_soon_threadsafe(event.set)
+            except RuntimeError:
+                # Waiter's loop already closed (shutdown) — nothing to wake.
+                pass
+
+    # ---- due timer --------------------------------------------------------
+
+    async def seconds_until_due(self, db: Any) -> Optional[float]:
+        """Seconds until the earliest known future next_run_at, or None.
+
+        While connected, the earliest future next_run_at is re-read from
+        scheduled_jobs at most once per safety poll (shared by all slots);
+        NOTIFY payloads keep it current in between.
+        """
+        now = time.time()
+        with self._lock:
+            due = self._next_due
+            fetched = self._next_due_fetched
+        stale = (
+            fetched is None
+            or time.monotonic() - fetched >= IDLE_SAFETY_POLL_SECONDS
+            or (due is not None and due <= now)
+        )
+        if self.connected and stale:
+            fetched_due = await self._fetch_next_due(db)
+            with self._lock:
+                self._next_due_fetched = time.monotonic()
+                if fetched_due is not None and (
+                    self._next_due is None or self._next_due <= now or fetched_due < self._next_due
+                ):
+                    self._next_due = fetched_due
+                elif fetched_due is None and self._next_due is not None and self._next_due <= now:
+                    self._next_due = None
+                due = self._next_due
+        if due is None or due <= now:
+            return None
+        return due - now
+
+    async def _fetch_next_due(self, db: Any) -> Optional[float]:
+        """Earliest future next_run_at of an active job (epoch), or None."""
+        loop = asyncio.get_running_loop()
+        t0 = time.monotonic()
+        try:
+            result = await loop.run_in_executor(
+                None,
+                lambda: db.table("scheduled_jobs").select("next_run_at")
+                .eq("status", "active")
+                .gt("next_run_at", datetime.now().astimezone().isoformat())
+                .order("next_run_at")
+                .limit(1)
+                .execute(),
+            )
+            rows = list(getattr(result, "data", None) or [])
+            return _as_epoch(rows[0].get("next_run_at")) if rows else None
+        except Exception as e:
+            logger.warning(f"next_run_at lookup failed: {e}")
+            return None
+        finally:
+            _METRICS.record_call("next_due", time.monotonic() - t0)
+
+    # ---- waiting ----------------------------------------------------------
+
+    async def wait(self, seen_generation: int, timeout: float) -> bool:
+        """Block until notified, timeout, or shutdown.
+
+        Args:
+            seen_generation: `generation` read before the empty claim.
+            timeout: Max seconds to wait.
+
+        Returns:
+            True if woken by a notification (including one that arrived
+            after seen_generation was read), False otherwise.
+        """
+        loop = asyncio.get_running_loop()
+        event = asyncio.Event()
+        waiter = (loop, event)
+        with self._lock:
+            if self._generation != seen_generation:
+                return True
+            self._waiters.add(waiter)
+        # Looked up dynamically: tests rebind the module-level Event.
+        stop = asyncio.ensure_future(shutdown_requested.wait())
+        woken = asyncio.ensure_future(event.wait())
+        try:
+            await asyncio.wait({stop, woken}, timeout=max(timeout, 0.0),
+                               return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            with self._lock:
+                self._waiters.discard(waiter)
+            for task in (stop, woken):
+                if not task.done():
+                    task.cancel()
+        return event.is_set()
+
+
+class PgNotifyJobWakeup(JobWakeup):
+    """JobWakeup fed by Postgres LISTEN on WAKEUP_CHANNEL.
+
+    A daemon thread holds one psycopg connection per process and turns each
+    NOTIFY into notify(payload); the payload is the job's next_run_at as
+    epoch seconds, or empty for "a running run finished". On disconnect the
+    pool drops back to 2s polling until the listener reconnects.
+    """
+
+    def __init__(self, dsn: str, channel: str = WAKEUP_CHANNEL) -> None:
+        super().__init__()
+        self.dsn = dsn
+        self.channel = channel
+        self._connected = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def connected(self) -> bool:
+        return self._connected.is_set()
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._listen_forever, name="scheduler-listen", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _listen_forever(self) -> None:
+        import psycopg
+
+        while not self._stop.is_set():
+            try:
+                with psycopg.connect(self.dsn, autocommit=True) as conn:
+                    conn.execute(f"LISTEN {self.channel}")
+                    self._connected.set()
+                    logger.info(f"scheduler wakeups: listening on {self.channel}")
+                    # Anything enqueued while we were disconnected.
+                    self.notify()
+                    while not self._stop.is_set():
+                        for note in conn.notifies(timeout=LISTEN_TIMEOUT_SECONDS):
+                            self.notify(note.payload or None)
+            except Exception as e:
+                logger.warning(f"scheduler wakeups: LISTEN connection lost: {e}")
+            finally:
+                self._connected.clear()
+            self._stop.wait(LISTEN_RECONNECT_SECONDS)
+
+
+_JOB_WAKEUP: JobWakeup = JobWakeup()
+
+
+def get_job_wakeup() -> JobWakeup:
+    """The process-wide wakeup source used by worker_loop."""
+    return _JOB_WAKEUP
+
+
+def start_job_wakeup(dsn: Optional[str] = None) -> JobWakeup:
+    """Install and start the wakeup source for this process.
+
+    Uses PgNotifyJobWakeup when a DSN (arg or SCHEDULER_NOTIFY_DSN) is set
+    and psycopg is installed; otherwise keeps the in-process JobWakeup.
+    """
+    global _JOB_WAKEUP
+    dsn = dsn if dsn is not None else NOTIFY_DSN
+    if dsn:
+        try:
+            import psycopg  # noqa: F401
+        except ImportError:
+            logger.warning(
+                "SCHEDULER_NOTIFY_DSN is set but psycopg is not installed; "
+                "falling back to in-process wakeups + polling."
+            )
+        else:
+            _JOB_WAKEUP.stop()
+            _JOB_WAKEUP = PgNotifyJobWakeup(dsn)
+    _JOB_WAKEUP.start()
+    return _JOB_WAKEUP
+
+
+def notify_job_enqueued(next_run_at: Union[None, float, str, datetime] = None) -> None:
+    """Tell idle workers in THIS process that a job was enqueued or re-armed.
+
+    Cross-process wakeups come from the Postgres trigger; this covers
+    in-process enqueues (chained jobs, reschedules) with zero DB round trips
+    and is harmless when the trigger also fires.
+    """
+    _JOB_WAKEUP.notify(next_run_at)
+
+
 # ============================================================================
 # claim_next_job (async wrapper around the RPC)
 # ============================================================================
@@ -246,6 +705,7 @@ async def claim_next_job(db: Any, worker_id_text: str) -> Optional[Dict[str, Any
     will.
     """
     loop = asyncio.get_running_loop()
+    t0 = time.monotonic()
     try:
         # NOTE (pre-existing, reviewed 2026-06-10): `db` is created on the main
         # thread and this RPC executes on a default-executor thread, which is
@@ -261,6 +721,8 @@ async def claim_next_job(db: Any, worker_id_text: str) -> Optional[Dict[str, Any
     except Exception as e:
         logger.exception(f"claim_next_job RPC failed: {e}")
         return None
+    finally:
+        _METRICS.record_call("claim_next_job", time.monotonic() - t0)
 
     rows = getattr(result, "data", None) or []
     if not rows:
@@ -268,6 +730,235 @@ async def claim_next_job(db: Any, worker_id_text: str) -> Optional[Dict[str, Any
     return rows[0]
 
 
+# ============================================================================
+# Subprocess pool for CPU-bound handlers
+# ============================================================================
+#
+# Thread-per-job keeps slow handlers from blocking each other on I/O, but
+# every thread shares one GIL: CPU-bound handlers (EXECUTION_PROCESS in the
+# registry) serialize each other even at pool_size>1. Those run in a small
+# spawn-context ProcessPoolExecutor instead. Pool processes import the
+# handler module in their initializer (pre-warmed), ignore SIGTERM/SIGINT
+# (the parent owns shutdown), and are killed by stop_process_pool(kill=True)
+# if they are still busy when the SIGTERM drain times out — their runs are
+# then failed + re-armed by the shutdown hygiene / recover_stuck_runs_v2,
+# exactly like thread runs left behind at shutdown. Each job flushes the
+# process's usage write buffer before returning, so a kill loses no
+# token_usage rows from finished jobs.
+
+def _rss_mb(field: str) -> Optional[float]:
+    """VmRSS / VmHWM of this process in MB from /proc (None off Linux)."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith(field + ":"):
+                    return round(int(line.split()[1]) / 1024.0, 1)
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def _reset_peak_rss() -> None:
+    """Reset VmHWM so it measures the next job only (Linux >= 4.0)."""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        pass
+
+
+def _init_job_process(handler_module: str) -> None:
+    """Pool process initializer: load the handlers once, leave signals to the parent."""
+    # Under `python -m <handler_module>` spawn already re-ran the handler
+    # module as __mp_main__, which registered every handler; importing it
+    # again under its real name would re-register them as duplicates.
+    if not JOB_HANDLERS:
+        importlib.import_module(handler_module)
+    signal.signal(signal.SIGTERM, signal.SIG_IGN)
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+def _warm_job_process() -> int:
+    """No-op task used to start every pool process up front."""
+    return os.getpid()
+
+
+def _run_job_in_process(job_type: str, job: Dict[str, Any]) -> Dict[str, Any]:
+    """Pool-process entry point: run one handler under its own event loop.
+
+    Errors come back in the payload (with the remote traceback) rather than
+    as exceptions, so resource usage is reported for failed runs too.
+    """
+    _reset_peak_rss()
+    cpu_start = time.process_time()
+    payload: Dict[str, Any] = {"result": None, "error": None}
+    try:
+        payload["result"] = asyncio.run(dispatch_job(job_type)(job))
+    except BaseException as e:  # noqa: BLE001 — report everything to the parent
+        payload["error"] = f"{type(e).__name__}: {e}\n{traceback.format_exc()}"
+    # Write this run's token_usage rows now: a process killed at shutdown
+    # never reaches its atexit drain.
+    from viraltracker.services.usage_write_buffer import flush_usage_write_buffer
+    flush_usage_write_buffer()
+    payload["usage"] = {
+        "execution_mode": EXECUTION_PROCESS,
+        "cpu_seconds": round(time.process_time() - cpu_start, 3),
+        "max_rss_mb": _rss_mb("VmHWM"),
+    }
+    try:
+        pickle.dumps(payload["result"])
+    except Exception:
+        payload["result"] = None
+    return payload
+
+
+class JobProcessPool:
+    """Pre-warmed subprocess pool for EXECUTION_PROCESS handlers."""
+
+    def __init__(
+        self,
+        size: int = PROCESS_POOL_SIZE,
+        handler_module: str = HANDLER_MODULE,
+        tasks_per_child: int = PROCESS_TASKS_PER_CHILD,
+    ) -> None:
+        self.size = size
+        self.handler_module = handler_module
+        self.tasks_per_child = tasks_per_child
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._stopped = False
+
+    @property
+    def running(self) -> bool:
+        return self._executor is not None
+
+    def start(self) -> None:
+        """Create the pool and start every process now (pre-warm)."""
+        if self._executor is not None:
+            return
+        self._stopped = False
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.size,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_job_process,
+            initargs=(self.handler_module,),
+            max_tasks_per_child=self.tasks_per_child,
+        )
+        for _ in range(self.size):
+            self._executor.submit(_warm_job_process)
+
+    async def run(
+        self,
+        job_type: str,
+        job: Dict[str, Any],
+        usage: Optional[Dict[str, Any]] = None,
+    ) -> Any:
+        """Run job_type's handler on `job` in a pool process.
+
+        Args:
+            job_type: Registered job type (looked up in the pool process).
+            job: Picklable job dict.
+            usage: Filled with execution_mode, cpu_seconds (process CPU time
+                of the run) and max_rss_mb (peak RSS of the pool process
+                during the run), success or failure.
+
+        Raises:
+            RuntimeError: The handler raised (message carries the remote
+                traceback), or the pool process died mid-run.
+        """
+        if self._executor is None:
+            raise RuntimeError("JobProcessPool is not running")
+        try:
+            payload = await asyncio.wrap_future(
+                self._executor.submit(_run_job_in_process, job_type, job)
+            )
+        except BrokenProcessPool as e:
+            # A pool process died (OOM kill, segfault) — or shutdown(kill=True)
+            # killed it. Outside shutdown the executor is unusable now, so
+            # replace it and later jobs still get a pool.
+            if not self._stopped:
+                logger.error(f"Job process pool broke during {job_type}; restarting pool")
+                self.shutdown(kill=True)
+                self.start()
+            raise RuntimeError(f"{job_type} pool process died: {e}") from e
+        if usage is not None:
+            usage.update(payload["usage"])
+        if payload["error"]:
+            raise RuntimeError(f"{job_type} failed in pool process: {payload['error']}")
+        return payload["result"]
+
+    def shutdown(self, kill: bool = False) -> None:
+        """Stop the pool; with kill=True, SIGKILL processes still running jobs.
+
+        Idle processes exit on the executor's sentinel (running their atexit
+        handlers); only those still alive after PROCESS_EXIT_GRACE_SECONDS,
+        i.e. busy with a job, are killed.
+        """
+        self._stopped = True
+        executor, self._executor = self._executor, None
+        if executor is None:
+            return
+        processes = list((getattr(executor, "_processes", None) or {}).values())
+        executor.shutdown(wait=False, cancel_futures=True)
+        if kill:
+            deadline = time.monotonic() + PROCESS_EXIT_GRACE_SECONDS
+            for proc in processes:
+                proc.join(max(0.0, deadline - time.monotonic()))
+            for proc in processes:
+                if proc.is_alive():
+                    proc.kill()
+
+
+_PROCESS_POOL: Optional[JobProcessPool] = None
+
+
+def start_process_pool(size: Optional[int] = None) -> Optional[JobProcessPool]:
+    """Start the subprocess pool if any registered job type needs it.
+
+    Returns None (all jobs run in threads) when the pool is disabled via
+    SCHEDULER_PROCESS_POOL_SIZE=0 or no handler uses EXECUTION_PROCESS.
+    """
+    global _PROCESS_POOL
+    size = PROCESS_POOL_SIZE if size is None else size
+    process_types = sorted(t for t, p in JOB_EXECUTION.items() if p == EXECUTION_PROCESS)
+    if size <= 0 or not process_types:
+        return None
+    if _PROCESS_POOL is None:
+        _PROCESS_POOL = JobProcessPool(size=size)
+    _PROCESS_POOL.start()
+    logger.info(f"Job process pool started: size={size} job_types={process_types}")
+    return _PROCESS_POOL
+
+
+def stop_process_pool(kill: bool = False) -> None:
+    """Stop the subprocess pool (kill=True at the end of the SIGTERM drain)."""
+    global _PROCESS_POOL
+    pool, _PROCESS_POOL = _PROCESS_POOL, None
+    if pool is not None:
+        pool.shutdown(kill=kill)
+
+
+async def run_job_handler(
+    job_type: str,
+    handler: Callable[..., Awaitable[Any]],
+    job: Dict[str, Any],
+    *,
+    name: str = "job-thread",
+    usage: Optional[Dict[str, Any]] = None,
+) -> Any:
+    """Run a claimed job under its registered execution policy.
+
+    EXECUTION_PROCESS jobs go to the subprocess pool when it is running;
+    everything else (and process jobs when the pool is off) runs through
+    run_coroutine_in_thread with `handler`. The pool looks the handler up by
+    job_type, so wrappers around `handler` (e.g. the Meta SDK lock) apply to
+    thread runs only — keep such job types on EXECUTION_THREAD.
+    """
+    pool = _PROCESS_POOL
+    if execution_policy(job_type) == EXECUTION_PROCESS and pool is not None and pool.running:
+        return await pool.run(job_type, job, usage)
+    return await run_coroutine_in_thread(handler, job, name=name, usage=usage)
+
+
 # ============================================================================
 # Worker loop (skeleton)
 # ============================================================================
@@ -276,6 +967,7 @@ async def run_coroutine_in_thread(
     coro_fn: Callable[..., Awaitable[Any]],
     *args: Any,
     name: str = "job-thread",
+    usage: Optional[Dict[str, Any]] = None,
 ) -> Any:
     """Run an async callable in its OWN daemon thread with its OWN event loop,
     awaiting completion WITHOUT blocking the caller's loop.
@@ -299,6 +991,10 @@ async def run_coroutine_in_thread(
     - If the awaiting task is CANCELLED (shutdown), the thread keeps running
       as a daemon — identical to today's in-flight-work-at-shutdown behavior.
 
+    If `usage` is given it is filled with the run's resource usage (see
+    JobProcessPool.run), success or failure: the thread's CPU time and the
+    worker's RSS at the end (RSS is process-wide for thread runs).
+
     Returns the coroutine's result.
     """
     loop = asyncio.get_running_loop()
@@ -306,11 +1002,13 @@ async def run_coroutine_in_thread(
     outcome: Dict[str, Any] = {}
 
     def _runner() -> None:
+        cpu_start = time.thread_time()
         try:
             outcome["result"] = asyncio.run(coro_fn(*args))
         except BaseException as e:  # noqa: BLE001 — must propagate everything
             outcome["exc"] = e
         finally:
+            outcome["cpu_seconds"] = time.thread_time() - cpu_start
             try:
                 loop.call_soon_threadsafe(done.set)
             except RuntimeError:
@@ -320,6 +1018,12 @@ async def run_coroutine_in_thread(
     t = threading.Thread(target=_runner, name=name, daemon=True)
     t.start()
     await done.wait()
+    if usage is not None:
+        usage.update({
+            "execution_mode": EXECUTION_THREAD,
+            "cpu_seconds": round(outcome.get("cpu_seconds", 0.0), 3),
+            "max_rss_mb": _rss_mb("VmRSS"),
+        })
     if "exc" in outcome:
         exc = outcome["exc"]
         if isinstance(exc, asyncio.CancelledError):
@@ -341,8 +1045,9 @@ async def worker_loop(
     slot: int,
     *,
     execute_fn: Callable[[Dict[str, Any]], Awaitable[Any]],
-    poll_idle_seconds: float = IDLE_BACKOFF_SECONDS,
+    poll_idle_seconds: Optional[float] = None,
     poll_caphit_seconds: float = CAP_HIT_BACKOFF_SECONDS,
+    wakeup: Optional[JobWakeup] = None,
 ) -> None:
     """One worker task: claim → dispatch → repeat until shutdown_requested.
 
@@ -355,27 +1060,53 @@ async def worker_loop(
                     daemon thread (run_coroutine_in_thread), so a handler's
                     sync DB/LLM calls block only that job — never this loop,
                     the sibling slots, or the timers.
+        poll_idle_seconds: Max idle wait between claims. Defaults to the
+                    wakeup's safety poll (2s without a notification feed,
+                    30s with one).
+        wakeup: Wake source for idle waits (default: get_job_wakeup()).
+
+    When the queue is empty the worker blocks on the wakeup until a job may
+    be claimable (NOTIFY / in-process notify), the earliest known
+    next_run_at arrives, or the safety poll elapses.
 
     PR 2 callsite: viraltracker/worker/scheduler_worker.py::run_scheduler().
     """
     worker_id_text = make_worker_id(slot)
     logger.info(f"worker_loop start worker_id={worker_id_text}")
+    # When the current idle stretch was ended by a signal: claim latency is
+    # measured from here to the successful claim.
+    woke_at: Optional[float] = None
 
     while not shutdown_requested.is_set():
         try:
+            source = wakeup or get_job_wakeup()
+            seen = source.generation
             claimed = await claim_next_job(db, worker_id_text)
             if claimed is None:
-                # Either no work or a cap was hit. Either way: sleep + retry.
-                # Use wait_for so a SIGTERM during idle exits promptly instead
-                # of waiting the full backoff.
-                try:
-                    await asyncio.wait_for(
-                        shutdown_requested.wait(), timeout=poll_idle_seconds
-                    )
-                except asyncio.TimeoutError:
-                    pass
+                _METRICS.record_claim(False)
+                woke_at = None
+                # Either no work or a cap was hit. Either way: wait for a
+                # wakeup, the next due job, or the safety poll. The wait
+                # also returns promptly on SIGTERM.
+                timeout = poll_idle_seconds if poll_idle_seconds is not None else source.safety_poll_seconds
+                due_in = await source.seconds_until_due(db)
+                due_first = due_in is not None and due_in < timeout
+                if due_first:
+                    timeout = due_in
+                if await source.wait(seen, timeout):
+                    _METRICS.record_wakeup("notify")
+                    woke_at = source.last_signal_at
+                elif due_first and not shutdown_requested.is_set():
+                    _METRICS.record_wakeup("due")
+                    woke_at = time.monotonic()
+                else:
+                    _METRICS.record_wakeup("poll")
                 continue
 
+            _METRICS.record_claim(
+                True, time.monotonic() - woke_at if woke_at is not None else None
+            )
+            woke_at = None
             logger.info(
                 f"worker {worker_id_text} claimed run_id={claimed.get('run_id')} "
                 f"job_id={claimed.get('job_id')} job_type={claimed.get('job_type')} "
@@ -472,7 +1203,12 @@ def _reset_for_tests() -> None:
     module namespace each call, not via a closed-over reference."""
     import sys
     JOB_HANDLERS.clear()
+    JOB_EXECUTION.clear()
+    stop_process_pool(kill=True)
     _SATURATED.pairs.clear()
     _CAP_CACHE.last_fetched = 0.0
     _CAP_CACHE.last_global_cap = None
+    _METRICS.reset()
+    _JOB_WAKEUP.stop()
+    sys.modules[__name__]._JOB_WAKEUP = JobWakeup()
     sys.modules[__name__].shutdown_requested = asyncio.Event()
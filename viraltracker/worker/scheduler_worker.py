@@ -26,13 +26,19 @@ import pytz
 import base64
 from viraltracker.worker.scheduler_concurrency import (
     DEFAULT_POOL_SIZE,
+    EXECUTION_PROCESS,
     JOB_HANDLERS,
     dispatch_job,
     make_worker_id,
     boot_id,
+    get_scheduler_metrics,
+    notify_job_enqueued,
     register_job_handler,
-    run_coroutine_in_thread,
+    run_job_handler,
     shutdown_requested as _concurrency_shutdown_event,
+    start_job_wakeup,
+    start_process_pool,
+    stop_process_pool,
     worker_loop,
 )
 
@@ -49,6 +55,9 @@ PST = pytz.timezone('America/Los_Angeles')
 # Graceful shutdown flag
 shutdown_requested = False
 
+# How often run_scheduler logs the claim-latency / RPC-rate metrics
+SCHEDULER_METRICS_LOG_SECONDS = 300.0
+
 # Maximum ads per scheduled run (configurable via system_settings)
 DEFAULT_MAX_ADS_PER_SCHEDULED_RUN = 200
 
@@ -561,6 +570,8 @@ def update_job(job_id: str, updates: Dict):
     try:
         db = get_supabase_client()
         db.table("scheduled_jobs").update(updates).eq("id", job_id).execute()
+        if updates.get("next_run_at"):
+            notify_job_enqueued(updates["next_run_at"])
     except Exception as e:
         logger.error(f"Failed to update job {job_id}: {e}")
 
@@ -754,6 +765,7 @@ def heal_orphaned_recurring_jobs() -> List[Dict[str, Any]]:
                     "concurrently by another path."
                 )
                 continue
+            notify_job_enqueued(next_run)
             summary = {
                 "job_id": job_id,
                 "job_type": job.get("job_type"),
@@ -2402,13 +2414,20 @@ async def execute_meta_sync_job(job: Dict) -> Dict[str, Any]:
         else:
             logs.append(f"Fetched {len(insights)} insight records")
 
-            rows_inserted = await service.sync_performance_to_db(
+            sync_result = await service.sync_performance_to_db(
                 insights=insights,
                 brand_id=UUID(brand_id)
             )
+            rows_inserted = sync_result.saved
 
             ads_synced = len(set(i.get('ad_id') for i in insights if i.get('ad_id')))
             logs.append(f"Synced {ads_synced} ads, {rows_inserted} data rows")
+            logs.append(
+                f"DB write: {sync_result.chunks} chunks in {sync_result.elapsed_seconds:.1f}s "
+                f"({sync_result.rows_per_second:.0f} rows/s)"
+            )
+            if sync_result.failed:
+                logs.append(f"{sync_result.failed} rows failed to save")
 
         freshness.record_success(brand_id, "meta_ads_performance", records_affected=rows_inserted, run_id=run_id)
 
@@ -2921,7 +2940,7 @@ async def execute_weekly_product_digest_job(job: Dict) -> Dict[str, Any]:
 # Scorecard Job Handler
 # ============================================================================
 
-@register_job_handler('scorecard')
+@register_job_handler('scorecard', execution=EXECUTION_PROCESS)
 async def execute_scorecard_job(job: Dict) -> Dict[str, Any]:
     """
     Execute a weekly performance scorecard job.
@@ -4222,6 +4241,7 @@ def _enqueue_creative_deep_analysis_chain(brand_id: str, params: Optional[Dict]
             "next_run_at": next_run,
             "parameters": merged_params,
         }).execute()
+        notify_job_enqueued(next_run)
         logger.info(f"Enqueued creative_deep_analysis chain for brand {brand_id}")
         return True
     except Exception as e:
@@ -5189,7 +5209,9 @@ async def _dispatch_claimed_job(db, claimed: Dict[str, Any]) -> None:
          swept execute_*_job handlers can verify they were called through
          the claim path and reuse the pre-claimed run_id.
       3. Emit the job_started activity event (matches the legacy path).
-      4. Look up the handler via dispatch_job() and await it.
+      4. Look up the handler via dispatch_job() and await it under its
+         execution policy (thread, or the subprocess pool), then record the
+         run's CPU / RSS usage on scheduled_job_runs.
       5. On dispatcher exception: mark the run failed and reschedule the
          parent job. A single bad job MUST NOT take the worker down.
     """
@@ -5259,9 +5281,17 @@ async def _dispatch_claimed_job(db, claimed: Dict[str, Any]) -> None:
                 with _META_SDK_LOCK:
                     return await original_handler(j)
 
-        await run_coroutine_in_thread(
-            handler, job, name=f"job-{job_type}-{str(run_id)[:8]}"
-        )
+        # EXECUTION_PROCESS job types (CPU-bound) run in the subprocess pool
+        # instead, so they don't serialize on the worker's GIL.
+        usage: Dict[str, Any] = {}
+        try:
+            await run_job_handler(
+                job_type, handler, job,
+                name=f"job-{job_type}-{str(run_id)[:8]}", usage=usage,
+            )
+        finally:
+            if usage:
+                update_job_run(run_id, usage)
 
     except Exception:
         logger.exception(
@@ -5295,7 +5325,12 @@ async def run_scheduler():
         (run_coroutine_in_thread): handlers do sync DB/LLM work inside
         async-def, which on the shared loop starved every other slot + timer
         for the job's whole duration (verified live 2026-06-09). With
-        thread-per-job, pool_size=N gives N truly concurrent jobs.
+        thread-per-job, pool_size=N gives N truly concurrent jobs. Job types
+        registered with execution=EXECUTION_PROCESS (CPU-bound) run in a
+        pre-warmed subprocess pool instead, so they don't share the GIL.
+        Idle slots block on the process JobWakeup (Postgres LISTEN/NOTIFY
+        when SCHEDULER_NOTIFY_DSN is set) until a run may be claimable or
+        the next next_run_at arrives; polling is only a safety net.
       - One recovery THREAD (start_recovery_thread, 0-30s startup jitter,
         ~60s tick) running recover_stuck_runs_v2 + heal_orphaned_recurring_jobs.
         A thread, not an asyncio task: long handlers block the event loop with
@@ -5335,6 +5370,28 @@ async def run_scheduler():
     async def _execute_one(claimed: Dict[str, Any]) -> None:
         await _dispatch_claimed_job(db, claimed)
 
+    async def _log_metrics():
+        """Periodic claim-latency / RPC-rate line for the worker logs."""
+        while not _concurrency_shutdown_event.is_set():
+            try:
+                await asyncio.wait_for(
+                    _concurrency_shutdown_event.wait(), timeout=SCHEDULER_METRICS_LOG_SECONDS
+                )
+            except asyncio.TimeoutError:
+                pass
+            m = get_scheduler_metrics().snapshot()
+            logger.info(
+                f"Scheduler metrics: rpc/min={m['rpc_per_minute']} "
+                f"calls/min={m['calls_per_minute']} claims={m['claims']} "
+                f"empty={m['empty_claims']} "
+                f"claim_latency_s={m['claim_latency_seconds']} "
+                f"wakeups={m['wakeups']} notify_connected={wakeup.connected}"
+            )
+
+    # Idle slots block on this instead of polling every 2s: Postgres
+    # LISTEN/NOTIFY when SCHEDULER_NOTIFY_DSN is set, else in-process only.
+    wakeup = start_job_wakeup()
+
     # Recovery owner runs in a dedicated DAEMON THREAD (stuck-run RPC + the
     # heal_orphaned_recurring_jobs sweep). NOT an asyncio task: long handlers
     # block the event loop with sync DB/LLM calls, which starved the asyncio
@@ -5342,8 +5399,13 @@ async def run_scheduler():
     # analysis job — verified live 2026-06-09. See start_recovery_thread().
     start_recovery_thread()
 
+    # Pre-warmed subprocess pool for EXECUTION_PROCESS (CPU-bound) handlers;
+    # None when SCHEDULER_PROCESS_POOL_SIZE=0 (everything runs in threads).
+    start_process_pool()
+
     tasks = [
         asyncio.create_task(_watch_shutdown_bool(), name="watch_shutdown"),
+        asyncio.create_task(_log_metrics(), name="scheduler_metrics"),
     ]
     for slot in range(pool_size):
         tasks.append(asyncio.create_task(
@@ -5368,6 +5430,15 @@ async def run_scheduler():
         for t in tasks:
             if not t.done():
                 t.cancel()
+        wakeup.stop()
+        # Pool processes still running a job after the drain are killed; their
+        # runs were already failed + re-armed by the shutdown hygiene.
+        stop_process_pool(kill=True)
+
+    # Flush buffered token_usage rows before the container goes away; rows
+    # that cannot reach the DB are spilled to disk and replayed next boot.
+    from viraltracker.services.usage_write_buffer import drain_usage_write_buffer
+    await asyncio.to_thread(drain_usage_write_buffer, 5.0)
 
     logger.info("Scheduler worker stopped")
 
@@ -5377,7 +5448,7 @@ async def run_scheduler():
 # ============================================================================
 
 
-@register_job_handler('creative_genome_update')
+@register_job_handler('creative_genome_update', execution=EXECUTION_PROCESS)
 async def execute_creative_genome_update_job(job: Dict) -> Dict[str, Any]:
     """Execute a Creative Genome update job — compute rewards and update element scores.
 
@@ -6916,6 +6987,7 @@ def _chain_interlink_job(article_id: str, brand_id: str, organization_id: str):
                 "organization_id": organization_id,
             },
         }).execute()
+        notify_job_enqueued(next_run)
         logger.info(f"Chained seo_auto_interlink for article {article_id}")
     except Exception as e:
         logger.error(f"Failed to chain interlink job for {article_id}: {e}")